@@ -0,0 +1,84 @@
+"""
+Pantallita 3.0 - Sprite Atlas Loading Module
+Reads the CSV indexes written by tools/build_assets.py (/img/atlas/*.csv)
+Display modules then open one atlas bitmap per image family and pick icons by tile index
+INLINE ARCHITECTURE - all parsing inline, no helper functions
+"""
+
+import os
+import config
+import state
+import logger
+
+
+# ============================================================================
+# ATLAS INDEX LOADING (INLINE)
+# ============================================================================
+
+def load_atlases():
+	"""
+	Load every atlas index into state.image_atlases.
+
+	Index format (one file per family, next to <family>.bmp):
+		# comment
+		source,/img/weather/columns
+		tile,13,13
+		1.bmp,0
+		2.bmp,1
+
+	state.image_atlases maps the family's source directory to
+	(atlas_path, tile_width, tile_height, {file_name: tile_index}).
+	Missing directory or a bad index = that family keeps using loose files.
+
+	Returns:
+		int: Number of atlases loaded
+	"""
+	state.image_atlases = {}
+
+	try:
+		file_names = os.listdir(config.Paths.ATLAS_IMAGES)
+	except OSError:
+		logger.log("No sprite atlases - using individual image files", config.LogLevel.DEBUG, area="ASSETS")
+		return 0
+
+	for file_name in file_names:
+		if not file_name.endswith(".csv"):
+			continue
+
+		index_path = f"{config.Paths.ATLAS_IMAGES}/{file_name}"
+		atlas_path = index_path[:-4] + ".bmp"
+		source = None
+		tile_width = 0
+		tile_height = 0
+		tiles = {}
+
+		try:
+			with open(index_path, "r") as f:
+				for line in f:
+					line = line.strip()
+					if not line or line.startswith("#"):
+						continue
+					parts = line.split(",")
+					if parts[0] == "source":
+						source = parts[1]
+					elif parts[0] == "tile":
+						tile_width = int(parts[1])
+						tile_height = int(parts[2])
+					else:
+						tiles[parts[0]] = int(parts[1])
+
+			# Atlas bitmap must exist too (index copied without its BMP = skip)
+			os.stat(atlas_path)
+
+			if source and tile_width > 0 and tile_height > 0 and tiles:
+				state.image_atlases[source] = (atlas_path, tile_width, tile_height, tiles)
+				logger.log(f"Atlas {atlas_path}: {len(tiles)} tiles ({tile_width}x{tile_height}) for {source}", config.LogLevel.DEBUG, area="ASSETS")
+			else:
+				logger.log(f"Atlas index {index_path} incomplete - ignored", config.LogLevel.WARNING, area="ASSETS")
+
+		except (OSError, ValueError, IndexError) as e:
+			logger.log(f"Atlas index {index_path} unusable: {e}", config.LogLevel.WARNING, area="ASSETS")
+
+	if state.image_atlases:
+		logger.log(f"Loaded {len(state.image_atlases)} sprite atlases", area="ASSETS")
+	return len(state.image_atlases)
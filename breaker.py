@@ -0,0 +1,129 @@
+"""
+Pantallita 3.0 - Provider Circuit Breaker
+One breaker per API provider (same provider names as quota.py)
+Opens after consecutive failures; while open, fetches skip the network and use cache
+Probes again after an exponential backoff with jitter; one success closes it
+INLINE ARCHITECTURE - flat counter math, no helper chains
+"""
+
+import time
+import random
+import config
+import state
+import logger
+import quota
+
+
+# ============================================================================
+# CALL GATE (INLINE)
+# ============================================================================
+
+def allow(provider):
+	"""
+	Check the provider's breaker before a request (call before quota.reserve
+	so an open breaker does not spend quota).
+
+	Closed: allow. Open: deny (caller returns cached data) until the backoff
+	has elapsed, then allow probe requests until one is recorded.
+
+	Returns:
+		bool: True if the request may go out, False = skip and use cache
+	"""
+	breaker = state.breakers.get(provider)
+	if breaker is None or breaker[0] < config.Breaker.FAILURE_THRESHOLD:
+		return True
+
+	remaining = breaker[1] - time.monotonic()
+	if remaining <= 0:
+		logger.log(f"Breaker {provider}: half-open - probing", config.LogLevel.INFO, area="BREAKER")
+		return True
+
+	breaker[4] += 1
+	logger.log(f"Breaker {provider}: open - skip, use cache ({int(remaining)}s to next probe)", config.LogLevel.DEBUG, area="BREAKER")
+	return False
+
+
+def record(provider, ok):
+	"""
+	Record the outcome of a request that reached (or failed to reach) the provider.
+
+	Failure = no response (timeout, DNS, socket error) or HTTP 5xx.
+	Any other response - including 4xx - proves the provider is reachable.
+
+	Args:
+		provider: One of quota.PROVIDERS
+		ok: True if the provider answered
+	"""
+	# Breaker: [consecutive_failures, open_until, backoff, trips, fast_fails]
+	breaker = state.breakers.get(provider)
+	if breaker is None:
+		breaker = [0, 0.0, 0, 0, 0]
+		state.breakers[provider] = breaker
+
+	threshold = config.Breaker.FAILURE_THRESHOLD
+
+	if ok:
+		if breaker[0] >= threshold:
+			logger.log(f"Breaker {provider}: closed - provider back ({breaker[4]} requests skipped while open)", config.LogLevel.INFO, area="BREAKER")
+		breaker[0] = 0
+		breaker[2] = 0
+		return
+
+	breaker[0] += 1
+	if breaker[0] < threshold:
+		return
+
+	# Trip, or a failed probe: back off exponentially, with jitter so the
+	# providers do not all probe in the same cycle
+	if breaker[0] == threshold:
+		breaker[2] = config.Breaker.BACKOFF_MIN
+		breaker[3] += 1
+	else:
+		breaker[2] = min(breaker[2] * 2, config.Breaker.BACKOFF_MAX)
+
+	jitter = config.Breaker.BACKOFF_JITTER
+	delay = breaker[2] * random.uniform(1 - jitter, 1 + jitter)
+	breaker[1] = time.monotonic() + delay
+	logger.log(f"Breaker {provider}: open after {breaker[0]} consecutive failures - next probe in {int(delay)}s", config.LogLevel.WARNING, area="BREAKER")
+
+
+def record_no_response(provider, timeout):
+	"""
+	Record a request that got no response (timeout, DNS, socket error).
+
+	Not counted when the fetch deadline had shortened the request's timeout
+	below Network.REQUEST_TIMEOUT - on a merely slow network that says more
+	about the screen's budget than about the provider.
+
+	Args:
+		provider: One of quota.PROVIDERS
+		timeout: Socket timeout the request was made with (connections.request_timeout)
+	"""
+	if timeout < config.Network.REQUEST_TIMEOUT:
+		logger.log(f"Breaker {provider}: no response within a shortened {timeout:.1f}s timeout - not counted", config.LogLevel.DEBUG, area="BREAKER")
+		return
+	record(provider, False)
+
+
+def is_open(provider):
+	"""True while the provider's breaker is open (including the probe window)."""
+	breaker = state.breakers.get(provider)
+	return breaker is not None and breaker[0] >= config.Breaker.FAILURE_THRESHOLD
+
+
+# ============================================================================
+# STATUS LOGGING (INLINE)
+# ============================================================================
+
+def log_status():
+	"""Log every provider whose breaker has failures, is open, or has tripped."""
+	now_time = time.monotonic()
+	for provider in quota.PROVIDERS:
+		breaker = state.breakers.get(provider)
+		if breaker is None or (breaker[0] == 0 and breaker[3] == 0):
+			continue
+		failures, open_until, backoff, trips, fast_fails = breaker
+		if failures >= config.Breaker.FAILURE_THRESHOLD:
+			logger.log(f"Breaker {provider}: OPEN ({failures} failures, probe in {max(0, int(open_until - now_time))}s, backoff {backoff}s), trips {trips}, skipped {fast_fails}", config.LogLevel.WARNING, area="BREAKER")
+		else:
+			logger.log(f"Breaker {provider}: closed ({failures} recent failures), trips {trips}, skipped {fast_fails}", config.LogLevel.INFO, area="BREAKER")
@@ -15,6 +15,18 @@ import time
 import gc
 import traceback
 import supervisor
+import os
+import sys
+
+# Precompiled startup mode: PANTALLITA_MPY_DIR in settings.toml points at the
+# .mpy builds from tools/build_mpy.py. Searched first, so project modules load
+# as bytecode instead of being compiled from .py on every boot.
+MPY_DIR = os.getenv("PANTALLITA_MPY_DIR")
+if MPY_DIR:
+	sys.path.insert(0, MPY_DIR)
+
+import_start = time.monotonic()
+
 from adafruit_display_text import bitmap_label
 
 import config
@@ -34,24 +46,59 @@ import logger
 # Import configuration manager (Phase 3)
 import config_manager
 
-# Import stocks modules (Phase 4)
-import stocks_api
-import display_stocks
+# Import weekday indicator module (Phase 6)
+import display_weekday
 
-# Import schedule modules (Phase 5)
-import schedule_loader
-import display_schedules
+# Import daily timeline engine
+import timeline
 
-# Import event modules (Phase 6)
-import event_loader
-import display_events
+# Import API quota budgeter
+import quota
 
-# Import weekday indicator module (Phase 6)
-import display_weekday
+# Import sprite atlas indexes (tools/build_assets.py)
+import atlas_loader
+
+# Import config-driven feature loader
+import features
+
+# Import connection manager (keep-alive session, DNS cache)
+import connections
+
+# Import per-provider circuit breakers
+import breaker
+
+# Import heap manager (scheduled collections, fragmentation guard)
+import heap
+
+# Import display playlist (screen order, durations, frequencies)
+import playlist
+
+# Import compiled config snapshot (CSV sources re-parsed only when changed)
+import snapshot
 
-# Import transit modules (Phase 7)
-import transit_api
-import display_transit
+# Import thin-client frame display only when settings.toml points at a frame
+# server (tools/fleet_server.py renders weather, forecast and transit)
+display_frame = None
+if config.Env.FLEET_FRAME_URL:
+	import display_frame
+
+# Feature modules - bound by features.sync(globals()) when their display is
+# enabled in config.csv (stocks Phase 4, schedules Phase 5, events Phase 6,
+# transit Phase 7). Every call site is gated by the same toggle.
+stocks_api = None
+stocks_planner = None
+market_calendar = None
+stocks_stream = None
+display_stocks = None
+schedule_loader = None
+display_schedules = None
+event_loader = None
+display_events = None
+transit_api = None
+display_transit = None
+
+state.boot_import_ms = int((time.monotonic() - import_start) * 1000)
+state.boot_mpy = bool(MPY_DIR)
 
 # ============================================================================
 # DISPLAY FUNCTIONS
@@ -113,28 +160,297 @@ def show_clock():
 # MAIN LOOP
 # ============================================================================
 
+def show_stocks_screen(duration):
+	"""
+	Run the stock screen for its playlist slot: market phase and grace
+	bookkeeping, price stream, chart/watchlist fetches, then the display.
+
+	Args:
+		duration: Seconds planned for the screen
+
+	Returns:
+		bool: True if a stock screen was shown
+	"""
+	showed_display = False
+
+	# Check market hours status (including grace period) from the timeline
+	now = state.rtc.datetime
+	current_minutes = now.tm_hour * 60 + now.tm_min
+	current_weekday = now.tm_wday  # 0=Monday, 6=Sunday
+
+	# Trading day: weekday and not an exchange holiday (calendar zeroes the session)
+	is_weekday = current_weekday < 5 and state.market_close_local_minutes > 0
+
+	# Market phase: open to close, then grace (for fetching final close price)
+	market_phase = timeline.get_market_phase(state.rtc)
+	is_market_hours = (market_phase == timeline.MARKET_OPEN)
+	is_grace_period = (market_phase == timeline.MARKET_GRACE)
+
+	# Dynamic grace period extension (only when respect_market_hours = false)
+	# Ensures all stocks get closing prices before switching to 24/7 cached display
+	respect_hours = config_manager.get_stocks_respect_market_hours()
+	if not respect_hours and current_minutes > state.market_grace_end_local_minutes and is_weekday:
+		# Past normal grace period, but respect_market_hours = false (24/7 display mode)
+		# Check if all stocks have been fetched during grace period
+		all_stock_symbols = set([s['symbol'] for s in state.cached_stocks])
+		unfetched_stocks = all_stock_symbols - state.grace_period_fetched_symbols
+
+		if len(unfetched_stocks) > 0:
+			# Still have unfetched stocks - extend grace period
+			is_grace_period = True
+			logger.log(f"Grace period auto-extension: {len(unfetched_stocks)} stocks remaining ({', '.join(list(unfetched_stocks)[:3])}{'...' if len(unfetched_stocks) > 3 else ''})", config.LogLevel.INFO, area="STOCKS")
+		else:
+			# All stocks fetched - end grace period, continue with cached data
+			if state.previous_grace_period_state:
+				# Log once when transitioning out
+				logger.log("All stocks updated - ending grace period, using cached data", config.LogLevel.INFO, area="STOCKS")
+
+	# Allow fetching during market hours OR grace period
+	state.should_fetch_stocks = is_weekday and (is_market_hours or is_grace_period)
+
+	# Grace period optimization: detect transition into grace period and reset tracking
+	if is_grace_period and not state.previous_grace_period_state:
+		# Entering grace period - clear the set of fetched symbols
+		state.grace_period_fetched_symbols.clear()
+		logger.log("Entering grace period - resetting symbol tracking", config.LogLevel.DEBUG, area="STOCKS")
+	state.previous_grace_period_state = is_grace_period
+
+	# Optional price stream during market hours (polling covers everything else)
+	if config_manager.get_stocks_streaming() and is_market_hours:
+		if stocks_stream.ensure_connected():
+			stocks_stream.poll()
+	elif stocks_stream.is_live():
+		stocks_stream.disconnect("outside market hours")
+
+	# Respect market hours if configured (already fetched above)
+	should_display_stocks = True
+	if respect_hours and not state.should_fetch_stocks:
+		should_display_stocks = False
+		logger.log("Outside market hours + grace - skipping stocks", config.LogLevel.DEBUG, area="STOCKS")
+
+	if should_display_stocks:
+		# Up-front fetch budget for the stock screen (no fetches while it shows)
+		state.fetch_deadline = connections.prefetch_deadline(duration)
+		try:
+			# Get stocks list and rotation offset
+			stocks_list = state.cached_stocks
+			offset = state.stock_rotation_offset
+
+			# Check if CURRENT stock at offset is highlighted (not search for next)
+			current_stock = stocks_list[offset]
+
+			if current_stock.get('highlight') == True:
+				# Single stock chart mode (highlighted)
+				symbol = current_stock['symbol']
+
+				now_time = time.monotonic()
+
+				# Fetch logic:
+				# - Market hours: always fetch (respecting rate limit)
+				# - Grace period: fetch ONCE per symbol, then reuse
+				# - Outside hours: fetch ONCE to cache, then reuse forever
+				should_fetch = False
+				if symbol not in state.cached_intraday_data:
+					# No cache - need to fetch regardless of market hours
+					should_fetch = True
+				elif state.should_fetch_stocks:
+					# During market hours or grace period
+					if is_grace_period:
+						# Grace period - only fetch if not already fetched this grace period
+						if symbol not in state.grace_period_fetched_symbols:
+							should_fetch = True
+					elif stocks_stream.is_live() and now_time - state.cached_intraday_data[symbol]['timestamp'] < config.Timing.STOCKS_QUOTE_FRESHNESS:
+						# Stream keeps the series current - reconcile over REST once per freshness window
+						should_fetch = False
+					else:
+						# Market hours - always fetch fresh data
+						should_fetch = True
+				# else: Outside market hours with cache - DO NOT fetch
+
+				# Credits: intraday + quote, or intraday only when the quote can be
+				# derived from bars (previous close already cached for today)
+				derive_quote = config_manager.get_stocks_derive_chart_quote()
+				credits_needed = 2
+				previous_close = state.stock_previous_close.get(symbol)
+				if derive_quote and previous_close and previous_close[0] == f"{now.tm_year:04d}-{now.tm_mon:02d}-{now.tm_mday:02d}":
+					credits_needed = 1
+
+				# Respect API quota, else use cache
+				if should_fetch and quota.available(quota.TWELVE_DATA) < credits_needed:
+					logger.log(f"Twelve Data quota low - using cached chart for {symbol}", config.LogLevel.DEBUG, area="STOCKS")
+				elif should_fetch:
+					logger.log(f"Fetching intraday data for {symbol}", config.LogLevel.DEBUG, area="STOCKS")
+					# Fetch intraday bars (full day on first fetch/new day/gaps, else only missing bars)
+					cached = state.cached_intraday_data.get(symbol)
+					intraday_data = stocks_planner.refresh_intraday(symbol, cached['data'] if cached else None)
+
+					# Quote from bars when possible, else one quote call (also caches previous close)
+					chart_quote = None
+					if intraday_data and derive_quote:
+						chart_quote = stocks_planner.derive_quote(symbol, intraday_data)
+					if intraday_data and chart_quote is None:
+						quote_data = stocks_api.fetch_stock_quotes([symbol])
+						if symbol in quote_data:
+							chart_quote = quote_data[symbol]
+							stocks_planner.record_previous_close(symbol, chart_quote)
+
+					if intraday_data and chart_quote:
+						# Progressive chart: width follows elapsed share of the trading day
+						if is_market_hours and state.market_open_local_minutes > 0:
+							progress_ratio = (current_minutes - state.market_open_local_minutes) / market_calendar.get_trading_minutes()
+						else:
+							progress_ratio = 1.0
+
+						# Decimate once at ingest - the display only draws columns
+						state.cached_intraday_data[symbol] = {
+							'data': intraday_data,
+							'quote': chart_quote,
+							'chart': stocks_api.build_chart_columns(intraday_data, chart_quote.get('open_price'), progress_ratio),
+							'progress': progress_ratio,
+							'timestamp': now_time
+						}
+						# Track symbol as fetched during grace period (optimization)
+						if is_grace_period:
+							state.grace_period_fetched_symbols.add(symbol)
+							logger.log(f"Added {symbol} to grace period tracking", config.LogLevel.DEBUG, area="STOCKS")
+
+				# Get cached data and display
+				if symbol in state.cached_intraday_data:
+					cached = state.cached_intraday_data[symbol]
+					time_series = cached['data']
+					quote = cached.get('quote')
+
+					# Partial chart cached during market hours - stretch to full width once closed
+					if not is_market_hours and cached['progress'] < 1.0 and time_series and quote:
+						cached['chart'] = stocks_api.build_chart_columns(time_series, quote.get('open_price'), 1.0)
+						cached['progress'] = 1.0
+
+					# Stream ticks changed the series since the last build
+					if cached.get('chart_dirty') and time_series and quote:
+						if is_market_hours:
+							cached['progress'] = (current_minutes - state.market_open_local_minutes) / market_calendar.get_trading_minutes()
+						cached['chart'] = stocks_api.build_chart_columns(time_series, quote.get('open_price'), cached['progress'])
+						cached['chart_dirty'] = False
+
+					# Build stock quote with display name (inline)
+					if time_series and quote:
+						stock_quote = {
+							'price': quote['price'],
+							'change_percent': quote['change_percent'],
+							'direction': quote['direction'],
+							'open_price': quote.get('open_price', 0),
+							'symbol': symbol,
+							'display_name': current_stock.get('display_name', symbol)
+						}
+
+						display_stocks.show_single_stock_chart(
+							symbol,
+							stock_quote,
+							cached['chart'],
+							duration
+						)
+						showed_display = True
+
+						# Advance offset by 1 for next cycle
+						state.stock_rotation_offset = (offset + 1) % len(stocks_list)
+					else:
+						logger.log(f"No time series data for {symbol}", config.LogLevel.WARNING, area="STOCKS")
+				else:
+					logger.log(f"No intraday data for {symbol}", config.LogLevel.WARNING, area="STOCKS")
+
+			else:
+				# Multi-stock mode - get next 4 non-highlighted stocks (display 3, 1 buffer)
+				stocks_to_show = []
+				for i in range(len(stocks_list)):
+					idx = (offset + i) % len(stocks_list)
+					stock = stocks_list[idx]
+					if stock.get('highlight') != True:
+						stocks_to_show.append(stock)
+					if len(stocks_to_show) >= 4:
+						break
+
+				if stocks_to_show:
+					# Refresh the watchlist in a credit-sized batch (upcoming symbols first,
+					# stale-only, grace/outside-hours rules applied by the planner)
+					stocks_planner.refresh(stocks_list, offset, is_grace_period)
+
+					# Attach cached prices to stocks for display (buffer covers missing quotes)
+					stocks_with_prices = []
+					for stock in stocks_to_show:
+						symbol = stock['symbol']
+						if symbol in state.cached_stock_prices:
+							stock['price'] = state.cached_stock_prices[symbol]['price']
+							stock['change_percent'] = state.cached_stock_prices[symbol]['change_percent']
+							stock['direction'] = state.cached_stock_prices[symbol]['direction']
+							stocks_with_prices.append(stock)
+						if len(stocks_with_prices) >= 3:  # Display 3
+							break
+
+					if len(stocks_with_prices) >= 2:  # Need at least 2 to show
+						stocks_planner.record_display_ages([s['symbol'] for s in stocks_with_prices])
+						display_stocks.show_multi_stock(
+							stocks_with_prices,
+							duration
+						)
+						showed_display = True
+
+						# Advance rotation offset by 3
+						state.stock_rotation_offset = (offset + 3) % len(stocks_list)
+					else:
+						logger.log("Not enough stock data - skipping display", config.LogLevel.WARNING, area="STOCKS")
+
+		except Exception as e:
+			logger.log(f"Stock display error: {e}", config.LogLevel.ERROR, area="STOCKS")
+		finally:
+			state.fetch_deadline = None
+
+	return showed_display
+
 def run_test_cycle():
 	"""Run one display cycle - now shows weather!"""
 	state.cycle_count += 1
+	state.fetch_deadline = None  # A screen that raised mid-fetch must not shorten this cycle
+	state.playlist_started = None  # Schedules run before this cycle's plan is made
 
 	# Log cycle separator (v2.5 style)
 	if config.Logging.SHOW_CYCLE_SEPARATOR:
 		logger.log_cycle_start(state.cycle_count, config.LogLevel.INFO)
 
+	# Offline-first: reconnect in the background with backoff; while WiFi is down
+	# the rotation continues on cached data (fetches return cache immediately)
+	hardware.maintain_wifi()
+
 	# Reload config and schedules periodically (every 10 cycles = ~50 minutes)
-	if state.cycle_count % 10 == 0:
+	# Deferred while offline - the cached copies stay in use
+	if state.cycle_count % 10 == 0 and not state.wifi_offline:
 		config_manager.load_config()
 
+		playlist.load_playlist()
+
+		# Import modules for newly enabled features (unload disabled ones if configured)
+		newly_loaded = features.sync(globals())
+		if "stocks" in newly_loaded and not state.cached_stocks:
+			state.cached_stocks = stocks_api.load_stocks_csv()
+		if "events" in newly_loaded and not state.cached_events:
+			state.cached_events = event_loader.merge_events(event_loader.load_local_events(), event_loader.fetch_github_events(state.rtc))
+
 		# Reload schedules (GitHub > local)
-		github_schedules, source = schedule_loader.fetch_github_schedules(state.rtc)
-		if github_schedules:
-			state.cached_schedules = github_schedules
-			logger.log(f"Reloaded {len(github_schedules)} schedules from {source}", config.LogLevel.DEBUG, area="SCHEDULE")
-		else:
-			local_schedules = schedule_loader.load_local_schedules()
-			if local_schedules:
-				state.cached_schedules = local_schedules
-				logger.log(f"Reloaded {len(local_schedules)} schedules from local file", config.LogLevel.DEBUG, area="SCHEDULE")
+		if config_manager.should_show_schedules():
+			github_schedules, source = schedule_loader.fetch_github_schedules(state.rtc)
+			if github_schedules:
+				state.cached_schedules = github_schedules
+				logger.log(f"Reloaded {len(github_schedules)} schedules from {source}", config.LogLevel.DEBUG, area="SCHEDULE")
+			else:
+				local_schedules = schedule_loader.load_local_schedules()
+				if local_schedules:
+					state.cached_schedules = local_schedules
+					logger.log(f"Reloaded {len(local_schedules)} schedules from local file", config.LogLevel.DEBUG, area="SCHEDULE")
+
+		# Config and schedules may have changed - recompile today's timeline
+		timeline.invalidate()
+
+		# Persist sources that changed (written only when one did)
+		snapshot.save()
 
 	# Check for active schedules (Phase 5) - takes priority over normal rotation
 	if config_manager.should_show_schedules() and state.cached_schedules:
@@ -143,7 +459,7 @@ def run_test_cycle():
 		current_time_str = f"{now.tm_hour}:{now.tm_min:02d}:{now.tm_sec:02d}"
 		logger.log(f"Checking schedules at {current_time_str} (day {now.tm_wday})", config.LogLevel.DEBUG, area="SCHEDULE")
 
-		active_schedule_name, active_schedule_config = schedule_loader.get_active_schedule(state.rtc, state.cached_schedules)
+		active_schedule_name, active_schedule_config = timeline.get_active_schedule(state.rtc)
 
 		if active_schedule_name:
 			# Active schedule found - display it for remaining duration
@@ -162,326 +478,133 @@ def run_test_cycle():
 		else:
 			logger.log(f"No active schedule at {current_time_str}", config.LogLevel.DEBUG, area="SCHEDULE")
 
-	# Check WiFi status
-	if not hardware.is_wifi_connected():
-		logger.log("WiFi disconnected!", config.LogLevel.WARNING)
-		show_message("NO WIFI", config.Colors.RED)
-		time.sleep(5)
+	# Plan this cycle from the playlist (fixed cycle length, squeezed before a schedule starts)
+	seconds_to_schedule = None
+	if config_manager.should_show_schedules() and state.cached_schedules:
+		seconds_to_schedule = timeline.seconds_until_next_schedule(state.rtc)
+	playlist.plan_cycle(state.rtc, state.cycle_count, seconds_to_schedule)
 
-		# Try to reconnect
-		if hardware.reconnect_wifi():
-			show_message("WIFI OK", config.Colors.GREEN)
-			time.sleep(2)
-		else:
-			logger.log("WiFi reconnect failed - showing clock", config.LogLevel.ERROR)
-			# Show clock as fallback
-			try:
-				show_clock()
-				time.sleep(config.Timing.CLOCK_UPDATE_INTERVAL)  # Sleep to avoid tight loop
-			except Exception as e:
-				logger.log(f"Clock display error: {e}", config.LogLevel.ERROR)
-				time.sleep(10)
-		return
-	
-	# Fetch weather, forecast and stock data
+	# Fetch weather and forecast data for the planned screens
 	try:
-		# Check if we need to fetch weather or forecast based on config
-		need_weather = config_manager.should_show_weather()
-		need_forecast = config_manager.should_show_forecast()
+		need_weather = playlist.duration("weather") > 0
+		need_forecast = playlist.duration("forecast") > 0
+
+		# Transit header shows the temperature when weather is enabled
+		need_current = need_weather or need_forecast
+		if playlist.duration("transit") > 0 and (config_manager.should_show_weather() or config_manager.should_show_forecast()):
+			need_current = True
 
 		# Fetch data only if needed
 		weather_data = None
 		forecast_data = None
 
-		if need_weather or need_forecast:
-			weather_data = weather_api.fetch_current()
+		# Up-front fetch budget for the screens that use the weather
+		state.fetch_deadline = connections.prefetch_deadline(playlist.duration("weather") + playlist.duration("forecast") + playlist.duration("transit"))
 
-		if need_forecast:
+		if need_current:
+			weather_data = weather_api.fetch_current()
+		if need_forecast and weather_data:
 			forecast_data = weather_api.fetch_forecast()
+		state.fetch_deadline = None
 
 		# Track if we showed anything
 		showed_display = False
+		clock_shown = False
 
-		if weather_data:
-			# Display forecast first (uses current weather for column 1)
-			if need_forecast and forecast_data:
-				display_forecast.show(weather_data, forecast_data, config.Timing.FORECAST_DISPLAY_DURATION)
-				showed_display = True
-			elif need_forecast:
-				logger.log("No forecast data - skipping forecast display", config.LogLevel.WARNING, area="MAIN")
-
-			# Then display current weather
-			if need_weather:
-				display_weather.show(weather_data, config.Timing.WEATHER_DISPLAY_DURATION)
-				showed_display = True
-
-		# Event display (Phase 6) - After weather, before transit/stocks
-		if config_manager.should_show_events() and state.cached_events:
-			# Get active events for today (filtered by date + time window)
-			active_events = event_loader.get_active_events(state.rtc, state.cached_events)
-			if active_events:
-				# Calculate remaining cycle time for events (flexible duration)
-				# Typical cycle: Forecast(60s) + Weather(240s) + Events(remaining) + Transit(30s) + Stocks(30s)
-				# Events get whatever time is left (usually 0-60s)
-				# For now, use fixed 30s for events
-				display_events.show_events(active_events, config.Timing.TRANSIT_DISPLAY_DURATION)
-				showed_display = True
-
-		# Transit display (Phase 7) - After events, before stocks
-		if config_manager.should_show_transit():
-			# Check if we should show transit this cycle
-			freq = config_manager.get_transit_display_frequency()
-			should_show_transit_this_cycle = (state.cycle_count % freq == 0)
-
-			if should_show_transit_this_cycle:
-				try:
-					display_transit.show_transit(config.Timing.TRANSIT_DISPLAY_DURATION, weather_data)
+		# Run the plan in playlist order. A screen that cannot show (no data,
+		# display error) is dropped and its time goes to the screens after it.
+		i = 0
+		while i < len(state.playlist_plan):
+			screen, duration = state.playlist_plan[i]
+			shown = False
+
+			# Screen build ahead - collect now rather than mid-build
+			heap.prepare("screen")
+
+			# Render benchmark: time and heap until the screen's first dwell (hardware.wait)
+			if screen in ("weather", "forecast", "transit"):
+				state.render_probe = (f"{screen} native", time.monotonic(), gc.mem_free())
+
+			# Any screen that raises is dropped like one without data
+			try:
+				# Thin client: server frame first, native renderer when none arrives
+				if display_frame is not None and screen in display_frame.SCREENS and display_frame.show(screen, duration):
+					shown = True
+
+				elif screen == "forecast":
+					# Uses current weather for column 1
+					if weather_data and forecast_data:
+						display_forecast.show(weather_data, forecast_data, duration)
+						shown = True
+					else:
+						logger.log("No forecast data - skipping forecast display", config.LogLevel.WARNING, area="MAIN")
+
+				elif screen == "weather":
+					if weather_data:
+						display_weather.show(weather_data, duration)
+						shown = True
+
+				elif screen == "events":
+					# Active events for today (filtered by date + time window)
+					active_events = timeline.get_active_events(state.rtc)
+					if active_events:
+						display_events.show_events(active_events, duration)
+						shown = True
+
+				elif screen == "transit":
+					display_transit.show_transit(duration, weather_data)
+					shown = True
+
+				elif screen == "stocks":
+					shown = show_stocks_screen(duration)
+
+				elif screen == playlist.CLOCK:
+					# Time of a dropped last screen - the cycle keeps its length
+					end_time = time.monotonic() + duration
+					while True:
+						show_clock()
+						remaining = end_time - time.monotonic()
+						if remaining <= 0 or hardware.wait(min(remaining, config.Timing.CLOCK_UPDATE_INTERVAL)) is not None:
+							break
+					shown = True
+			except Exception as e:
+				logger.log(f"{screen} display error: {e}", config.LogLevel.ERROR, area="MAIN")
+				shown = False
+
+			if shown:
+				if screen == playlist.CLOCK:
+					clock_shown = True
+				else:
 					showed_display = True
+				i += 1
+			else:
+				playlist.drop(screen)
+
+		# Off-cycle watchlist refresh during market hours keeps quotes within the
+		# freshness window between stock screens (spreads credits across minutes)
+		if config_manager.should_show_stocks() and state.cached_stocks and playlist.duration("stocks") == 0:
+			if timeline.get_market_phase(state.rtc) == timeline.MARKET_OPEN:
+				state.fetch_deadline = time.monotonic() + config.Timing.SCREEN_REFRESH_BUDGET
+				try:
+					stocks_planner.refresh(state.cached_stocks, state.stock_rotation_offset, False, force=True)
 				except Exception as e:
-					logger.log(f"Transit display error: {e}", config.LogLevel.ERROR, area="TRANSIT")
-
-		# Stock display (Phase 4)
-		if config_manager.should_show_stocks() and state.cached_stocks:
-			# Check if we should show stocks this cycle
-			freq = config_manager.get_stocks_display_frequency()
-			should_show_stocks_this_cycle = (state.cycle_count % freq == 0)
-
-			if should_show_stocks_this_cycle:
-				# Check market hours status (including grace period)
-				now = state.rtc.datetime
-				current_minutes = now.tm_hour * 60 + now.tm_min
-				current_weekday = now.tm_wday  # 0=Monday, 6=Sunday
-
-				is_weekday = current_weekday < 5  # Monday-Friday
-
-				# Market hours: open to close
-				is_market_hours = (current_minutes >= state.market_open_local_minutes and
-				                  current_minutes <= state.market_close_local_minutes)
-
-				# Grace period: close to grace end (for fetching final close price)
-				is_grace_period = (current_minutes > state.market_close_local_minutes and
-				                  current_minutes <= state.market_grace_end_local_minutes)
-
-				# Dynamic grace period extension (only when respect_market_hours = false)
-				# Ensures all stocks get closing prices before switching to 24/7 cached display
-				respect_hours = config_manager.get_stocks_respect_market_hours()
-				if not respect_hours and current_minutes > state.market_grace_end_local_minutes and is_weekday:
-					# Past normal grace period, but respect_market_hours = false (24/7 display mode)
-					# Check if all stocks have been fetched during grace period
-					all_stock_symbols = set([s['symbol'] for s in state.cached_stocks])
-					unfetched_stocks = all_stock_symbols - state.grace_period_fetched_symbols
-
-					if len(unfetched_stocks) > 0:
-						# Still have unfetched stocks - extend grace period
-						is_grace_period = True
-						logger.log(f"Grace period auto-extension: {len(unfetched_stocks)} stocks remaining ({', '.join(list(unfetched_stocks)[:3])}{'...' if len(unfetched_stocks) > 3 else ''})", config.LogLevel.INFO, area="STOCKS")
-					else:
-						# All stocks fetched - end grace period, continue with cached data
-						if state.previous_grace_period_state:
-							# Log once when transitioning out
-							logger.log("All stocks updated - ending grace period, using cached data", config.LogLevel.INFO, area="STOCKS")
-
-				# Allow fetching during market hours OR grace period
-				state.should_fetch_stocks = is_weekday and (is_market_hours or is_grace_period)
-
-				# Grace period optimization: detect transition into grace period and reset tracking
-				if is_grace_period and not state.previous_grace_period_state:
-					# Entering grace period - clear the set of fetched symbols
-					state.grace_period_fetched_symbols.clear()
-					logger.log("Entering grace period - resetting symbol tracking", config.LogLevel.DEBUG, area="STOCKS")
-				state.previous_grace_period_state = is_grace_period
-
-				# Respect market hours if configured (already fetched above)
-				should_display_stocks = True
-				if respect_hours and not state.should_fetch_stocks:
-					should_display_stocks = False
-					logger.log("Outside market hours + grace - skipping stocks", config.LogLevel.DEBUG, area="STOCKS")
-
-				if should_display_stocks:
-					try:
-						# Get stocks list and rotation offset
-						stocks_list = state.cached_stocks
-						offset = state.stock_rotation_offset
-
-						# Check if CURRENT stock at offset is highlighted (not search for next)
-						current_stock = stocks_list[offset]
-
-						if current_stock.get('highlight') == True:
-							# Single stock chart mode (highlighted)
-							symbol = current_stock['symbol']
-
-							# Check if we need to fetch (rate limiting)
-							now_time = time.monotonic()
-							time_since_last_fetch = now_time - state.last_stock_fetch_time
-
-							# Fetch logic:
-							# - Market hours: always fetch (respecting rate limit)
-							# - Grace period: fetch ONCE per symbol, then reuse
-							# - Outside hours: fetch ONCE to cache, then reuse forever
-							should_fetch = False
-							if symbol not in state.cached_intraday_data:
-								# No cache - need to fetch regardless of market hours
-								should_fetch = True
-							elif state.should_fetch_stocks:
-								# During market hours or grace period
-								if is_grace_period:
-									# Grace period - only fetch if not already fetched this grace period
-									if symbol not in state.grace_period_fetched_symbols:
-										should_fetch = True
-								else:
-									# Market hours - always fetch fresh data
-									should_fetch = True
-							# else: Outside market hours with cache - DO NOT fetch
-
-							# Respect rate limiting
-							if should_fetch and time_since_last_fetch >= config.Timing.STOCKS_FETCH_INTERVAL:
-								logger.log(f"Fetching intraday data for {symbol}", config.LogLevel.DEBUG, area="STOCKS")
-								# Fetch intraday time series (78 points = full trading day at 5min intervals)
-								intraday_data = stocks_api.fetch_intraday_time_series(symbol, interval="5min", outputsize=78)
-								# Fetch actual quote for accurate price and percentage
-								quote_data = stocks_api.fetch_stock_quotes([symbol])
-
-								if intraday_data and quote_data and symbol in quote_data:
-									state.cached_intraday_data[symbol] = {
-										'data': intraday_data,
-										'quote': quote_data[symbol],
-										'timestamp': now_time
-									}
-									state.last_stock_fetch_time = now_time
-
-									# Track symbol as fetched during grace period (optimization)
-									if is_grace_period:
-										state.grace_period_fetched_symbols.add(symbol)
-										logger.log(f"Added {symbol} to grace period tracking", config.LogLevel.DEBUG, area="STOCKS")
-
-							# Get cached data and display
-							if symbol in state.cached_intraday_data:
-								cached = state.cached_intraday_data[symbol]
-								time_series = cached['data']
-								quote = cached.get('quote')
-
-								# Build stock quote with display name (inline)
-								if time_series and quote:
-									stock_quote = {
-										'price': quote['price'],
-										'change_percent': quote['change_percent'],
-										'direction': quote['direction'],
-										'open_price': quote.get('open_price', 0),
-										'symbol': symbol,
-										'display_name': current_stock.get('display_name', symbol)
-									}
-
-									display_stocks.show_single_stock_chart(
-										symbol,
-										stock_quote,
-										time_series,
-										config.Timing.STOCKS_DISPLAY_DURATION
-									)
-									showed_display = True
-
-									# Advance offset by 1 for next cycle
-									state.stock_rotation_offset = (offset + 1) % len(stocks_list)
-								else:
-									logger.log(f"No time series data for {symbol}", config.LogLevel.WARNING, area="STOCKS")
-							else:
-								logger.log(f"No intraday data for {symbol}", config.LogLevel.WARNING, area="STOCKS")
+					logger.log(f"Watchlist refresh error: {e}", config.LogLevel.ERROR, area="STOCKS")
+				finally:
+					state.fetch_deadline = None
 
-						else:
-							# Multi-stock mode - get next 4 non-highlighted stocks (display 3, 1 buffer)
-							stocks_to_show = []
-							for i in range(len(stocks_list)):
-								idx = (offset + i) % len(stocks_list)
-								stock = stocks_list[idx]
-								if stock.get('highlight') != True:
-									stocks_to_show.append(stock)
-								if len(stocks_to_show) >= 4:
-									break
-
-							if stocks_to_show:
-								# Check if we need to fetch (rate limiting)
-								now_time = time.monotonic()
-								time_since_last_fetch = now_time - state.last_stock_fetch_time
-
-								# Get symbols to fetch (fetch 4, display 3 - buffer for failures)
-								# slicing [:4] is safe even if list is shorter
-								symbols_to_fetch = [s['symbol'] for s in stocks_to_show[:4]]
-
-								# Grace period optimization: filter out already-fetched symbols during grace period
-								if is_grace_period:
-									symbols_to_fetch = [sym for sym in symbols_to_fetch
-									                   if sym not in state.grace_period_fetched_symbols]
-
-								# Fetch logic:
-								# - Market hours: always fetch (respecting rate limit)
-								# - Grace period: fetch ONCE per symbol (already filtered above), then reuse
-								# - Outside hours: fetch ONCE to cache, then reuse forever
-								should_fetch = False
-								for sym in symbols_to_fetch:
-									if sym not in state.cached_stock_prices:
-										# No cache - need to fetch regardless of market hours
-										should_fetch = True
-										break
-									elif state.should_fetch_stocks:
-										# Market hours OR grace period - fetch
-										# (Grace period symbols already filtered to only unfetched ones)
-										should_fetch = True
-										break
-								# else: Outside market hours with cache - DO NOT fetch
-
-								# Respect rate limiting
-								if should_fetch and time_since_last_fetch >= config.Timing.STOCKS_FETCH_INTERVAL:
-									logger.log(f"Fetching quotes for {len(symbols_to_fetch)} stocks", config.LogLevel.DEBUG, area="STOCKS")
-									quotes = stocks_api.fetch_stock_quotes(symbols_to_fetch)
-									if quotes:
-										for sym, data in quotes.items():
-											# Store quote data in cache
-											state.cached_stock_prices[sym] = {
-												'price': data['price'],
-												'change_percent': data['change_percent'],
-												'direction': data['direction'],
-												'timestamp': now_time
-											}
-										state.last_stock_fetch_time = now_time
-
-										# Track symbols as fetched during grace period (optimization)
-										if is_grace_period:
-											for sym in quotes.keys():
-												state.grace_period_fetched_symbols.add(sym)
-											logger.log(f"Added {len(quotes)} symbols to grace period tracking", config.LogLevel.DEBUG, area="STOCKS")
-
-								# Attach cached prices to stocks for display
-								stocks_with_prices = []
-								for stock in stocks_to_show[:3]:  # Display 3
-									symbol = stock['symbol']
-									if symbol in state.cached_stock_prices:
-										stock['price'] = state.cached_stock_prices[symbol]['price']
-										stock['change_percent'] = state.cached_stock_prices[symbol]['change_percent']
-										stock['direction'] = state.cached_stock_prices[symbol]['direction']
-										stocks_with_prices.append(stock)
-
-								if len(stocks_with_prices) >= 2:  # Need at least 2 to show
-									display_stocks.show_multi_stock(
-										stocks_with_prices,
-										config.Timing.STOCKS_DISPLAY_DURATION
-									)
-									showed_display = True
-
-									# Advance rotation offset by 3
-									state.stock_rotation_offset = (offset + 3) % len(stocks_list)
-								else:
-									logger.log("Not enough stock data - skipping display", config.LogLevel.WARNING, area="STOCKS")
-
-					except Exception as e:
-						logger.log(f"Stock display error: {e}", config.LogLevel.ERROR, area="STOCKS")
+		# Close the price stream once the market closes, even when the stock screen is not planned
+		if stocks_stream is not None and stocks_stream.is_live() and timeline.get_market_phase(state.rtc) != timeline.MARKET_OPEN:
+			stocks_stream.disconnect("outside market hours")
 
 		# If no displays enabled or no data, show clock as fallback
 		if not showed_display:
-			if not need_weather and not need_forecast:
-				logger.log("All displays disabled - showing clock", config.LogLevel.INFO, area="MAIN")
+			if not state.playlist_plan and not need_weather and not need_forecast:
+				logger.log("No screens planned - showing clock", config.LogLevel.INFO, area="MAIN")
 			else:
-				logger.log("No weather data - showing clock", config.LogLevel.WARNING)
-			show_clock()
-			time.sleep(config.Timing.CLOCK_UPDATE_INTERVAL)  # Sleep to avoid tight loop
+				logger.log("No screen data - showing clock", config.LogLevel.WARNING)
+			if not clock_shown:
+				show_clock()
+				hardware.wait(config.Timing.CLOCK_UPDATE_INTERVAL)  # Sleep to avoid tight loop
 			
 		logger.log("### CYCLE COMPLETE ### \n", config.LogLevel.INFO, area="MAIN")
 
@@ -492,133 +615,243 @@ def run_test_cycle():
 		# Fall back to clock
 		try:
 			show_clock()
-			time.sleep(config.Timing.CLOCK_UPDATE_INTERVAL)  # Sleep to avoid tight loop
+			hardware.wait(config.Timing.CLOCK_UPDATE_INTERVAL)  # Sleep to avoid tight loop
+		except KeyboardInterrupt:
+			raise  # UP pressed during the fallback
 		except:
 			time.sleep(10)
 
 	# Memory check using centralized logger
 	if state.cycle_count % config.Timing.MEMORY_CHECK_INTERVAL == 0:
 		logger.log_memory("MAIN", config.LogLevel.INFO)
+		connections.log_stats()
+		breaker.log_status()
+		quota.log_projection(state.rtc)
+		if stocks_planner is not None:
+			stocks_planner.log_age_distribution()
+		logger.log_image_stats()
+		logger.log_render_stats()
+		heap.log_stats()
+		snapshot.log_stats()
 
 
 # ============================================================================
-# INITIALIZATION
+# BOOT STAGES
 # ============================================================================
 
-def initialize():
-	"""Initialize all hardware and services"""
-	logger.log("==== PANTALLITA 3.0 | PHASE 7: TRANSIT DISPLAY ====")
-
-	try:
-		# Initialize display FIRST (before show_message)
-		logger.log("Initializing display...", config.LogLevel.DEBUG)
-		hardware.init_display()
-
-		# NOW we can show messages
-		show_message("INIT...", config.Colors.GREEN, 16)
-
-		# Initialize RTC
-		show_message("RTC...", config.Colors.GREEN, 16)
-		hardware.init_rtc()
-
-		# Initialize buttons
-		show_message("BUTTONS", config.Colors.GREEN, 16)
-		hardware.init_buttons()
-
-		# Connect to WiFi
-		show_message("WIFI...", config.Colors.GREEN, 16)
-		hardware.connect_wifi()
-
-		# Fetch location info from AccuWeather (for timezone)
-		show_message("LOCATION", config.Colors.GREEN, 16)
-		location_info = weather_api.fetch_location_info()
-
-		# Sync time (with timezone from AccuWeather or fallback)
-		show_message("SYNC...", config.Colors.GREEN, 16)
-		if location_info:
-			hardware.sync_time(state.rtc, timezone_offset=location_info['offset'])
-		else:
-			# Fallback to worldtimeapi.org
-			logger.log("Using settings.toml timezone as fallback", config.LogLevel.WARNING, area="MAIN")
-			hardware.sync_time(state.rtc)
-
-		# Load display configuration
-		show_message("CONFIG...", config.Colors.GREEN, 16)
-		config_manager.load_config()
-
-		# Load stocks configuration (Phase 4)
-		if config_manager.should_show_stocks():
-			show_message("STOCKS...", config.Colors.GREEN, 16)
-			state.cached_stocks = stocks_api.load_stocks_csv()
-			logger.log(f"Loaded {len(state.cached_stocks)} stocks from CSV", area="MAIN")
-
-			# Calculate market hours in local timezone
-			# Market hours: 9:30 AM - 4:00 PM ET
-			grace_period = config_manager.get_stocks_grace_period_minutes()
+# Each stage receives the results dict ({stage_name: return value}) so later
+# stages can use earlier outputs (e.g. time sync uses the location's offset).
+
+def boot_display(results):
+	hardware.init_display()
+
+def boot_rtc(results):
+	return hardware.init_rtc()
+
+def boot_buttons(results):
+	return hardware.init_buttons()
+
+def boot_local_config(results):
+	# Compiled snapshot first - unchanged CSVs below are decoded, not parsed
+	snapshot.load()
+	# config.csv only - GitHub overrides are applied by boot_remote_config
+	loaded = config_manager.load_local_config()
+	config.Env.TEMPERATURE_UNIT = config_manager.ConfigState.temperature_unit
+	features.sync(globals())
+	playlist.load_playlist()
+	return loaded
+
+def boot_first_screen(results):
+	# Battery-backed RTC already has the time - show it before any network work
+	show_clock()
+	state.boot_first_screen_ms = int((time.monotonic() - state.boot_started) * 1000)
+
+def boot_local_data(results):
+	# Local CSVs (GitHub versions override them in the network stages)
+	atlas_loader.load_atlases()
+	if schedule_loader is not None:
+		local_schedules = schedule_loader.load_local_schedules()
+		if local_schedules:
+			state.cached_schedules = local_schedules
+	if event_loader is not None:
+		return event_loader.load_local_events()
+
+def boot_wifi(results):
+	return hardware.connect_wifi()
+
+def boot_location(results):
+	# AccuWeather location (timezone for the time sync and market hours)
+	return weather_api.fetch_location_info()
+
+def boot_time_sync(results):
+	location_info = results.get("location")
+	if location_info:
+		synced = hardware.sync_time(state.rtc, timezone_offset=location_info['offset'])
+	else:
+		# Fallback to worldtimeapi.org
+		logger.log("Using settings.toml timezone as fallback", config.LogLevel.WARNING, area="MAIN")
+		synced = hardware.sync_time(state.rtc)
+
+	# Market hours come from the market calendar (holidays, early closes, ET DST),
+	# applied per day by the timeline. Keep the UTC offset the RTC was synced with.
+	if location_info:
+		state.market_local_utc_offset = location_info['offset']
+	else:
+		logger.log("No timezone info - assuming ET market hours", config.LogLevel.WARNING, area="STOCKS")
+	return synced
+
+def boot_quota(results):
+	# Own stage (runs even when the time sync failed) - restores today's API
+	# quota counters, or keeps the stored ones when the date is not trusted
+	quota.init(state.rtc, clock_synced=bool(results.get("time_sync")))
+
+def boot_remote_config(results):
+	loaded = config_manager.load_config()
+	features.sync(globals())  # GitHub config may enable more features
+	return loaded
+
+def boot_stocks(results):
+	if config_manager.should_show_stocks():
+		state.cached_stocks = stocks_api.load_stocks_csv()
+		logger.log(f"Loaded {len(state.cached_stocks)} stocks from CSV", area="MAIN")
+
+def boot_remote_schedules(results):
+	if not config_manager.should_show_schedules():
+		return
+	if not state.cached_schedules:
+		state.cached_schedules = schedule_loader.load_local_schedules() or {}
+	# GitHub (date-specific > default) replaces the local schedules loaded earlier
+	github_schedules, source = schedule_loader.fetch_github_schedules(state.rtc)
+	if github_schedules:
+		state.cached_schedules = github_schedules
+		logger.log(f"Loaded {len(github_schedules)} schedules from {source}", area="SCHEDULE")
+	elif state.cached_schedules:
+		logger.log(f"Loaded {len(state.cached_schedules)} schedules from local file", area="SCHEDULE")
+	else:
+		logger.log("No schedules loaded (no GitHub or local schedules.csv)", config.LogLevel.WARNING, area="SCHEDULE")
+
+def boot_remote_events(results):
+	if not config_manager.should_show_events():
+		return
+	# Local recurring events (loaded before the network) + GitHub ephemeral events
+	local_events = results.get("local_data")
+	if local_events is None:
+		local_events = event_loader.load_local_events()  # Enabled by the GitHub config
+	github_events = event_loader.fetch_github_events(state.rtc)
+	state.cached_events = event_loader.merge_events(local_events, github_events)
+	total_events = sum(len(event_list) for event_list in state.cached_events.values())
+	if total_events > 0:
+		logger.log(f"Loaded {total_events} events across {len(state.cached_events)} dates", area="EVENT")
+	else:
+		logger.log("No events loaded", config.LogLevel.DEBUG, area="EVENT")
+
+def boot_timeline(results):
+	# Compile today's timeline (schedules, events, market hours, transit windows)
+	timeline.invalidate()
+	timeline.ensure_current(state.rtc)
+	# Everything parsed during boot (transits via the timeline) - one flash write
+	snapshot.save()
+
+# (name, depends_on, network, critical, message, function)
+# Ready local stages always run before ready network stages. With
+# CIRCUITPY_WIFI_SSID set, the supervisor associates WiFi in the background
+# while the local stages run, so boot_wifi usually finds the radio up.
+BOOT_STAGES = (
+	("display", (), False, True, None, boot_display),
+	("rtc", (), False, True, "RTC...", boot_rtc),
+	("buttons", (), False, False, "BUTTONS", boot_buttons),
+	("local_config", (), False, False, "CONFIG...", boot_local_config),
+	("first_screen", ("display", "rtc", "local_config"), False, False, None, boot_first_screen),
+	("local_data", (), False, False, None, boot_local_data),
+	("wifi", (), True, False, "WIFI...", boot_wifi),
+	("location", ("wifi",), True, False, "LOCATION", boot_location),
+	("time_sync", ("wifi", "location"), True, False, "SYNC...", boot_time_sync),
+	("quota", ("time_sync",), False, False, None, boot_quota),
+	("remote_config", ("wifi",), True, False, "CONFIG...", boot_remote_config),
+	("stocks", ("remote_config",), True, False, "STOCKS...", boot_stocks),
+	("remote_schedules", ("time_sync", "remote_config", "local_data"), True, False, "SCHEDULES", boot_remote_schedules),
+	("remote_events", ("time_sync", "remote_config", "local_data"), True, False, "EVENTS...", boot_remote_events),
+	("timeline", ("time_sync", "remote_config", "stocks", "remote_schedules", "remote_events"), False, False, None, boot_timeline),
+)
 
-			if location_info:
-				# Market is always ET (UTC-5 standard time)
-				tz_offset_hours = location_info['offset']
-				et_offset_hours = -5  # ET standard time
 
-				# Time difference between local and ET
-				hours_diff = tz_offset_hours - et_offset_hours
+# ============================================================================
+# INITIALIZATION
+# ============================================================================
 
-				# Market times in ET
-				market_open_et = 570   # 9:30 AM = 9*60 + 30
-				market_close_et = 960  # 4:00 PM = 16*60
+def initialize():
+	"""
+	Run the boot stages in dependency order and log a per-stage profile.
+
+	Local stages run as soon as their dependencies are met and before any
+	ready network stage, so the clock (first useful screen) is up before WiFi.
+	A failing non-critical stage is logged and its dependents still run with
+	whatever it left behind (same fallbacks as before).
+	"""
+	logger.log("==== PANTALLITA 3.0 | PHASE 7: TRANSIT DISPLAY ====")
 
-				# Convert to local time
-				state.market_open_local_minutes = market_open_et + (hours_diff * 60)
-				state.market_close_local_minutes = market_close_et + (hours_diff * 60)
-				state.market_grace_end_local_minutes = state.market_close_local_minutes + grace_period
+	state.boot_started = time.monotonic()
+	state.boot_profile = []
+	state.boot_first_screen_ms = 0
+	results = {}
+	finished = set()
+	pending = list(BOOT_STAGES)
 
-				logger.log(f"Market hours (local): {state.market_open_local_minutes//60}:{state.market_open_local_minutes%60:02d} - {state.market_close_local_minutes//60}:{state.market_close_local_minutes%60:02d} (grace: +{grace_period}min)", area="STOCKS")
-			else:
-				# Default to ET times (assume we're in ET)
-				state.market_open_local_minutes = 570   # 9:30 AM
-				state.market_close_local_minutes = 960  # 4:00 PM
-				state.market_grace_end_local_minutes = 960 + grace_period
-				logger.log("No timezone info - using ET market hours", config.LogLevel.WARNING, area="STOCKS")
-
-		# Load schedules (Phase 5)
-		show_message("SCHEDULES", config.Colors.GREEN, 16)
-		# Try GitHub first (date-specific > default), then fallback to local
-		github_schedules, source = schedule_loader.fetch_github_schedules(state.rtc)
-		if github_schedules:
-			state.cached_schedules = github_schedules
-			logger.log(f"Loaded {len(github_schedules)} schedules from {source}", area="SCHEDULE")
-		else:
-			# Fallback to local schedules.csv
-			local_schedules = schedule_loader.load_local_schedules()
-			if local_schedules:
-				state.cached_schedules = local_schedules
-				logger.log(f"Loaded {len(local_schedules)} schedules from local file", area="SCHEDULE")
-			else:
-				logger.log("No schedules loaded (no GitHub or local schedules.csv)", config.LogLevel.WARNING, area="SCHEDULE")
-
-		# Load events (Phase 6)
-		if config_manager.should_show_events():
-			show_message("EVENTS...", config.Colors.GREEN, 16)
-			# Load local recurring events
-			local_events = event_loader.load_local_events()
-			# Load GitHub ephemeral events (date-specific, auto-skip past)
-			github_events = event_loader.fetch_github_events(state.rtc)
-			# Merge local + GitHub
-			state.cached_events = event_loader.merge_events(local_events, github_events)
-			total_events = sum(len(event_list) for event_list in state.cached_events.values())
-			if total_events > 0:
-				logger.log(f"Loaded {total_events} events across {len(state.cached_events)} dates", area="EVENT")
-			else:
-				logger.log("No events loaded", config.LogLevel.DEBUG, area="EVENT")
+	try:
+		while pending:
+			# Pick the next ready stage: local first, then network (inline)
+			chosen = None
+			for stage in pending:
+				ready = True
+				for dependency in stage[1]:
+					if dependency not in finished:
+						ready = False
+						break
+				if ready and (chosen is None or (chosen[2] and not stage[2])):
+					chosen = stage
+					if not stage[2]:
+						break
+			if chosen is None:
+				raise RuntimeError(f"Boot stages blocked: {', '.join(stage[0] for stage in pending)}")
+			pending.remove(chosen)
+
+			name, depends_on, network, critical, message, function = chosen
+
+			# Progress text until the clock is up, then keep the clock fresh
+			if state.boot_first_screen_ms == 0:
+				if message and state.main_group is not None:
+					show_message(message, config.Colors.GREEN, 16)
+			elif network:
+				show_clock()
 
-		# Ready!
-		show_message("READY!", config.Colors.GREEN, 16)
-		time.sleep(2)
+			stage_start = time.monotonic()
+			ok = True
+			try:
+				results[name] = function(results)
+			except Exception as e:
+				ok = False
+				if critical:
+					raise
+				logger.log(f"Boot stage {name} failed: {e} - continuing", config.LogLevel.WARNING, area="MAIN")
+			state.boot_profile.append((name, int((time.monotonic() - stage_start) * 1000), ok, network))
+			finished.add(name)
+
+		# Boot profile (inline)
+		total_ms = int((time.monotonic() - state.boot_started) * 1000)
+		state.boot_ready_ms = total_ms
+		network_ms = 0
+		for name, duration_ms, ok, network in state.boot_profile:
+			if network:
+				network_ms += duration_ms
+			status = "" if ok else " FAILED"
+			logger.log(f"  boot {name:<16} {duration_ms:>6} ms {'net' if network else 'local'}{status}", config.LogLevel.DEBUG, area="MAIN")
+		logger.log(f"Boot: first useful screen {state.boot_first_screen_ms} ms ({int(state.boot_started * 1000) + state.boot_first_screen_ms} ms since power-on), ready {total_ms} ms ({network_ms} ms network)", area="MAIN")
+
+		show_clock()
 
 		logger.log("Hardware ready", area="MAIN")
 		logger.log("=== Initialization complete ===")
-		logger.log("Press UP button to stop test")
+		logger.log("Press UP to stop, DOWN for next screen (hold to refresh)")
 		logger.log("=== Starting weather display cycle === \n")
 
 		return True
@@ -626,7 +859,8 @@ def initialize():
 	except Exception as e:
 		logger.log(f"Initialization failed: {e}", config.LogLevel.ERROR)
 		traceback.print_exception(e)
-		show_message("INIT ERR", config.Colors.RED, 16)
+		if state.main_group is not None:
+			show_message("INIT ERR", config.Colors.RED, 16)
 		return False
 	
 
@@ -652,7 +886,11 @@ def main():
 		used_bytes = config.Hardware.TOTAL_MEMORY - state.last_memory_free
 		used_percent = (used_bytes / config.Hardware.TOTAL_MEMORY) * 100
 		used_kb = used_bytes // 1024
-		logger.log(f"Baseline memory: {used_percent:.1f}% used ({used_kb}KB) \n")
+		logger.log(f"Baseline memory: {used_percent:.1f}% used ({used_kb}KB)")
+
+		# One line per boot - tools/boot_report.py groups these by feature set and mode
+		loaded = "+".join(features.loaded_features()) or "none"
+		logger.log(f"Boot report: features={loaded} mpy={'on' if state.boot_mpy else 'off'} imports_ms={state.boot_import_ms} first_screen_ms={state.boot_first_screen_ms} ready_ms={state.boot_ready_ms} heap_kb={used_kb} \n")
 
 		# Track actual start time for accurate uptime
 		state.start_time = time.monotonic()
@@ -663,6 +901,7 @@ def main():
 	except KeyboardInterrupt:
 		logger.log("=== Test stopped by button press ===")
 		show_message("STOPPED", config.Colors.ORANGE, 16)
+		quota.save(force=True)  # Counts since the last throttled write
 		time.sleep(2)
 
 		# Final statistics
@@ -676,6 +915,10 @@ def main():
 		logger.log(f"Total cycles: {state.cycle_count}")
 		logger.log(f"Weather fetches: {state.weather_fetch_count}")
 		logger.log(f"Weather errors: {state.weather_fetch_errors}")
+		if config.Env.FLEET_DIGEST_URL:
+			logger.log(f"Fleet digests: {state.fleet_fetch_count} ({state.fleet_fetch_errors} errors)")
+		if display_frame is not None:
+			logger.log(f"Frames: {state.frame_fetch_count} ({state.frame_fetch_errors} errors, {state.frame_bytes // max(1, state.frame_fetch_count)} B avg)")
 
 		# Calculate actual uptime using logger helper
 		uptime_seconds = time.monotonic() - state.start_time
@@ -685,6 +928,7 @@ def main():
 		logger.log(f"Weather test error: {e}", config.LogLevel.ERROR)
 		traceback.print_exception(e)
 		show_message("ERROR!", config.Colors.RED, 16)
+		quota.save(force=True)
 		time.sleep(10)
 
 if __name__ == "__main__":
@@ -18,6 +18,17 @@ class Hardware:
 	"""Hardware specifications"""
 	TOTAL_MEMORY = 2000000  # ESP32-S3 SRAM in bytes (~2MB)
 
+class Memory:
+	"""Heap manager thresholds (heap.py)"""
+	IDLE_MIN_DWELL = 2                # Seconds a dwell must last to hide a collection in it
+	IDLE_ALLOC_THRESHOLD = 16384      # Bytes allocated since the last collection before an idle collect
+	PREPARE_ALLOC_THRESHOLD = 4096    # Same, before a fetch or screen build
+	RESERVE = 65536                   # Free heap wanted before a large phase (caches released below it)
+	MIN_LARGEST_BLOCK = 32768         # Largest free block below this = fragmented (forecast JSON ~20KB)
+	FRAGMENTATION_LIMIT = 75          # % of the free heap outside the largest block = fragmented
+	PROBE_INTERVAL = 300              # Seconds between largest-block probes (idle dwell only)
+	PROBE_RESOLUTION = 1024           # Largest-block bisection granularity (bytes)
+
 # ============================================================================
 # LAYOUT & POSITIONING
 # ============================================================================
@@ -51,6 +62,7 @@ class Layout:
 	FORECAST_ICON2_X = 26    # Column 2 icon: x=26,y=9 (0-based) = x=27,y=10 (1-based)
 	FORECAST_ICON3_X = 47    # Column 3 icon: x=47,y=9 (0-based) = x=48,y=10 (1-based)
 	FORECAST_ICON_Y = 9      # Icon Y position (all columns)
+	FORECAST_ICON_SIZE = 13  # Column icons are 13x13 (also the schedule weather icon)
 
 	FORECAST_TIME_Y = 1      # Time label Y position (0-based) = y=2 (1-based)
 	FORECAST_TEMP_Y = 25     # Temperature label Y position
@@ -67,10 +79,14 @@ class Layout:
 	SCHEDULE_UV_Y = 30
 	SCHEDULE_IMAGE_X = 23            # Schedule image (40×28, right side)
 	SCHEDULE_IMAGE_Y = 0
+	SCHEDULE_IMAGE_WIDTH = 40
+	SCHEDULE_IMAGE_HEIGHT = 28
 
 	# Event display positioning (Phase 6)
 	EVENT_IMAGE_X = 37               # Event image (25×28, top-right corner)
 	EVENT_IMAGE_Y = 2
+	EVENT_IMAGE_WIDTH = 25           # Maximum size - smaller images are top-left aligned
+	EVENT_IMAGE_HEIGHT = 28
 	EVENT_TEXT_X = 1                 # Text left margin
 	EVENT_BOTTOM_MARGIN = 1          # Pixels from bottom edge
 	EVENT_LINE_SPACING = 2           # Spacing between top and bottom text lines
@@ -143,6 +159,7 @@ class Env:
 
 	# Stocks API (Phase 4)
 	TWELVE_DATA_API_KEY = None
+	TWELVE_DATA_WS_URL = None
 	STOCKS_GITHUB_URL = None
 
 	# Schedules (Phase 5)
@@ -156,6 +173,11 @@ class Env:
 	CTA_BUS_API_KEY = None
 	TRANSITS_GITHUB_URL = None
 
+	# Fleet aggregator (tools/fleet_server.py, optional)
+	FLEET_DIGEST_URL = None
+	FLEET_DEVICE_ID = None
+	FLEET_FRAME_URL = None
+
 	@classmethod
 	def load(cls):
 		"""Load all environment variables"""
@@ -172,6 +194,7 @@ class Env:
 
 		# Stocks API (Phase 4)
 		cls.TWELVE_DATA_API_KEY = os.getenv("TWELVE_DATA_API_KEY")
+		cls.TWELVE_DATA_WS_URL = os.getenv("TWELVE_DATA_WS_URL", "wss://ws.twelvedata.com/v1/quotes/price")
 		cls.STOCKS_GITHUB_URL = os.getenv("STOCKS_GITHUB_URL")
 
 		# Schedules (Phase 5)
@@ -185,6 +208,11 @@ class Env:
 		cls.CTA_BUS_API_KEY = os.getenv("CTA_BUS_API_KEY")
 		cls.TRANSITS_GITHUB_URL = os.getenv("TRANSITS_GITHUB_URL")
 
+		# Fleet aggregator (optional - replaces the AccuWeather, Twelve Data and CTA calls)
+		cls.FLEET_DIGEST_URL = os.getenv("FLEET_DIGEST_URL")
+		cls.FLEET_DEVICE_ID = os.getenv("FLEET_DEVICE_ID", "pantallita")
+		cls.FLEET_FRAME_URL = os.getenv("FLEET_FRAME_URL")  # Thin client: weather/forecast/transit as server frames
+
 # ============================================================================
 # API ENDPOINTS
 # ============================================================================
@@ -196,6 +224,26 @@ class API:
 	ACCUWEATHER_CURRENT = "/currentconditions/v1/{location}?details=true"
 	ACCUWEATHER_FORECAST = "/forecasts/v1/hourly/12hour/{location}?details=true"
 
+# ============================================================================
+# NETWORK
+# ============================================================================
+
+class Network:
+	"""Connection manager settings (connections.py)"""
+	DNS_TTL = 300          # Seconds a resolved host address is reused
+	DNS_CACHE_MAX = 16     # Hosts kept in the DNS cache (oldest dropped first)
+	REQUEST_TIMEOUT = 10   # Socket timeout when no fetch deadline is set
+	MIN_REQUEST_TIMEOUT = 2  # Less budget than this left = skip the request, use cache
+	RX_BUFFER_SIZE = 40960  # Shared response body buffer (netbuf.py) - 12-hour forecast with details ~25KB
+	RX_CHUNK = 1536         # Bytes per readinto (about one TCP segment)
+
+class Breaker:
+	"""Per-provider circuit breaker (breaker.py)"""
+	FAILURE_THRESHOLD = 3   # Consecutive failures (no response / HTTP 5xx) that open the breaker
+	BACKOFF_MIN = 60        # Seconds until the first probe after opening
+	BACKOFF_MAX = 1800      # Probe interval cap (doubles after each failed probe)
+	BACKOFF_JITTER = 0.2    # +/- fraction applied to each probe delay
+
 # ============================================================================
 # PATHS
 # ============================================================================
@@ -220,6 +268,12 @@ class Paths:
 	# Event images (Phase 6)
 	EVENT_IMAGES = "/img/events"
 
+	# Packed sprite atlases + CSV indexes (built by tools/build_assets.py)
+	ATLAS_IMAGES = "/img/atlas"
+
+	# Compiled config snapshot (snapshot.py) - parsed CSV sources + their crc32
+	SNAPSHOT = "/snapshot.bin"
+
 # ============================================================================
 # LOGGING
 # ============================================================================
@@ -250,6 +304,30 @@ class Timing:
 	CLOCK_UPDATE_INTERVAL = 10  # Update clock every 10 seconds << CLOCK DISPLAY
 	MEMORY_CHECK_INTERVAL = 5  # Check memory every 10 cycles
 
+	# Buttons (keypad event queue, debounced by the runtime)
+	KEY_POLL_INTERVAL = 0.2  # Seconds between key queue checks while DOWN is held (long-press timing)
+	KEY_IDLE_POLL_INTERVAL = 0.5  # Seconds between key queue checks otherwise (presses queue meanwhile)
+	LONG_PRESS = 1.5         # Seconds DOWN must be held to force a refresh
+
+	# Boot
+	NTP_ATTEMPTS = 3        # NTP tries during time sync (replaces the fixed 2 s settle delay)
+	NTP_RETRY_DELAY = 0.5   # Seconds between NTP tries
+
+	# Fetch budgets (deadline-aware fetches, see connections.request_timeout)
+	PREFETCH_SHARE = 0.25       # Share of a screen's planned seconds its up-front fetches may take (within the cycle)
+	SCREEN_REFRESH_BUDGET = 5   # Seconds a refresh inside a running screen may block it
+	SCREEN_END_MARGIN = 1       # In-screen refreshes must finish this long before the screen ends
+
+	# Offline mode (rotation keeps running from cache while WiFi is down)
+	STALE_GRACE = 60            # Cached data this far past its refresh window = stale marker
+	WIFI_RETRY_MIN = 15         # First background reconnect attempt delay (doubles)
+	WIFI_RETRY_MAX = 600        # Reconnect delay cap
+	WIFI_CONNECT_TIMEOUT = 8    # Seconds one reconnect attempt may block the rotation
+
+	# Display playlist (playlist.py, overridable in playlist.csv)
+	PLAYLIST_CYCLE_DURATION = 360  # Forecast 60 + weather 240 + transit 30 + stocks 30
+	PLAYLIST_MIN_DURATION = 10     # Shortest slot a screen is given when the cycle is squeezed
+
 	# Weather display (Phase 1)
 	WEATHER_DISPLAY_DURATION = 240  # 4 minutes
 	WEATHER_UPDATE_INTERVAL = 300   # 5 minutes
@@ -262,13 +340,51 @@ class Timing:
 
 	# Stock display (Phase 4)
 	STOCKS_DISPLAY_DURATION = 30    # 30 seconds
-	STOCKS_FETCH_INTERVAL = 65      # 65 seconds (rate limit: 8 calls/minute)
 	STOCKS_CACHE_MAX_AGE = 900      # 15 minutes
+	STOCKS_QUOTE_FRESHNESS = 300    # Refresh each watchlist quote at most once per 5 minutes
+	STOCKS_BATCH_MAX = 8            # Max symbols per batch quote request (= credits)
+	STOCKS_CHART_RESERVE = 2        # Credits kept for the highlighted chart (intraday + quote)
+	STOCKS_AGE_SAMPLES = 60         # Displayed-quote age samples kept for reporting
+	STOCKS_INTRADAY_BARS = 78       # Full trading day at 5min intervals
+	STOCKS_INTRADAY_OVERLAP = 2     # Bars re-requested on incremental updates (last bar may still be forming)
+	STOCKS_INTRADAY_GAP_MAX = 12    # Missing bars beyond this (1 hour) trigger a full refetch
+	STOCKS_STREAM_HEARTBEAT = 10    # Seconds between price stream heartbeats
+	STOCKS_STREAM_RETRY_MIN = 30    # First reconnect delay after the stream drops (doubles)
+	STOCKS_STREAM_RETRY_MAX = 600   # Reconnect delay cap (polling covers the gap)
 	INTRADAY_CACHE_MAX_AGE = 900    # 15 minutes
 
 	# Transit display (Phase 7)
 	TRANSIT_DISPLAY_DURATION = 30   # 30 seconds
 	TRANSIT_UPDATE_INTERVAL = 60    # 1 minute (refresh during display loop)
 
+	# Fleet client mode (fleet_client.py)
+	FLEET_DIGEST_INTERVAL = 60      # Digest refetch interval (transit is the fastest section)
+
+# ============================================================================
+# API QUOTAS
+# ============================================================================
+
+class Quota:
+	"""Per-provider API budgets (0 = no limit). Day counters persist in NVM"""
+	# AccuWeather: 15,000 calls/month per device (~500/day)
+	ACCUWEATHER_PER_MINUTE = 0
+	ACCUWEATHER_PER_DAY = 500
+
+	# Twelve Data free tier: 8 credits/minute, 800/day (1 credit per symbol)
+	TWELVE_DATA_PER_MINUTE = 8
+	TWELVE_DATA_PER_DAY = 800
+
+	# CTA Train Tracker: 50,000 transactions/day
+	CTA_TRAIN_PER_MINUTE = 0
+	CTA_TRAIN_PER_DAY = 50000
+
+	# CTA Bus Tracker: 10,000 transactions/day
+	CTA_BUS_PER_MINUTE = 0
+	CTA_BUS_PER_DAY = 10000
+
+	NVM_OFFSET = 0              # Byte offset of quota record in microcontroller.nvm
+	SAVE_INTERVAL = 900         # Persist day counters at most every 15 minutes (NVM wear)
+	PROJECTION_WARN_RATIO = 0.9 # Warn when projected daily use exceeds 90% of limit
+
 # Load environment variables at import
 Env.load()
@@ -8,6 +8,8 @@ import time
 import config
 import state
 import logger
+import netbuf
+import snapshot
 
 # ============================================================================
 # CONFIGURATION STATE
@@ -30,6 +32,8 @@ class ConfigState:
 	stocks_display_frequency = 3  # Show stocks every N cycles
 	stocks_respect_market_hours = True  # Only show during market hours
 	stocks_grace_period_minutes = 30  # Minutes after market close to fetch/show stocks
+	stocks_derive_chart_quote = True  # Chart quote from intraday bars + daily previous close (1 credit per refresh)
+	stocks_streaming = False  # WebSocket price stream (falls back to polling when down)
 
 	# Weekday indicator settings
 	show_weekday_indicator = True  # Show colored day-of-week square in top-right corner
@@ -39,6 +43,9 @@ class ConfigState:
 	transit_respect_commute_hours = True  # Only show transit during configured commute hours
 	transit_display_frequency = 3  # Show transit every N cycles
 
+	# Memory settings
+	unload_disabled_modules = False  # Drop feature modules from RAM when a feature is turned off
+
 	# Last config load time
 	last_load_time = 0
 	load_count = 0
@@ -79,6 +86,24 @@ def parse_csv_line(line):
 	return (setting, value)
 
 
+def parse_config_content(csv_content):
+	"""
+	Parse config CSV content into (setting, value) pairs (applied by the caller).
+
+	Args:
+		csv_content: CSV text (str) or file/body view from netbuf
+
+	Returns:
+		list: [(setting, value), ...] in file order
+	"""
+	pairs = []
+	for line in netbuf.lines(csv_content):
+		result = parse_csv_line(line)
+		if result:
+			pairs.append(result)
+	return pairs
+
+
 def apply_setting(setting, value):
 	"""
 	Apply a setting value to ConfigState.
@@ -86,7 +111,7 @@ def apply_setting(setting, value):
 	INLINE - no helper functions.
 	"""
 	# Boolean settings
-	if setting in ['display_weather', 'display_forecast', 'display_clock', 'display_stocks', 'display_schedules', 'display_events', 'stocks_respect_market_hours', 'show_weekday_indicator', 'display_transit', 'transit_respect_commute_hours']:
+	if setting in ['display_weather', 'display_forecast', 'display_clock', 'display_stocks', 'display_schedules', 'display_events', 'stocks_respect_market_hours', 'stocks_derive_chart_quote', 'stocks_streaming', 'show_weekday_indicator', 'display_transit', 'transit_respect_commute_hours', 'unload_disabled_modules']:
 		# Parse boolean value
 		if value.lower() in ['true', '1', 'yes', 'on']:
 			bool_value = True
@@ -111,12 +136,18 @@ def apply_setting(setting, value):
 			ConfigState.display_events = bool_value
 		elif setting == 'stocks_respect_market_hours':
 			ConfigState.stocks_respect_market_hours = bool_value
+		elif setting == 'stocks_derive_chart_quote':
+			ConfigState.stocks_derive_chart_quote = bool_value
+		elif setting == 'stocks_streaming':
+			ConfigState.stocks_streaming = bool_value
 		elif setting == 'show_weekday_indicator':
 			ConfigState.show_weekday_indicator = bool_value
 		elif setting == 'display_transit':
 			ConfigState.display_transit = bool_value
 		elif setting == 'transit_respect_commute_hours':
 			ConfigState.transit_respect_commute_hours = bool_value
+		elif setting == 'unload_disabled_modules':
+			ConfigState.unload_disabled_modules = bool_value
 
 		return True
 
@@ -185,18 +216,14 @@ def load_local_config():
 	INLINE - no helper functions.
 	"""
 	try:
-		# Open config file
-		with open('/config.csv', 'r') as f:
-			lines = f.readlines()
+		# Config file (read and parsed only when it changed since the snapshot)
+		pairs = snapshot.parsed_file("config.csv", '/config.csv', parse_config_content)
 
-		# Parse each line (inline)
+		# Apply each setting (inline)
 		settings_applied = 0
-		for line in lines:
-			result = parse_csv_line(line)
-			if result:
-				setting, value = result
-				if apply_setting(setting, value):
-					settings_applied += 1
+		for setting, value in pairs:
+			if apply_setting(setting, value):
+				settings_applied += 1
 
 		if settings_applied > 0:
 			logger.log(f"Loaded {settings_applied} settings from local config.csv", area="CONFIG")
@@ -243,19 +270,14 @@ def load_github_config():
 			logger.log(f"GitHub config fetch failed: HTTP {response.status_code}", config.LogLevel.WARNING, area="CONFIG")
 			return False
 
-		# Get text content
-		content = response.text
+		# Parse straight from the receive buffer, only when it changed since the snapshot
+		pairs = snapshot.parsed("github:config.csv", netbuf.read(response, spill=True), parse_config_content)
 
-		# Parse lines (inline)
-		lines = content.split('\n')
+		# Apply each setting (inline)
 		settings_applied = 0
-
-		for line in lines:
-			result = parse_csv_line(line)
-			if result:
-				setting, value = result
-				if apply_setting(setting, value):
-					settings_applied += 1
+		for setting, value in pairs:
+			if apply_setting(setting, value):
+				settings_applied += 1
 
 		if settings_applied > 0:
 			logger.log(f"Loaded {settings_applied} settings from GitHub config", area="CONFIG")
@@ -310,9 +332,9 @@ def load_config():
 	logger.log(f"Config loaded (source: {ConfigState.last_source})", area="CONFIG")
 	logger.log(f"  Weather: {ConfigState.display_weather}, Forecast: {ConfigState.display_forecast}, Stocks: {ConfigState.display_stocks}, Clock: {ConfigState.display_clock}, Schedules: {ConfigState.display_schedules}, Events: {ConfigState.display_events}, Transit: {ConfigState.display_transit}", area="CONFIG")
 	logger.log(f"  Temperature unit: {ConfigState.temperature_unit}", area="CONFIG")
-	logger.log(f"  Stocks frequency: {ConfigState.stocks_display_frequency}, Respect market hours: {ConfigState.stocks_respect_market_hours}, Grace period: {ConfigState.stocks_grace_period_minutes}min", area="CONFIG")
+	logger.log(f"  Stocks frequency: {ConfigState.stocks_display_frequency}, Respect market hours: {ConfigState.stocks_respect_market_hours}, Grace period: {ConfigState.stocks_grace_period_minutes}min, Derive chart quote: {ConfigState.stocks_derive_chart_quote}, Streaming: {ConfigState.stocks_streaming}", area="CONFIG")
 	logger.log(f"  Transit frequency: {ConfigState.transit_display_frequency}, Respect commute hours: {ConfigState.transit_respect_commute_hours}", area="CONFIG")
-	logger.log(f"  Weekday indicator: {ConfigState.show_weekday_indicator}", area="CONFIG")
+	logger.log(f"  Weekday indicator: {ConfigState.show_weekday_indicator}, Unload disabled modules: {ConfigState.unload_disabled_modules}", area="CONFIG")
 
 	return True
 
@@ -361,6 +383,14 @@ def get_stocks_grace_period_minutes():
 	"""Get grace period after market close (in minutes)"""
 	return ConfigState.stocks_grace_period_minutes
 
+def get_stocks_derive_chart_quote():
+	"""Check if the chart quote is derived from intraday bars (no quote call per refresh)"""
+	return ConfigState.stocks_derive_chart_quote
+
+def get_stocks_streaming():
+	"""Check if the WebSocket price stream is enabled"""
+	return ConfigState.stocks_streaming
+
 def should_show_weekday_indicator():
 	"""Check if weekday indicator should be shown"""
 	return ConfigState.show_weekday_indicator
@@ -376,3 +406,7 @@ def get_transit_display_frequency():
 def get_transit_respect_commute_hours():
 	"""Check if transit should only show during commute hours"""
 	return ConfigState.transit_respect_commute_hours
+
+def get_unload_disabled_modules():
+	"""Check if feature modules are unloaded when their display is disabled"""
+	return ConfigState.unload_disabled_modules
@@ -0,0 +1,232 @@
+"""
+Pantallita 3.0 - Connection Manager Module
+One long-lived socket pool + HTTP session per WiFi association:
+keep-alive socket reuse per host, shared TLS context, DNS cache with TTL,
+clean teardown / rebuild on WiFi loss, reuse and handshake-savings stats,
+socket timeouts derived from the current screen's fetch deadline
+INLINE ARCHITECTURE - thin wrappers over socketpool / adafruit_requests, no helper chains
+"""
+
+import time
+import ssl
+import socketpool
+import wifi
+import adafruit_requests
+import adafruit_connection_manager
+import config
+import state
+import logger
+import heap
+import netbuf
+
+
+# ============================================================================
+# DNS CACHE (INLINE)
+# ============================================================================
+
+class CachingSocketPool:
+	"""
+	socketpool.SocketPool stand-in with a getaddrinfo cache.
+
+	adafruit_connection_manager resolves the host before every new socket;
+	the stream client and NTP resolve too. Results are kept for
+	config.Network.DNS_TTL seconds, and a stale entry is served when the
+	resolver fails (stale-if-error). Everything else is forwarded.
+	"""
+
+	def __init__(self, pool):
+		self._pool = pool
+		self._dns = {}  # {(host, port): (addrinfo_list, expires_at)}
+
+	def __getattr__(self, name):
+		return getattr(self._pool, name)
+
+	def getaddrinfo(self, host, port, family=0, socktype=0, proto=0, flags=0):
+		key = (host, port)
+		now_time = time.monotonic()
+		cached = self._dns.get(key)
+		if cached is not None and now_time < cached[1]:
+			state.conn_dns_hits += 1
+			return cached[0]
+
+		state.conn_dns_misses += 1
+		try:
+			result = self._pool.getaddrinfo(host, port, family, socktype, proto, flags)
+		except OSError:
+			if cached is not None:
+				logger.log(f"DNS lookup for {host} failed - using cached address", config.LogLevel.WARNING, area="NET")
+				return cached[0]
+			raise
+
+		if len(self._dns) >= config.Network.DNS_CACHE_MAX and key not in self._dns:
+			self._dns.pop(next(iter(self._dns)))  # Drop the oldest insert
+		self._dns[key] = (result, now_time + config.Network.DNS_TTL)
+		return result
+
+	def socket(self, *args, **kwargs):
+		state.conn_new_sockets += 1
+		return self._pool.socket(*args, **kwargs)
+
+
+# ============================================================================
+# TRACKED SESSION (INLINE)
+# ============================================================================
+
+class TrackedSession(adafruit_requests.Session):
+	"""
+	adafruit_requests.Session that records, per request, whether the
+	connection manager had to open a socket (DNS + TCP + TLS) or reused a
+	kept-alive one, and how long the request took to its response headers.
+	Every request starts from a collected heap (heap.prepare) so the body
+	and its JSON parse land in contiguous free memory.
+	"""
+
+	def request(self, method, url, *args, **kwargs):
+		heap.prepare("fetch")
+		new_before = state.conn_new_sockets
+		start = time.monotonic()
+		response = super().request(method, url, *args, **kwargs)
+		elapsed = time.monotonic() - start
+
+		host = url.split("/")[2] if "://" in url else url
+		stats = state.conn_host_stats.get(host)
+		if stats is None:
+			stats = [0, 0]  # [requests, new connections]
+			state.conn_host_stats[host] = stats
+		stats[0] += 1
+		state.conn_requests += 1
+
+		if state.conn_new_sockets != new_before:
+			stats[1] += 1
+			state.conn_new_time += elapsed
+			state.conn_new_count += 1
+		else:
+			state.conn_reused_time += elapsed
+			state.conn_reused_count += 1
+		return response
+
+
+# ============================================================================
+# LIFECYCLE (INLINE)
+# ============================================================================
+
+def build_session():
+	"""
+	Create the socket pool, TLS context and HTTP session for the current
+	WiFi association. Tears down any previous session first.
+	"""
+	teardown("rebuild")
+
+	netbuf.init()  # First session = boot: allocate the receive buffer before the heap fragments
+	state.socket_pool = CachingSocketPool(socketpool.SocketPool(wifi.radio))
+	if state.ssl_context is None:
+		state.ssl_context = ssl.create_default_context()  # Reused across rebuilds
+	state.session = TrackedSession(state.socket_pool, state.ssl_context)
+	state.conn_sessions_built += 1
+	logger.log(f"HTTP session created (#{state.conn_sessions_built})", config.LogLevel.DEBUG, area="NET")
+
+
+def teardown(reason):
+	"""
+	Close every pooled socket and drop the session (WiFi lost / rebuild).
+	Safe to call when nothing is open.
+	"""
+	if state.socket_pool is None:
+		return
+
+	try:
+		adafruit_connection_manager.connection_manager_close_all(state.socket_pool, release_references=True)
+	except Exception as e:
+		logger.log(f"Socket teardown error: {e}", config.LogLevel.DEBUG, area="NET")
+
+	state.session = None
+	state.socket_pool = None
+	logger.log(f"HTTP session closed ({reason})", config.LogLevel.DEBUG, area="NET")
+
+
+# ============================================================================
+# FETCH DEADLINES (INLINE)
+# ============================================================================
+
+def request_timeout():
+	"""
+	Socket timeout for the next request, derived from state.fetch_deadline.
+
+	Screens set state.fetch_deadline (monotonic seconds) around their fetches
+	from the cycle plan and reset it to None afterwards. Without a deadline
+	the default config.Network.REQUEST_TIMEOUT applies. adafruit_requests
+	applies the timeout to each socket wait (connect, headers, body), so
+	the deadline bounds every stall rather than the exact total.
+
+	Returns:
+		float: Timeout in seconds, or None = offline / too little time left, use cache
+	"""
+	if state.session is None:
+		logger.log("Offline - skip, use cache", config.LogLevel.DEBUG, area="NET")
+		return None
+
+	if state.fetch_deadline is None:
+		return config.Network.REQUEST_TIMEOUT
+
+	remaining = state.fetch_deadline - time.monotonic()
+	if remaining < config.Network.MIN_REQUEST_TIMEOUT:
+		state.deadline_skips += 1
+		logger.log(f"Fetch budget spent ({max(0, remaining):.1f}s left) - skip, use cache", config.LogLevel.DEBUG, area="NET")
+		return None
+	return min(config.Network.REQUEST_TIMEOUT, remaining)
+
+
+
+def prefetch_deadline(seconds):
+	"""
+	Fetch deadline for a screen's up-front fetches (before it shows).
+
+	Timing.PREFETCH_SHARE of the seconds the screen is planned for, never
+	past the end of this cycle's plan (time spent fetching comes out of the
+	cycle), and at least one minimal request.
+
+	Args:
+		seconds: The screen's planned duration (playlist.duration)
+
+	Returns:
+		float: Deadline in monotonic seconds, for state.fetch_deadline
+	"""
+	now = time.monotonic()
+	budget = seconds * config.Timing.PREFETCH_SHARE
+	if state.playlist_started is not None:
+		budget = min(budget, state.playlist_started + state.playlist_budget - now)
+	return now + max(budget, config.Network.MIN_REQUEST_TIMEOUT)
+
+# ============================================================================
+# STATISTICS (INLINE)
+# ============================================================================
+
+def log_stats():
+	"""
+	Log connection reuse ratio, DNS cache hit rate and estimated handshake
+	time saved (reused requests x (avg new-connection time - avg reused time)).
+	"""
+	if state.conn_requests == 0:
+		return
+
+	reused = state.conn_requests - state.conn_new_count
+	reuse_pct = reused * 100 // state.conn_requests
+	lookups = state.conn_dns_hits + state.conn_dns_misses
+	dns_pct = state.conn_dns_hits * 100 // lookups if lookups else 0
+
+	saved_text = "n/a"
+	if state.conn_new_count and state.conn_reused_count:
+		avg_new = state.conn_new_time / state.conn_new_count
+		avg_reused = state.conn_reused_time / state.conn_reused_count
+		saved = max(0, avg_new - avg_reused) * state.conn_reused_count
+		saved_text = f"{saved:.1f}s ({int(avg_new * 1000)}ms new vs {int(avg_reused * 1000)}ms reused)"
+
+	logger.log(f"Connections: {state.conn_requests} requests, {reuse_pct}% reused, DNS cache {dns_pct}% hits, handshake time saved {saved_text}, sessions {state.conn_sessions_built}, deadline skips {state.deadline_skips}", config.LogLevel.INFO, area="NET")
+
+	hosts = []
+	for host, stats in state.conn_host_stats.items():
+		hosts.append(f"{host} {stats[0] - stats[1]}/{stats[0]}")
+	logger.log(f"  Reused per host: {', '.join(hosts)}", config.LogLevel.DEBUG, area="NET")
+
+	if state.rx_reads:
+		logger.log(f"Receive buffer: {state.rx_reads} bodies, avg {state.rx_bytes // state.rx_reads}B, peak {state.rx_peak}/{config.Network.RX_BUFFER_SIZE}B, {state.rx_spills} spilled to heap", config.LogLevel.INFO, area="NET")
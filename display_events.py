@@ -4,10 +4,9 @@ Renders event displays with custom images and colored text
 INLINE ARCHITECTURE - everything inline, no helper functions
 """
 
-import time
-import gc
 from adafruit_display_text import bitmap_label
 import displayio
+import adafruit_imageload
 
 import config
 import state
@@ -15,6 +14,7 @@ import logger
 import config_manager
 import display_weekday
 import hardware
+import heap
 
 
 # ============================================================================
@@ -110,11 +110,14 @@ def show_events(active_events, duration):
 
 		logger.log(f"Showing event {i+1}/{event_count}: {top_line} {bottom_line} ({duration_per_event}s)", config.LogLevel.INFO, area="EVENT")
 
-		# Show single event (inline)
-		show_event(top_line, bottom_line, image_file, color_name, duration_per_event)
+		# Show single event (inline) - DOWN moves on to the next event, a long-press ends the screen
+		action = show_event(top_line, bottom_line, image_file, color_name, duration_per_event)
 
-		# Memory cleanup between events (inline)
-		gc.collect()
+		# Next event's image and labels - collect first (heap.py skips it if little was allocated)
+		heap.prepare("event")
+
+		if action == hardware.ACTION_REFRESH:
+			break
 
 
 def show_event(top_text, bottom_text, image_file, color_name, duration):
@@ -128,6 +131,9 @@ def show_event(top_text, bottom_text, image_file, color_name, duration):
 		color_name: Color name for bottom text (e.g., "RED", "BUGAMBILIA")
 		duration: Duration in seconds
 
+	Returns:
+		str: Button action that ended the event early (hardware.ACTION_*), or None
+
 	INLINE - all rendering inline
 	"""
 	# Clear display (inline)
@@ -140,6 +146,15 @@ def show_event(top_text, bottom_text, image_file, color_name, duration):
 	event_image_path = f"{config.Paths.EVENT_IMAGES}/{image_file}"
 	fallback_image_path = f"{config.Paths.EVENT_IMAGES}/blank.bmp"
 
+	# Sprite atlas (inline): event images share one opened bitmap, picked by tile index
+	tile_index = 0
+	tile_size = None
+	atlas = state.image_atlases.get(config.Paths.EVENT_IMAGES)
+	if atlas and image_file in atlas[3]:
+		event_image_path = atlas[0]
+		tile_index = atlas[3][image_file]
+		tile_size = (atlas[1], atlas[2])
+
 	try:
 		# Try loading event-specific image (inline)
 		# LRU Cache check (inline)
@@ -147,25 +162,47 @@ def show_event(top_text, bottom_text, image_file, color_name, duration):
 			# Cache hit - move to end (mark as recently used)
 			state.image_cache_order.remove(event_image_path)
 			state.image_cache_order.append(event_image_path)
-			bitmap = state.image_cache[event_image_path]
+			bitmap, shader, ram_bytes = state.image_cache[event_image_path]
 			logger.log(f"Using cached event image: {image_file}", config.LogLevel.DEBUG, area="EVENT")
 		else:
 			# Cache miss - load from SD card
 			logger.log(f"Loading event image from SD: {image_file}", config.LogLevel.DEBUG, area="EVENT")
 			bitmap = displayio.OnDiskBitmap(event_image_path)
+			shader = bitmap.pixel_shader
+			ram_bytes = 0
+			state.image_fs_opens += 1
+
+			# RAM tier: small indexed images decode once into RAM (no flash reads per refresh)
+			# (atlases qualify on the byte budget alone - the whole family decodes once)
+			if isinstance(shader, displayio.Palette) and (bitmap.width * bitmap.height <= state.IMAGE_RAM_MAX_PIXELS or tile_size):
+				cost = ((bitmap.width + 3) // 4) * 4 * bitmap.height + len(shader) * 4
+				if state.image_ram_bytes + cost <= state.IMAGE_RAM_BUDGET:
+					bitmap, shader = adafruit_imageload.load(event_image_path, bitmap=displayio.Bitmap, palette=displayio.Palette)
+					ram_bytes = cost
+					state.image_ram_bytes += cost
+					state.image_fs_opens += 1
 
 			# Add to cache
-			state.image_cache[event_image_path] = bitmap
+			state.image_cache[event_image_path] = (bitmap, shader, ram_bytes)
 			state.image_cache_order.append(event_image_path)
 
 			# LRU eviction: remove oldest if cache is full
 			if len(state.image_cache_order) > state.IMAGE_CACHE_MAX:
 				oldest_path = state.image_cache_order.pop(0)
+				state.image_ram_bytes -= state.image_cache[oldest_path][2]
 				del state.image_cache[oldest_path]
 				logger.log(f"Evicted oldest image from cache: {oldest_path}", config.LogLevel.DEBUG, area="EVENT")
 
-		# Create TileGrid with bitmap's pixel shader
-		event_img = displayio.TileGrid(bitmap, pixel_shader=bitmap.pixel_shader)
+		# Tier counters (reported by logger.log_image_stats)
+		if ram_bytes:
+			state.image_ram_shows += 1
+		else:
+			state.image_disk_shows += 1
+
+		# Create TileGrid with bitmap's pixel shader (whole bitmap = single tile)
+		if tile_size is None:
+			tile_size = (bitmap.width, bitmap.height)
+		event_img = displayio.TileGrid(bitmap, pixel_shader=shader, tile_width=tile_size[0], tile_height=tile_size[1], default_tile=tile_index)
 		event_img.x = config.Layout.EVENT_IMAGE_X
 		event_img.y = config.Layout.EVENT_IMAGE_Y
 		state.main_group.append(event_img)
@@ -179,17 +216,23 @@ def show_event(top_text, bottom_text, image_file, color_name, duration):
 			if fallback_image_path in state.image_cache:
 				state.image_cache_order.remove(fallback_image_path)
 				state.image_cache_order.append(fallback_image_path)
-				bitmap = state.image_cache[fallback_image_path]
+				bitmap, shader, ram_bytes = state.image_cache[fallback_image_path]
 			else:
+				# Fallback stays on disk (rarely shown, not worth RAM budget)
 				bitmap = displayio.OnDiskBitmap(fallback_image_path)
-				state.image_cache[fallback_image_path] = bitmap
+				shader = bitmap.pixel_shader
+				ram_bytes = 0
+				state.image_fs_opens += 1
+				state.image_cache[fallback_image_path] = (bitmap, shader, ram_bytes)
 				state.image_cache_order.append(fallback_image_path)
 
 				if len(state.image_cache_order) > state.IMAGE_CACHE_MAX:
 					oldest_path = state.image_cache_order.pop(0)
+					state.image_ram_bytes -= state.image_cache[oldest_path][2]
 					del state.image_cache[oldest_path]
 
-			event_img = displayio.TileGrid(bitmap, pixel_shader=bitmap.pixel_shader)
+			state.image_disk_shows += 1
+			event_img = displayio.TileGrid(bitmap, pixel_shader=shader)
 			event_img.x = config.Layout.EVENT_IMAGE_X
 			event_img.y = config.Layout.EVENT_IMAGE_Y
 			state.main_group.append(event_img)
@@ -237,12 +280,5 @@ def show_event(top_text, bottom_text, image_file, color_name, duration):
 	# Display for duration (inline)
 	logger.log(f"Event: '{top_text}' / '{bottom_text}' (color: {color_name})", config.LogLevel.INFO, area="EVENT")
 
-	# Loop with button check instead of single sleep
-	start_time = time.monotonic()
-	while time.monotonic() - start_time < duration:
-		# Check for button press (inline)
-		if hardware.button_up_pressed():
-			logger.log("UP button pressed - stopping execution", config.LogLevel.INFO, area="EVENT")
-			raise KeyboardInterrupt  # Stop code execution
-
-		time.sleep(1)
+	# Static screen - sleep until the end or a button action
+	return hardware.wait(duration)
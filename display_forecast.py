@@ -7,6 +7,7 @@ CRITICAL: ALL logic is INLINE - NO helper functions
 import time
 import displayio
 from adafruit_display_text import bitmap_label
+import adafruit_imageload
 
 import config
 import state
@@ -24,7 +25,7 @@ def show(current_data, forecast_data, duration):
 	Show 3-column forecast display with smart precipitation logic.
 
 	CRITICAL ARCHITECTURE RULE:
-	This function has ZERO helper function calls (except hardware.button_up_pressed).
+	This function has ZERO helper function calls (except hardware.wait).
 	All logic is inlined to minimize stack depth.
 
 	Args:
@@ -119,9 +120,11 @@ def show(current_data, forecast_data, duration):
 
 	# ========================================================================
 	# WEEKDAY INDICATOR (if enabled)
+	# Hollow square = cached forecast past its refresh window (always shown then)
 	# ========================================================================
-	if config_manager.should_show_weekday_indicator():
-		display_weekday.add_weekday_indicator(state.rtc)
+	stale = time.monotonic() - state.last_forecast_time > config.Timing.FORECAST_CACHE_MAX_AGE + config.Timing.STALE_GRACE
+	if config_manager.should_show_weekday_indicator() or stale:
+		display_weekday.add_weekday_indicator(state.rtc, stale)
 
 	# ========================================================================
 	# CALCULATE TIME LABELS AND COLORS (INLINE)
@@ -194,30 +197,64 @@ def show(current_data, forecast_data, duration):
 	for i, col in enumerate(columns_data):
 		icon_path = f"{config.Paths.FORECAST_IMAGES}/{col['icon']}.bmp"
 
+		# Sprite atlas (inline): all three columns share one opened bitmap
+		tile_index = 0
+		tile_size = None
+		atlas = state.image_atlases.get(config.Paths.FORECAST_IMAGES)
+		if atlas and f"{col['icon']}.bmp" in atlas[3]:
+			icon_path = atlas[0]
+			tile_index = atlas[3][f"{col['icon']}.bmp"]
+			tile_size = (atlas[1], atlas[2])
+
 		try:
 			# LRU Cache check (inline - no helper functions)
 			if icon_path in state.image_cache:
 				# Cache hit - move to end (mark as recently used)
 				state.image_cache_order.remove(icon_path)
 				state.image_cache_order.append(icon_path)
-				bitmap = state.image_cache[icon_path]
+				bitmap, shader, ram_bytes = state.image_cache[icon_path]
 			else:
 				# Cache miss - load from SD card
 				bitmap = displayio.OnDiskBitmap(icon_path)
+				shader = bitmap.pixel_shader
+				ram_bytes = 0
+				state.image_fs_opens += 1
+
+				# RAM tier: small indexed images decode once into RAM (no flash reads per refresh)
+				# (atlases qualify on the byte budget alone - the whole family decodes once)
+				if isinstance(shader, displayio.Palette) and (bitmap.width * bitmap.height <= state.IMAGE_RAM_MAX_PIXELS or tile_size):
+					cost = ((bitmap.width + 3) // 4) * 4 * bitmap.height + len(shader) * 4
+					if state.image_ram_bytes + cost <= state.IMAGE_RAM_BUDGET:
+						bitmap, shader = adafruit_imageload.load(icon_path, bitmap=displayio.Bitmap, palette=displayio.Palette)
+						ram_bytes = cost
+						state.image_ram_bytes += cost
+						state.image_fs_opens += 1
 
 				# Add to cache
-				state.image_cache[icon_path] = bitmap
+				state.image_cache[icon_path] = (bitmap, shader, ram_bytes)
 				state.image_cache_order.append(icon_path)
 
 				# LRU eviction: remove oldest if cache is full
 				if len(state.image_cache_order) > state.IMAGE_CACHE_MAX:
 					oldest_path = state.image_cache_order.pop(0)  # Remove oldest
+					state.image_ram_bytes -= state.image_cache[oldest_path][2]
 					del state.image_cache[oldest_path]  # Free memory
 
-			# Create TileGrid (icons at fixed positions)
+			# Tier counters (reported by logger.log_image_stats)
+			if ram_bytes:
+				state.image_ram_shows += 1
+			else:
+				state.image_disk_shows += 1
+
+			# Create TileGrid (icons at fixed positions, whole bitmap = single tile)
+			if tile_size is None:
+				tile_size = (bitmap.width, bitmap.height)
 			tile_grid = displayio.TileGrid(
 				bitmap,
-				pixel_shader=bitmap.pixel_shader,
+				pixel_shader=shader,
+				tile_width=tile_size[0],
+				tile_height=tile_size[1],
+				default_tile=tile_index,
 				x=col["x"],
 				y=config.Layout.FORECAST_ICON_Y
 			)
@@ -314,14 +351,9 @@ def show(current_data, forecast_data, duration):
 
 	end_time = time.monotonic() + duration
 	last_minute = -1  # Track last minute to avoid unnecessary updates
+	import hardware  # Imported here to avoid circular imports
 
-	while time.monotonic() < end_time:
-		# Check button inline
-		import hardware
-		if hardware.button_up_pressed():
-			logger.log("UP button pressed during forecast display", config.LogLevel.INFO, area="FORECAST")
-			raise KeyboardInterrupt
-
+	while True:
 		# Update column 1 time only when minute changes
 		now = state.rtc.datetime
 		current_minute = now.tm_min
@@ -337,6 +369,11 @@ def show(current_data, forecast_data, duration):
 			col1_time_label.text = new_time_text
 			last_minute = current_minute
 
-		time.sleep(0.1)
+		# Sleep until the next minute tick or the end of the screen (DOWN ends it early)
+		remaining = end_time - time.monotonic()
+		if remaining <= 0:
+			break
+		if hardware.wait(min(remaining, 60 - now.tm_sec)) is not None:
+			break
 
 	logger.log("Forecast display complete", config.LogLevel.DEBUG, area="FORECAST")
@@ -0,0 +1,304 @@
+"""
+Pantallita 3.0 - Thin-Client Frame Display Module
+Shows the weather, forecast and transit screens as pre-rendered 64x32 frames
+from tools/fleet_server.py (/frame, drawn by tools/frame_renderer.py). All
+three screens share one Bitmap + Palette; only the clock and the arrival
+countdowns are live labels on top of it
+INLINE ARCHITECTURE - frame decode and overlay updates inline
+"""
+
+import time
+import gc
+import struct
+import displayio
+from adafruit_display_text import bitmap_label
+
+import config
+import state
+import logger
+import connections
+import netbuf
+import config_manager
+import hardware
+import timeline
+
+try:
+	import bitmaptools  # Row blits (C) - per-pixel fallback without it
+except ImportError:
+	bitmaptools = None
+
+# Screens the server renders (stocks, events and schedules stay native)
+SCREENS = ("weather", "forecast", "transit")
+
+# Frame format (tools/frame_renderer.py)
+FLAG_DELTA = 1
+FLAG_4BIT = 2
+HEADER_SIZE = 15  # "PF1", flags, colors, overlays, reserved, crc32, base crc32
+OVERLAY_SIZE = 16
+OVERLAY_CLOCK = 1
+OVERLAY_COUNTDOWN = 2
+NO_BACKGROUND = 255
+
+# Refetch interval while a screen is showing (same as the native screens)
+REFRESH_INTERVAL = {
+	"weather": config.Timing.WEATHER_UPDATE_INTERVAL,
+	"forecast": config.Timing.FORECAST_UPDATE_INTERVAL,
+	"transit": config.Timing.TRANSIT_UPDATE_INTERVAL,
+}
+
+
+def is_enabled():
+	"""True when settings.toml points the device at a frame server."""
+	return bool(config.Env.FLEET_FRAME_URL)
+
+
+# ============================================================================
+# FRAME FETCH + DECODE (INLINE)
+# ============================================================================
+
+def fetch(screen):
+	"""
+	Fetch one screen's frame and decode it into state.frame_bitmap.
+
+	Sends the crc of the frame already in the bitmap, so an unchanged or
+	mostly unchanged screen arrives as a handful of changed rows.
+
+	Returns:
+		list: Overlays [(kind, font, anchor, x, y, color, background, pads, value, text)],
+		      or None on failure (bitmap untouched)
+	"""
+	timeout = connections.request_timeout()
+	if timeout is None:
+		return None
+
+	now = state.rtc.datetime
+	url = (f"{config.Env.FLEET_FRAME_URL}?device={config.Env.FLEET_DEVICE_ID}&screen={screen}"
+	       f"&now={now.tm_year:04d}{now.tm_mon:02d}{now.tm_mday:02d}{now.tm_hour:02d}{now.tm_min:02d}"
+	       f"&wd={1 if config_manager.should_show_weekday_indicator() else 0}&base={state.frame_crc:08x}")
+	if screen == "transit":
+		active_routes = timeline.get_active_transit_routes(state.rtc)
+		if active_routes is not None:
+			url += "&routes=" + ",".join(route['label'] for route in active_routes)
+
+	response = None
+
+	try:
+		response = state.session.get(url, timeout=timeout)
+
+		if response.status_code != 200:
+			logger.log(f"Frame {screen}: HTTP {response.status_code}", config.LogLevel.WARNING, area="FRAME")
+			state.frame_fetch_errors += 1
+			return None
+
+		data = netbuf.read(response)
+		state.frame_fetch_count += 1
+		state.frame_bytes += len(data)
+
+		# Header (inline)
+		if len(data) < HEADER_SIZE or bytes(data[:3]) != b"PF1":
+			raise ValueError("not a frame")
+		flags, colors, count, _, crc, base_crc = struct.unpack_from("<BBBBII", data, 3)
+		if flags & FLAG_DELTA and base_crc != state.frame_crc:
+			raise ValueError("delta for another frame")
+
+		palette_offset = HEADER_SIZE
+		offset = palette_offset + colors * 3
+
+		# Overlays, colors resolved to RGB (inline)
+		overlays = []
+		for _ in range(count):
+			kind, font, anchor, x, y, color, background, pad_top, pad_bottom, pad_left, pad_right, value, length = struct.unpack_from("<BBBhhBBbbbbhB", data, offset)
+			offset += OVERLAY_SIZE
+			text = str(data[offset:offset + length], "utf-8")
+			offset += length
+			color = (data[palette_offset + color * 3] << 16) | (data[palette_offset + color * 3 + 1] << 8) | data[palette_offset + color * 3 + 2]
+			if background != NO_BACKGROUND:
+				background = (data[palette_offset + background * 3] << 16) | (data[palette_offset + background * 3 + 1] << 8) | data[palette_offset + background * 3 + 2]
+			else:
+				background = None
+			overlays.append((kind, font, anchor, x, y, color, background, (pad_top, pad_bottom, pad_left, pad_right), value, text))
+
+		mask = 0xFFFFFFFF
+		if flags & FLAG_DELTA:
+			mask = struct.unpack_from("<I", data, offset)[0]
+			offset += 4
+		row_bytes = config.Display.WIDTH // 2 if flags & FLAG_4BIT else config.Display.WIDTH
+		rows = 0
+		for y in range(config.Display.HEIGHT):
+			if mask & (1 << y):
+				rows += 1
+		if len(data) < offset + rows * row_bytes:
+			raise ValueError(f"truncated frame ({len(data)} bytes)")
+
+		# One bitmap/palette for every frame screen (created on first frame)
+		if state.frame_bitmap is None:
+			state.frame_bitmap = displayio.Bitmap(config.Display.WIDTH, config.Display.HEIGHT, 256)
+			state.frame_palette = displayio.Palette(256)
+			state.frame_grid = displayio.TileGrid(state.frame_bitmap, pixel_shader=state.frame_palette)
+			state.frame_row = bytearray(config.Display.WIDTH)
+
+		# Palette + pixels (inline) - from here on the bitmap is being replaced
+		state.frame_crc = 0
+		for i in range(colors):
+			o = palette_offset + i * 3
+			state.frame_palette[i] = (data[o] << 16) | (data[o + 1] << 8) | data[o + 2]
+
+		view = memoryview(data)
+		row = state.frame_row
+		for y in range(config.Display.HEIGHT):
+			if not mask & (1 << y):
+				continue
+			if flags & FLAG_4BIT:
+				# Two pixels per byte, high nibble first
+				for x in range(row_bytes):
+					packed = data[offset + x]
+					row[2 * x] = packed >> 4
+					row[2 * x + 1] = packed & 0x0F
+				pixels = row
+			else:
+				pixels = view[offset:offset + row_bytes]
+			offset += row_bytes
+
+			if bitmaptools:
+				bitmaptools.arrayblit(state.frame_bitmap, pixels, 0, y, config.Display.WIDTH, y + 1)
+			else:
+				for x in range(config.Display.WIDTH):
+					state.frame_bitmap[x, y] = pixels[x]
+
+		state.frame_crc = crc
+		logger.log(f"Frame {screen}: {len(data)} B, {rows} rows, {colors} colors, {count} overlays", config.LogLevel.DEBUG, area="FRAME")
+		return overlays
+
+	except Exception as e:
+		logger.log(f"Frame {screen} failed: {e}", config.LogLevel.ERROR, area="FRAME")
+		state.frame_fetch_errors += 1
+		return None
+
+	finally:
+		if response:
+			try:
+				response.close()
+			except:
+				pass
+
+
+# ============================================================================
+# FRAME SCREEN (INLINE)
+# ============================================================================
+
+def show(screen, duration):
+	"""
+	Show a server-rendered screen for duration seconds.
+
+	The frame is refetched on the screen's usual refresh interval (or a
+	REFRESH press); between fetches the clock follows the RTC and the
+	countdowns tick down locally.
+
+	Returns:
+		bool: False when no frame could be fetched (caller draws the screen natively)
+	"""
+	state.render_probe = (f"{screen} frame", time.monotonic(), gc.mem_free())
+
+	# Up-front fetch budget, screen not shown yet
+	state.fetch_deadline = connections.prefetch_deadline(duration)
+	try:
+		overlays = fetch(screen)
+	finally:
+		state.fetch_deadline = None
+
+	if overlays is None:
+		# Native fallback gets its own benchmark sample
+		state.render_probe = (f"{screen} native", time.monotonic(), gc.mem_free())
+		return False
+
+	# Clear display (inline)
+	while len(state.main_group) > 0:
+		state.main_group.pop()
+	state.main_group.append(state.frame_grid)
+
+	logger.log(f"Starting {screen} frame display ({duration}s)", config.LogLevel.INFO, area="FRAME")
+
+	start_time = time.monotonic()
+	frame_time = start_time
+	last_fetch = start_time
+	last_minute = -1
+	labels = []
+
+	while True:
+		# Live overlays: one label per overlay, rebuilt when a new frame arrives
+		if overlays is not None:
+			while len(state.main_group) > 1:
+				state.main_group.pop()
+			labels = []
+			for kind, font, anchor, x, y, color, background, pads, value, text in overlays:
+				if anchor:
+					label = bitmap_label.Label(
+						state.font_large if font else state.font_small,
+						text=" ",
+						color=color,
+						background_color=background,
+						padding_top=pads[0],
+						padding_bottom=pads[1],
+						padding_left=pads[2],
+						padding_right=pads[3],
+						anchor_point=(0.5 if anchor == 1 else 1.0, 0.0),
+						anchored_position=(x, y)
+					)
+				else:
+					label = bitmap_label.Label(
+						state.font_large if font else state.font_small,
+						text=" ",
+						color=color,
+						background_color=background,
+						padding_top=pads[0],
+						padding_bottom=pads[1],
+						padding_left=pads[2],
+						padding_right=pads[3],
+						x=x,
+						y=y
+					)
+				state.main_group.append(label)
+				labels.append((label, kind, value, text))
+			overlays = None
+			last_minute = -1
+
+		# Update clock and countdowns when the minute changes
+		now = state.rtc.datetime
+		if now.tm_min != last_minute:
+			hour_12 = now.tm_hour % 12
+			if hour_12 == 0:
+				hour_12 = 12
+			time_str = f"{hour_12}:{now.tm_min:02d}"
+			elapsed_minutes = int((time.monotonic() - frame_time) // 60)
+			for label, kind, value, text in labels:
+				if kind == OVERLAY_CLOCK:
+					label.text = text.replace("{t}", time_str)
+				elif kind == OVERLAY_COUNTDOWN:
+					label.text = str(max(0, value - elapsed_minutes))
+			last_minute = now.tm_min
+
+		elapsed = time.monotonic() - start_time
+		if elapsed >= duration:
+			break
+
+		# Refetch (short budget, never past the end of the screen)
+		if time.monotonic() - last_fetch >= REFRESH_INTERVAL[screen]:
+			state.fetch_deadline = min(time.monotonic() + config.Timing.SCREEN_REFRESH_BUDGET, start_time + duration - config.Timing.SCREEN_END_MARGIN)
+			try:
+				overlays = fetch(screen)
+			finally:
+				state.fetch_deadline = None
+			last_fetch = time.monotonic()
+			if overlays is not None:
+				frame_time = last_fetch
+			continue
+
+		# Sleep until the next minute tick, refetch or end of screen (inline)
+		action = hardware.wait(min(duration - elapsed, 60 - now.tm_sec, last_fetch + REFRESH_INTERVAL[screen] - time.monotonic()))
+		if action == hardware.ACTION_SKIP:
+			break
+		if action == hardware.ACTION_REFRESH:
+			last_fetch = -REFRESH_INTERVAL[screen]  # Refetch on the next pass
+
+	logger.log(f"{screen} frame display complete", config.LogLevel.INFO, area="FRAME")
+	return True
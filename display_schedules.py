@@ -5,11 +5,11 @@ INLINE ARCHITECTURE - everything inline, no helper functions
 """
 
 import time
-import gc
 from adafruit_display_text import bitmap_label
 from adafruit_display_shapes.line import Line
 from adafruit_display_shapes.rect import Rect
 import displayio
+import adafruit_imageload
 
 import config
 import config_manager
@@ -18,6 +18,7 @@ import logger
 import weather_api
 import hardware
 import display_weekday
+import connections
 
 
 # ============================================================================
@@ -72,6 +73,8 @@ def show_schedule(rtc, schedule_name, schedule_config, duration):
 	# Fetch initial weather data (inline) - skip for night_mode 2
 	weather_data = None
 	if should_fetch_weather:
+		# Up-front fetch budget (the schedule screen has not started yet)
+		state.fetch_deadline = connections.prefetch_deadline(duration)
 		try:
 			weather_data = weather_api.fetch_current()
 			if weather_data:
@@ -79,19 +82,45 @@ def show_schedule(rtc, schedule_name, schedule_config, duration):
 				logger.log(f"Weather: {weather_data['feels_like']}°, UV:{uv_index}", config.LogLevel.DEBUG, area="SCHEDULE")
 		except Exception as e:
 			logger.log(f"Schedule weather fetch error: {e}", config.LogLevel.WARNING, area="SCHEDULE")
+		finally:
+			state.fetch_deadline = None
 
 	# === DRAW STATIC ELEMENTS (ONCE) ===
 
 	# Schedule image (40×28, right side) - no cache (loaded once per schedule)
 	try:
 		schedule_image_path = f"{config.Paths.SCHEDULE_IMAGES}/{schedule_config['image']}"
+		atlas = state.image_atlases.get(config.Paths.SCHEDULE_IMAGES)
+
+		if atlas and schedule_config['image'] in atlas[3]:
+			# Sprite atlas: one opened bitmap shared by every schedule - worth caching
+			if atlas[0] in state.image_cache:
+				state.image_cache_order.remove(atlas[0])
+				state.image_cache_order.append(atlas[0])
+				bitmap, shader, ram_bytes = state.image_cache[atlas[0]]
+			else:
+				logger.log(f"Loading schedule atlas: {atlas[0]}", config.LogLevel.DEBUG, area="SCHEDULE")
+				bitmap = displayio.OnDiskBitmap(atlas[0])
+				shader = bitmap.pixel_shader
+				state.image_fs_opens += 1
+				state.image_cache[atlas[0]] = (bitmap, shader, 0)
+				state.image_cache_order.append(atlas[0])
 
-		# Load directly without caching (schedules only run once per day)
-		logger.log(f"Loading schedule image: {schedule_image_path}", config.LogLevel.DEBUG, area="SCHEDULE")
-		bitmap = displayio.OnDiskBitmap(schedule_image_path)
+				# LRU eviction: remove oldest if cache is full
+				if len(state.image_cache_order) > state.IMAGE_CACHE_MAX:
+					oldest_path = state.image_cache_order.pop(0)
+					state.image_ram_bytes -= state.image_cache[oldest_path][2]
+					del state.image_cache[oldest_path]
+
+			schedule_img = displayio.TileGrid(bitmap, pixel_shader=shader, tile_width=atlas[1], tile_height=atlas[2], default_tile=atlas[3][schedule_config['image']])
+		else:
+			# Load directly without caching (schedules only run once per day)
+			logger.log(f"Loading schedule image: {schedule_image_path}", config.LogLevel.DEBUG, area="SCHEDULE")
+			bitmap = displayio.OnDiskBitmap(schedule_image_path)
+
+			# Create TileGrid with bitmap's pixel shader
+			schedule_img = displayio.TileGrid(bitmap, pixel_shader=bitmap.pixel_shader)
 
-		# Create TileGrid with bitmap's pixel shader
-		schedule_img = displayio.TileGrid(bitmap, pixel_shader=bitmap.pixel_shader)
 		schedule_img.x = config.Layout.SCHEDULE_IMAGE_X
 		schedule_img.y = config.Layout.SCHEDULE_IMAGE_Y
 		state.main_group.append(schedule_img)
@@ -117,27 +146,58 @@ def show_schedule(rtc, schedule_name, schedule_config, duration):
 			weather_icon = f"{weather_data['icon']}.bmp"
 			weather_icon_path = f"{config.Paths.COLUMN_IMAGES}/{weather_icon}"
 
+			# Sprite atlas (inline): same column atlas as the forecast display
+			tile_index = 0
+			tile_size = None
+			atlas = state.image_atlases.get(config.Paths.COLUMN_IMAGES)
+			if atlas and weather_icon in atlas[3]:
+				weather_icon_path = atlas[0]
+				tile_index = atlas[3][weather_icon]
+				tile_size = (atlas[1], atlas[2])
+
 			# LRU Cache check (inline)
 			if weather_icon_path in state.image_cache:
 				# Cache hit - move to end (mark as recently used)
 				state.image_cache_order.remove(weather_icon_path)
 				state.image_cache_order.append(weather_icon_path)
-				bitmap = state.image_cache[weather_icon_path]
+				bitmap, shader, ram_bytes = state.image_cache[weather_icon_path]
 			else:
 				# Cache miss - load from SD card
 				bitmap = displayio.OnDiskBitmap(weather_icon_path)
+				shader = bitmap.pixel_shader
+				ram_bytes = 0
+				state.image_fs_opens += 1
+
+				# RAM tier: small indexed images decode once into RAM (no flash reads per refresh)
+				# (atlases qualify on the byte budget alone - the whole family decodes once)
+				if isinstance(shader, displayio.Palette) and (bitmap.width * bitmap.height <= state.IMAGE_RAM_MAX_PIXELS or tile_size):
+					cost = ((bitmap.width + 3) // 4) * 4 * bitmap.height + len(shader) * 4
+					if state.image_ram_bytes + cost <= state.IMAGE_RAM_BUDGET:
+						bitmap, shader = adafruit_imageload.load(weather_icon_path, bitmap=displayio.Bitmap, palette=displayio.Palette)
+						ram_bytes = cost
+						state.image_ram_bytes += cost
+						state.image_fs_opens += 1
 
 				# Add to cache
-				state.image_cache[weather_icon_path] = bitmap
+				state.image_cache[weather_icon_path] = (bitmap, shader, ram_bytes)
 				state.image_cache_order.append(weather_icon_path)
 
 				# LRU eviction: remove oldest if cache is full
 				if len(state.image_cache_order) > state.IMAGE_CACHE_MAX:
 					oldest_path = state.image_cache_order.pop(0)
+					state.image_ram_bytes -= state.image_cache[oldest_path][2]
 					del state.image_cache[oldest_path]
 
-			# Create TileGrid with bitmap's pixel shader
-			weather_img = displayio.TileGrid(bitmap, pixel_shader=bitmap.pixel_shader)
+			# Tier counters (reported by logger.log_image_stats)
+			if ram_bytes:
+				state.image_ram_shows += 1
+			else:
+				state.image_disk_shows += 1
+
+			# Create TileGrid with bitmap's pixel shader (whole bitmap = single tile)
+			if tile_size is None:
+				tile_size = (bitmap.width, bitmap.height)
+			weather_img = displayio.TileGrid(bitmap, pixel_shader=shader, tile_width=tile_size[0], tile_height=tile_size[1], default_tile=tile_index)
 			weather_img.x = config.Layout.SCHEDULE_WEATHER_ICON_X
 			weather_img.y = weather_icon_y  # Dynamic position
 			state.main_group.append(weather_img)
@@ -296,9 +356,11 @@ def show_schedule(rtc, schedule_name, schedule_config, duration):
 
 		# Refresh weather + cleanup (every 5 minutes for stress test) - inline
 		# Skip weather fetch for night_mode 2 (clock only)
-		if should_fetch_weather and elapsed - last_weather_fetch > 300:  # 5 minutes (stress test)
+		if should_fetch_weather and elapsed - last_weather_fetch >= 300:  # 5 minutes (stress test)
 			logger.log(f"Schedule weather refresh ({elapsed/60:.1f} min elapsed)", config.LogLevel.DEBUG, area="SCHEDULE")
 
+			# Refresh budget: short stall at most, and never past the end of the segment
+			state.fetch_deadline = min(time.monotonic() + config.Timing.SCREEN_REFRESH_BUDGET, start_time + duration - config.Timing.SCREEN_END_MARGIN)
 			try:
 				new_weather_data = weather_api.fetch_current()
 
@@ -313,47 +375,70 @@ def show_schedule(rtc, schedule_name, schedule_config, duration):
 						weather_icon = f"{new_weather_data['icon']}.bmp"
 						weather_icon_path = f"{config.Paths.COLUMN_IMAGES}/{weather_icon}"
 
+						# Sprite atlas (inline)
+						tile_index = 0
+						tile_size = None
+						atlas = state.image_atlases.get(config.Paths.COLUMN_IMAGES)
+						if atlas and weather_icon in atlas[3]:
+							weather_icon_path = atlas[0]
+							tile_index = atlas[3][weather_icon]
+							tile_size = (atlas[1], atlas[2])
+
 						# LRU Cache check (inline)
 						if weather_icon_path in state.image_cache:
 							# Cache hit - move to end (mark as recently used)
 							state.image_cache_order.remove(weather_icon_path)
 							state.image_cache_order.append(weather_icon_path)
-							bitmap = state.image_cache[weather_icon_path]
+							bitmap, shader, ram_bytes = state.image_cache[weather_icon_path]
 						else:
-							# Cache miss - load from SD card
+							# Cache miss - load from SD card (disk tier, refreshes are rare)
 							bitmap = displayio.OnDiskBitmap(weather_icon_path)
+							shader = bitmap.pixel_shader
+							state.image_fs_opens += 1
 
 							# Add to cache
-							state.image_cache[weather_icon_path] = bitmap
+							state.image_cache[weather_icon_path] = (bitmap, shader, 0)
 							state.image_cache_order.append(weather_icon_path)
 
 							# LRU eviction: remove oldest if cache is full
 							if len(state.image_cache_order) > state.IMAGE_CACHE_MAX:
 								oldest_path = state.image_cache_order.pop(0)
+								state.image_ram_bytes -= state.image_cache[oldest_path][2]
 								del state.image_cache[oldest_path]
 
-						# Find and update weather icon tile grid (inline)
-						for item in state.main_group:
+						if tile_size is None:
+							tile_size = (bitmap.width, bitmap.height)
+						new_weather_img = displayio.TileGrid(bitmap, pixel_shader=shader, tile_width=tile_size[0], tile_height=tile_size[1], default_tile=tile_index)
+
+						# Find and replace weather icon tile grid (inline)
+						for i in range(len(state.main_group)):
+							item = state.main_group[i]
 							if isinstance(item, displayio.TileGrid) and item.x == config.Layout.SCHEDULE_WEATHER_ICON_X:
-								item.bitmap = bitmap
-								item.pixel_shader = bitmap.pixel_shader
+								new_weather_img.x = item.x
+								new_weather_img.y = item.y
+								state.main_group[i] = new_weather_img
 								break
 
 					weather_data = new_weather_data
 
 			except Exception as e:
 				logger.log(f"Schedule weather refresh error: {e}", config.LogLevel.WARNING, area="SCHEDULE")
+			finally:
+				state.fetch_deadline = None
 
-			# Cleanup after fetch (inline)
-			gc.collect()
 			last_weather_fetch = elapsed
 
-		# Check for button press (inline)
-		if hardware.button_up_pressed():
-			logger.log("UP button pressed - stopping execution", config.LogLevel.INFO, area="SCHEDULE")
-			raise KeyboardInterrupt  # Stop code execution
-
-		# Sleep 1 second between updates
-		time.sleep(1)
+		# Sleep until the next clock minute, progress column, weather refresh or the end (inline)
+		elapsed = time.monotonic() - start_time
+		wait_seconds = min(duration - elapsed, 60 - rtc.datetime.tm_sec)
+		if show_progress_bar:
+			wait_seconds = min(wait_seconds, (last_progress_column + 1) * duration / config.Layout.PROGRESS_BAR_WIDTH - elapsed)
+		if should_fetch_weather:
+			wait_seconds = min(wait_seconds, last_weather_fetch + 300 - elapsed)
+
+		# The schedule owns the screen for its window: DOWN does not skip it,
+		# a long-press refreshes the weather now
+		if hardware.wait(max(wait_seconds, config.Timing.KEY_POLL_INTERVAL)) == hardware.ACTION_REFRESH:
+			last_weather_fetch = -300
 
 	logger.log(f"Schedule complete: {schedule_name}", config.LogLevel.INFO, area="SCHEDULE")
@@ -5,16 +5,23 @@ INLINE ARCHITECTURE - no helper functions, everything inline
 """
 
 import time
+import displayio
 from adafruit_display_text import bitmap_label
 from adafruit_display_shapes.triangle import Triangle
 from adafruit_display_shapes.line import Line
 
+try:
+	import bitmaptools
+except ImportError:
+	bitmaptools = None  # Fall back to per-column vertical fills
+
 import config
 import state
 import logger
 import config_manager
 import display_weekday
 import hardware
+import stocks_stream
 
 # ============================================================================
 # MULTI-STOCK DISPLAY (INLINE)
@@ -40,9 +47,16 @@ def show_multi_stock(stocks_to_show, duration):
 	while len(state.main_group) > 0:
 		state.main_group.pop()
 
-	# Weekday indicator (if enabled)
-	if config_manager.should_show_weekday_indicator():
-		display_weekday.add_weekday_indicator(state.rtc)
+	# Weekday indicator (if enabled) - hollow when a quote missed its refresh
+	# window while the market is open (always shown then)
+	stale = False
+	if state.should_fetch_stocks:
+		for s in stocks_to_show:
+			cached = state.cached_stock_prices.get(s['symbol'])
+			if cached and time.monotonic() - cached['timestamp'] > config.Timing.STOCKS_CACHE_MAX_AGE + config.Timing.STALE_GRACE:
+				stale = True
+	if config_manager.should_show_weekday_indicator() or stale:
+		display_weekday.add_weekday_indicator(state.rtc, stale)
 
 	# Log start with prices (inline)
 	log_parts = []
@@ -185,15 +199,17 @@ def show_multi_stock(stocks_to_show, duration):
 			state.main_group.append(pixel)
 
 	# Display for duration (inline)
-	# Loop with button check instead of single sleep
-	start_time = time.monotonic()
-	while time.monotonic() - start_time < duration:
-		# Check for button press (inline)
-		if hardware.button_up_pressed():
-			logger.log("UP button pressed - stopping execution", config.LogLevel.INFO, area="STOCKS")
-			raise KeyboardInterrupt  # Stop code execution
-
-		time.sleep(1)
+	# Sleep until the end or a button action - 1 s steps only while a price stream needs draining
+	end_time = time.monotonic() + duration
+	while True:
+		# Drain price stream while waiting (no-op when polling)
+		stocks_stream.poll()
+
+		remaining = end_time - time.monotonic()
+		if remaining <= 0:
+			break
+		if hardware.wait(min(remaining, 1) if stocks_stream.is_live() else remaining) is not None:
+			break
 
 	logger.log("Multi-stock display complete", config.LogLevel.INFO, area="STOCKS")
 
@@ -202,7 +218,7 @@ def show_multi_stock(stocks_to_show, duration):
 # SINGLE STOCK CHART DISPLAY (INLINE)
 # ============================================================================
 
-def show_single_stock_chart(stock_symbol, stock_quote, time_series, duration):
+def show_single_stock_chart(stock_symbol, stock_quote, chart, duration):
 	"""
 	Display single stock with intraday price chart
 
@@ -214,7 +230,7 @@ def show_single_stock_chart(stock_symbol, stock_quote, time_series, duration):
 	Args:
 		stock_symbol: Stock symbol (e.g., "CRM")
 		stock_quote: Quote dict with price/change data
-		time_series: List of price points [{datetime, open_price, close_price}, ...]
+		chart: Precomputed columns from stocks_api.build_chart_columns()
 		duration: Display duration in seconds
 
 	INLINE - all rendering inline, no helper functions
@@ -223,9 +239,14 @@ def show_single_stock_chart(stock_symbol, stock_quote, time_series, duration):
 	while len(state.main_group) > 0:
 		state.main_group.pop()
 
-	# Weekday indicator (if enabled)
-	if config_manager.should_show_weekday_indicator():
-		display_weekday.add_weekday_indicator(state.rtc)
+	# Weekday indicator (if enabled) - hollow when the chart missed its refresh
+	# window while the market is open (always shown then)
+	stale = False
+	cached = state.cached_intraday_data.get(stock_symbol)
+	if state.should_fetch_stocks and cached and time.monotonic() - cached['timestamp'] > config.Timing.INTRADAY_CACHE_MAX_AGE + config.Timing.STALE_GRACE:
+		stale = True
+	if config_manager.should_show_weekday_indicator() or stale:
+		display_weekday.add_weekday_indicator(state.rtc, stale)
 
 	# Get display name (inline)
 	display_name = stock_quote.get("display_name", stock_symbol)
@@ -244,17 +265,9 @@ def show_single_stock_chart(stock_symbol, stock_quote, time_series, duration):
 	else:
 		pct_color = config.Colors.RED
 
-	# Get opening price for bicolor chart (from quote, fallback to time series)
-	opening_price = stock_quote.get("open_price")
-	if opening_price is None or opening_price == 0:
-		# Fallback to first point in time series if quote doesn't have it
-		if time_series and len(time_series) > 0:
-			opening_price = time_series[0].get("open_price")
-			if opening_price is None:
-				opening_price = time_series[0].get("close_price")
-
 	# Debug log for bicolor chart
-	logger.log(f"Bicolor chart: {display_name} open=${opening_price:.2f}, current=${current_price:.2f}, change={change_percent:+.2f}%", config.LogLevel.DEBUG, area="STOCKS")
+	if chart:
+		logger.log(f"Bicolor chart: {display_name} open=${chart['open_price']:.2f}, current=${current_price:.2f}, change={change_percent:+.2f}%, {chart['width']} columns", config.LogLevel.DEBUG, area="STOCKS")
 
 	# Row 1 (y=1): Ticker + percentage (inline)
 	ticker_label = bitmap_label.Label(
@@ -308,117 +321,55 @@ def show_single_stock_chart(stock_symbol, stock_quote, time_series, duration):
 	CHART_Y_START = 17
 	CHART_WIDTH = 64
 
-	if time_series and len(time_series) > 0:
-		# Progressive loading: calculate expected points based on elapsed time
-		# Trading day: 6.5 hours = 390 minutes = 78 points at 5min intervals
-		# Calculate elapsed time to determine how many points to show
-		trading_minutes = 390  # 9:30 AM - 4:00 PM
-		num_total_points = 78  # Full trading day at 5min intervals
-
-		# Use available points (inline)
-		points_to_show = time_series  # All available points (chronological)
-
-		# Find min and max prices for scaling (inline)
-		prices = [point["close_price"] for point in points_to_show]
-		min_price = min(prices)
-		max_price = max(prices)
-		price_range = max_price - min_price
-
-		# Handle flat line (inline)
-		if price_range == 0:
-			price_range = 1
-
-		# Progressive display: show points proportionally on left, blank space on right
-		data_points = []
-		num_points = len(points_to_show)
-
-		# Calculate display width based on ACTUAL elapsed time, not number of points
-		# Get current time in minutes since midnight (local) from DS3231 RTC
-		now = state.rtc.datetime
-		current_minutes = now.tm_hour * 60 + now.tm_min
-		current_weekday = now.tm_wday  # 0=Monday, 6=Sunday
-
-		# Check if we're actually in market hours (weekday + within market times)
-		is_weekday = current_weekday < 5  # Monday-Friday
-		is_within_market_hours = (current_minutes >= state.market_open_local_minutes and
-		                         current_minutes <= state.market_close_local_minutes)
-
-		# Debug logging to diagnose timezone issues
-		logger.log(f"Chart timing: now={now.tm_hour}:{now.tm_min:02d} ({current_minutes}min), weekday={current_weekday}, market={state.market_open_local_minutes}-{state.market_close_local_minutes}, is_weekday={is_weekday}, is_within_hours={is_within_market_hours}", config.LogLevel.DEBUG, area="STOCKS")
-
-		# Calculate elapsed minutes since market open
-		if state.market_open_local_minutes > 0 and is_weekday and is_within_market_hours:
-			# We're during actual market hours - show progressive chart
-			elapsed_minutes = current_minutes - state.market_open_local_minutes
-			progress_ratio = elapsed_minutes / trading_minutes
-			logger.log(f"Progressive chart: elapsed={elapsed_minutes}min, ratio={progress_ratio:.2f} ({int(progress_ratio*100)}% of day)", config.LogLevel.DEBUG, area="STOCKS")
-		else:
-			# Outside market hours (weekend, before open, after close) - show full chart
-			progress_ratio = 1.0
-			logger.log(f"Full chart: outside market hours (market_open={state.market_open_local_minutes}, weekday={is_weekday}, within_hours={is_within_market_hours})", config.LogLevel.DEBUG, area="STOCKS")
-
-		display_width = max(int(progress_ratio * CHART_WIDTH), 2)  # Minimum 2 pixels
-
-		# Compress points to fit display_width, preserving first and last
-		# Store (x, y, price) for bicolor chart support
-		if num_points == 1:
-			# Single point - show at x=0
-			point = points_to_show[0]
-			price_scaled = (point["close_price"] - min_price) / price_range
-			y = CHART_Y_START + CHART_HEIGHT - 1 - int(price_scaled * (CHART_HEIGHT - 1))
-			data_points.append((0, y, point["close_price"]))
-		elif num_points <= display_width:
-			# No compression needed - direct mapping within display_width
-			for i, point in enumerate(points_to_show):
-				x = int((i / (num_points - 1)) * (display_width - 1)) if num_points > 1 else 0
-				price_scaled = (point["close_price"] - min_price) / price_range
-				y = CHART_Y_START + CHART_HEIGHT - 1 - int(price_scaled * (CHART_HEIGHT - 1))
-				data_points.append((x, y, point["close_price"]))
-		else:
-			# Compression needed: preserve first and last within display_width
-			# Always show first point (open)
-			first_point = points_to_show[0]
-			price_scaled = (first_point["close_price"] - min_price) / price_range
-			y = CHART_Y_START + CHART_HEIGHT - 1 - int(price_scaled * (CHART_HEIGHT - 1))
-			data_points.append((0, y, first_point["close_price"]))
-
-			# Compress middle points within display_width
-			middle_pixels = display_width - 2  # Exclude first and last
-			middle_points = num_points - 2  # Exclude first and last
-
-			if middle_pixels > 0 and middle_points > 0:
-				for pixel_x in range(1, display_width - 1):
-					# Map pixel to data point index (inline)
-					point_idx = 1 + int((pixel_x - 1) * middle_points / middle_pixels)
-					point = points_to_show[point_idx]
-					price_scaled = (point["close_price"] - min_price) / price_range
-					y = CHART_Y_START + CHART_HEIGHT - 1 - int(price_scaled * (CHART_HEIGHT - 1))
-					data_points.append((pixel_x, y, point["close_price"]))
-
-			# Always show last point (current price)
-			last_point = points_to_show[-1]
-			price_scaled = (last_point["close_price"] - min_price) / price_range
-			y = CHART_Y_START + CHART_HEIGHT - 1 - int(price_scaled * (CHART_HEIGHT - 1))
-			data_points.append((display_width - 1, y, last_point["close_price"]))
-
-		# Draw lines connecting data points with bicolor (inline)
-		# Color each segment based on whether ending point is above/below opening price
-		for i in range(len(data_points) - 1):
-			x1, y1, price1 = data_points[i]
-			x2, y2, price2 = data_points[i + 1]
-
-			# Determine color based on ending point vs opening price (bicolor chart)
-			if opening_price is not None:
-				if price2 >= opening_price:
-					line_color = config.Colors.GREEN
-				else:
-					line_color = config.Colors.RED
+	if chart and chart['width'] > 0:
+		# One indexed bitmap for the whole chart, created once and reused (inline)
+		if state.stock_chart_bitmap is None:
+			state.stock_chart_bitmap = displayio.Bitmap(CHART_WIDTH, CHART_HEIGHT, 4)
+			state.stock_chart_palette = displayio.Palette(4)
+			state.stock_chart_palette.make_transparent(0)
+			state.stock_chart_palette[1] = config.Colors.GREEN
+			state.stock_chart_palette[2] = config.Colors.RED
+			state.stock_chart_palette[3] = config.Colors.DARK_GRAY
+			state.stock_chart_tilegrid = displayio.TileGrid(
+				state.stock_chart_bitmap,
+				pixel_shader=state.stock_chart_palette,
+				x=0,
+				y=CHART_Y_START
+			)
+
+		bitmap = state.stock_chart_bitmap
+		bitmap.fill(0)
+
+		# Columns were decimated and scaled at ingest (stocks_api.build_chart_columns)
+		ys = chart['ys']
+		above = chart['above']
+		width = chart['width']
+
+		# Dotted baseline at the opening price (drawn first, price line on top)
+		open_y = chart.get('open_y', 0xFF)
+		if open_y < CHART_HEIGHT:
+			for x in range(0, width, 2):
+				bitmap[x, open_y] = 3
+
+		# Bicolor line: each segment colored by whether its end column is above/below open
+		if width == 1:
+			bitmap[0, ys[0]] = 1 if above[0] & 1 else 2
+		for x in range(1, width):
+			color_index = 1 if above[x >> 3] & (1 << (x & 7)) else 2
+			y1 = ys[x - 1]
+			y2 = ys[x]
+			if bitmaptools is not None:
+				bitmaptools.draw_line(bitmap, x - 1, y1, x, y2, color_index)
 			else:
-				# Fallback: use overall direction color if opening price unavailable
-				line_color = pct_color
+				# Adjacent columns: half the vertical jump on each side (inline)
+				mid = (y1 + y2) // 2
+				step = 1 if y2 >= y1 else -1
+				for y in range(y1, mid + step, step):
+					bitmap[x - 1, y] = color_index
+				for y in range(mid, y2 + step, step):
+					bitmap[x, y] = color_index
 
-			line = Line(x1, y1, x2, y2, color=line_color)
-			state.main_group.append(line)
+		state.main_group.append(state.stock_chart_tilegrid)
 
 	# Add cache indicator when displaying stocks outside market hours (inline)
 	# Market hours: 9:30 AM - 4:00 PM ET on weekdays (8:30 AM - 3:00 PM local Chicago)
@@ -437,14 +388,16 @@ def show_single_stock_chart(stock_symbol, stock_quote, time_series, duration):
 			state.main_group.append(pixel)
 
 	# Display for duration (inline)
-	# Loop with button check instead of single sleep
-	start_time = time.monotonic()
-	while time.monotonic() - start_time < duration:
-		# Check for button press (inline)
-		if hardware.button_up_pressed():
-			logger.log("UP button pressed - stopping execution", config.LogLevel.INFO, area="STOCKS")
-			raise KeyboardInterrupt  # Stop code execution
-
-		time.sleep(1)
+	# Sleep until the end or a button action - 1 s steps only while a price stream needs draining
+	end_time = time.monotonic() + duration
+	while True:
+		# Drain price stream while waiting (no-op when polling)
+		stocks_stream.poll()
+
+		remaining = end_time - time.monotonic()
+		if remaining <= 0:
+			break
+		if hardware.wait(min(remaining, 1) if stocks_stream.is_live() else remaining) is not None:
+			break
 
 	logger.log("Stock chart display complete", config.LogLevel.INFO, area="STOCKS")
@@ -5,7 +5,6 @@ INLINE ARCHITECTURE - all logic inline, no helper functions
 """
 
 import time
-import gc
 from adafruit_display_text import bitmap_label
 import displayio
 
@@ -16,6 +15,8 @@ import config_manager
 import display_weekday
 import transit_api
 import hardware
+import timeline
+import connections
 
 
 # ============================================================================
@@ -50,8 +51,12 @@ def show_transit(duration, current_data=None):
 
 	logger.log(f"Starting transit display ({duration}s)", config.LogLevel.INFO, area="TRANSIT")
 
-	# Fetch initial transit data (inline)
-	transit_data = transit_api.fetch_transit_data()
+	# Fetch initial transit data (inline) - up-front fetch budget, screen not shown yet
+	state.fetch_deadline = connections.prefetch_deadline(duration)
+	try:
+		transit_data = transit_api.fetch_transit_data(timeline.get_active_transit_routes(state.rtc))
+	finally:
+		state.fetch_deadline = None
 
 	if not transit_data:
 		logger.log("No transit data available", config.LogLevel.WARNING, area="TRANSIT")
@@ -86,9 +91,10 @@ def show_transit(duration, current_data=None):
 	)
 	state.main_group.append(header_label)
 
-	# Weekday indicator (if enabled)
-	if config_manager.should_show_weekday_indicator():
-		display_weekday.add_weekday_indicator(state.rtc)
+	# Weekday indicator (if enabled) - hollow when arrivals come from the
+	# counted-down cache (offline / CTA down), always shown then
+	if config_manager.should_show_weekday_indicator() or state.transit_data_stale:
+		display_weekday.add_weekday_indicator(state.rtc, state.transit_data_stale)
 
 	# Route row Y positions (v2.5 layout)
 	row_y_positions = [9, 17, 25]  # Y positions for 3 route rows
@@ -172,11 +178,13 @@ def show_transit(duration, current_data=None):
 			last_minute = current_minute
 
 		# Refresh transit data (every 60 seconds)
-		if elapsed - last_transit_fetch > 60:
+		if elapsed - last_transit_fetch >= 60:
 			logger.log(f"Transit refresh ({elapsed:.0f}s elapsed)", config.LogLevel.DEBUG, area="TRANSIT")
 
+			# Refresh budget: short stall at most, and never past the end of the screen
+			state.fetch_deadline = min(time.monotonic() + config.Timing.SCREEN_REFRESH_BUDGET, start_time + duration - config.Timing.SCREEN_END_MARGIN)
 			try:
-				new_transit_data = transit_api.fetch_transit_data()
+				new_transit_data = transit_api.fetch_transit_data(timeline.get_active_transit_routes(state.rtc))
 
 				if new_transit_data:
 					transit_data = new_transit_data
@@ -186,9 +194,9 @@ def show_transit(duration, current_data=None):
 
 			except Exception as e:
 				logger.log(f"Transit refresh error: {e}", config.LogLevel.WARNING, area="TRANSIT")
+			finally:
+				state.fetch_deadline = None
 
-			# Cleanup after fetch (inline)
-			gc.collect()
 			last_transit_fetch = elapsed
 
 		# Update display with current transit_data (only when data changes)
@@ -286,13 +294,13 @@ def show_transit(duration, current_data=None):
 						pass
 					route_indicators[i] = None
 
-		# Check for button press (inline)
-		if hardware.button_up_pressed():
-			logger.log("UP button pressed - stopping execution", config.LogLevel.INFO, area="TRANSIT")
-			raise KeyboardInterrupt  # Stop code execution
-
-		# Sleep 1 second between updates
-		time.sleep(1)
+		# Sleep until the next minute tick, transit refresh or end of screen (inline)
+		elapsed = time.monotonic() - start_time
+		action = hardware.wait(min(duration - elapsed, 60 - state.rtc.datetime.tm_sec, last_transit_fetch + 60 - elapsed))
+		if action == hardware.ACTION_SKIP:
+			break
+		if action == hardware.ACTION_REFRESH:
+			last_transit_fetch = -60  # Refresh on the next pass
 
 	logger.log(f"Transit display complete", config.LogLevel.INFO, area="TRANSIT")
 
@@ -324,14 +332,7 @@ def show_no_transit_message(duration):
 	)
 	state.main_group.append(message_label)
 
-	# Display for duration with button check (inline)
+	# Static screen - sleep until the end or a button action (inline)
 	logger.log(f"No transit data - showing message for {duration}s", config.LogLevel.INFO, area="TRANSIT")
 
-	start_time = time.monotonic()
-	while time.monotonic() - start_time < duration:
-		# Check for button press (inline)
-		if hardware.button_up_pressed():
-			logger.log("UP button pressed - stopping execution", config.LogLevel.INFO, area="TRANSIT")
-			raise KeyboardInterrupt  # Stop code execution
-
-		time.sleep(1)
+	hardware.wait(duration)
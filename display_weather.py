@@ -26,7 +26,7 @@ def show(weather_data, duration):
 	Show current weather display.
 	
 	CRITICAL ARCHITECTURE RULE:
-	This function has ZERO helper function calls (except hardware.button_up_pressed).
+	This function has ZERO helper function calls (except hardware.wait).
 	All logic is inlined to minimize stack depth.
 	
 	Args:
@@ -56,33 +56,67 @@ def show(weather_data, duration):
 	icon_num = weather_data['icon']
 	icon_path = f"{config.Paths.WEATHER_IMAGES}/{icon_num}.bmp"
 
+	# Sprite atlas (inline): one opened bitmap serves every icon, picked by tile index
+	tile_index = 0
+	tile_size = None
+	atlas = state.image_atlases.get(config.Paths.WEATHER_IMAGES)
+	if atlas and f"{icon_num}.bmp" in atlas[3]:
+		icon_path = atlas[0]
+		tile_index = atlas[3][f"{icon_num}.bmp"]
+		tile_size = (atlas[1], atlas[2])
+
 	try:
 		# LRU Cache check (inline - no helper functions)
 		if icon_path in state.image_cache:
 			# Cache hit - move to end (mark as recently used)
 			state.image_cache_order.remove(icon_path)
 			state.image_cache_order.append(icon_path)
-			bitmap = state.image_cache[icon_path]
+			bitmap, shader, ram_bytes = state.image_cache[icon_path]
 			logger.log(f"Using cached icon: {icon_path}", config.LogLevel.DEBUG, area="DISPLAY")
 		else:
 			# Cache miss - load from SD card
 			logger.log(f"Loading icon from SD: {icon_path}", config.LogLevel.DEBUG, area="DISPLAY")
 			bitmap = displayio.OnDiskBitmap(icon_path)
+			shader = bitmap.pixel_shader
+			ram_bytes = 0
+			state.image_fs_opens += 1
+
+			# RAM tier: small indexed images decode once into RAM (no flash reads per refresh)
+			# (atlases qualify on the byte budget alone - the whole family decodes once)
+			if isinstance(shader, displayio.Palette) and (bitmap.width * bitmap.height <= state.IMAGE_RAM_MAX_PIXELS or tile_size):
+				cost = ((bitmap.width + 3) // 4) * 4 * bitmap.height + len(shader) * 4
+				if state.image_ram_bytes + cost <= state.IMAGE_RAM_BUDGET:
+					bitmap, shader = adafruit_imageload.load(icon_path, bitmap=displayio.Bitmap, palette=displayio.Palette)
+					ram_bytes = cost
+					state.image_ram_bytes += cost
+					state.image_fs_opens += 1
 
 			# Add to cache
-			state.image_cache[icon_path] = bitmap
+			state.image_cache[icon_path] = (bitmap, shader, ram_bytes)
 			state.image_cache_order.append(icon_path)
 
 			# LRU eviction: remove oldest if cache is full
 			if len(state.image_cache_order) > state.IMAGE_CACHE_MAX:
 				oldest_path = state.image_cache_order.pop(0)  # Remove oldest
+				state.image_ram_bytes -= state.image_cache[oldest_path][2]
 				del state.image_cache[oldest_path]  # Free memory
 				logger.log(f"Evicted oldest image from cache: {oldest_path}", config.LogLevel.DEBUG, area="DISPLAY")
 
-		# Create TileGrid with the bitmap's pixel shader
+		# Tier counters (reported by logger.log_image_stats)
+		if ram_bytes:
+			state.image_ram_shows += 1
+		else:
+			state.image_disk_shows += 1
+
+		# Create TileGrid with the bitmap's pixel shader (whole bitmap = single tile)
+		if tile_size is None:
+			tile_size = (bitmap.width, bitmap.height)
 		tile_grid = displayio.TileGrid(
 			bitmap,
-			pixel_shader=bitmap.pixel_shader,
+			pixel_shader=shader,
+			tile_width=tile_size[0],
+			tile_height=tile_size[1],
+			default_tile=tile_index,
 			x=0,
 			y=0
 		)
@@ -101,9 +135,11 @@ def show(weather_data, duration):
 
 	# ========================================================================
 	# WEEKDAY INDICATOR (if enabled) - AFTER weather icon so it appears on top
+	# Hollow square = cached weather past its refresh window (always shown then)
 	# ========================================================================
-	if config_manager.should_show_weekday_indicator():
-		display_weekday.add_weekday_indicator(state.rtc)
+	stale = time.monotonic() - state.last_weather_time > config.Timing.WEATHER_CACHE_MAX_AGE + config.Timing.STALE_GRACE
+	if config_manager.should_show_weekday_indicator() or stale:
+		display_weekday.add_weekday_indicator(state.rtc, stale)
 
 	# ========================================================================
 	# TEMPERATURE LABELS (v2 Logic - Correct)
@@ -275,14 +311,9 @@ def show(weather_data, duration):
 	
 	end_time = time.monotonic() + duration
 	last_minute = -1  # Track last minute to avoid unnecessary updates
-	
-	while time.monotonic() < end_time:
-		# Check button inline (import hardware only when needed to avoid circular imports)
-		import hardware
-		if hardware.button_up_pressed():
-			logger.log("UP button pressed during weather display", config.LogLevel.INFO, area="DISPLAY")
-			raise KeyboardInterrupt
-	
+	import hardware  # Imported here to avoid circular imports
+
+	while True:
 		# Update clock only when minute changes (prevents blinking)
 		now = state.rtc.datetime
 		current_minute = now.tm_min
@@ -297,8 +328,12 @@ def show(weather_data, duration):
 			new_time_text = f"{hour_12}:{current_minute:02d}"
 			time_label.text = new_time_text
 			last_minute = current_minute
-	
-		time.sleep(0.1)
 
+		# Sleep until the next minute tick or the end of the screen (DOWN ends it early)
+		remaining = end_time - time.monotonic()
+		if remaining <= 0:
+			break
+		if hardware.wait(min(remaining, 60 - now.tm_sec)) is not None:
+			break
 
 	logger.log("Weather display complete", config.LogLevel.DEBUG, area="DISPLAY")
\ No newline at end of file
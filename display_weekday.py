@@ -14,7 +14,7 @@ import logger
 # WEEKDAY INDICATOR (INLINE)
 # ============================================================================
 
-def add_weekday_indicator(rtc):
+def add_weekday_indicator(rtc, stale=False):
 	"""
 	Add 4×4 colored day-of-week indicator to top-right corner with black margin
 
@@ -26,8 +26,13 @@ def add_weekday_indicator(rtc):
 	Uses displayio.Bitmap for memory efficiency (1 object vs 25 Line objects)
 	Bottom margin extended to y=6 to clear any stray pixels
 
+	Staleness marker: with stale=True the square is drawn hollow (2×2 center
+	left black) - the screen is showing cached data older than its refresh
+	window (offline, provider down, fetch budget spent).
+
 	Args:
 		rtc: Real-time clock object for getting current day
+		stale: Draw the hollow (stale data) variant
 
 	INLINE - all color mapping and bitmap creation inline
 	"""
@@ -68,6 +73,12 @@ def add_weekday_indicator(rtc):
 		for x in range(1, 5):  # x = 1, 2, 3, 4 (skip x=0 for left margin)
 			bitmap[x, y] = 1  # Use day color
 
+	# Hollow square = stale data (inline)
+	if stale:
+		for y in range(1, 3):
+			for x in range(2, 4):
+				bitmap[x, y] = 0
+
 	# Create TileGrid at top-right corner (x=59 to account for left margin)
 	day_grid = displayio.TileGrid(
 		bitmap,
@@ -78,4 +89,4 @@ def add_weekday_indicator(rtc):
 
 	state.main_group.append(day_grid)
 
-	logger.log(f"Weekday indicator added: day={weekday}", config.LogLevel.DEBUG, area="WEEKDAY")
+	logger.log(f"Weekday indicator added: day={weekday}{' (stale)' if stale else ''}", config.LogLevel.DEBUG, area="WEEKDAY")
@@ -7,6 +7,8 @@ INLINE ARCHITECTURE - all parsing inline, no helper functions
 import config
 import state
 import logger
+import netbuf
+import snapshot
 
 
 # ============================================================================
@@ -25,13 +27,9 @@ def load_local_events():
 
 	INLINE - all parsing inline, no helpers
 	"""
-	events = {}
-
 	try:
-		with open("events.csv", "r") as f:
-			content = f.read()
-
-		return parse_event_csv_content(content, is_ephemeral=False)
+		# Read and parsed only when the file changed since the snapshot
+		return snapshot.parsed_file("events.csv", "events.csv", parse_event_csv_content)
 
 	except OSError:
 		logger.log("Local events.csv not found", config.LogLevel.DEBUG, area="EVENT")
@@ -64,6 +62,13 @@ def fetch_github_events(rtc):
 	"""
 	response = None
 
+	# Ephemeral parses drop past dates - a new day re-parses the same text
+	now = rtc.datetime
+	today = now.tm_year * 10000 + now.tm_mon * 100 + now.tm_mday
+
+	def parse(content):
+		return parse_event_csv_content(content, is_ephemeral=True, rtc=rtc)
+
 	# Try GitHub first (if configured)
 	if config.Env.GITHUB_EVENTS_URL:
 		try:
@@ -74,11 +79,8 @@ def fetch_github_events(rtc):
 
 			# Check status
 			if response.status_code == 200:
-				# Get text content
-				content = response.text
-
-				# Parse content (inline)
-				events = parse_event_csv_content(content, is_ephemeral=True, rtc=rtc)
+				# Parse straight from the receive buffer, only when it changed since the snapshot
+				events = snapshot.parsed("github:ephemeral_events.csv", netbuf.read(response, spill=True), parse, salt=today)
 
 				if events:
 					total_events = sum(len(event_list) for event_list in events.values())
@@ -101,10 +103,7 @@ def fetch_github_events(rtc):
 	try:
 		logger.log("Trying local ephemeral_events.csv...", config.LogLevel.DEBUG, area="EVENT")
 
-		with open("ephemeral_events.csv", "r") as f:
-			content = f.read()
-
-		events = parse_event_csv_content(content, is_ephemeral=True, rtc=rtc)
+		events = snapshot.parsed_file("ephemeral_events.csv", "ephemeral_events.csv", parse, salt=today)
 
 		if events:
 			total_events = sum(len(event_list) for event_list in events.values())
@@ -132,7 +131,7 @@ def parse_event_csv_content(csv_content, is_ephemeral=False, rtc=None):
 	Parse event CSV content directly from string (no file I/O)
 
 	Args:
-		csv_content: CSV string content
+		csv_content: CSV text (str) or body view from netbuf.read
 		is_ephemeral: True for GitHub (YYYY-MM-DD), False for local (MM-DD)
 		rtc: Real-time clock (required for ephemeral to skip past dates)
 
@@ -153,9 +152,7 @@ def parse_event_csv_content(csv_content, is_ephemeral=False, rtc=None):
 		current_date = (now.tm_year, now.tm_mon, now.tm_mday)
 
 	try:
-		lines = csv_content.strip().split('\n')
-
-		for line in lines:
+		for line in netbuf.lines(csv_content):
 			line = line.strip()
 
 			# Skip empty lines and comments
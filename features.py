@@ -0,0 +1,90 @@
+"""
+Pantallita 3.0 - Feature Module Loader
+Imports feature modules on first use, driven by the config_manager toggles
+Optionally drops them again when a feature is disabled at runtime
+INLINE ARCHITECTURE - one table, one sync pass, no helper chains
+"""
+
+import sys
+import gc
+import time
+import config
+import state
+import logger
+import config_manager
+
+# (feature, config_manager toggle, modules in import order)
+# Only the last module is checked to decide whether a feature is loaded.
+FEATURES = (
+	("stocks", "should_show_stocks", ("stocks_api", "stocks_planner", "market_calendar", "stocks_stream", "display_stocks")),
+	("transit", "should_show_transit", ("transit_api", "display_transit")),
+	("events", "should_show_events", ("event_loader", "display_events")),
+	("schedules", "should_show_schedules", ("schedule_loader", "display_schedules")),
+)
+
+
+# ============================================================================
+# LOAD / UNLOAD (INLINE)
+# ============================================================================
+
+def sync(namespace):
+	"""
+	Bring the loaded feature modules in line with the current config.
+
+	Enabled feature: its modules are imported and bound into namespace
+	(code.py passes globals(), where they start as None).
+
+	Disabled feature with unload_disabled_modules on: names reset to None
+	and the modules removed from sys.modules, so their bytecode and module
+	globals are freed on the next collection. With the setting off a loaded
+	module simply stays resident (call sites are gated by the same toggles).
+
+	Args:
+		namespace: dict receiving the module objects (code.py globals())
+
+	Returns:
+		list: Features loaded by this call (callers load their data)
+	"""
+	newly_loaded = []
+	unloaded = []
+
+	for feature, toggle, modules in FEATURES:
+		enabled = getattr(config_manager, toggle)()
+		loaded = namespace.get(modules[-1]) is not None
+
+		if enabled and not loaded:
+			start = time.monotonic()
+			mem_before = gc.mem_free()
+			for name in modules:
+				namespace[name] = __import__(name)
+			import_ms = int((time.monotonic() - start) * 1000)
+			state.feature_import_ms[feature] = import_ms
+			newly_loaded.append(feature)
+			logger.log(f"Loaded {feature} modules in {import_ms} ms ({(mem_before - gc.mem_free()) // 1024}KB)", config.LogLevel.DEBUG, area="MAIN")
+
+		elif not enabled and loaded and config_manager.get_unload_disabled_modules():
+			# Close the price stream before its module goes away
+			if feature == "stocks" and namespace["stocks_stream"].is_live():
+				namespace["stocks_stream"].disconnect("stocks disabled")
+			for name in modules:
+				namespace[name] = None
+				if name in sys.modules:
+					del sys.modules[name]
+			state.feature_import_ms.pop(feature, None)
+			unloaded.append(feature)
+
+	if unloaded:
+		mem_before = gc.mem_free()
+		gc.collect()
+		logger.log(f"Unloaded {', '.join(unloaded)} modules ({(gc.mem_free() - mem_before) // 1024}KB freed)", area="MAIN")
+
+	return newly_loaded
+
+
+def loaded_features():
+	"""Names of the features whose modules are currently imported."""
+	names = []
+	for feature, toggle, modules in FEATURES:
+		if modules[-1] in sys.modules:
+			names.append(feature)
+	return names
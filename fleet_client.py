@@ -0,0 +1,144 @@
+"""
+Pantallita 3.0 - Fleet Digest Client Module
+Optional client mode for tools/fleet_server.py: one small JSON digest per
+device replaces the AccuWeather, Twelve Data and CTA calls
+INLINE ARCHITECTURE - digest sections already have the weather_api/stocks_api/transit_api shapes
+"""
+
+import time
+import config
+import state
+import logger
+import connections
+import netbuf
+
+
+def is_enabled():
+	"""True when settings.toml points the device at a fleet aggregator."""
+	return bool(config.Env.FLEET_DIGEST_URL)
+
+
+# ============================================================================
+# DIGEST FETCH (INLINE)
+# ============================================================================
+
+def refresh():
+	"""
+	Fetch the digest when it is older than Timing.FLEET_DIGEST_INTERVAL
+	(or predates a DOWN long-press). Failures keep the previous digest.
+
+	Returns:
+		dict: Current digest, or None if none was ever fetched
+	"""
+	age = time.monotonic() - state.fleet_digest_time
+	if state.fleet_digest and age < config.Timing.FLEET_DIGEST_INTERVAL and state.fleet_digest_time > state.force_refresh_at:
+		return state.fleet_digest
+
+	# Socket timeout from the remaining fetch budget (no time left = use last digest)
+	timeout = connections.request_timeout()
+	if timeout is None:
+		return state.fleet_digest
+
+	url = f"{config.Env.FLEET_DIGEST_URL}?device={config.Env.FLEET_DEVICE_ID}"
+	response = None
+
+	try:
+		response = state.session.get(url, timeout=timeout)
+
+		if response.status_code != 200:
+			logger.log(f"Fleet digest error: HTTP {response.status_code}", config.LogLevel.ERROR, area="FLEET")
+			state.fleet_fetch_errors += 1
+			return state.fleet_digest
+
+		digest = netbuf.load_json(response)
+		state.fleet_digest = digest
+		state.fleet_digest_time = time.monotonic()
+		state.fleet_fetch_count += 1
+		logger.log(f"Fleet digest #{state.fleet_fetch_count}: {', '.join(k for k in digest if k not in ('v', 'age'))}", config.LogLevel.DEBUG, area="FLEET")
+		return digest
+
+	except Exception as e:
+		logger.log(f"Fleet digest fetch failed: {e}", config.LogLevel.ERROR, area="FLEET")
+		state.fleet_fetch_errors += 1
+		return state.fleet_digest
+
+	finally:
+		if response:
+			try:
+				response.close()
+			except:
+				pass
+
+
+def fetched_at(section):
+	"""Monotonic time the aggregator fetched a digest section upstream."""
+	return state.fleet_digest_time - state.fleet_digest.get("age", {}).get(section, 0)
+
+
+# ============================================================================
+# PROVIDER REPLACEMENTS (same returns as the *_api fetch functions)
+# ============================================================================
+
+def current():
+	"""weather_api.fetch_current() from the digest (keeps the cache fed for staleness)."""
+	digest = refresh()
+	if digest and digest.get("weather"):
+		state.last_weather_data = digest["weather"]
+		state.last_weather_time = fetched_at("weather")
+	return state.last_weather_data
+
+
+def forecast():
+	"""weather_api.fetch_forecast() from the digest."""
+	digest = refresh()
+	if digest and digest.get("forecast"):
+		state.last_forecast_data = digest["forecast"]
+		state.last_forecast_time = fetched_at("forecast")
+	return state.last_forecast_data
+
+
+def quotes(symbols):
+	"""stocks_api.fetch_stock_quotes() from the digest (symbols the aggregator does not carry are left out)."""
+	digest = refresh()
+	if not digest:
+		return {}
+	available = digest.get("quotes", {})
+	result = {}
+	for symbol in symbols:
+		if symbol in available:
+			result[symbol] = available[symbol]
+	return result
+
+
+def series(symbol):
+	"""stocks_api.fetch_intraday_time_series() from the digest (always the full day so far)."""
+	digest = refresh()
+	if not digest:
+		return []
+	return digest.get("series", {}).get(symbol, [])
+
+
+def arrivals(route_config):
+	"""
+	transit_api.fetch_*_arrivals() from the digest, counted down by the time
+	since the aggregator fetched them (stale marker past the refresh window).
+	"""
+	digest = refresh()
+	if not digest:
+		return []
+
+	cached = digest.get("transit", {}).get(route_config['label'])
+	if not cached:
+		return []
+
+	age = time.monotonic() - fetched_at("transit")
+	if age > config.Timing.TRANSIT_UPDATE_INTERVAL + config.Timing.STALE_GRACE:
+		state.transit_data_stale = True
+
+	age_minutes = int(age // 60)
+	result = []
+	for arrival in cached:
+		minutes = arrival['minutes'] - age_minutes
+		if minutes >= route_config['min_time']:
+			result.append({'destination': arrival['destination'], 'minutes': minutes})
+	return result
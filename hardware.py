@@ -5,22 +5,32 @@ Hardware initialization and management
 
 import board
 import displayio
-import digitalio
+import keypad
 import framebufferio
 import rgbmatrix
 import busio
 import wifi
-import socketpool
-import ssl
-import adafruit_requests
 import adafruit_ds3231
 import adafruit_ntp
 from adafruit_bitmap_font import bitmap_font
 import time
+import gc
+import random
 
 import config
 import state
 import logger
+import connections
+import netbuf
+import heap
+
+# Key numbers (pin order in init_buttons)
+KEY_UP = 0
+KEY_DOWN = 1
+
+# Button actions returned by poll_buttons / wait
+ACTION_SKIP = "skip"
+ACTION_REFRESH = "refresh"
 
 # ============================================================================
 # DISPLAY INITIALIZATION
@@ -97,38 +107,112 @@ def init_rtc():
 # ============================================================================
 
 def init_buttons():
-	"""Initialize MatrixPortal S3 built-in buttons"""
+	"""
+	Initialize MatrixPortal S3 built-in buttons as a keypad event queue.
+	keypad scans and debounces in the background, so presses made while
+	a dwell loop sleeps are queued instead of missed.
+	"""
 	logger.log("Initializing buttons...", config.LogLevel.DEBUG, area="HW")
 
 	try:
-		# UP button (stop)
-		state.button_up = digitalio.DigitalInOut(board.BUTTON_UP)
-		state.button_up.switch_to_input(pull=digitalio.Pull.UP)
+		# Key numbers follow the pin order: KEY_UP, KEY_DOWN (both active LOW)
+		state.keys = keypad.Keys((board.BUTTON_UP, board.BUTTON_DOWN), value_when_pressed=False, pull=True)
+		state.key_event = keypad.Event()  # Reused by get_into (no allocation per event)
+		state.key_down_since = None
 
-		# DOWN button (reserved)
-		state.button_down = digitalio.DigitalInOut(board.BUTTON_DOWN)
-		state.button_down.switch_to_input(pull=digitalio.Pull.UP)
-
-		logger.log("Buttons initialized - UP=stop, DOWN=reserved", config.LogLevel.DEBUG, area="HW")
+		logger.log("Buttons initialized - UP=stop, DOWN=next screen (hold=refresh)", config.LogLevel.DEBUG, area="HW")
 		return True
 
 	except Exception as e:
 		logger.log(f"Button initialization failed: {e}", config.LogLevel.WARNING, area="HW")
-		state.button_up = None
-		state.button_down = None
+		state.keys = None
 		return False
 
-def button_up_pressed():
-	"""Check if UP button is pressed (active LOW)"""
-	if state.button_up:
-		return not state.button_up.value
-	return False
+def poll_buttons():
+	"""
+	Drain the key event queue (non-blocking).
 
-def button_down_pressed():
-	"""Check if DOWN button is pressed (active LOW)"""
-	if state.button_down:
-		return not state.button_down.value
-	return False
+	- UP pressed: raises KeyboardInterrupt (stop)
+	- DOWN released before LONG_PRESS: ACTION_SKIP (next screen)
+	- DOWN held for LONG_PRESS: ACTION_REFRESH (fires while still held,
+	  cached data is marked stale via state.force_refresh_at)
+
+	Returns:
+		str: ACTION_SKIP, ACTION_REFRESH or None
+	"""
+	keys = state.keys
+	if keys is None:
+		return None
+
+	event = state.key_event
+	while keys.events.get_into(event):
+		if event.key_number == KEY_UP and event.pressed:
+			logger.log("UP button pressed - stopping execution", config.LogLevel.INFO, area="HW")
+			raise KeyboardInterrupt
+		if event.key_number == KEY_DOWN:
+			if event.pressed:
+				state.key_down_since = time.monotonic()
+			elif state.key_down_since is not None:
+				# Short press (a long press already cleared key_down_since)
+				state.key_down_since = None
+				logger.log("DOWN button - skip to next screen", config.LogLevel.INFO, area="HW")
+				return ACTION_SKIP
+
+	if state.key_down_since is not None and time.monotonic() - state.key_down_since >= config.Timing.LONG_PRESS:
+		state.key_down_since = None
+		state.force_refresh_at = time.monotonic()
+		logger.log("DOWN button held - forcing refresh", config.LogLevel.INFO, area="HW")
+		return ACTION_REFRESH
+
+	return None
+
+def wait(seconds):
+	"""
+	Dwell for up to seconds, returning early on a button action.
+
+	Dwell loops call this with the time until their next UI change (minute
+	tick, data refresh, end of screen) instead of polling in 0.1 s / 1 s
+	steps. CircuitPython cannot block on the key queue, so the sleep is cut
+	into slices that only check the queue: Timing.KEY_IDLE_POLL_INTERVAL
+	(keypad queues presses meanwhile), Timing.KEY_POLL_INTERVAL while DOWN
+	is held so a long press fires on time. The dwell ends at the same time
+	whether or not an idle collection ran at its start.
+
+	Returns:
+		str: ACTION_SKIP / ACTION_REFRESH, or None when the time ran out
+	"""
+	# Render benchmark: a screen's first dwell means it is fully built - record
+	# the time and heap it took since its probe (code.py / display_frame.show)
+	if state.render_probe is not None:
+		name, started, mem_free = state.render_probe
+		state.render_probe = None
+		totals = state.render_bench.get(name)
+		if totals is None:
+			totals = [0, 0, 0]
+			state.render_bench[name] = totals
+		totals[0] += 1
+		totals[1] += time.monotonic() - started
+		totals[2] += mem_free - gc.mem_free()
+
+	end_time = time.monotonic() + seconds
+
+	# Nothing else runs while the screen dwells - collect here, not mid-fetch
+	heap.idle(seconds)
+
+	while True:
+		action = poll_buttons()
+		if action is not None:
+			return action
+		remaining = end_time - time.monotonic()
+		if remaining <= 0:
+			return None
+		if state.keys is None:
+			time.sleep(remaining)
+			return None
+		if state.key_down_since is not None:
+			time.sleep(min(remaining, config.Timing.KEY_POLL_INTERVAL))
+		else:
+			time.sleep(min(remaining, config.Timing.KEY_IDLE_POLL_INTERVAL))
 
 # ============================================================================
 # WIFI INITIALIZATION
@@ -143,19 +227,16 @@ def connect_wifi():
 		raise ValueError("Missing WiFi credentials")
 
 	try:
-		# Connect to WiFi
-		wifi.radio.connect(config.Env.WIFI_SSID, config.Env.WIFI_PASSWORD)
-		logger.log(f"WiFi connected - IP: {wifi.radio.ipv4_address}", area="HW")
-
-		# Create socket pool
-		state.socket_pool = socketpool.SocketPool(wifi.radio)
+		# Connect to WiFi (the supervisor may have associated already in the
+		# background from CIRCUITPY_WIFI_SSID while local boot stages ran)
+		if wifi.radio.connected and wifi.radio.ipv4_address:
+			logger.log(f"WiFi already up - IP: {wifi.radio.ipv4_address}", area="HW")
+		else:
+			wifi.radio.connect(config.Env.WIFI_SSID, config.Env.WIFI_PASSWORD)
+			logger.log(f"WiFi connected - IP: {wifi.radio.ipv4_address}", area="HW")
 
-		# Create HTTP session
-		state.session = adafruit_requests.Session(
-			state.socket_pool,
-			ssl.create_default_context()
-		)
-		logger.log("HTTP session created", config.LogLevel.DEBUG, area="HW")
+		# Socket pool + HTTP session (keep-alive pooling, DNS cache)
+		connections.build_session()
 
 		return True
 
@@ -167,13 +248,52 @@ def is_wifi_connected():
 	"""Check if WiFi is connected"""
 	return wifi.radio.connected
 
-def reconnect_wifi():
-	"""Attempt to reconnect WiFi"""
-	logger.log("Attempting WiFi reconnect...", area="HW")
+def maintain_wifi():
+	"""
+	Keep WiFi up without blocking the rotation (called once per cycle).
+
+	Connected: nothing to do; after an outage the HTTP session is rebuilt
+	(the supervisor may have re-associated on its own).
+	Disconnected: enter offline mode once (close pooled sockets - screens
+	keep rotating on cached data), then try one bounded reconnect per
+	backoff step (WIFI_RETRY_MIN doubling to WIFI_RETRY_MAX, +/-20% jitter).
+
+	Returns:
+		bool: True if online
+	"""
+	now_time = time.monotonic()
+
+	if wifi.radio.connected and wifi.radio.ipv4_address:
+		if state.wifi_offline or state.session is None:
+			connections.build_session()
+			state.wifi_reconnects += 1
+			logger.log(f"WiFi back after {int(now_time - state.wifi_offline_since)}s - IP: {wifi.radio.ipv4_address}", area="HW")
+			state.wifi_offline = False
+		return True
+
+	if not state.wifi_offline:
+		state.wifi_offline = True
+		state.wifi_offline_since = now_time
+		state.wifi_retry_delay = config.Timing.WIFI_RETRY_MIN
+		state.wifi_next_attempt = now_time  # First attempt right away
+		connections.teardown("wifi lost")
+		logger.log("WiFi lost - offline mode, rotating cached data", config.LogLevel.WARNING, area="HW")
+
+	if now_time < state.wifi_next_attempt:
+		return False
+
 	try:
-		return connect_wifi()
+		wifi.radio.connect(config.Env.WIFI_SSID, config.Env.WIFI_PASSWORD, timeout=config.Timing.WIFI_CONNECT_TIMEOUT)
+		connections.build_session()
+		state.wifi_reconnects += 1
+		logger.log(f"WiFi reconnected after {int(time.monotonic() - state.wifi_offline_since)}s - IP: {wifi.radio.ipv4_address}", area="HW")
+		state.wifi_offline = False
+		return True
 	except Exception as e:
-		logger.log(f"WiFi reconnect failed: {e}", config.LogLevel.ERROR, area="HW")
+		delay = state.wifi_retry_delay * random.uniform(0.8, 1.2)
+		state.wifi_next_attempt = time.monotonic() + delay
+		state.wifi_retry_delay = min(state.wifi_retry_delay * 2, config.Timing.WIFI_RETRY_MAX)
+		logger.log(f"WiFi reconnect failed: {e} - next attempt in {int(delay)}s", config.LogLevel.WARNING, area="HW")
 		return False
 
 # ============================================================================
@@ -194,7 +314,7 @@ def get_timezone_offset():
 		response = state.session.get(url, timeout=10)
 
 		if response.status_code == 200:
-			data = response.json()
+			data = netbuf.load_json(response)
 
 			# Get UTC offset in seconds, convert to hours
 			offset_seconds = data.get("raw_offset", 0)
@@ -238,10 +358,6 @@ def sync_time(rtc, timezone_offset=None):
 		return False
 
 	try:
-		# Give network time to settle (socket pool needs to be ready)
-		import time as time_module
-		time_module.sleep(2)
-
 		# Get timezone offset (use provided or fallback to worldtimeapi.org)
 		if timezone_offset is not None:
 			tz_offset = timezone_offset
@@ -252,7 +368,17 @@ def sync_time(rtc, timezone_offset=None):
 
 		# Get time from NTP with timezone offset
 		ntp = adafruit_ntp.NTP(state.socket_pool, tz_offset=tz_offset)
-		rtc.datetime = ntp.datetime
+
+		# Short retries instead of a fixed settle delay (the pool is usually ready at once)
+		for attempt in range(config.Timing.NTP_ATTEMPTS):
+			try:
+				rtc.datetime = ntp.datetime
+				break
+			except OSError as e:
+				if attempt == config.Timing.NTP_ATTEMPTS - 1:
+					raise
+				logger.log(f"NTP attempt {attempt + 1} failed: {e} - retrying", config.LogLevel.DEBUG, area="HW")
+				time.sleep(config.Timing.NTP_RETRY_DELAY)
 
 		# Format for display
 		now = rtc.datetime
@@ -0,0 +1,195 @@
+"""
+Pantallita 3.0 - Heap Manager Module
+Schedules garbage collection instead of ad hoc gc.collect() calls: collects
+during idle dwell (hardware.wait) and right before the large-allocation
+phases (HTTP fetches, screen builds), tracks the largest free block, and
+releases caches (images, font glyphs, intraday bars) when the heap is low
+or fragmented, so a forecast JSON parse does not meet a heap full of garbage
+INLINE ARCHITECTURE - module functions over state counters, no helper chains
+"""
+
+import gc
+import time
+import config
+import state
+import logger
+
+
+# ============================================================================
+# COLLECTION (INLINE)
+# ============================================================================
+
+def collect(reason):
+	"""Collect now and record the pause (state.heap_* counters, DEBUG log)."""
+	start_ns = time.monotonic_ns()
+	gc.collect()
+	pause_ms = (time.monotonic_ns() - start_ns) / 1000000
+
+	state.heap_collections += 1
+	state.heap_pause_ms += pause_ms
+	if pause_ms > state.heap_pause_max_ms:
+		state.heap_pause_max_ms = pause_ms
+	state.heap_alloc_at_collect = gc.mem_alloc()
+
+	logger.log(f"GC ({reason}): {pause_ms:.1f}ms, {gc.mem_free() // 1024}KB free", config.LogLevel.DEBUG, area="MEM")
+
+
+def idle(seconds):
+	"""
+	Start of a dwell (hardware.wait): collect while nothing is happening,
+	when the dwell is long enough to hide the pause and enough was allocated
+	since the last collection. Probes fragmentation every PROBE_INTERVAL.
+	"""
+	if seconds < config.Memory.IDLE_MIN_DWELL:
+		return
+	if gc.mem_alloc() - state.heap_alloc_at_collect < config.Memory.IDLE_ALLOC_THRESHOLD:
+		return
+
+	collect("idle")
+	state.heap_idle_collections += 1
+
+	if time.monotonic() - state.heap_probe_time >= config.Memory.PROBE_INTERVAL:
+		check()
+
+
+def prepare(phase):
+	"""
+	Before a large-allocation phase (fetch + JSON parse, screen build):
+	collect if garbage piled up since the last collection, and release
+	caches if the free heap is still below Memory.RESERVE afterwards.
+
+	Args:
+		phase: "fetch", "screen", ... (log text)
+	"""
+	if gc.mem_alloc() - state.heap_alloc_at_collect < config.Memory.PREPARE_ALLOC_THRESHOLD and gc.mem_free() >= config.Memory.RESERVE:
+		return
+
+	collect(phase)
+	if gc.mem_free() < config.Memory.RESERVE:
+		release(f"{gc.mem_free() // 1024}KB free before {phase}")
+
+
+# ============================================================================
+# FRAGMENTATION GUARD (INLINE)
+# ============================================================================
+
+def largest_free_block():
+	"""
+	Largest block that can be allocated right now, in bytes, up to
+	2 x Memory.MIN_LARGEST_BLOCK - a block that size is healthy, the true
+	maximum is not worth the probe.
+
+	CircuitPython only reports the free total; a fragmented heap can have
+	plenty free but no run long enough for a response body. Tries the cap
+	first, and bisects below it only when that fails (call after a
+	collection). Every try zero-fills its block and a failed one forces a
+	collection, so the probe counts as a pause in the GC stats.
+	"""
+	start_ns = time.monotonic_ns()
+	cap = min(gc.mem_free(), config.Memory.MIN_LARGEST_BLOCK * 2)
+	try:
+		bytearray(cap)
+		low = cap
+	except MemoryError:
+		low = 0
+		high = cap
+		while high - low > config.Memory.PROBE_RESOLUTION:
+			size = (low + high) // 2
+			try:
+				bytearray(size)
+				low = size
+			except MemoryError:
+				high = size
+
+	pause_ms = (time.monotonic_ns() - start_ns) / 1000000
+	state.heap_probes += 1
+	state.heap_pause_ms += pause_ms
+	if pause_ms > state.heap_pause_max_ms:
+		state.heap_pause_max_ms = pause_ms
+	return low
+
+
+def check():
+	"""Probe the largest free block; release caches when it is too small or too small a share of the free heap."""
+	state.heap_probe_time = time.monotonic()
+	free = gc.mem_free()
+	block = largest_free_block()
+	state.heap_largest_block = block
+	if state.heap_min_block is None or block < state.heap_min_block:
+		state.heap_min_block = block
+
+	if block >= config.Memory.MIN_LARGEST_BLOCK * 2:
+		logger.log(f"Heap: largest block at least {block // 1024}KB of {free // 1024}KB free", config.LogLevel.DEBUG, area="MEM")
+		return
+
+	fragmentation = 100 - block * 100 // free if free else 100
+	logger.log(f"Heap: largest block {block // 1024}KB of {free // 1024}KB free ({fragmentation}% fragmented)", config.LogLevel.DEBUG, area="MEM")
+
+	if block < config.Memory.MIN_LARGEST_BLOCK or fragmentation > config.Memory.FRAGMENTATION_LIMIT:
+		release(f"largest block {block // 1024}KB, {fragmentation}% fragmented")
+
+
+def release(reason):
+	"""
+	Drop rebuildable caches and collect, cheapest to rebuild first: decoded
+	images (reload from flash), font glyphs (reload from the BDF on demand),
+	then intraday bars (refetched when a chart shows next).
+	Stops as soon as the heap is back above the thresholds.
+	"""
+	released = []
+
+	# Image cache (on-screen TileGrids keep their own bitmap references)
+	if state.image_cache:
+		released.append(f"{len(state.image_cache)} images")
+		state.image_cache.clear()
+		state.image_cache_order.clear()
+		state.image_ram_bytes = 0
+
+	# Font glyph caches (adafruit_bitmap_font GlyphCache.collect)
+	for font in (state.font_large, state.font_small):
+		if font is not None and hasattr(font, "collect"):
+			font.collect()
+	released.append("glyphs")
+	collect("release")
+
+	free = gc.mem_free()
+	if free < config.Memory.RESERVE or largest_free_block() < config.Memory.MIN_LARGEST_BLOCK:
+		# Intraday bars (a chart on screen keeps its own bitmap)
+		if state.cached_intraday_data:
+			released.append(f"intraday {', '.join(state.cached_intraday_data)}")
+			state.cached_intraday_data.clear()
+			collect("release")
+
+	state.heap_releases += 1
+	block = largest_free_block()
+	state.heap_largest_block = block
+	logger.log(f"Heap low ({reason}) - released {', '.join(released)}: {gc.mem_free() // 1024}KB free, largest block {block // 1024}KB", config.LogLevel.WARNING, area="MEM")
+
+
+# ============================================================================
+# STATISTICS (INLINE)
+# ============================================================================
+
+def log_stats():
+	"""
+	Log collections and largest-block probes since the last report with
+	their pause times, and the largest free block seen (capped at
+	2 x Memory.MIN_LARGEST_BLOCK).
+
+	Shows: GC: 14 collections (9 idle), 1 probes, pause avg 6.2ms max 11.0ms, largest block 64KB (min 60KB), 0 releases
+	"""
+	pauses = state.heap_collections + state.heap_probes
+	if pauses == 0:
+		return
+
+	block_text = "not probed"
+	if state.heap_min_block is not None:
+		block_text = f"{state.heap_largest_block // 1024}KB (min {state.heap_min_block // 1024}KB)"
+
+	logger.log(f"GC: {state.heap_collections} collections ({state.heap_idle_collections} idle), {state.heap_probes} probes, pause avg {state.heap_pause_ms / pauses:.1f}ms max {state.heap_pause_max_ms:.1f}ms, largest block {block_text}, {state.heap_releases} releases", config.LogLevel.INFO, area="MEM")
+
+	state.heap_collections = 0
+	state.heap_idle_collections = 0
+	state.heap_probes = 0
+	state.heap_pause_ms = 0
+	state.heap_pause_max_ms = 0
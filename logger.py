@@ -143,3 +143,64 @@ def log_cycle_start(cycle_number, level=config.LogLevel.INFO, area="MAIN"):
 		return
 
 	log(f"### CYCLE {cycle_number} ###", level, area)
+
+
+def log_image_stats(level=config.LogLevel.INFO):
+	"""
+	Log image tier usage per minute and a timed full redraw of the current screen.
+
+	INLINE implementation - called from main loop every N cycles.
+	Shows: Images: 0.4 opens/min, 1.2 disk / 3.1 RAM shown/min, RAM 2840/16384B, redraw 18ms
+	"""
+	if level > config.CURRENT_LOG_LEVEL:
+		return
+
+	import time
+
+	now_time = time.monotonic()
+	minutes = (now_time - state.image_stats_start) / 60 if state.image_stats_start else 0
+	if minutes <= 0:
+		state.image_stats_start = now_time
+		return
+
+	# Timed full redraw: hiding and showing the root group marks the whole
+	# screen dirty, so every on-screen OnDiskBitmap is re-read from flash
+	redraw_ms = -1
+	if state.display and state.main_group:
+		try:
+			state.display.auto_refresh = False
+			state.main_group.hidden = True
+			state.main_group.hidden = False
+			start_ns = time.monotonic_ns()
+			state.display.refresh()
+			redraw_ms = (time.monotonic_ns() - start_ns) // 1000000
+		except Exception:
+			pass
+		finally:
+			state.display.auto_refresh = True
+
+	log(f"Images: {state.image_fs_opens / minutes:.1f} opens/min, {state.image_disk_shows / minutes:.1f} disk / {state.image_ram_shows / minutes:.1f} RAM shown/min, RAM {state.image_ram_bytes}/{state.IMAGE_RAM_BUDGET}B, redraw {redraw_ms}ms", level, "DISPLAY")
+
+	state.image_fs_opens = 0
+	state.image_disk_shows = 0
+	state.image_ram_shows = 0
+	state.image_stats_start = now_time
+
+
+def log_render_stats(level=config.LogLevel.INFO):
+	"""
+	Log average time to screen and heap used per renderer (server frame vs native).
+
+	INLINE implementation - called from main loop every N cycles.
+	Shows: Render: transit frame 310ms 2210B x4, transit native 1840ms 9650B x2
+	"""
+	if level > config.CURRENT_LOG_LEVEL or not state.render_bench:
+		return
+
+	parts = []
+	for name in sorted(state.render_bench):
+		count, seconds, heap = state.render_bench[name]
+		parts.append(f"{name} {seconds * 1000 / count:.0f}ms {heap // count}B x{count}")
+	log(f"Render: {', '.join(parts)}", level, "DISPLAY")
+
+	state.render_bench = {}
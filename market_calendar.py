@@ -0,0 +1,209 @@
+"""
+Pantallita 3.0 - Market Calendar Module
+NYSE session table per year (holidays, early closes) plus US DST rules for ET
+Sets today's local market open / close / grace minutes in state
+INLINE ARCHITECTURE - rule tables built once per year, lookups are dict reads
+"""
+
+import config
+import state
+import logger
+
+# Regular session (minutes since midnight, Eastern Time)
+OPEN_ET = 570          # 9:30 AM
+CLOSE_ET = 960         # 4:00 PM
+EARLY_CLOSE_ET = 780   # 1:00 PM
+
+# Eastern Time UTC offsets
+ET_STANDARD_OFFSET = -5
+ET_DAYLIGHT_OFFSET = -4
+
+
+# ============================================================================
+# DATE MATH (INLINE)
+# ============================================================================
+
+def weekday(year, month, day):
+	"""
+	Day of week without datetime (0=Monday, 6=Sunday, matches tm_wday).
+	Sakamoto's method.
+	"""
+	offsets = (0, 3, 2, 5, 0, 3, 5, 1, 4, 6, 2, 4)
+	if month < 3:
+		year -= 1
+	sunday_based = (year + year // 4 - year // 100 + year // 400 + offsets[month - 1] + day) % 7
+	return (sunday_based + 6) % 7
+
+
+def nth_weekday(year, month, target_weekday, n):
+	"""
+	Day of month of the nth target_weekday (n=-1 = last one in the month).
+	"""
+	if n > 0:
+		first = weekday(year, month, 1)
+		return 1 + (target_weekday - first) % 7 + (n - 1) * 7
+
+	days_in_month = (31, 29 if year % 4 == 0 and (year % 100 != 0 or year % 400 == 0) else 28,
+	                 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)[month - 1]
+	last = weekday(year, month, days_in_month)
+	return days_in_month - (last - target_weekday) % 7
+
+
+# ============================================================================
+# YEAR TABLE (INLINE)
+# ============================================================================
+
+def build_year(year):
+	"""
+	Build the NYSE exception table and ET DST dates for a year.
+
+	state.market_calendar_table maps (month, day) -> close minute ET:
+	- 0 = exchange closed (holiday)
+	- EARLY_CLOSE_ET = early close (1:00 PM ET)
+	Days not in the table are regular sessions on weekdays.
+
+	Rules (NYSE):
+	- Fixed holidays on Saturday move to Friday, on Sunday to Monday
+	  (New Year's Day on Saturday is not observed on Dec 31)
+	- Early close: July 3 when July 4 is Tue-Fri, day after Thanksgiving,
+	  Christmas Eve when it is a Mon-Thu
+	"""
+	table = {}
+
+	# Fixed-date holidays with weekend observance (inline)
+	fixed = [(1, 1), (7, 4), (12, 25)]
+	if year >= 2022:
+		fixed.append((6, 19))  # Juneteenth
+	for month, day in fixed:
+		wd = weekday(year, month, day)
+		if wd == 5:
+			if month != 1:
+				table[(month, day - 1)] = 0
+		elif wd == 6:
+			table[(month, day + 1)] = 0
+		else:
+			table[(month, day)] = 0
+
+	# Floating Monday/Thursday holidays
+	table[(1, nth_weekday(year, 1, 0, 3))] = 0    # Martin Luther King Jr. Day
+	table[(2, nth_weekday(year, 2, 0, 3))] = 0    # Washington's Birthday
+	table[(5, nth_weekday(year, 5, 0, -1))] = 0   # Memorial Day
+	table[(9, nth_weekday(year, 9, 0, 1))] = 0    # Labor Day
+	thanksgiving = nth_weekday(year, 11, 3, 4)
+	table[(11, thanksgiving)] = 0
+
+	# Good Friday: Easter Sunday (anonymous Gregorian computus) minus 2 days
+	a = year % 19
+	b = year // 100
+	c = year % 100
+	d = b // 4
+	e = b % 4
+	f = (b + 8) // 25
+	g = (b - f + 1) // 3
+	h = (19 * a + b - d - g + 15) % 30
+	i = c // 4
+	k = c % 4
+	l = (32 + 2 * e + 2 * i - h - k) % 7
+	m = (a + 11 * h + 22 * l) // 451
+	easter_month = (h + l - 7 * m + 114) // 31
+	easter_day = ((h + l - 7 * m + 114) % 31) + 1
+	if easter_day > 2:
+		table[(easter_month, easter_day - 2)] = 0
+	else:
+		table[(3, 31 + easter_day - 2)] = 0  # Easter on April 1/2
+
+	# Early closes (only when the day is a regular weekday session)
+	if weekday(year, 7, 4) in (1, 2, 3, 4):
+		table[(7, 3)] = EARLY_CLOSE_ET
+	table[(11, thanksgiving + 1)] = EARLY_CLOSE_ET
+	if weekday(year, 12, 24) <= 3 and (12, 24) not in table:
+		table[(12, 24)] = EARLY_CLOSE_ET
+
+	# US DST for Eastern Time: 2nd Sunday in March -> 1st Sunday in November
+	state.market_dst_start = (3, nth_weekday(year, 3, 6, 2))
+	state.market_dst_end = (11, nth_weekday(year, 11, 6, 1))
+
+	state.market_calendar_table = table
+	state.market_calendar_year = year
+
+	closed = 0
+	for close in table.values():
+		if close == 0:
+			closed += 1
+	logger.log(f"Market calendar {year}: {closed} holidays, {len(table) - closed} early closes, ET DST {state.market_dst_start[0]}/{state.market_dst_start[1]}-{state.market_dst_end[0]}/{state.market_dst_end[1]}", config.LogLevel.DEBUG, area="STOCKS")
+
+
+# ============================================================================
+# TODAY'S SESSION (INLINE)
+# ============================================================================
+
+def apply_today(rtc):
+	"""
+	Set state.market_*_local_minutes for today's date.
+
+	Closed days (weekends, holidays) set all three to 0, which the timeline
+	and display modules already treat as "no session today". The local offset
+	is the one the RTC was synced with (state.market_local_utc_offset); the ET
+	offset follows US DST for today's date, so the window shifts by an hour
+	on the days the two disagree.
+
+	Returns:
+		bool: True if the exchange has a session today
+	"""
+	now = rtc.datetime
+	if state.market_calendar_year != now.tm_year:
+		build_year(now.tm_year)
+
+	today = (now.tm_mon, now.tm_mday)
+	close_et = state.market_calendar_table.get(today, CLOSE_ET)
+
+	if now.tm_wday >= 5 or close_et == 0:
+		if state.market_close_local_minutes != 0:
+			reason = "weekend" if now.tm_wday >= 5 else "holiday"
+			logger.log(f"Market closed today ({reason})", config.LogLevel.INFO, area="STOCKS")
+		state.market_open_local_minutes = 0
+		state.market_close_local_minutes = 0
+		state.market_grace_end_local_minutes = 0
+		return False
+
+	# ET offset for today's date, local offset from the time sync
+	if state.market_dst_start <= today < state.market_dst_end:
+		et_offset_hours = ET_DAYLIGHT_OFFSET
+	else:
+		et_offset_hours = ET_STANDARD_OFFSET
+
+	local_offset_hours = state.market_local_utc_offset
+	if local_offset_hours is None:
+		local_offset_hours = et_offset_hours  # No timezone info - assume ET
+
+	hours_diff = local_offset_hours - et_offset_hours
+
+	import config_manager
+	grace_period = config_manager.get_stocks_grace_period_minutes()
+
+	open_local = OPEN_ET + hours_diff * 60
+	close_local = close_et + hours_diff * 60
+	changed = (open_local != state.market_open_local_minutes or
+	           close_local + grace_period != state.market_grace_end_local_minutes)
+
+	state.market_open_local_minutes = open_local
+	state.market_close_local_minutes = close_local
+	state.market_grace_end_local_minutes = close_local + grace_period
+
+	# Log only when the session changes (timeline recompiles on every reload)
+	if not changed:
+		return True
+
+	early = " (early close)" if close_et != CLOSE_ET else ""
+	logger.log(f"Market hours (local): {state.market_open_local_minutes//60}:{state.market_open_local_minutes%60:02d} - {state.market_close_local_minutes//60}:{state.market_close_local_minutes%60:02d}{early} (grace: +{grace_period}min)", area="STOCKS")
+	return True
+
+
+def get_trading_minutes():
+	"""
+	Length of today's session in minutes (390 regular, 210 early close).
+	Used for the progressive chart ratio. Returns 390 when closed.
+	"""
+	if state.market_close_local_minutes <= state.market_open_local_minutes:
+		return CLOSE_ET - OPEN_ET
+	return state.market_close_local_minutes - state.market_open_local_minutes
@@ -0,0 +1,214 @@
+"""
+Pantallita 3.0 - Network Receive Buffer Module
+One receive buffer, allocated once at boot, that every fetch reads its
+response body into (readinto, Network.RX_CHUNK bytes at a time). JSON is
+parsed straight from the buffer and CSV bodies are scanned one line at a
+time through memoryview slices - no per-response body bytes, decoded text
+copy or list of lines. CSV bodies larger than the buffer spill to the heap
+(as response.text did) instead of failing
+Bodies are read with adafruit_requests' Response._readinto (checked against
+READINTO_VERSION, the library in lib/); a Response without it is read
+through the public iter_content instead
+INLINE ARCHITECTURE - module functions over state.rx_buffer
+"""
+
+import json
+import adafruit_requests
+import config
+import state
+import logger
+
+# adafruit_requests version whose private Response._readinto read() was
+# checked against (same reader its iter_content and json() use)
+READINTO_VERSION = "4.1.15"
+
+_overflow = bytearray(1)  # One-byte read past a full buffer = body too large
+
+
+def init():
+	"""Allocate the buffer (boot, while the heap is unfragmented). Safe to call again."""
+	if state.rx_buffer is None:
+		state.rx_buffer = bytearray(config.Network.RX_BUFFER_SIZE)
+		state.rx_view = memoryview(state.rx_buffer)
+
+		version = getattr(adafruit_requests, "__version__", None)
+		if version is not None and version != READINTO_VERSION:
+			logger.log(f"adafruit_requests {version}: receive buffer reads were checked against {READINTO_VERSION} (Response._readinto)", config.LogLevel.WARNING, area="NET")
+
+
+# ============================================================================
+# BODY READ (INLINE)
+# ============================================================================
+
+def read(response, spill=False):
+	"""
+	Read a response body into the shared buffer.
+
+	The returned view is only valid until the next fetch - parse it (or
+	copy what must be kept) before making another request.
+
+	Args:
+		spill: Body larger than the buffer continues on the heap instead of
+		       failing (CSV config - the buffer is not a config size limit)
+
+	Returns:
+		memoryview: Body bytes (slice of state.rx_buffer), or a heap bytearray when spilled
+
+	Raises:
+		ValueError: Body larger than Network.RX_BUFFER_SIZE (without spill)
+	"""
+	init()
+	view = state.rx_view
+	size = len(view)
+	length = 0
+	body = None
+
+	readinto = getattr(response, "_readinto", None)
+	if readinto is not None:
+		# _readinto handles Content-Length and chunked bodies
+		while length < size:
+			count = readinto(view[length:min(length + config.Network.RX_CHUNK, size)])
+			if not count:
+				break
+			length += count
+
+		if length == size and readinto(_overflow):
+			if not spill:
+				raise ValueError(f"response larger than the {size} B receive buffer")
+
+			# Oversized CSV: buffer + the rest on the heap (what response.text did)
+			body = bytearray(view)
+			body.extend(_overflow)
+			chunk = bytearray(config.Network.RX_CHUNK)
+			while True:
+				count = readinto(chunk)
+				if not count:
+					break
+				body.extend(memoryview(chunk)[:count])
+	else:
+		# No _readinto in this adafruit_requests: public chunks, copied in
+		for chunk in response.iter_content(chunk_size=config.Network.RX_CHUNK):
+			if body is not None:
+				body.extend(chunk)
+			elif length + len(chunk) <= size:
+				view[length:length + len(chunk)] = chunk
+				length += len(chunk)
+			elif not spill:
+				raise ValueError(f"response larger than the {size} B receive buffer")
+			else:
+				body = bytearray(view[:length])
+				body.extend(chunk)
+
+	if body is not None:
+		state.rx_spills += 1
+		logger.log(f"Response of {len(body)} B is over the {size} B receive buffer - read onto the heap", config.LogLevel.INFO, area="NET")
+		return _body(body, len(body))
+	return _body(view, length)
+
+
+def read_file(path):
+	"""
+	Read a local file into the shared buffer (same lifetime rules as read).
+	A file larger than the buffer is read onto the heap instead, as
+	f.read() did - the buffer is not a config size limit.
+
+	Returns:
+		memoryview: File bytes (slice of state.rx_buffer), or a heap bytearray when spilled
+
+	Raises:
+		OSError: File missing
+	"""
+	init()
+	view = state.rx_view
+	size = len(view)
+	length = 0
+
+	with open(path, "rb") as f:
+		while length < size:
+			count = f.readinto(view[length:])
+			if not count:
+				break
+			length += count
+
+		if length == size and f.readinto(_overflow):
+			# Oversized file: buffer + the rest on the heap
+			body = bytearray(view)
+			body.extend(_overflow)
+			body.extend(f.read())
+			state.rx_spills += 1
+			logger.log(f"{path} ({len(body)} B) is over the {size} B receive buffer - read onto the heap", config.LogLevel.INFO, area="CONFIG")
+			return _body(body, len(body))
+
+	return _body(view, length)
+
+
+def _body(body, length):
+	"""
+	Count a body read. A body in the shared buffer is returned as a view,
+	remembered so lines() can scan state.rx_buffer; a spilled one as its
+	own bytearray (not kept referenced here).
+	"""
+	state.rx_reads += 1
+	state.rx_bytes += length
+	if length > state.rx_peak:
+		state.rx_peak = length
+	if isinstance(body, bytearray):
+		state.rx_body = None
+		return body
+	content = body[:length]
+	state.rx_body = content
+	return content
+
+
+def load_json(response):
+	"""response.json() equivalent, parsed in place from the shared buffer (json.loads takes any buffer)."""
+	return json.loads(read(response))
+
+
+# ============================================================================
+# LINE SCANNER (INLINE)
+# ============================================================================
+
+def lines(content):
+	"""
+	Lines of a CSV body without splitting it into a list.
+
+	Args:
+		content: Body from read() / read_file() (each line decoded on its
+		         own) or a str - callers strip() each line as before
+
+	Line ends are found with bytearray.find on the buffer behind the view
+	(C, not a Python loop per byte). Any other buffer is copied to bytes
+	once for the same scan.
+
+	Yields:
+		str: One line at a time, without the newline
+	"""
+	if isinstance(content, str):
+		start = 0
+		length = len(content)
+		while start < length:
+			end = content.find('\n', start)
+			if end == -1:
+				end = length
+			yield content[start:end]
+			start = end + 1
+		return
+
+	if content is state.rx_body:
+		data = state.rx_buffer  # read() / read_file() views start at the buffer's first byte
+	elif isinstance(content, (bytes, bytearray)):
+		data = content  # Spilled body
+	else:
+		data = bytes(content)
+	if not hasattr(data, "find"):
+		data = bytes(content)  # Port without bytearray.find
+
+	start = 0
+	length = len(content)
+	while start < length:
+		end = data.find(b"\n", start, length)
+		if end == -1:
+			end = length
+		yield str(content[start:end], "utf-8")
+		start = end + 1
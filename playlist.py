@@ -0,0 +1,309 @@
+"""
+Pantallita 3.0 - Display Playlist Module
+Declarative screen rotation: order, min/max durations, priorities, frequencies
+and preconditions come from playlist.csv (built-in defaults if missing)
+Each cycle gets a plan whose durations add up to a fixed cycle length
+INLINE ARCHITECTURE - one allocation pass, plan kept in state for other modules
+"""
+
+import time
+import config
+import state
+import logger
+import config_manager
+import timeline
+
+# Screens the main loop knows how to show (playlist rows for anything else are ignored)
+SCREENS = ("forecast", "weather", "events", "transit", "stocks")
+
+# Filler slot (not a playlist.csv screen): the time of a dropped last screen
+# goes to the clock so the cycle keeps its length
+CLOCK = "clock"
+
+# Preconditions usable in the conditions column (all listed must hold)
+CONDITIONS = ("online", "offline", "market", "commute", "weekday", "weekend")
+
+# Built-in playlist - the rotation run_test_cycle used to hard-code
+# (screen, min_seconds, max_seconds, priority, frequency, conditions)
+# max 0 = open-ended (takes whatever time is left), frequency 0 = config.csv setting
+DEFAULT_PLAYLIST = (
+	("forecast", config.Timing.FORECAST_DISPLAY_DURATION, config.Timing.FORECAST_DISPLAY_DURATION, 2, 1, ()),
+	("weather", config.Timing.FORECAST_DISPLAY_DURATION, 0, 3, 1, ()),
+	("events", config.Timing.PLAYLIST_MIN_DURATION, config.Timing.FORECAST_DISPLAY_DURATION, 4, 1, ()),
+	("transit", config.Timing.TRANSIT_DISPLAY_DURATION, config.Timing.TRANSIT_DISPLAY_DURATION, 2, 0, ()),
+	("stocks", config.Timing.STOCKS_DISPLAY_DURATION, config.Timing.STOCKS_DISPLAY_DURATION, 1, 0, ()),
+)
+
+
+# ============================================================================
+# LOADING (INLINE)
+# ============================================================================
+
+def load_playlist():
+	"""
+	Load the playlist from /playlist.csv, falling back to DEFAULT_PLAYLIST.
+
+	Format (one screen per line, file order = display order):
+		screen,min_seconds,max_seconds,priority,frequency,conditions
+		cycle,360                  <- optional cycle length override
+
+	- max_seconds 0: open-ended, absorbs the time left over
+	- priority: higher keeps its slot when the cycle is squeezed
+	- frequency: show every N cycles (blank/0 = stocks/transit frequency from config.csv)
+	- conditions: pipe-separated, all must hold (online, offline, market, commute, weekday, weekend)
+
+	Returns:
+		bool: True if playlist.csv was loaded
+	"""
+	state.playlist_screens = list(DEFAULT_PLAYLIST)
+	state.playlist_cycle_duration = config.Timing.PLAYLIST_CYCLE_DURATION
+
+	try:
+		with open('/playlist.csv', 'r') as f:
+			lines = f.readlines()
+	except OSError:
+		logger.log("No playlist.csv - using built-in rotation", config.LogLevel.DEBUG, area="PLAYLIST")
+		return False
+
+	screens = []
+	cycle_duration = config.Timing.PLAYLIST_CYCLE_DURATION
+
+	for line in lines:
+		line = line.strip()
+		if not line or line.startswith('#') or line.startswith('screen,'):
+			continue
+
+		parts = [p.strip() for p in line.split(',')]
+		name = parts[0].lower()
+
+		try:
+			if name == "cycle":
+				cycle_duration = int(parts[1])
+				continue
+
+			if name not in SCREENS:
+				logger.log(f"Unknown playlist screen: {name}", config.LogLevel.WARNING, area="PLAYLIST")
+				continue
+			if name in [s[0] for s in screens]:
+				logger.log(f"Duplicate playlist screen: {name} - keeping the first", config.LogLevel.WARNING, area="PLAYLIST")
+				continue
+
+			min_seconds = int(parts[1])
+			max_seconds = int(parts[2]) if len(parts) > 2 and parts[2] else 0
+			priority = int(parts[3]) if len(parts) > 3 and parts[3] else 1
+			frequency = int(parts[4]) if len(parts) > 4 and parts[4] else 0
+
+			conditions = []
+			if len(parts) > 5 and parts[5]:
+				for condition in parts[5].split('|'):
+					condition = condition.strip().lower()
+					if condition not in CONDITIONS:
+						raise ValueError(f"unknown condition {condition}")
+					conditions.append(condition)
+
+			if min_seconds < 1 or (max_seconds and max_seconds < min_seconds) or frequency < 0:
+				raise ValueError("bad durations")
+
+			screens.append((name, min_seconds, max_seconds, priority, frequency, tuple(conditions)))
+
+		except (ValueError, IndexError) as e:
+			logger.log(f"Invalid playlist line '{line}': {e}", config.LogLevel.WARNING, area="PLAYLIST")
+
+	if not screens:
+		logger.log("No valid screens in playlist.csv - using built-in rotation", config.LogLevel.WARNING, area="PLAYLIST")
+		return False
+
+	state.playlist_screens = screens
+	state.playlist_cycle_duration = max(cycle_duration, config.Timing.PLAYLIST_MIN_DURATION)
+	logger.log(f"Loaded playlist.csv: {', '.join(s[0] for s in screens)} ({state.playlist_cycle_duration}s cycle)", area="PLAYLIST")
+	return True
+
+
+# ============================================================================
+# ALLOCATION (INLINE)
+# ============================================================================
+
+def allocate(rows, budget):
+	"""
+	Split budget seconds across playlist rows.
+
+	1. Lowest priority rows are dropped until the minimums fit (ties: later row first)
+	2. Every row gets its minimum
+	3. Leftover goes to rows in priority order, each up to its max
+	4. Still left: the open-ended row (max 0) takes it, else the top priority row
+
+	Args:
+		rows: Playlist rows (screen, min, max, priority, frequency, conditions) in display order
+		budget: Seconds to fill
+
+	Returns:
+		list: [[screen, seconds], ...] in display order
+	"""
+	# Row indexes by priority (stable: file order breaks ties)
+	by_priority = sorted(range(len(rows)), key=lambda i: -rows[i][3])
+
+	total_min = 0
+	for row in rows:
+		total_min += row[1]
+	while len(by_priority) > 1 and total_min > budget:
+		dropped = by_priority.pop()
+		total_min -= rows[dropped][1]
+		logger.log(f"Playlist: no room for {rows[dropped][0]} ({budget}s budget)", config.LogLevel.DEBUG, area="PLAYLIST")
+
+	durations = {}
+	for i in by_priority:
+		durations[i] = rows[i][1]
+	if len(by_priority) == 1 and total_min > budget:
+		durations[by_priority[0]] = max(budget, config.Timing.PLAYLIST_MIN_DURATION)
+
+	leftover = budget - sum(durations.values())
+	for i in by_priority:
+		if leftover <= 0:
+			break
+		if rows[i][2] > 0:
+			extra = min(leftover, rows[i][2] - durations[i])
+			durations[i] += extra
+			leftover -= extra
+
+	if leftover > 0 and by_priority:
+		target = by_priority[0]
+		for i in by_priority:
+			if rows[i][2] == 0:
+				target = i
+				break
+		durations[target] += leftover
+
+	plan = []
+	for i in range(len(rows)):
+		if i in durations:
+			plan.append([rows[i][0], durations[i]])
+	return plan
+
+
+# ============================================================================
+# CYCLE PLAN (INLINE)
+# ============================================================================
+
+def plan_cycle(rtc, cycle_count, seconds_to_schedule=None):
+	"""
+	Build this cycle's plan into state.playlist_plan.
+
+	A row is a candidate when its display is enabled (and has data), its
+	frequency matches the cycle and all its conditions hold. The candidates
+	share the cycle length - or the time until the next schedule starts,
+	so the schedule begins on time.
+
+	Args:
+		rtc: Real-time clock object
+		cycle_count: Current cycle number
+		seconds_to_schedule: Seconds until the next schedule (None = none today)
+
+	Returns:
+		list: [[screen, seconds], ...] in display order
+	"""
+	now = rtc.datetime
+	market_phase = None
+	candidates = []
+
+	for row in state.playlist_screens:
+		name, min_seconds, max_seconds, priority, frequency, conditions = row
+
+		# Display toggle + data the screen needs
+		if name == "forecast":
+			available = config_manager.should_show_forecast()
+		elif name == "weather":
+			available = config_manager.should_show_weather()
+		elif name == "events":
+			available = config_manager.should_show_events() and bool(state.cached_events) and bool(timeline.get_active_events(rtc))
+		elif name == "transit":
+			available = config_manager.should_show_transit()
+		else:
+			available = config_manager.should_show_stocks() and bool(state.cached_stocks)
+			if available and config_manager.get_stocks_respect_market_hours():
+				if market_phase is None:
+					market_phase = timeline.get_market_phase(rtc)
+				available = market_phase != timeline.MARKET_CLOSED
+		if not available:
+			continue
+
+		# Frequency (0 = the config.csv setting for stocks/transit, every cycle otherwise)
+		if frequency == 0:
+			if name == "stocks":
+				frequency = config_manager.get_stocks_display_frequency()
+			elif name == "transit":
+				frequency = config_manager.get_transit_display_frequency()
+			else:
+				frequency = 1
+		if cycle_count % frequency != 0:
+			continue
+
+		# Preconditions (inline)
+		ok = True
+		for condition in conditions:
+			if condition == "online":
+				ok = not state.wifi_offline
+			elif condition == "offline":
+				ok = state.wifi_offline
+			elif condition == "market":
+				if market_phase is None:
+					market_phase = timeline.get_market_phase(rtc)
+				ok = market_phase == timeline.MARKET_OPEN
+			elif condition == "commute":
+				routes = timeline.get_active_transit_routes(rtc)
+				ok = routes is None or len(routes) > 0
+			elif condition == "weekday":
+				ok = now.tm_wday < 5
+			elif condition == "weekend":
+				ok = now.tm_wday >= 5
+			if not ok:
+				break
+		if ok:
+			candidates.append(row)
+
+	budget = state.playlist_cycle_duration
+	if seconds_to_schedule is not None and seconds_to_schedule < budget:
+		budget = max(seconds_to_schedule, config.Timing.PLAYLIST_MIN_DURATION)
+		logger.log(f"Next schedule in {seconds_to_schedule}s - fitting the cycle to {budget}s", config.LogLevel.DEBUG, area="PLAYLIST")
+
+	state.playlist_plan = allocate(candidates, budget)
+	state.playlist_budget = budget
+	state.playlist_started = time.monotonic()
+	logger.log(f"Plan: {', '.join(f'{s} {d}s' for s, d in state.playlist_plan) or 'nothing to show'} ({budget}s cycle)", config.LogLevel.INFO, area="PLAYLIST")
+	return state.playlist_plan
+
+
+def duration(screen):
+	"""Seconds planned for screen this cycle (0 = not in the plan)."""
+	for name, seconds in state.playlist_plan:
+		if name == screen:
+			return seconds
+	return 0
+
+
+def drop(screen):
+	"""
+	Remove a screen that could not be shown (no data, display error) and give
+	its time to the screens after it, so the cycle keeps its length - or to
+	a clock slot (CLOCK) when it was the last screen to show.
+	Screens already shown are not touched.
+	"""
+	plan = state.playlist_plan
+	for i in range(len(plan)):
+		if plan[i][0] != screen:
+			continue
+
+		budget = plan[i][1]
+		tail_rows = []
+		for name, seconds in plan[i + 1:]:
+			budget += seconds
+			for row in state.playlist_screens:
+				if row[0] == name:
+					tail_rows.append(row)
+					break
+
+		tail = allocate(tail_rows, budget)
+		if not tail and screen != CLOCK:
+			tail = [[CLOCK, budget]]
+		state.playlist_plan = plan[:i] + tail
+		logger.log(f"Playlist: {screen} skipped - {plan[i][1]}s given to {', '.join(s for s, d in state.playlist_plan[i:]) or 'nothing'}", config.LogLevel.DEBUG, area="PLAYLIST")
+		return
@@ -0,0 +1,241 @@
+"""
+Pantallita 3.0 - API Quota Budgeter
+Per-provider token buckets (per-minute) and daily counters (per-day)
+Every fetch reserves its cost first; a denied reservation means "skip, use cache"
+INLINE ARCHITECTURE - flat bucket math, no helper chains
+"""
+
+import time
+import struct
+import config
+import state
+import logger
+
+try:
+	import microcontroller
+except ImportError:
+	microcontroller = None  # Host/CPython: quota persists only in RAM
+
+# Providers (index = slot in the NVM record)
+ACCUWEATHER = "accuweather"
+TWELVE_DATA = "twelve_data"
+CTA_TRAIN = "cta_train"
+CTA_BUS = "cta_bus"
+
+PROVIDERS = (ACCUWEATHER, TWELVE_DATA, CTA_TRAIN, CTA_BUS)
+
+# NVM record: magic, year, month, day, then one uint16 day counter per provider
+NVM_FORMAT = "<2sHBB4H"
+NVM_MAGIC = b"QB"
+
+
+# ============================================================================
+# INITIALIZATION
+# ============================================================================
+
+def init(rtc, clock_synced=True):
+	"""
+	Create buckets and restore today's day counters from NVM.
+
+	Args:
+		rtc: Real-time clock object (day counters reset at local midnight)
+		clock_synced: False when the time sync failed - the RTC date cannot
+		              be trusted, so the stored counters are restored
+		              whatever day they carry (over-count rather than
+		              start the day from zero)
+	"""
+	limits = {
+		ACCUWEATHER: (config.Quota.ACCUWEATHER_PER_MINUTE, config.Quota.ACCUWEATHER_PER_DAY),
+		TWELVE_DATA: (config.Quota.TWELVE_DATA_PER_MINUTE, config.Quota.TWELVE_DATA_PER_DAY),
+		CTA_TRAIN: (config.Quota.CTA_TRAIN_PER_MINUTE, config.Quota.CTA_TRAIN_PER_DAY),
+		CTA_BUS: (config.Quota.CTA_BUS_PER_MINUTE, config.Quota.CTA_BUS_PER_DAY),
+	}
+
+	now = rtc.datetime
+	today = (now.tm_year, now.tm_mon, now.tm_mday)
+	now_time = time.monotonic()
+
+	# Bucket: [per_minute, per_day, minute_tokens, last_refill, day_used, denied]
+	state.quota_buckets = {}
+	for provider in PROVIDERS:
+		per_minute, per_day = limits[provider]
+		state.quota_buckets[provider] = [per_minute, per_day, float(per_minute), now_time, 0, 0]
+
+	state.quota_day = today
+	state.quota_tracking_start_minutes = now.tm_hour * 60 + now.tm_min
+
+	# Restore counters persisted earlier today (survives reboots)
+	if microcontroller is not None:
+		try:
+			size = struct.calcsize(NVM_FORMAT)
+			offset = config.Quota.NVM_OFFSET
+			record = struct.unpack(NVM_FORMAT, bytes(microcontroller.nvm[offset:offset + size]))
+			if record[0] == NVM_MAGIC and ((record[1], record[2], record[3]) == today or not clock_synced):
+				for i, provider in enumerate(PROVIDERS):
+					state.quota_buckets[provider][4] = record[4 + i]
+				state.quota_tracking_start_minutes = 0  # Counters cover the whole day
+				restored = [p + "=" + str(state.quota_buckets[p][4]) for p in PROVIDERS]
+				if clock_synced:
+					logger.log(f"Restored quota counters: {', '.join(restored)}", config.LogLevel.INFO, area="QUOTA")
+				else:
+					logger.log(f"Clock not synced - keeping stored quota counters from {record[1]}-{record[2]:02d}-{record[3]:02d}: {', '.join(restored)}", config.LogLevel.WARNING, area="QUOTA")
+		except Exception as e:
+			logger.log(f"Quota restore failed: {e}", config.LogLevel.WARNING, area="QUOTA")
+
+
+def save(force=False):
+	"""
+	Persist day counters to NVM (rate limited by config.Quota.SAVE_INTERVAL).
+	Forced at the day rollover and when the program stops, so only the
+	counts since the last write are lost on a crash or power cut.
+
+	Args:
+		force: Write immediately regardless of interval
+	"""
+	if microcontroller is None or not state.quota_buckets or state.quota_day is None:
+		return
+
+	now_time = time.monotonic()
+	if not force and now_time - state.quota_last_save < config.Quota.SAVE_INTERVAL:
+		state.quota_save_pending = True
+		return
+
+	try:
+		year, month, day = state.quota_day
+		counters = [min(state.quota_buckets[p][4], 65535) for p in PROVIDERS]
+		record = struct.pack(NVM_FORMAT, NVM_MAGIC, year, month, day, *counters)
+		offset = config.Quota.NVM_OFFSET
+		microcontroller.nvm[offset:offset + len(record)] = record
+		state.quota_last_save = now_time
+		state.quota_save_pending = False
+	except Exception as e:
+		logger.log(f"Quota save failed: {e}", config.LogLevel.WARNING, area="QUOTA")
+
+
+# ============================================================================
+# RESERVATION (INLINE)
+# ============================================================================
+
+def available(provider):
+	"""
+	Tokens available right now (min of minute bucket and day remaining).
+	Does not consume anything - use before multi-call fetch sequences.
+
+	Returns:
+		int: Available credits (large number when provider is unlimited)
+	"""
+	bucket = state.quota_buckets.get(provider)
+	if bucket is None:
+		return 1 << 30  # Not initialized - never block
+
+	per_minute, per_day, tokens, last_refill, day_used, denied = bucket
+
+	# Refill minute bucket (inline)
+	if per_minute > 0:
+		elapsed = time.monotonic() - last_refill
+		tokens = min(per_minute, tokens + elapsed * per_minute / 60)
+		minute_available = int(tokens)
+	else:
+		minute_available = 1 << 30
+
+	day_available = (per_day - day_used) if per_day > 0 else 1 << 30
+
+	return max(0, min(minute_available, day_available))
+
+
+def reserve(provider, cost=1):
+	"""
+	Reserve quota for one request before making it.
+
+	Args:
+		provider: One of PROVIDERS
+		cost: Credits the request consumes (Twelve Data: 1 per symbol)
+
+	Returns:
+		bool: True if the call may proceed, False = skip and use cache
+	"""
+	bucket = state.quota_buckets.get(provider)
+	if bucket is None:
+		return True  # Not initialized (e.g. during boot) - allow
+
+	# Day rollover (inline) - reset all day counters at local midnight
+	if state.rtc:
+		now = state.rtc.datetime
+		today = (now.tm_year, now.tm_mon, now.tm_mday)
+		if today != state.quota_day:
+			for p in PROVIDERS:
+				state.quota_buckets[p][4] = 0
+				state.quota_buckets[p][5] = 0
+			state.quota_day = today
+			state.quota_tracking_start_minutes = 0
+			save(force=True)
+			logger.log("Quota day rollover - counters reset", config.LogLevel.INFO, area="QUOTA")
+
+	now_time = time.monotonic()
+	per_minute, per_day = bucket[0], bucket[1]
+
+	# Refill minute bucket (inline)
+	if per_minute > 0:
+		bucket[2] = min(per_minute, bucket[2] + (now_time - bucket[3]) * per_minute / 60)
+	bucket[3] = now_time
+
+	# Check limits
+	if per_minute > 0 and bucket[2] < cost:
+		bucket[5] += 1
+		logger.log(f"Quota: {provider} minute budget exhausted ({bucket[2]:.1f}/{per_minute} left, need {cost}) - skip, use cache", config.LogLevel.INFO, area="QUOTA")
+		return False
+
+	if per_day > 0 and bucket[4] + cost > per_day:
+		bucket[5] += 1
+		logger.log(f"Quota: {provider} daily budget exhausted ({bucket[4]}/{per_day}) - skip, use cache", config.LogLevel.WARNING, area="QUOTA")
+		return False
+
+	# Consume
+	if per_minute > 0:
+		bucket[2] -= cost
+	bucket[4] += cost
+	save()
+
+	logger.log(f"Quota: {provider} -{cost} (day {bucket[4]}/{per_day if per_day > 0 else '-'})", config.LogLevel.VERBOSE, area="QUOTA")
+	return True
+
+
+# ============================================================================
+# PROJECTION LOGGING (INLINE)
+# ============================================================================
+
+def log_projection(rtc):
+	"""
+	Log today's usage and projected end-of-day usage per provider.
+	Warns when a provider is projected to exceed its daily limit.
+	"""
+	if not state.quota_buckets:
+		return
+
+	# Flush any throttled save
+	if state.quota_save_pending:
+		save()
+
+	now = rtc.datetime
+	minutes_now = now.tm_hour * 60 + now.tm_min
+	tracked_minutes = max(minutes_now - state.quota_tracking_start_minutes, 1)
+	remaining_minutes = 1440 - minutes_now
+
+	for provider in PROVIDERS:
+		per_minute, per_day, tokens, last_refill, day_used, denied = state.quota_buckets[provider]
+		if per_day <= 0 or (day_used == 0 and denied == 0):
+			continue
+
+		# Too little history to extrapolate - report usage only
+		if tracked_minutes < 30:
+			logger.log(f"Quota {provider}: {day_used}/{per_day} used, denied {denied}", config.LogLevel.INFO, area="QUOTA")
+			continue
+
+		rate = day_used / tracked_minutes
+		projected = int(day_used + rate * remaining_minutes)
+		pct = (projected * 100) // per_day
+
+		if projected > per_day * config.Quota.PROJECTION_WARN_RATIO:
+			logger.log(f"Quota {provider}: {day_used}/{per_day} used, projected {projected} ({pct}%) - reduce fetch frequency", config.LogLevel.WARNING, area="QUOTA")
+		else:
+			logger.log(f"Quota {provider}: {day_used}/{per_day} used, projected {projected} ({pct}%), denied {denied}", config.LogLevel.INFO, area="QUOTA")
@@ -7,6 +7,8 @@ INLINE ARCHITECTURE - all parsing inline, no helper functions
 import config
 import state
 import logger
+import netbuf
+import snapshot
 
 
 # ============================================================================
@@ -22,13 +24,9 @@ def load_local_schedules():
 
 	INLINE - all parsing inline, no helpers
 	"""
-	schedules = {}
-
 	try:
-		with open("schedules.csv", "r") as f:
-			content = f.read()
-
-		return parse_schedule_csv_content(content)
+		# Read and parsed only when the file changed since the snapshot
+		return snapshot.parsed_file("schedules.csv", "schedules.csv", parse_schedule_csv_content)
 
 	except OSError:
 		logger.log("Local schedules.csv not found", config.LogLevel.DEBUG, area="SCHEDULE")
@@ -86,8 +84,7 @@ def fetch_github_schedules(rtc):
 
 		if response.status_code == 200:
 			# Success - parse date-specific CSV
-			content = response.text
-			schedules = parse_schedule_csv_content(content)
+			schedules = snapshot.parsed("github:schedules.csv", netbuf.read(response, spill=True), parse_schedule_csv_content)
 			source = f"github:{date_str}.csv"
 			logger.log(f"Loaded {len(schedules)} schedules from {date_str}.csv", config.LogLevel.INFO, area="SCHEDULE")
 
@@ -101,8 +98,7 @@ def fetch_github_schedules(rtc):
 
 			if response.status_code == 200:
 				# Success - parse default CSV
-				content = response.text
-				schedules = parse_schedule_csv_content(content)
+				schedules = snapshot.parsed("github:schedules.csv", netbuf.read(response, spill=True), parse_schedule_csv_content)
 				source = "github:default.csv"
 				logger.log(f"Loaded {len(schedules)} schedules from default.csv", config.LogLevel.INFO, area="SCHEDULE")
 			else:
@@ -133,7 +129,7 @@ def parse_schedule_csv_content(csv_content):
 	Example: Get Dressed,1,0123456,7,0,7,15,get_dressed.bmp,1,0
 
 	Args:
-		csv_content: CSV string content
+		csv_content: CSV text (str) or body view from netbuf.read
 
 	Returns:
 		dict: {schedule_name: {enabled, days, start_hour, start_min, end_hour, end_min, image, progressbar, night_mode}}
@@ -143,9 +139,7 @@ def parse_schedule_csv_content(csv_content):
 	schedules = {}
 
 	try:
-		lines = csv_content.strip().split('\n')
-
-		for line in lines:
+		for line in netbuf.lines(csv_content):
 			line = line.strip()
 
 			# Skip empty lines and comments
@@ -0,0 +1,291 @@
+"""
+Pantallita 3.0 - Compiled Config Snapshot Module
+Keeps every parsed config source (config.csv, stocks, schedules, events,
+ephemeral events, transits - local and GitHub) in one file on flash (binary
+index, compact JSON payloads), each entry tagged with the crc32 of the text
+it was parsed from, plus the size and mtime of a local file.
+Local files go through parsed_file(): an unchanged file (same size and
+mtime) is not even read, its result is decoded from the snapshot. GitHub
+bodies go through parsed(), keyed on the crc32. Only a changed source goes
+through its CSV parser
+INLINE ARCHITECTURE - module functions over state.snapshot_*
+"""
+
+import gc
+import time
+import struct
+import binascii
+import json
+import os
+import config
+import state
+import logger
+import netbuf
+
+# File: "PS1", version, entry count, then per entry
+#   name length (B), crc32 (I), file size (I), file mtime (I), salt (I),
+#   payload length (I), name, payload - size/mtime 0 for GitHub bodies
+MAGIC = b"PS1"
+# Bump when a parser's output changes - older snapshots are then ignored
+VERSION = 3
+HEADER_FORMAT = "<3sBH"
+ENTRY_FORMAT = "<BIIIII"
+
+try:
+	mem_alloc = gc.mem_alloc
+except AttributeError:
+	mem_alloc = None  # Host/CPython: heap use not measured
+
+
+# ============================================================================
+# ENCODING (INLINE)
+# ============================================================================
+
+def encode(value):
+	"""
+	Payload text for a parser's result.
+
+	Compact JSON, shaped exactly like the result: json.loads runs in C and
+	builds the parser's objects directly - no per-line strings or split
+	fields, and no intermediate rows to rebuild dicts from. Kept as str so
+	no decoder has to make a text copy of it first. Tuples come back as
+	lists.
+	"""
+	return json.dumps(value, separators=(",", ":"))
+
+
+def decode(payload):
+	"""Parser result from payload text (fresh objects on every call)."""
+	return json.loads(payload)
+
+
+# ============================================================================
+# SOURCE LOOKUP (INLINE)
+# ============================================================================
+
+def parsed_file(source, path, parse, salt=0):
+	"""
+	Parsed form of a local config file, reading it only when it changed.
+
+	A file with the size and mtime recorded in the snapshot is not opened -
+	its result is decoded from the snapshot. Otherwise it is read into the
+	receive buffer and goes through parsed() (a touched but identical file
+	still skips the parser, and gets its new stamp recorded).
+
+	Args:
+		source: Snapshot entry name ("stocks.csv", ...)
+		path: File to stat and read
+		parse: Parser, called as parse(content) on a miss
+		salt: See parsed()
+
+	Returns:
+		The parser's result (a fresh copy on a snapshot hit)
+
+	Raises:
+		OSError: File missing
+	"""
+	info = os.stat(path)
+	stamp = (info[6], int(info[8]) & 0xFFFFFFFF, salt)  # st_size, st_mtime
+
+	entry = state.snapshot_sources.get(source)
+	if entry is not None and entry[2] == stamp:
+		hit, value = _decode_or_parse(source, entry[1], None, None)
+		if hit:
+			return value
+
+	return parsed(source, netbuf.read_file(path), parse, salt, stamp)
+
+
+def parsed(source, content, parse, salt=0, stamp=None):
+	"""
+	Parsed form of a config source, re-parsing only when its text changed.
+
+	Args:
+		source: Snapshot entry name ("github:stocks.csv", ...)
+		content: Raw text (str, bytes or netbuf view) - hashed, then parsed on a miss
+		parse: Parser, called as parse(content) on a miss
+		salt: Mixed into the hash for parsers whose output also depends on
+		      something other than the text (ephemeral events drop past dates)
+		stamp: (size, mtime, salt) of a local file (parsed_file)
+
+	Returns:
+		The parser's result (a fresh copy on a snapshot hit)
+	"""
+	crc = binascii.crc32(content.encode("utf-8") if isinstance(content, str) else content, salt)
+
+	entry = state.snapshot_sources.get(source)
+	payload = entry[1] if entry is not None and entry[0] == crc else None
+	hit, value = _decode_or_parse(source, payload, content, parse)
+
+	if hit:
+		if stamp is not None and entry[2] != stamp:
+			# Same text under a new mtime - record it so the next load skips the read
+			state.snapshot_sources[source] = (crc, payload, stamp)
+			state.snapshot_dirty = True
+		return value
+
+	# Compile the new result into the snapshot (written by save())
+	try:
+		payload = encode(value)
+		state.snapshot_sources[source] = (crc, payload, stamp)
+		state.snapshot_dirty = True
+		logger.log(f"Snapshot: {source} changed, compiled {len(payload)} chars", config.LogLevel.DEBUG, area="CONFIG")
+	except Exception as e:
+		logger.log(f"Snapshot: cannot compile {source}: {e}", config.LogLevel.WARNING, area="CONFIG")
+
+	return value
+
+
+def _decode_or_parse(source, payload, content, parse):
+	"""
+	Decode a snapshot payload, else parse the text (when given), timing the
+	load into state.snapshot_bench.
+
+	Returns:
+		tuple: (True, value) decoded, (False, value) parsed, (False, None)
+		       unreadable payload and no text to fall back on
+	"""
+	hit = False
+	value = None
+
+	# Peak heap of the load: collect first, then no automatic collections
+	# during it, so everything it allocates (result and garbage) is counted
+	if mem_alloc:
+		gc.collect()
+		gc.disable()
+	start = time.monotonic_ns()
+	allocated = mem_alloc() if mem_alloc else 0
+	try:
+		if payload is not None:
+			try:
+				value = decode(payload)
+				hit = True
+			except Exception as e:
+				logger.log(f"Snapshot entry {source} unreadable ({e}) - parsing text", config.LogLevel.WARNING, area="CONFIG")
+
+		if not hit:
+			if parse is None:
+				return False, None
+			value = parse(content)
+
+		bench = state.snapshot_bench["snapshot" if hit else "text"]
+		bench[0] += 1
+		bench[1] += (time.monotonic_ns() - start) / 1000000
+		bench[2] += mem_alloc() - allocated if mem_alloc else 0
+	finally:
+		if mem_alloc:
+			gc.enable()
+
+	return hit, value
+
+
+# ============================================================================
+# FILE LOAD / SAVE (INLINE)
+# ============================================================================
+
+def load():
+	"""Read the snapshot file (one read at boot) into state.snapshot_sources."""
+	start = time.monotonic_ns()
+	state.snapshot_sources = {}
+
+	try:
+		with open(config.Paths.SNAPSHOT, "rb") as f:
+			data = f.read()
+	except OSError:
+		logger.log("No config snapshot yet - parsing text sources", config.LogLevel.DEBUG, area="CONFIG")
+		return 0
+
+	try:
+		magic, version, count = struct.unpack_from(HEADER_FORMAT, data, 0)
+		if magic != MAGIC or version != VERSION:
+			raise ValueError(f"format {magic} v{version}")
+
+		offset = struct.calcsize(HEADER_FORMAT)
+		entry_size = struct.calcsize(ENTRY_FORMAT)
+		sources = {}
+		for _ in range(count):
+			name_length, crc, size, mtime, salt, payload_length = struct.unpack_from(ENTRY_FORMAT, data, offset)
+			offset += entry_size
+			name = str(data[offset:offset + name_length], "utf-8")
+			offset += name_length
+			if offset + payload_length > len(data):
+				raise ValueError("truncated")
+			stamp = (size, mtime, salt) if size or mtime else None
+			sources[name] = (crc, str(data[offset:offset + payload_length], "utf-8"), stamp)
+			offset += payload_length
+		state.snapshot_sources = sources
+
+	except Exception as e:
+		logger.log(f"Config snapshot ignored ({e}) - parsing text sources", config.LogLevel.WARNING, area="CONFIG")
+		return 0
+
+	state.snapshot_file_bytes = len(data)
+	state.snapshot_load_ms = (time.monotonic_ns() - start) / 1000000
+	logger.log(f"Config snapshot: {len(state.snapshot_sources)} sources, {len(data)} B in {state.snapshot_load_ms:.1f}ms", config.LogLevel.INFO, area="CONFIG")
+	return len(state.snapshot_sources)
+
+
+def save():
+	"""
+	Write the snapshot when a source changed since the last write.
+
+	CIRCUITPY is read-only to code while USB owns it (unless boot.py
+	remounts it) - then the snapshot only lives in RAM, which still saves
+	the periodic re-parses until the next reboot.
+	"""
+	if not state.snapshot_dirty or not state.snapshot_writable:
+		return False
+
+	data = bytearray(struct.pack(HEADER_FORMAT, MAGIC, VERSION, len(state.snapshot_sources)))
+	for name in state.snapshot_sources:
+		crc, payload, stamp = state.snapshot_sources[name]
+		size, mtime, salt = stamp or (0, 0, 0)
+		name_bytes = name.encode("utf-8")
+		payload_bytes = payload.encode("utf-8")
+		data.extend(struct.pack(ENTRY_FORMAT, len(name_bytes), crc, size, mtime, salt, len(payload_bytes)))
+		data.extend(name_bytes)
+		data.extend(payload_bytes)
+
+	temp_path = config.Paths.SNAPSHOT + ".tmp"
+	try:
+		# Write then rename - a reset mid-write leaves the old snapshot intact
+		with open(temp_path, "wb") as f:
+			f.write(data)
+		os.rename(temp_path, config.Paths.SNAPSHOT)
+	except OSError as e:
+		state.snapshot_writable = False
+		logger.log(f"Config snapshot kept in RAM - flash not writable ({e})", config.LogLevel.INFO, area="CONFIG")
+		return False
+
+	state.snapshot_dirty = False
+	state.snapshot_file_bytes = len(data)
+	state.snapshot_saves += 1
+	logger.log(f"Config snapshot saved: {len(state.snapshot_sources)} sources, {len(data)} B", config.LogLevel.DEBUG, area="CONFIG")
+	return True
+
+
+# ============================================================================
+# STATISTICS (INLINE)
+# ============================================================================
+
+def log_stats():
+	"""
+	Log config loads served from the snapshot versus parsed from text.
+
+	Shows: Config snapshot: 12 hits 2.1ms 640B peak avg, 3 text parses 38.4ms 9120B peak avg, 2310 B file (loaded in 4.2ms), 1 saves
+	"""
+	hits, hit_ms, hit_heap = state.snapshot_bench["snapshot"]
+	parses, parse_ms, parse_heap = state.snapshot_bench["text"]
+	if hits == 0 and parses == 0:
+		return
+
+	parts = []
+	if hits:
+		parts.append(f"{hits} hits {hit_ms / hits:.1f}ms {hit_heap // hits}B peak avg")
+	if parses:
+		parts.append(f"{parses} text parses {parse_ms / parses:.1f}ms {parse_heap // parses}B peak avg")
+	parts.append(f"{state.snapshot_file_bytes} B file (loaded in {state.snapshot_load_ms:.1f}ms)")
+	parts.append(f"{state.snapshot_saves} saves" if state.snapshot_writable else "flash read-only")
+	logger.log(f"Config snapshot: {', '.join(parts)}", config.LogLevel.INFO, area="CONFIG")
+
+	state.snapshot_bench = {"text": [0, 0, 0], "snapshot": [0, 0, 0]}
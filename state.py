@@ -20,17 +20,55 @@ font_small = None
 # RTC object (initialized by hardware.init_rtc)
 rtc = None
 
-# Button objects (initialized by hardware.init_buttons)
-button_up = None
-button_down = None
+# Buttons (initialized by hardware.init_buttons) - keypad event queue
+keys = None
+key_event = None  # Preallocated keypad.Event for get_into
+key_down_since = None  # monotonic time DOWN was pressed (None = not held)
+force_refresh_at = 0  # DOWN long-press time - caches fetched before it count as stale
 
 # ============================================================================
 # NETWORK STATE
 # ============================================================================
 
-# HTTP session (initialized by hardware.connect_wifi)
+# HTTP session (initialized by hardware.connect_wifi via connections.build_session)
 session = None
 socket_pool = None
+ssl_context = None  # One TLS context for the whole run (survives session rebuilds)
+
+# Connection reuse statistics (connections.log_stats)
+conn_requests = 0         # HTTP requests made through the session
+conn_new_sockets = 0      # Sockets opened (each = DNS + TCP + TLS handshake)
+conn_new_count = 0        # Requests that needed a new socket
+conn_new_time = 0.0       # Seconds spent in those requests
+conn_reused_count = 0     # Requests served on a kept-alive socket
+conn_reused_time = 0.0    # Seconds spent in those requests
+conn_host_stats = {}      # {host: [requests, new connections]}
+conn_dns_hits = 0
+conn_dns_misses = 0
+conn_sessions_built = 0
+
+# Offline mode (hardware.maintain_wifi)
+wifi_offline = False
+wifi_offline_since = 0     # monotonic time WiFi was lost
+wifi_next_attempt = 0      # monotonic time of the next background reconnect attempt
+wifi_retry_delay = 0       # Current reconnect backoff (seconds)
+wifi_reconnects = 0        # Successful reconnects since boot
+
+# Fetch deadline for the current screen (monotonic seconds, None = default timeout)
+fetch_deadline = None
+deadline_skips = 0  # Requests skipped because the budget was spent
+
+# Shared receive buffer (netbuf.py) - every response body is read into it
+rx_buffer = None  # bytearray(Network.RX_BUFFER_SIZE), allocated once at boot
+rx_view = None  # memoryview of rx_buffer (slices without copies)
+rx_reads = 0  # Bodies read
+rx_bytes = 0  # Body bytes read
+rx_peak = 0  # Largest body (bytes) - headroom check for RX_BUFFER_SIZE
+rx_spills = 0  # CSV bodies larger than the buffer, read onto the heap instead
+rx_body = None  # View of the last body read into rx_buffer - netbuf.lines scans rx_buffer for it
+
+# Provider circuit breakers (breaker.py)
+breakers = {}  # {provider: [consecutive_failures, open_until, backoff, trips, fast_fails]}
 
 # ============================================================================
 # RUNTIME STATE
@@ -45,6 +83,15 @@ start_time = 0
 # Last memory check
 last_memory_free = 0
 
+# Boot profile (filled by code.initialize)
+boot_started = 0  # monotonic() when initialize() began
+boot_profile = []  # [(stage, duration_ms, ok, network)] in run order
+boot_first_screen_ms = 0  # Time to first useful screen (clock), ms after boot_started
+boot_ready_ms = 0  # All boot stages done, ms after boot_started
+boot_import_ms = 0  # code.py top-level imports (core modules only - features load later)
+boot_mpy = False  # True when PANTALLITA_MPY_DIR (precompiled .mpy modules) is in use
+feature_import_ms = {}  # {feature: ms} import time of each loaded feature (features.sync)
+
 # ============================================================================
 # WEATHER CACHE (Phase 1)
 # ============================================================================
@@ -78,10 +125,28 @@ forecast_fetch_errors = 0
 # - LRU eviction: removes oldest when cache exceeds IMAGE_CACHE_MAX
 # - Reduces SD card reads and memory churn for images used multiple times per day
 # - Schedule images NOT cached (loaded once per schedule, then garbage collected)
-image_cache = {}  # {path: OnDiskBitmap}
+image_cache = {}  # {path: (bitmap, pixel_shader, ram_bytes)} - ram_bytes 0 = OnDiskBitmap
 image_cache_order = []  # LRU tracking list (oldest first, newest last)
 IMAGE_CACHE_MAX = 12  # Max images to cache
 
+# RAM decode tier - small indexed images (13x13 column icons, 25x28 event images)
+# are decoded with adafruit_imageload into displayio.Bitmap + Palette so display
+# refreshes never read flash. Larger images and the budget overflow stay on disk.
+# Set IMAGE_RAM_BUDGET = 0 to measure the all-OnDiskBitmap baseline.
+IMAGE_RAM_BUDGET = 16384  # Bytes of decoded pixels + palettes across the cache
+IMAGE_RAM_MAX_PIXELS = 1024  # Images larger than this stay OnDiskBitmap
+image_ram_bytes = 0  # Currently decoded bytes in the cache
+
+# Image tier counters (reset by logger.log_image_stats)
+image_fs_opens = 0  # Files opened (OnDiskBitmap header + RAM decodes)
+image_disk_shows = 0  # Images shown from OnDiskBitmap (flash read on every refresh)
+image_ram_shows = 0  # Images shown from RAM
+image_stats_start = 0  # monotonic() when counters were last reset
+
+# Sprite atlases (tools/build_assets.py) - one bitmap per image family, icons
+# picked by tile index. Cached under the atlas path like any other image.
+image_atlases = {}  # {source_dir: (atlas_path, tile_w, tile_h, {file_name: tile_index})}
+
 # ============================================================================
 # STOCKS CACHE (Phase 4)
 # ============================================================================
@@ -93,20 +158,44 @@ cached_stocks = []  # List of stock dicts from CSV
 cached_stock_prices = {}  # {symbol: {"price": float, "change_percent": float, "direction": str, "timestamp": float}}
 
 # Intraday chart cache (for single stock charts)
-cached_intraday_data = {}  # {symbol: {"data": [...], "quote": {...}, "timestamp": float}}
+cached_intraday_data = {}  # {symbol: {"data": [...], "quote": {...}, "chart": {...}, "progress": float, "timestamp": float, "chart_dirty": bool}}
+
+# Single chart bitmap (64x15, reused between showings - created on first chart)
+stock_chart_bitmap = None  # displayio.Bitmap (4 colors: clear, green, red, baseline)
+stock_chart_palette = None  # displayio.Palette
+stock_chart_tilegrid = None  # displayio.TileGrid at y=17
+
+# Previous close per symbol, fetched once per session (derives chart quotes from bars)
+stock_previous_close = {}  # {symbol: ("YYYY-MM-DD" session date, previous_close)}
+
+# WebSocket price stream (stocks_stream.py) - None socket = polling only
+stock_stream_socket = None
+stock_stream_buffer = bytearray()  # Partial frames between polls
+stock_stream_symbols = []  # Symbols subscribed on the current connection
+stock_stream_last_heartbeat = 0
+stock_stream_retry_at = 0  # monotonic time of next reconnect attempt
+stock_stream_retry_delay = 30  # Current backoff (seconds)
+stock_stream_ticks = 0  # Ticks applied on the current connection
+
+# Ages (seconds) of quotes at the moment they were displayed (for reporting)
+stock_display_ages = []
 
 # Stock rotation tracking
 stock_rotation_offset = 0  # Current position in stocks list
 
-# Stock fetch tracking
-last_stock_fetch_time = 0  # monotonic time of last fetch (for rate limiting)
-
 # Market hours tracking
 should_fetch_stocks = False  # True if within market hours, False if outside
 market_open_local_minutes = 0  # Market open time in minutes since midnight (local time)
 market_close_local_minutes = 0  # Market close time in minutes since midnight (local time)
 market_grace_end_local_minutes = 0  # Grace period end time in minutes since midnight (local time)
 
+# Market calendar (market_calendar.py) - rebuilt once per year, applied daily
+market_local_utc_offset = None  # UTC offset (hours) the RTC was synced with, None = assume ET
+market_calendar_year = None  # Year the table below was built for
+market_calendar_table = {}  # {(month, day): close_minute_et} - 0 = holiday, 780 = early close
+market_dst_start = (3, 8)  # ET DST start (month, day) for market_calendar_year
+market_dst_end = (11, 1)  # ET DST end (month, day) for market_calendar_year
+
 # Grace period optimization - track which symbols already fetched during current grace period
 grace_period_fetched_symbols = set()  # Set of symbols fetched during current grace period
 previous_grace_period_state = False  # Track previous cycle to detect transition into grace period
@@ -120,3 +209,94 @@ cached_schedules = {}  # {schedule_name: {enabled, days, start_hour, start_min,
 
 # Events from GitHub ephemeral + local recurring (loaded at startup)
 cached_events = {}  # {MMDD: [[top, bottom, image, color, start_hour, end_hour], ...]}
+
+# ============================================================================
+# DAILY TIMELINE (compiled at midnight and on reload)
+# ============================================================================
+
+# Sorted transitions and minute -> segment index for today (see timeline.py)
+timeline_date = None  # (year, month, day) the timeline was compiled for
+timeline_dirty = True  # Set by timeline.invalidate() after config/schedule/event reloads
+timeline_transitions = []  # [(minute, kind, key, is_start), ...] sorted by minute
+timeline_segments = []  # [(start_min, end_min, schedule_name, events, market_phase, transit_indices), ...]
+timeline_minute_index = None  # bytearray(1440): minute of day -> segment index
+timeline_transit_routes = []  # Route configs active today (indexed by transit_indices)
+
+# ============================================================================
+# DISPLAY PLAYLIST (playlist.py)
+# ============================================================================
+
+playlist_screens = []  # [(screen, min, max, priority, frequency, conditions), ...] in display order
+playlist_cycle_duration = 360  # Seconds every cycle's plan adds up to
+playlist_plan = []  # [[screen, seconds], ...] this cycle, in display order
+playlist_budget = 0  # Seconds this cycle's plan fills (cycle length or time to next schedule)
+playlist_started = None  # monotonic time this cycle's plan was made (None = no plan yet this cycle)
+
+# Last arrivals per transit route, shown counted down while a CTA breaker is open
+transit_arrivals_cache = {}  # {label: (arrivals, monotonic fetch time)}
+transit_data_stale = False  # Last fetch_transit_data used cached arrivals
+
+# ============================================================================
+# FLEET DIGEST (fleet_client.py)
+# ============================================================================
+
+fleet_digest = None  # Last digest from tools/fleet_server.py {v, age, weather, forecast, quotes, series, transit}
+fleet_digest_time = 0  # monotonic time of last digest fetch
+fleet_fetch_count = 0
+fleet_fetch_errors = 0
+
+# ============================================================================
+# HEAP MANAGER (heap.py)
+# ============================================================================
+
+heap_alloc_at_collect = 0  # gc.mem_alloc() right after the last collection
+heap_collections = 0  # Collections since the last heap.log_stats
+heap_idle_collections = 0  # ... of which during idle dwell
+heap_probes = 0  # Largest-block probes since the last report
+heap_pause_ms = 0  # Total collection + probe pause since the last report
+heap_pause_max_ms = 0
+heap_probe_time = 0  # monotonic time of the last largest-block probe
+heap_largest_block = 0  # Bytes, last probe
+heap_min_block = None  # Smallest largest-block seen this run (None = never probed)
+heap_releases = 0  # Cache releases (low / fragmented heap) this run
+
+# ============================================================================
+# CONFIG SNAPSHOT (snapshot.py)
+# ============================================================================
+
+snapshot_sources = {}  # {source: (crc32 of its text, JSON of its parse result, (size, mtime, salt) of a local file or None)}
+snapshot_dirty = False  # A source changed since the file was written
+snapshot_writable = True  # False after a write failed (CIRCUITPY read-only)
+snapshot_file_bytes = 0
+snapshot_load_ms = 0  # Boot read + index of the snapshot file
+snapshot_saves = 0
+snapshot_bench = {"text": [0, 0, 0], "snapshot": [0, 0, 0]}  # [loads, ms, peak heap bytes] since the last report
+
+# ============================================================================
+# THIN-CLIENT FRAMES (display_frame.py)
+# ============================================================================
+
+# One bitmap for every server-rendered screen (created on the first frame)
+frame_bitmap = None  # displayio.Bitmap 64x32, 256 colors
+frame_palette = None  # displayio.Palette(256)
+frame_grid = None  # displayio.TileGrid showing frame_bitmap
+frame_row = None  # bytearray(64) - 4-bit rows are expanded here before the blit
+frame_crc = 0  # crc32 of the frame in frame_bitmap (row-delta base for the next fetch)
+frame_fetch_count = 0
+frame_fetch_errors = 0
+frame_bytes = 0  # Total frame bytes received
+
+# Render benchmark - closed by the screen's first hardware.wait, reported by logger.log_render_stats
+render_probe = None  # (name, monotonic start, gc.mem_free at start) of the screen being built
+render_bench = {}  # {"weather frame": [count, seconds, heap bytes], "weather native": [...], ...}
+
+# ============================================================================
+# API QUOTA BUDGETS
+# ============================================================================
+
+# Per-provider buckets (see quota.py): {provider: [per_minute, per_day, minute_tokens, last_refill, day_used, denied]}
+quota_buckets = {}
+quota_day = None  # (year, month, day) the day counters belong to
+quota_tracking_start_minutes = 0  # Minute of day counting started (for projections)
+quota_last_save = 0  # monotonic time of last NVM write
+quota_save_pending = False  # Counters changed since last NVM write
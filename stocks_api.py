@@ -8,6 +8,12 @@ import time
 import config
 import state
 import logger
+import quota
+import breaker
+import connections
+import netbuf
+import snapshot
+import fleet_client
 
 # ============================================================================
 # STOCKS CSV LOADING (INLINE)
@@ -54,8 +60,8 @@ def load_stocks_from_github():
 			logger.log(f"GitHub stocks fetch failed: HTTP {response.status_code}", config.LogLevel.WARNING, area="STOCKS")
 			return []
 
-		# Parse CSV content (inline)
-		return parse_stocks_csv_content(response.text)
+		# Parse straight from the receive buffer, only when it changed since the snapshot
+		return snapshot.parsed("github:stocks.csv", netbuf.read(response, spill=True), parse_stocks_csv_content)
 
 	except Exception as e:
 		logger.log(f"GitHub stocks fetch failed: {e}", config.LogLevel.WARNING, area="STOCKS")
@@ -76,9 +82,8 @@ def load_stocks_from_local():
 	INLINE - all parsing inline
 	"""
 	try:
-		with open('/stocks.csv', 'r') as f:
-			content = f.read()
-		return parse_stocks_csv_content(content)
+		# Read and parsed only when the file changed since the snapshot
+		return snapshot.parsed_file("stocks.csv", '/stocks.csv', parse_stocks_csv_content)
 
 	except OSError:
 		logger.log("Local stocks.csv not found", config.LogLevel.DEBUG, area="STOCKS")
@@ -105,9 +110,7 @@ def parse_stocks_csv_content(csv_content):
 	stocks = []
 
 	try:
-		lines = csv_content.strip().split('\n')
-
-		for line in lines:
+		for line in netbuf.lines(csv_content):
 			line = line.strip()
 
 			# Skip empty lines and comments
@@ -158,18 +161,36 @@ def fetch_stock_quotes(symbols_to_fetch):
 		symbols_to_fetch: List of stock symbols ["AAPL", "MSFT", ...]
 
 	Returns:
-		dict: {symbol: {"price": float, "change_percent": float, "direction": str, "open_price": float}}
+		dict: {symbol: {"price": float, "change_percent": float, "direction": str, "open_price": float,
+		                "previous_close": float, "date": "YYYY-MM-DD"}}
 
 	INLINE - all parsing inline, no helper functions
 	"""
 	if not symbols_to_fetch:
 		return {}
 
+	# Fleet client mode: quotes come from the aggregator's digest
+	if fleet_client.is_enabled():
+		return fleet_client.quotes(symbols_to_fetch)
+
 	# Check API key
 	if not config.Env.TWELVE_DATA_API_KEY:
 		logger.log("TWELVE_DATA_API_KEY not configured", config.LogLevel.ERROR, area="STOCKS")
 		return {}
 
+	# Socket timeout from the remaining fetch budget (no time left = use cache)
+	timeout = connections.request_timeout()
+	if timeout is None:
+		return {}
+
+	# Provider circuit breaker (fail fast to cache during outages)
+	if not breaker.allow(quota.TWELVE_DATA):
+		return {}
+
+	# Reserve API quota - 1 credit per symbol (skip and use cache when exhausted)
+	if not quota.reserve(quota.TWELVE_DATA, len(symbols_to_fetch)):
+		return {}
+
 	response = None
 	stock_data = {}
 
@@ -181,14 +202,15 @@ def fetch_stock_quotes(symbols_to_fetch):
 		url = f"https://api.twelvedata.com/quote?symbol={symbols_str}&apikey={config.Env.TWELVE_DATA_API_KEY}"
 
 		logger.log(f"Fetching quotes: {symbols_str}", config.LogLevel.DEBUG, area="STOCKS")
-		response = state.session.get(url, timeout=10)
+		response = state.session.get(url, timeout=timeout)
+		breaker.record(quota.TWELVE_DATA, response.status_code < 500)
 
 		if response.status_code != 200:
 			logger.log(f"Stock API error: HTTP {response.status_code}", config.LogLevel.ERROR, area="STOCKS")
 			return {}
 
 		# Parse JSON (inline)
-		data = response.json()
+		data = netbuf.load_json(response)
 
 		# Handle Twelve Data response formats (inline)
 		# Single symbol: {"symbol": "AAPL", "close": ..., "percent_change": ...}
@@ -219,12 +241,15 @@ def fetch_stock_quotes(symbols_to_fetch):
 			try:
 				price = float(quote.get("close", 0))
 				open_price = float(quote.get("open", 0))
+				previous_close = float(quote.get("previous_close", 0))
 				change_percent = float(quote.get("percent_change", 0))
 				direction = "up" if change_percent >= 0 else "down"
 
 				stock_data[symbol] = {
 					"price": price,
 					"open_price": open_price,
+					"previous_close": previous_close,
+					"date": quote.get("datetime", "")[:10],
 					"change_percent": change_percent,
 					"direction": direction
 				}
@@ -237,6 +262,8 @@ def fetch_stock_quotes(symbols_to_fetch):
 		return stock_data
 
 	except Exception as e:
+		if response is None:
+			breaker.record_no_response(quota.TWELVE_DATA, timeout)  # No response: timeout / DNS / socket error
 		logger.log(f"Stock quotes fetch failed: {e}", config.LogLevel.ERROR, area="STOCKS")
 		return {}
 
@@ -268,10 +295,27 @@ def fetch_intraday_time_series(symbol, interval="15min", outputsize=26):
 
 	INLINE - all parsing inline, no helper functions
 	"""
+	# Fleet client mode: the digest carries the full day (refresh_intraday merges it like a full fetch)
+	if fleet_client.is_enabled():
+		return fleet_client.series(symbol)
+
 	if not config.Env.TWELVE_DATA_API_KEY:
 		logger.log("TWELVE_DATA_API_KEY not configured", config.LogLevel.ERROR, area="STOCKS")
 		return []
 
+	# Socket timeout from the remaining fetch budget (no time left = use cache)
+	timeout = connections.request_timeout()
+	if timeout is None:
+		return []
+
+	# Provider circuit breaker (fail fast to cache during outages)
+	if not breaker.allow(quota.TWELVE_DATA):
+		return []
+
+	# Reserve API quota (skip and use cache when exhausted)
+	if not quota.reserve(quota.TWELVE_DATA):
+		return []
+
 	response = None
 
 	try:
@@ -279,14 +323,15 @@ def fetch_intraday_time_series(symbol, interval="15min", outputsize=26):
 		url = f"https://api.twelvedata.com/time_series?symbol={symbol}&interval={interval}&outputsize={outputsize}&apikey={config.Env.TWELVE_DATA_API_KEY}"
 
 		logger.log(f"Fetching intraday for {symbol}...", config.LogLevel.DEBUG, area="STOCKS")
-		response = state.session.get(url, timeout=10)
+		response = state.session.get(url, timeout=timeout)
+		breaker.record(quota.TWELVE_DATA, response.status_code < 500)
 
 		if response.status_code != 200:
 			logger.log(f"Time series API error: HTTP {response.status_code}", config.LogLevel.ERROR, area="STOCKS")
 			return []
 
 		# Parse JSON (inline)
-		data = response.json()
+		data = netbuf.load_json(response)
 
 		# Check for errors (inline)
 		if "status" in data and data["status"] == "error":
@@ -319,6 +364,8 @@ def fetch_intraday_time_series(symbol, interval="15min", outputsize=26):
 		return time_series
 
 	except Exception as e:
+		if response is None:
+			breaker.record_no_response(quota.TWELVE_DATA, timeout)  # No response: timeout / DNS / socket error
 		logger.log(f"Time series fetch failed for {symbol}: {e}", config.LogLevel.ERROR, area="STOCKS")
 		return []
 
@@ -328,3 +375,132 @@ def fetch_intraday_time_series(symbol, interval="15min", outputsize=26):
 				response.close()
 			except:
 				pass
+
+
+# ============================================================================
+# CHART DECIMATION AT INGEST (INLINE)
+# ============================================================================
+
+def build_chart_columns(time_series, opening_price, progress_ratio):
+	"""
+	Precompute the intraday chart as one y-value per pixel column.
+
+	Runs once when data arrives so the display path only draws. Series longer
+	than the visible width are decimated with LTTB (largest triangle three
+	buckets), which keeps intraday highs and lows that nearest-index sampling
+	would skip. Shorter series are linearly interpolated across the width.
+
+	Args:
+		time_series: List of {datetime, open_price, close_price} (chronological)
+		opening_price: Day open for bicolor coloring (None = use first bar)
+		progress_ratio: Fraction of the trading day elapsed (1.0 = full width)
+
+	Returns:
+		dict: {
+			'ys': bytearray(64) row offset within chart (0 = top), 0xFF = empty,
+			'above': bytearray(8) bitmask, bit set = column at/above open,
+			'width': number of populated columns,
+			'open_y': row offset of the opening price, 0xFF = outside chart range,
+			'open_price': float
+		}
+		or None if time_series is empty
+
+	INLINE - all decimation and scaling inline
+	"""
+	CHART_WIDTH = config.Display.WIDTH
+	CHART_HEIGHT = 15
+
+	if not time_series:
+		return None
+
+	prices = [point["close_price"] for point in time_series]
+	num_points = len(prices)
+
+	if opening_price is None or opening_price == 0:
+		opening_price = time_series[0].get("open_price") or prices[0]
+
+	display_width = min(max(int(progress_ratio * CHART_WIDTH), 2), CHART_WIDTH)
+
+	# Column -> price (inline)
+	column_prices = []
+	if num_points == 1:
+		column_prices.append(prices[0])
+	elif num_points <= display_width:
+		# Interpolate between points so every column has a value
+		for x in range(display_width):
+			pos = x * (num_points - 1) / (display_width - 1)
+			i = int(pos)
+			if i >= num_points - 1:
+				column_prices.append(prices[-1])
+			else:
+				frac = pos - i
+				column_prices.append(prices[i] + (prices[i + 1] - prices[i]) * frac)
+	elif display_width <= 2:
+		# Too early in the day for buckets - first and last bar
+		column_prices.append(prices[0])
+		column_prices.append(prices[-1])
+	else:
+		# LTTB: keep first and last, one point per bucket in between
+		column_prices.append(prices[0])
+		bucket_size = (num_points - 2) / (display_width - 2)
+		selected = 0
+		for bucket in range(display_width - 2):
+			start = int(bucket * bucket_size) + 1
+			end = int((bucket + 1) * bucket_size) + 1
+
+			# Average of the next bucket (last point for the final bucket)
+			next_start = end
+			next_end = min(int((bucket + 2) * bucket_size) + 1, num_points)
+			if next_start >= next_end:
+				avg_x = num_points - 1
+				avg_y = prices[-1]
+			else:
+				avg_x = (next_start + next_end - 1) / 2
+				total = 0
+				for j in range(next_start, next_end):
+					total += prices[j]
+				avg_y = total / (next_end - next_start)
+
+			# Point in this bucket forming the largest triangle
+			ax = selected
+			ay = prices[selected]
+			best_area = -1
+			best_index = start
+			for j in range(start, end):
+				area = abs((ax - avg_x) * (prices[j] - ay) - (ax - j) * (avg_y - ay))
+				if area > best_area:
+					best_area = area
+					best_index = j
+
+			column_prices.append(prices[best_index])
+			selected = best_index
+		column_prices.append(prices[-1])
+
+	# Scale to chart rows and build color bitmask (inline)
+	min_price = min(prices)
+	max_price = max(prices)
+	price_range = max_price - min_price
+	if price_range == 0:
+		price_range = 1
+
+	ys = bytearray(b"\xff" * CHART_WIDTH)
+	above = bytearray(CHART_WIDTH // 8)
+	for x in range(len(column_prices)):
+		price = column_prices[x]
+		price_scaled = (price - min_price) / price_range
+		ys[x] = CHART_HEIGHT - 1 - int(price_scaled * (CHART_HEIGHT - 1))
+		if price >= opening_price:
+			above[x >> 3] |= 1 << (x & 7)
+
+	# Baseline row at the opening price (only when it falls inside the range)
+	open_y = 0xFF
+	if min_price <= opening_price <= max_price:
+		open_y = CHART_HEIGHT - 1 - int((opening_price - min_price) / price_range * (CHART_HEIGHT - 1))
+
+	return {
+		'ys': ys,
+		'above': above,
+		'width': len(column_prices),
+		'open_y': open_y,
+		'open_price': opening_price
+	}
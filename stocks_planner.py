@@ -0,0 +1,291 @@
+"""
+Pantallita 3.0 - Stocks Refresh Planner
+Refreshes the whole non-highlighted watchlist in credit-sized batches
+Upcoming rotation symbols first, each symbol at most once per freshness window
+INLINE ARCHITECTURE - all planning inline, no helper functions
+"""
+
+import time
+import config
+import state
+import logger
+import quota
+import stocks_api
+
+
+# ============================================================================
+# BATCH PLANNING (INLINE)
+# ============================================================================
+
+def plan_batch(stocks_list, offset, is_grace_period, max_credits, force=False):
+	"""
+	Pick the next symbols to refresh, in rotation order starting at offset.
+
+	A symbol needs a refresh when:
+	- It has no cached price (always, even outside market hours)
+	- Market hours: its cached price is older than STOCKS_QUOTE_FRESHNESS
+	- Grace period: it has not been fetched yet this grace period
+
+	Args:
+		stocks_list: state.cached_stocks
+		offset: Current rotation offset (symbols shown next come first)
+		is_grace_period: True during the post-close grace period
+		max_credits: Maximum symbols in this batch (1 credit each)
+		force: Treat as market hours even when state.should_fetch_stocks is
+		       not set yet this cycle (off-cycle refresh, market open)
+
+	Returns:
+		list: Symbols to fetch (may be empty)
+
+	INLINE - single pass over the watchlist
+	"""
+	batch = []
+	if max_credits <= 0 or not stocks_list:
+		return batch
+
+	now_time = time.monotonic()
+	count = len(stocks_list)
+
+	for i in range(count):
+		stock = stocks_list[(offset + i) % count]
+		if stock.get('highlight') == True:
+			continue
+
+		symbol = stock['symbol']
+		if symbol in batch:
+			continue
+
+		cached = state.cached_stock_prices.get(symbol)
+		if cached is None:
+			needs_refresh = True
+		elif not (force or state.should_fetch_stocks):
+			needs_refresh = False  # Outside hours - cached close is final
+		elif is_grace_period:
+			needs_refresh = symbol not in state.grace_period_fetched_symbols
+		else:
+			needs_refresh = now_time - cached['timestamp'] >= config.Timing.STOCKS_QUOTE_FRESHNESS or cached['timestamp'] < state.force_refresh_at
+
+		if needs_refresh:
+			batch.append(symbol)
+			if len(batch) >= max_credits:
+				break
+
+	return batch
+
+
+def refresh(stocks_list, offset, is_grace_period, force=False):
+	"""
+	Fetch one credit-sized batch of stale watchlist quotes.
+
+	Batch size is what the Twelve Data minute budget allows right now, minus a
+	reserve kept for the highlighted chart, capped at STOCKS_BATCH_MAX. Calling
+	this every cycle spreads the watchlist across the minute budget.
+
+	Args:
+		force: See plan_batch (the caller knows the market is open)
+
+	Returns:
+		int: Number of quotes refreshed
+	"""
+	# Keep credits for the highlighted chart if the watchlist has one
+	has_highlight = False
+	for stock in stocks_list:
+		if stock.get('highlight') == True:
+			has_highlight = True
+			break
+	chart_reserve = config.Timing.STOCKS_CHART_RESERVE if has_highlight else 0
+
+	credits = min(quota.available(quota.TWELVE_DATA) - chart_reserve, config.Timing.STOCKS_BATCH_MAX)
+	batch = plan_batch(stocks_list, offset, is_grace_period, credits, force)
+	if not batch:
+		return 0
+
+	logger.log(f"Refreshing {len(batch)} quotes: {', '.join(batch)}", config.LogLevel.DEBUG, area="STOCKS")
+	quotes = stocks_api.fetch_stock_quotes(batch)
+	if not quotes:
+		return 0
+
+	now_time = time.monotonic()
+	for sym, data in quotes.items():
+		state.cached_stock_prices[sym] = {
+			'price': data['price'],
+			'change_percent': data['change_percent'],
+			'direction': data['direction'],
+			'timestamp': now_time
+		}
+		record_previous_close(sym, data)
+
+	# Track symbols as fetched during grace period (optimization)
+	if is_grace_period:
+		for sym in quotes.keys():
+			state.grace_period_fetched_symbols.add(sym)
+		logger.log(f"Added {len(quotes)} symbols to grace period tracking", config.LogLevel.DEBUG, area="STOCKS")
+
+	return len(quotes)
+
+
+# ============================================================================
+# DISPLAYED QUOTE AGE TRACKING (INLINE)
+# ============================================================================
+
+def record_display_ages(symbols):
+	"""
+	Record the cache age of each quote as it is shown (bounded sample list).
+	"""
+	now_time = time.monotonic()
+	for symbol in symbols:
+		cached = state.cached_stock_prices.get(symbol)
+		if cached is None:
+			continue
+		state.stock_display_ages.append(int(now_time - cached['timestamp']))
+
+	# Keep the most recent samples only
+	overflow = len(state.stock_display_ages) - config.Timing.STOCKS_AGE_SAMPLES
+	if overflow > 0:
+		del state.stock_display_ages[:overflow]
+
+
+def log_age_distribution():
+	"""
+	Log min / median / p90 / max age of displayed quotes, then reset samples.
+	"""
+	ages = state.stock_display_ages
+	if not ages:
+		return
+
+	ages.sort()
+	count = len(ages)
+	median = ages[count // 2]
+	p90 = ages[min(count - 1, (count * 9) // 10)]
+
+	# Only market-hours quotes are expected to stay within the freshness window
+	fresh_limit = config.Timing.STOCKS_QUOTE_FRESHNESS
+	within = 0
+	for age in ages:
+		if age <= fresh_limit:
+			within += 1
+
+	logger.log(f"Displayed quote age ({count} samples): min {logger.format_cache_age(ages[0])}, median {logger.format_cache_age(median)}, p90 {logger.format_cache_age(p90)}, max {logger.format_cache_age(ages[-1])}, {within * 100 // count}% within {logger.format_cache_age(fresh_limit)}", config.LogLevel.INFO, area="STOCKS")
+
+	state.stock_display_ages = []
+
+
+# ============================================================================
+# INCREMENTAL INTRADAY UPDATES (INLINE)
+# ============================================================================
+
+def refresh_intraday(symbol, cached_series):
+	"""
+	Fetch only the intraday bars missing from the cached series.
+
+	Full refetch (STOCKS_INTRADAY_BARS) when:
+	- Nothing is cached yet
+	- The cached series is from an earlier trading day
+	- More than STOCKS_INTRADAY_GAP_MAX bars are missing, or the overlap is lost
+
+	Otherwise requests missing bars + STOCKS_INTRADAY_OVERLAP, replaces the
+	overlapping bars (the last one may have been still forming) and appends.
+
+	Args:
+		symbol: Highlighted stock symbol
+		cached_series: Cached [{datetime, open_price, close_price}, ...] or None
+
+	Returns:
+		list: Updated chronological series, or [] if the fetch failed
+	"""
+	full_size = config.Timing.STOCKS_INTRADAY_BARS
+	outputsize = full_size
+
+	if cached_series:
+		# Bar datetimes are exchange time: "YYYY-MM-DD HH:MM:SS"
+		last_bar = cached_series[-1]["datetime"]
+		now = state.rtc.datetime
+		today = f"{now.tm_year:04d}-{now.tm_mon:02d}-{now.tm_mday:02d}"
+
+		if last_bar[:10] == today and state.market_open_local_minutes > 0:
+			try:
+				last_bar_minutes = int(last_bar[11:13]) * 60 + int(last_bar[14:16])
+				# Exchange minutes now, using the 9:30 ET open as the anchor
+				now_minutes = now.tm_hour * 60 + now.tm_min - state.market_open_local_minutes + 570
+				missing = (now_minutes - last_bar_minutes) // 5
+				if 0 <= missing <= config.Timing.STOCKS_INTRADAY_GAP_MAX:
+					outputsize = missing + config.Timing.STOCKS_INTRADAY_OVERLAP
+			except ValueError:
+				pass  # Unexpected datetime format - full refetch
+
+	new_series = stocks_api.fetch_intraday_time_series(symbol, interval="5min", outputsize=outputsize)
+	if not new_series or outputsize == full_size:
+		return new_series
+
+	# Merge: first new bar must overlap the cached series, else there is a gap
+	first_new = new_series[0]["datetime"]
+	if first_new > cached_series[-1]["datetime"]:
+		logger.log(f"Intraday gap for {symbol} ({cached_series[-1]['datetime']} -> {first_new}) - full refetch", config.LogLevel.INFO, area="STOCKS")
+		return stocks_api.fetch_intraday_time_series(symbol, interval="5min", outputsize=full_size)
+
+	keep = len(cached_series)
+	while keep > 0 and cached_series[keep - 1]["datetime"] >= first_new:
+		keep -= 1
+	merged = cached_series[:keep] + new_series
+	if len(merged) > full_size:
+		merged = merged[-full_size:]
+
+	logger.log(f"Intraday update for {symbol}: {len(new_series)} bars fetched, {len(merged) - len(cached_series)} new", config.LogLevel.DEBUG, area="STOCKS")
+	return merged
+
+
+# ============================================================================
+# CHART QUOTE FROM INTRADAY BARS (INLINE)
+# ============================================================================
+
+def record_previous_close(symbol, quote):
+	"""
+	Remember a quote's previous close for its session date (once per day).
+	"""
+	if quote.get("previous_close") and quote.get("date"):
+		state.stock_previous_close[symbol] = (quote["date"], quote["previous_close"])
+
+
+def derive_quote(symbol, series):
+	"""
+	Build the chart quote from intraday bars instead of a quote call.
+
+	- price: last bar close
+	- open_price: first bar open of the latest session in the series
+	- change_percent: price vs the cached previous close for that session
+
+	Args:
+		symbol: Highlighted stock symbol
+		series: Chronological [{datetime, open_price, close_price}, ...]
+
+	Returns:
+		dict: Same shape as fetch_stock_quotes() entries, or None when the
+		previous close for the series' session is not cached yet
+	"""
+	if not series:
+		return None
+
+	session_date = series[-1]["datetime"][:10]
+	cached = state.stock_previous_close.get(symbol)
+	if cached is None or cached[0] != session_date:
+		return None
+
+	previous_close = cached[1]
+	price = series[-1]["close_price"]
+
+	# First bar of the latest session (series may still hold yesterday's tail)
+	open_price = series[0]["open_price"]
+	for point in series:
+		if point["datetime"][:10] == session_date:
+			open_price = point["open_price"]
+			break
+
+	change_percent = (price - previous_close) * 100 / previous_close
+	return {
+		"price": price,
+		"open_price": open_price,
+		"previous_close": previous_close,
+		"date": session_date,
+		"change_percent": change_percent,
+		"direction": "up" if change_percent >= 0 else "down"
+	}
@@ -0,0 +1,338 @@
+"""
+Pantallita 3.0 - Stocks Streaming Module
+Optional WebSocket price stream (Twelve Data /quotes/price protocol)
+Ticks update state.cached_stock_prices and the intraday series in place;
+while the stream is down, the normal polling path takes over automatically
+INLINE ARCHITECTURE - minimal RFC 6455 client over socketpool, no helper chains
+"""
+
+import time
+import json
+import os
+import binascii
+import config
+import state
+import logger
+
+# WebSocket opcodes
+OP_TEXT = 0x1
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+RECV_CHUNK = 512
+BUFFER_MAX = 4096
+
+
+# ============================================================================
+# CONNECTION (INLINE)
+# ============================================================================
+
+def connect(symbols):
+	"""
+	Open the WebSocket, complete the upgrade handshake and subscribe.
+
+	URL comes from config.Env.TWELVE_DATA_WS_URL (ws:// for the local mock
+	server in tools/mock_ws_server.py, wss:// for Twelve Data).
+
+	Returns:
+		bool: True if connected and subscribed
+	"""
+	if state.socket_pool is None or not symbols:
+		return False
+
+	url = config.Env.TWELVE_DATA_WS_URL
+	secure = url.startswith("wss://")
+	rest = url.split("://", 1)[1]
+	if "/" in rest:
+		host_port, path = rest.split("/", 1)
+		path = "/" + path
+	else:
+		host_port, path = rest, "/"
+	if ":" in host_port:
+		host, port = host_port.split(":", 1)
+		port = int(port)
+	else:
+		host = host_port
+		port = 443 if secure else 80
+
+	if config.Env.TWELVE_DATA_API_KEY:
+		path = f"{path}?apikey={config.Env.TWELVE_DATA_API_KEY}"
+
+	sock = None
+	try:
+		addr = state.socket_pool.getaddrinfo(host, port)[0][4]
+		sock = state.socket_pool.socket(state.socket_pool.AF_INET, state.socket_pool.SOCK_STREAM)
+		sock.settimeout(10)
+		if secure:
+			import ssl
+			sock = ssl.create_default_context().wrap_socket(sock, server_hostname=host)
+		sock.connect(addr)
+
+		# Upgrade handshake (inline)
+		key = binascii.b2a_base64(os.urandom(16)).strip().decode()
+		request = f"GET {path} HTTP/1.1\r\nHost: {host}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\nSec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n"
+		sock.send(request.encode())
+
+		header = bytearray()
+		chunk = bytearray(RECV_CHUNK)
+		while b"\r\n\r\n" not in header:
+			count = sock.recv_into(chunk)
+			if count == 0:
+				raise OSError("closed during handshake")
+			header.extend(chunk[:count])
+			if len(header) > BUFFER_MAX:
+				raise OSError("handshake header too large")
+
+		end = header.find(b"\r\n\r\n") + 4
+		status_line = bytes(header[:header.find(b"\r\n")])
+		if b" 101 " not in status_line:
+			raise OSError(f"upgrade refused: {status_line.decode()}")
+
+		sock.settimeout(0)  # Non-blocking from here on
+		state.stock_stream_socket = sock
+		state.stock_stream_buffer = bytearray(header[end:])  # Frames sent right after the upgrade
+		state.stock_stream_symbols = list(symbols)
+		state.stock_stream_last_heartbeat = time.monotonic()
+		state.stock_stream_ticks = 0
+
+		subscribe = {"action": "subscribe", "params": {"symbols": ",".join(symbols)}}
+		send_frame(OP_TEXT, json.dumps(subscribe).encode())
+
+		state.stock_stream_retry_delay = config.Timing.STOCKS_STREAM_RETRY_MIN
+		logger.log(f"Price stream connected ({host}), subscribed {len(symbols)} symbols", config.LogLevel.INFO, area="STREAM")
+		return True
+
+	except Exception as e:
+		logger.log(f"Price stream connect failed: {e} - polling", config.LogLevel.WARNING, area="STREAM")
+		if sock:
+			try:
+				sock.close()
+			except:
+				pass
+		state.stock_stream_socket = None
+		schedule_retry()
+		return False
+
+
+def disconnect(reason):
+	"""
+	Close the socket and schedule a reconnect (polling covers the gap).
+	"""
+	if state.stock_stream_socket is not None:
+		try:
+			state.stock_stream_socket.close()
+		except:
+			pass
+		logger.log(f"Price stream closed ({reason}) after {state.stock_stream_ticks} ticks - falling back to polling", config.LogLevel.WARNING, area="STREAM")
+	state.stock_stream_socket = None
+	state.stock_stream_buffer = bytearray()
+	schedule_retry()
+
+
+def schedule_retry():
+	"""
+	Exponential backoff between reconnect attempts.
+	"""
+	delay = state.stock_stream_retry_delay
+	state.stock_stream_retry_at = time.monotonic() + delay
+	state.stock_stream_retry_delay = min(delay * 2, config.Timing.STOCKS_STREAM_RETRY_MAX)
+
+
+def is_live():
+	"""True while the stream socket is open."""
+	return state.stock_stream_socket is not None
+
+
+def ensure_connected():
+	"""
+	Connect (or reconnect after backoff) when streaming is enabled.
+	Subscribes to every symbol in state.cached_stocks.
+	"""
+	symbols = [stock['symbol'] for stock in state.cached_stocks]
+	if state.stock_stream_socket is not None:
+		if symbols != state.stock_stream_symbols:
+			disconnect("watchlist changed")
+			state.stock_stream_retry_at = 0  # Resubscribe right away
+		else:
+			return True
+
+	if time.monotonic() < state.stock_stream_retry_at:
+		return False
+	return connect(symbols)
+
+
+# ============================================================================
+# FRAMES (INLINE)
+# ============================================================================
+
+def send_frame(opcode, payload):
+	"""
+	Send one masked client frame (RFC 6455 requires client masking).
+	"""
+	length = len(payload)
+	if length < 126:
+		header = bytearray((0x80 | opcode, 0x80 | length))
+	else:
+		header = bytearray((0x80 | opcode, 0x80 | 126, length >> 8, length & 0xFF))
+
+	mask = os.urandom(4)
+	masked = bytearray(payload)
+	for i in range(length):
+		masked[i] ^= mask[i & 3]
+
+	state.stock_stream_socket.send(header + mask + masked)
+
+
+def poll():
+	"""
+	Drain the socket without blocking and apply complete frames.
+	Cheap to call from display wait loops; sends the heartbeat when due.
+
+	Returns:
+		int: Price ticks applied
+	"""
+	sock = state.stock_stream_socket
+	if sock is None:
+		return 0
+
+	applied = 0
+	try:
+		# Heartbeat keeps the server-side subscription alive
+		now_time = time.monotonic()
+		if now_time - state.stock_stream_last_heartbeat >= config.Timing.STOCKS_STREAM_HEARTBEAT:
+			send_frame(OP_TEXT, b'{"action":"heartbeat"}')
+			state.stock_stream_last_heartbeat = now_time
+
+		# Read everything available (inline)
+		chunk = bytearray(RECV_CHUNK)
+		while True:
+			try:
+				count = sock.recv_into(chunk)
+			except OSError as e:
+				if e.args and e.args[0] in (11, 35, 116):  # EAGAIN / EWOULDBLOCK / ETIMEDOUT
+					break
+				raise
+			if count == 0:
+				disconnect("server closed")
+				return applied
+			state.stock_stream_buffer.extend(chunk[:count])
+			if len(state.stock_stream_buffer) > BUFFER_MAX:
+				disconnect("receive buffer overflow")
+				return applied
+
+		# Parse complete frames (inline)
+		buf = state.stock_stream_buffer
+		pos = 0
+		while len(buf) - pos >= 2:
+			opcode = buf[pos] & 0x0F
+			length = buf[pos + 1] & 0x7F
+			header_len = 2
+			if length == 126:
+				if len(buf) - pos < 4:
+					break
+				length = (buf[pos + 2] << 8) | buf[pos + 3]
+				header_len = 4
+			elif length == 127:
+				disconnect("oversized frame")
+				return applied
+
+			if len(buf) - pos < header_len + length:
+				break  # Incomplete frame - wait for more bytes
+
+			payload = bytes(buf[pos + header_len:pos + header_len + length])
+			pos += header_len + length
+
+			if opcode == OP_TEXT:
+				message = json.loads(payload)
+				event = message.get("event")
+				if event == "price":
+					if apply_tick(message.get("symbol"), float(message.get("price", 0)), int(message.get("timestamp", 0))):
+						applied += 1
+				elif event == "subscribe-status":
+					fails = message.get("fails") or []
+					if fails:
+						failed = [f.get("symbol", "?") for f in fails]
+						logger.log(f"Stream rejected: {', '.join(failed)} (polled instead)", config.LogLevel.INFO, area="STREAM")
+			elif opcode == OP_PING:
+				send_frame(OP_PONG, payload)
+			elif opcode == OP_CLOSE:
+				disconnect("close frame")
+				return applied
+
+		del buf[:pos]
+
+	except Exception as e:
+		disconnect(f"error: {e}")
+
+	state.stock_stream_ticks += applied
+	return applied
+
+
+# ============================================================================
+# TICK APPLICATION (INLINE)
+# ============================================================================
+
+def apply_tick(symbol, price, timestamp):
+	"""
+	Update cached price and the intraday series for one price event.
+
+	- Multi-stock cache: price, change vs previous close, timestamp (the
+	  refresh planner then treats the symbol as fresh and skips polling it)
+	- Intraday series: close of the current 5-minute bar, or a new bar
+	  (same session only); the chart is rebuilt lazily before display
+
+	Returns:
+		bool: True if the tick was applied
+	"""
+	if not symbol or price <= 0:
+		return False
+
+	now_time = time.monotonic()
+
+	# Previous close: cached per session, else implied by the last polled quote
+	previous_close = None
+	if symbol in state.stock_previous_close:
+		previous_close = state.stock_previous_close[symbol][1]
+	cached = state.cached_stock_prices.get(symbol)
+	if previous_close is None and cached is not None and cached['change_percent'] != -100:
+		previous_close = cached['price'] / (1 + cached['change_percent'] / 100)
+
+	if previous_close:
+		change_percent = (price - previous_close) * 100 / previous_close
+		state.cached_stock_prices[symbol] = {
+			'price': price,
+			'change_percent': change_percent,
+			'direction': "up" if change_percent >= 0 else "down",
+			'timestamp': now_time
+		}
+
+	# Intraday series (highlighted symbols)
+	intraday = state.cached_intraday_data.get(symbol)
+	if intraday and intraday['data'] and timestamp > 0:
+		# Bar start in exchange time (ET, DST from the market calendar)
+		now = state.rtc.datetime
+		today = (now.tm_mon, now.tm_mday)
+		et_offset = -4 if state.market_dst_start <= today < state.market_dst_end else -5
+		bar = time.localtime(timestamp - timestamp % 300 + et_offset * 3600)
+		bar_datetime = f"{bar.tm_year:04d}-{bar.tm_mon:02d}-{bar.tm_mday:02d} {bar.tm_hour:02d}:{bar.tm_min:02d}:00"
+
+		series = intraday['data']
+		last = series[-1]
+		if bar_datetime == last['datetime']:
+			last['close_price'] = price
+		elif bar_datetime > last['datetime'] and bar_datetime[:10] == last['datetime'][:10]:
+			series.append({"datetime": bar_datetime, "open_price": price, "close_price": price})
+			if len(series) > config.Timing.STOCKS_INTRADAY_BARS:
+				del series[0]
+		else:
+			return previous_close is not None
+
+		quote = intraday.get('quote')
+		if quote and previous_close:
+			quote['price'] = price
+			quote['change_percent'] = (price - previous_close) * 100 / previous_close
+			quote['direction'] = "up" if quote['change_percent'] >= 0 else "down"
+		intraday['chart_dirty'] = True
+
+	return True
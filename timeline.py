@@ -0,0 +1,313 @@
+"""
+Pantallita 3.0 - Daily Timeline Module
+Compiles every time-triggered behavior (schedules, events, market hours,
+transit commute windows) into one sorted list of transitions for the day
+INLINE ARCHITECTURE - compile once, answer lookups with a single index read
+"""
+
+import config
+import state
+import logger
+
+# Market phases stored per segment
+MARKET_CLOSED = 0
+MARKET_OPEN = 1
+MARKET_GRACE = 2
+
+# Transition kinds (used in state.timeline_transitions and logs)
+KIND_SCHEDULE = "schedule"
+KIND_EVENT = "event"
+KIND_MARKET = "market"
+KIND_GRACE = "grace"
+KIND_TRANSIT = "transit"
+
+
+# ============================================================================
+# INVALIDATION
+# ============================================================================
+
+def invalidate():
+	"""
+	Mark the timeline stale so it is recompiled on the next lookup.
+	Call after config, schedules, events or market hours are reloaded.
+	"""
+	state.timeline_dirty = True
+
+
+# ============================================================================
+# COMPILATION (INLINE)
+# ============================================================================
+
+def compile_day(rtc):
+	"""
+	Compile today's transitions and the minute -> segment index.
+
+	Sources:
+	- state.cached_schedules (start/end minutes, midnight crossover split)
+	- state.cached_events for today's MMDD (hour windows)
+	- market_calendar session for today (open, grace; none on holidays)
+	- transit routes from transits.csv (days + commute hours)
+
+	Each segment is a tuple:
+		(start_min, end_min, schedule_name, events, market_phase, transit_indices)
+
+	INLINE - all window expansion inline, runs at midnight and on reload
+	"""
+	now = rtc.datetime
+	weekday = now.tm_wday
+	mmdd_key = f"{now.tm_mon:02d}{now.tm_mday:02d}"
+
+	# Windows: [start_min, end_min, kind, key]
+	windows = []
+
+	# Schedules (same rules as schedule_loader.is_schedule_active)
+	schedule_order = []
+	for schedule_name, schedule_config in state.cached_schedules.items():
+		if not schedule_config["enabled"] or weekday not in schedule_config["days"]:
+			continue
+		start_mins = schedule_config["start_hour"] * 60 + schedule_config["start_min"]
+		end_mins = schedule_config["end_hour"] * 60 + schedule_config["end_min"]
+		schedule_order.append(schedule_name)
+		if end_mins <= start_mins:
+			# Crosses midnight: [0, end) and [start, 1440)
+			if end_mins > 0:
+				windows.append((0, end_mins, KIND_SCHEDULE, schedule_name))
+			windows.append((start_mins, 1440, KIND_SCHEDULE, schedule_name))
+		else:
+			windows.append((start_mins, end_mins, KIND_SCHEDULE, schedule_name))
+
+	# Events (hour granularity, same rules as event_loader.get_active_events)
+	today_events = state.cached_events.get(mmdd_key, [])
+	for i, event_data in enumerate(today_events):
+		windows.append((event_data[4] * 60, event_data[5] * 60, KIND_EVENT, i))
+
+	# Market hours (trading days only) - open is inclusive of the close minute,
+	# grace runs through the grace end minute (matches main loop checks)
+	import config_manager
+	if config_manager.should_show_stocks():
+		import market_calendar
+		market_calendar.apply_today(rtc)
+	if weekday < 5 and state.market_close_local_minutes > 0:
+		open_start = max(state.market_open_local_minutes, 0)
+		open_end = min(state.market_close_local_minutes + 1, 1440)
+		grace_end = min(state.market_grace_end_local_minutes + 1, 1440)
+		if open_end > open_start:
+			windows.append((open_start, open_end, KIND_MARKET, MARKET_OPEN))
+		if grace_end > open_end:
+			windows.append((open_end, grace_end, KIND_GRACE, MARKET_GRACE))
+
+	# Transit routes (only when the transit display is enabled)
+	state.timeline_transit_routes = []
+	if config_manager.should_show_transit():
+		import transit_api
+		routes = transit_api.load_transits_config()
+		respect_commute_hours = config_manager.get_transit_respect_commute_hours()
+		for route_config in routes:
+			if not transit_api.is_active_today(route_config['days'], weekday):
+				continue
+			route_index = len(state.timeline_transit_routes)
+			state.timeline_transit_routes.append(route_config)
+			if respect_commute_hours and route_config['commute_hours']:
+				for start_hour, end_hour in route_config['commute_hours']:
+					windows.append((start_hour * 60, end_hour * 60, KIND_TRANSIT, route_index))
+			else:
+				windows.append((0, 1440, KIND_TRANSIT, route_index))
+
+	# Build sorted transition list: (minute, kind, key, is_start)
+	transitions = []
+	for start_min, end_min, kind, key in windows:
+		transitions.append((start_min, kind, key, True))
+		if end_min < 1440:
+			transitions.append((end_min, kind, key, False))
+	transitions.sort(key=lambda t: t[0])
+
+	# Segment boundaries (distinct transition minutes plus midnight)
+	boundaries = [0]
+	for transition in transitions:
+		if transition[0] != boundaries[-1]:
+			boundaries.append(transition[0])
+
+	# Evaluate the active set once per segment (inline)
+	segments = []
+	for b in range(len(boundaries)):
+		seg_start = boundaries[b]
+		seg_end = boundaries[b + 1] if b + 1 < len(boundaries) else 1440
+
+		active_schedules = []
+		active_events = []
+		market_phase = MARKET_CLOSED
+		transit_indices = []
+
+		for start_min, end_min, kind, key in windows:
+			if not (start_min <= seg_start < end_min):
+				continue
+			if kind == KIND_SCHEDULE:
+				active_schedules.append(key)
+			elif kind == KIND_EVENT:
+				active_events.append(today_events[key])
+			elif kind == KIND_MARKET or kind == KIND_GRACE:
+				market_phase = key
+			elif kind == KIND_TRANSIT:
+				if key not in transit_indices:
+					transit_indices.append(key)
+
+		# First schedule in CSV order wins (matches get_active_schedule)
+		schedule_name = None
+		for name in schedule_order:
+			if name in active_schedules:
+				schedule_name = name
+				break
+
+		# Windows were appended in CSV order, so events/routes keep that order
+		segments.append((seg_start, seg_end, schedule_name, active_events, market_phase, tuple(transit_indices)))
+
+	# Minute -> segment index (1 byte per minute)
+	minute_index = None
+	if len(segments) <= 255:
+		minute_index = bytearray(1440)
+		for i, segment in enumerate(segments):
+			for minute in range(segment[0], segment[1]):
+				minute_index[minute] = i
+	else:
+		logger.log(f"Timeline has {len(segments)} segments - using scan lookups", config.LogLevel.WARNING, area="TIMELINE")
+
+	state.timeline_transitions = transitions
+	state.timeline_segments = segments
+	state.timeline_minute_index = minute_index
+	state.timeline_date = (now.tm_year, now.tm_mon, now.tm_mday)
+	state.timeline_dirty = False
+
+	logger.log(f"Compiled timeline for {now.tm_mon}/{now.tm_mday}: {len(transitions)} transitions, {len(segments)} segments", config.LogLevel.INFO, area="TIMELINE")
+
+
+def ensure_current(rtc):
+	"""
+	Recompile the timeline if the date changed or a reload invalidated it.
+	Cheap enough to call every cycle.
+	"""
+	now = rtc.datetime
+	if state.timeline_dirty or state.timeline_date != (now.tm_year, now.tm_mon, now.tm_mday):
+		try:
+			compile_day(rtc)
+		except Exception as e:
+			logger.log(f"Timeline compile failed: {e}", config.LogLevel.ERROR, area="TIMELINE")
+			state.timeline_segments = []
+			state.timeline_minute_index = None
+			state.timeline_dirty = True
+			return False
+	return True
+
+
+# ============================================================================
+# LOOKUPS (INLINE)
+# ============================================================================
+
+def get_segment(rtc):
+	"""
+	Get the segment covering the current minute.
+
+	Returns:
+		tuple: (start_min, end_min, schedule_name, events, market_phase, transit_indices)
+		       or None if the timeline could not be compiled
+	"""
+	if not ensure_current(rtc):
+		return None
+
+	now = rtc.datetime
+	minute = now.tm_hour * 60 + now.tm_min
+
+	if state.timeline_minute_index is not None:
+		return state.timeline_segments[state.timeline_minute_index[minute]]
+
+	# Fallback for oversized timelines
+	for segment in state.timeline_segments:
+		if segment[0] <= minute < segment[1]:
+			return segment
+	return None
+
+
+def get_active_schedule(rtc):
+	"""
+	Timeline equivalent of schedule_loader.get_active_schedule().
+
+	Returns:
+		tuple: (schedule_name, schedule_config) or (None, None)
+	"""
+	segment = get_segment(rtc)
+	if segment is None:
+		import schedule_loader
+		return schedule_loader.get_active_schedule(rtc, state.cached_schedules)
+	if segment[2] is None:
+		return None, None
+	return segment[2], state.cached_schedules.get(segment[2])
+
+
+def get_active_events(rtc):
+	"""
+	Timeline equivalent of event_loader.get_active_events().
+
+	Returns:
+		list: Active event data arrays (empty list if none)
+	"""
+	segment = get_segment(rtc)
+	if segment is None:
+		import event_loader
+		return event_loader.get_active_events(rtc, state.cached_events)
+	return segment[3]
+
+
+def get_market_phase(rtc):
+	"""
+	Get market phase for the current minute.
+
+	Returns:
+		int: MARKET_CLOSED, MARKET_OPEN or MARKET_GRACE
+	"""
+	segment = get_segment(rtc)
+	if segment is None:
+		return MARKET_CLOSED
+	return segment[4]
+
+
+def get_active_transit_routes(rtc):
+	"""
+	Get transit routes active right now (day + commute hours already applied).
+
+	Returns:
+		list: Route config dicts, or None if the timeline is unavailable
+	"""
+	segment = get_segment(rtc)
+	if segment is None:
+		return None
+	return [state.timeline_transit_routes[i] for i in segment[5]]
+
+
+def seconds_until_next_change(rtc):
+	"""
+	Seconds until the current segment ends (next transition of any kind).
+
+	Returns:
+		int: Seconds until next transition (until midnight if none left)
+	"""
+	segment = get_segment(rtc)
+	now = rtc.datetime
+	minute = now.tm_hour * 60 + now.tm_min
+	end_min = segment[1] if segment else 1440
+	return (end_min - minute) * 60 - now.tm_sec
+
+
+def seconds_until_next_schedule(rtc):
+	"""
+	Seconds until the next schedule starts today.
+
+	Returns:
+		int: Seconds until next schedule start, or None if none remain today
+	"""
+	if not ensure_current(rtc):
+		return None
+	now = rtc.datetime
+	minute = now.tm_hour * 60 + now.tm_min
+	for transition_minute, kind, key, is_start in state.timeline_transitions:
+		if transition_minute > minute and kind == KIND_SCHEDULE and is_start:
+			return (transition_minute - minute) * 60 - now.tm_sec
+	return None
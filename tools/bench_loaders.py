@@ -0,0 +1,417 @@
+"""
+Pantallita 3.0 - Loader Scaling Benchmark (host-side, CPython 3.8+)
+Times the device's CSV loaders and lookups on synthetic inputs at 1x, 10x,
+100x and 1000x the repo's current config sizes, records peak memory per call
+(tracemalloc), and flags functions whose time or memory grows faster than
+linearly with the input
+
+Usage:
+	python3 tools/bench_loaders.py [--scales 1,10,100,1000] [--only event]
+	python3 tools/bench_loaders.py --save bench-$(git rev-parse --short HEAD).json
+	python3 tools/bench_loaders.py --compare bench-old.json [--save bench-new.json]
+
+Benchmarked (the real device functions, imported from the repo root):
+	event_loader.parse_event_csv_content (local MM-DD and ephemeral YYYY-MM-DD)
+	event_loader.merge_events, event_loader.get_active_events
+	schedule_loader.parse_schedule_csv_content, schedule_loader.get_active_schedule
+	stocks_api.parse_stocks_csv_content
+	transit_api.load_transits_config: its text parse (parse_transits_csv_content)
+	and its unchanged-file path (snapshot.parsed_file hit: a stat, no read)
+
+CSV inputs are passed as memoryviews, like the netbuf views the device
+parses. 1x = events.csv 41, ephemeral_events.csv 21, schedules.csv 17,
+stocks.csv 16, transits.csv 3 rows. Inputs larger than the device's
+receive buffer (config.Network.RX_BUFFER_SIZE) are marked with "!" - the
+device reads them onto the heap instead (netbuf spill), so they also cost
+a body-sized allocation there.
+
+Growth is the log-log slope of time (and peak memory) against the scale,
+fitted over the scales from 10x up: ~1 = linear, ~0 = constant. Above
+--threshold (default 1.2) the case is flagged SUPERLINEAR.
+
+Standard library only - no host dependencies.
+"""
+
+import argparse
+import atexit
+import datetime
+import importlib
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(TOOLS_DIR)
+sys.path.insert(0, REPO_ROOT)
+
+# stocks_api and transit_api import connections, which imports the CircuitPython
+# radio stack at module level (TrackedSession subclasses adafruit_requests.Session).
+# The parsers never touch the network - placeholders stand in for the modules
+# CPython does not have so the real loader modules can be imported.
+for _name in ("socketpool", "wifi", "adafruit_requests", "adafruit_connection_manager"):
+	try:
+		importlib.import_module(_name)
+	except ImportError:
+		_module = types.ModuleType(_name)
+		_module.Session = object
+		sys.modules[_name] = _module
+
+import config  # noqa: E402
+import state  # noqa: E402
+import snapshot  # noqa: E402
+import event_loader  # noqa: E402
+import schedule_loader  # noqa: E402
+import stocks_api  # noqa: E402
+import transit_api  # noqa: E402
+
+# Rows in the repo's CSVs today (= scale 1)
+BASE_ROWS = {"events": 41, "ephemeral": 21, "schedules": 17, "stocks": 16, "transits": 3}
+
+# Benchmark clock: Monday 2026-06-15 12:00
+NOW = datetime.datetime(2026, 6, 15, 12, 0)
+
+COLORS = ("RED", "GREEN", "BLUE", "PINK", "AQUA", "LILAC", "ORANGE", "WHITE")
+IMAGES = ("small_cake.bmp", "blank.bmp", "tooth.bmp", "guidepost_logo.bmp")
+TYPES = ("stock", "stock", "stock", "forex", "crypto", "commodity")
+DAY_SETS = ("weekday", "weekend", "all", "")
+
+
+class BenchRTC:
+	"""rtc stand-in: the loaders only read rtc.datetime."""
+	datetime = NOW.timetuple()
+
+
+# ============================================================================
+# SYNTHETIC INPUTS
+# ============================================================================
+
+def gen_events(rows, ephemeral, rng):
+	"""events.csv (MM-DD) or ephemeral_events.csv (YYYY-MM-DD) text, dates spread over a year."""
+	lines = ["# Synthetic events"]
+	for i in range(rows):
+		if ephemeral:
+			# ~10% already past (exercises the skip), the rest over the next year
+			day = NOW.date() + datetime.timedelta(days=rng.randint(-36, 329))
+			date = f"{day.year:04d}-{day.month:02d}-{day.day:02d}"
+		else:
+			day = datetime.date(2024, 1, 1) + datetime.timedelta(days=rng.randint(0, 365))
+			date = f"{day.month:02d}-{day.day:02d}"
+		line = f"{date},Event {i},Line {i % 97},{rng.choice(IMAGES)},{rng.choice(COLORS)}"
+		if i % 3 == 0:
+			start = rng.randint(0, 20)
+			line += f",{start},{rng.randint(start + 1, 24)}"
+		lines.append(line)
+	return "\n".join(lines) + "\n"
+
+
+def gen_schedules(rows, rng):
+	"""schedules.csv text - no window covers NOW, so a lookup scans every schedule (worst case)."""
+	lines = ["# name,enabled,days,start_hour,start_min,end_hour,end_min,image,progressbar,night_mode"]
+	for i in range(rows):
+		start_hour = rng.choice((rng.randint(0, 10), rng.randint(13, 22)))
+		days = "".join(str(d) for d in range(7) if rng.random() < 0.7) or "0"
+		lines.append(f"Schedule {i},{1 if i % 5 else 0},{days},{start_hour},{rng.choice((0, 15, 30, 45))},"
+		             f"{start_hour + 1},{rng.choice((0, 15, 30))},{rng.choice(IMAGES)},{i % 2},{i % 3}")
+	return "\n".join(lines) + "\n"
+
+
+def gen_stocks(rows, rng):
+	"""stocks.csv text."""
+	lines = ["# symbol,name,type,display_name,highlight"]
+	for i in range(rows):
+		display = f"D{i}" if i % 4 == 0 else ""
+		lines.append(f"s{i:05d},Synthetic Company {i} Inc.,{rng.choice(TYPES)},{display},{1 if i % 10 == 0 else 0}")
+	return "\n".join(lines) + "\n"
+
+
+def gen_transits(rows, rng):
+	"""transits.csv text (9 fields: type,route,label,stops,min_time,color,commute_hours,days,color2)."""
+	lines = ["# type,route,label,stops,min_time,color,commute_hours,days,color2"]
+	for i in range(rows):
+		kind = "train" if i % 2 == 0 else "bus"
+		stops = "|".join(str(40000 + rng.randint(0, 1999)) for _ in range(rng.randint(1, 3)))
+		hours = rng.choice(("6-10", "6-9|16-19", "", "15-20"))
+		lines.append(f"{kind},R{i % 40},Route{i},{stops},{rng.randint(0, 12)},{rng.choice(COLORS)},"
+		             f"{hours},{rng.choice(DAY_SETS)},{rng.choice(COLORS) if i % 4 == 0 else ''}")
+	return "\n".join(lines) + "\n"
+
+
+_work_dir = None
+
+
+def work_dir():
+	"""Scratch directory for file-backed cases (removed at exit)."""
+	global _work_dir
+	if _work_dir is None:
+		_work_dir = tempfile.mkdtemp(prefix="bench_loaders_")
+		atexit.register(shutil.rmtree, _work_dir, True)
+	return _work_dir
+
+
+def as_view(text):
+	"""CSV text as the device sees it: a memoryview of the body bytes."""
+	return memoryview(text.encode("utf-8"))
+
+
+# ============================================================================
+# CASES
+# ============================================================================
+
+# Each case: scale -> (callable, input bytes). Inputs are built before timing.
+
+def case_parse_local_events(scale, rng):
+	content = as_view(gen_events(BASE_ROWS["events"] * scale, False, rng))
+	return (lambda: event_loader.parse_event_csv_content(content)), len(content)
+
+
+def case_parse_ephemeral_events(scale, rng):
+	content = as_view(gen_events(BASE_ROWS["ephemeral"] * scale, True, rng))
+	rtc = BenchRTC()
+	return (lambda: event_loader.parse_event_csv_content(content, is_ephemeral=True, rtc=rtc)), len(content)
+
+
+def case_merge_events(scale, rng):
+	local = event_loader.parse_event_csv_content(as_view(gen_events(BASE_ROWS["events"] * scale, False, rng)))
+	github = event_loader.parse_event_csv_content(as_view(gen_events(BASE_ROWS["ephemeral"] * scale, True, rng)), is_ephemeral=True, rtc=BenchRTC())
+	return (lambda: event_loader.merge_events(local, github)), 0
+
+
+def case_get_active_events(scale, rng):
+	local = event_loader.parse_event_csv_content(as_view(gen_events(BASE_ROWS["events"] * scale, False, rng)))
+	github = event_loader.parse_event_csv_content(as_view(gen_events(BASE_ROWS["ephemeral"] * scale, True, rng)), is_ephemeral=True, rtc=BenchRTC())
+	merged = event_loader.merge_events(local, github)
+	rtc = BenchRTC()
+	return (lambda: event_loader.get_active_events(rtc, merged)), 0
+
+
+def case_parse_schedules(scale, rng):
+	content = as_view(gen_schedules(BASE_ROWS["schedules"] * scale, rng))
+	return (lambda: schedule_loader.parse_schedule_csv_content(content)), len(content)
+
+
+def case_get_active_schedule(scale, rng):
+	schedules = schedule_loader.parse_schedule_csv_content(as_view(gen_schedules(BASE_ROWS["schedules"] * scale, rng)))
+	rtc = BenchRTC()
+	return (lambda: schedule_loader.get_active_schedule(rtc, schedules)), 0
+
+
+def case_parse_stocks(scale, rng):
+	content = as_view(gen_stocks(BASE_ROWS["stocks"] * scale, rng))
+	return (lambda: stocks_api.parse_stocks_csv_content(content)), len(content)
+
+
+def case_parse_transits(scale, rng):
+	content = as_view(gen_transits(BASE_ROWS["transits"] * scale, rng))
+	return (lambda: transit_api.parse_transits_csv_content(content)), len(content)
+
+
+def case_transits_snapshot_hit(scale, rng):
+	text = gen_transits(BASE_ROWS["transits"] * scale, rng)
+	path = os.path.join(work_dir(), "transits.csv")
+	with open(path, "w") as f:
+		f.write(text)
+	state.snapshot_sources = {}
+	snapshot.parsed_file("transits.csv", path, transit_api.parse_transits_csv_content)  # Compile once
+	return (lambda: snapshot.parsed_file("transits.csv", path, transit_api.parse_transits_csv_content)), len(text.encode("utf-8"))
+
+
+CASES = (
+	("event_loader.parse_event_csv_content[local]", case_parse_local_events),
+	("event_loader.parse_event_csv_content[ephemeral]", case_parse_ephemeral_events),
+	("event_loader.merge_events", case_merge_events),
+	("event_loader.get_active_events", case_get_active_events),
+	("schedule_loader.parse_schedule_csv_content", case_parse_schedules),
+	("schedule_loader.get_active_schedule", case_get_active_schedule),
+	("stocks_api.parse_stocks_csv_content", case_parse_stocks),
+	("transit_api.load_transits_config[text parse]", case_parse_transits),
+	("transit_api.load_transits_config[snapshot hit]", case_transits_snapshot_hit),
+)
+
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+
+def measure(function, repeat, min_batch_seconds):
+	"""
+	Best-of-repeat seconds per call (batched so each timing spans at least
+	min_batch_seconds), then peak traced memory of one more call.
+	"""
+	# Calibrate the batch size
+	number = 1
+	while True:
+		start = time.perf_counter()
+		for _ in range(number):
+			function()
+		elapsed = time.perf_counter() - start
+		if elapsed >= min_batch_seconds or number >= 1 << 20:
+			break
+		number *= 2 if elapsed <= 0 else max(2, min(10, int(min_batch_seconds / elapsed) + 1))
+
+	best = elapsed / number
+	for _ in range(repeat - 1):
+		start = time.perf_counter()
+		for _ in range(number):
+			function()
+		best = min(best, (time.perf_counter() - start) / number)
+
+	tracemalloc.start()
+	try:
+		function()
+		peak = tracemalloc.get_traced_memory()[1]
+	finally:
+		tracemalloc.stop()
+	return best, peak
+
+
+def slope(points):
+	"""Least-squares slope of log(value) against log(scale); None with fewer than 2 usable points."""
+	points = [(math.log(scale), math.log(value)) for scale, value in points if value > 0]
+	if len(points) < 2:
+		return None
+	mean_x = sum(x for x, _ in points) / len(points)
+	mean_y = sum(y for _, y in points) / len(points)
+	spread = sum((x - mean_x) ** 2 for x, _ in points)
+	if spread == 0:
+		return None
+	return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+
+def revision():
+	"""Short git revision of the repo (None outside a git checkout)."""
+	try:
+		output = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, timeout=10)
+	except (OSError, subprocess.SubprocessError):
+		return None
+	return output.stdout.strip() or None
+
+
+def format_seconds(seconds):
+	if seconds >= 1:
+		return f"{seconds:.2f}s"
+	if seconds >= 0.001:
+		return f"{seconds * 1000:.2f}ms"
+	return f"{seconds * 1000000:.1f}us"
+
+
+def format_bytes(size):
+	if size >= 1048576:
+		return f"{size / 1048576:.1f}MB"
+	if size >= 1024:
+		return f"{size / 1024:.1f}KB"
+	return f"{size}B"
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+	parser = argparse.ArgumentParser(description="Benchmark Pantallita loaders and lookups at growing config sizes")
+	parser.add_argument("--scales", default="1,10,100,1000", help="Comma-separated multiples of today's row counts")
+	parser.add_argument("--only", default=None, help="Run cases whose name contains this text")
+	parser.add_argument("--repeat", type=int, default=5, help="Timed batches per case (best is kept)")
+	parser.add_argument("--min-batch", type=float, default=0.05, help="Minimum seconds per timed batch")
+	parser.add_argument("--threshold", type=float, default=1.2, help="Growth slope above which a case is flagged")
+	parser.add_argument("--seed", type=int, default=3, help="Generator seed (same seed = same inputs)")
+	parser.add_argument("--save", default=None, help="Write results to this JSON file")
+	parser.add_argument("--compare", default=None, help="Earlier --save file to compare against")
+	parser.add_argument("--tolerance", type=float, default=0.2, help="Slowdown (fraction) reported as a regression by --compare")
+	args = parser.parse_args()
+
+	scales = sorted({int(value) for value in args.scales.split(",") if value.strip()})
+	cases = [case for case in CASES if args.only is None or args.only in case[0]]
+	if not cases:
+		print(f"No case matches '{args.only}'")
+		return 1
+
+	# Loader log lines would swamp the table (and the timings)
+	config.CURRENT_LOG_LEVEL = config.LogLevel.PRODUCTION
+
+	results = {}
+	slopes = {}
+	flagged = []
+	width = max(len(name) for name, _ in cases)
+	print(f"{'case':<{width}} {'scale':>6} {'input':>9} {'time/call':>10} {'peak mem':>9}")
+
+	for name, setup in cases:
+		results[name] = {}
+		for scale in scales:
+			function, input_bytes = setup(scale, random.Random(args.seed))
+			seconds, peak = measure(function, args.repeat, args.min_batch)
+			results[name][str(scale)] = {"input_bytes": input_bytes, "seconds": seconds, "peak_bytes": peak}
+			mark = "!" if input_bytes > config.Network.RX_BUFFER_SIZE else " "
+			input_text = format_bytes(input_bytes) if input_bytes else "-"
+			print(f"{name:<{width}} {scale:>5}x {input_text:>8}{mark} {format_seconds(seconds):>10} {format_bytes(peak):>9}")
+
+		# Growth over the scales from 10x up (1x timings are mostly call overhead)
+		fitted = [scale for scale in scales if scale >= 10] if len([scale for scale in scales if scale >= 10]) >= 2 else scales
+		time_slope = slope([(scale, results[name][str(scale)]["seconds"]) for scale in fitted])
+		memory_slope = slope([(scale, results[name][str(scale)]["peak_bytes"]) for scale in fitted])
+		slopes[name] = {"time": time_slope, "memory": memory_slope}
+		if (time_slope is not None and time_slope > args.threshold) or (memory_slope is not None and memory_slope > args.threshold):
+			flagged.append(name)
+
+	print()
+	print(f"{'growth (log-log slope, ~1 = linear)':<{width}} {'time':>6} {'memory':>7}")
+	for name, _ in cases:
+		time_slope = slopes[name]["time"]
+		memory_slope = slopes[name]["memory"]
+		time_text = f"{time_slope:.2f}" if time_slope is not None else "-"
+		memory_text = f"{memory_slope:.2f}" if memory_slope is not None else "-"
+		print(f"{name:<{width}} {time_text:>6} {memory_text:>7}{'  SUPERLINEAR' if name in flagged else ''}")
+	print(f"\n'!' = input larger than the device receive buffer ({format_bytes(config.Network.RX_BUFFER_SIZE)}, config.Network.RX_BUFFER_SIZE) - read onto the heap there")
+
+	report = {
+		"revision": revision(),
+		"created": datetime.datetime.now().isoformat(timespec="seconds"),
+		"python": platform.python_version(),
+		"machine": platform.machine(),
+		"seed": args.seed,
+		"scales": scales,
+		"threshold": args.threshold,
+		"results": results,
+		"slopes": slopes,
+		"flagged": flagged,
+	}
+
+	regressions = 0
+	if args.compare:
+		with open(args.compare) as f:
+			baseline = json.load(f)
+		print(f"\nCompared with {args.compare} (revision {baseline.get('revision')}, Python {baseline.get('python')}):")
+		for name, _ in cases:
+			for scale in scales:
+				old = baseline.get("results", {}).get(name, {}).get(str(scale))
+				if not old or not old["seconds"]:
+					continue
+				new = results[name][str(scale)]
+				ratio = new["seconds"] / old["seconds"]
+				memory_ratio = new["peak_bytes"] / old["peak_bytes"] if old["peak_bytes"] else 1
+				note = ""
+				if ratio > 1 + args.tolerance:
+					note = "  REGRESSION"
+					regressions += 1
+				elif ratio < 1 - args.tolerance:
+					note = "  faster"
+				print(f"  {name:<{width}} {scale:>5}x time x{ratio:.2f} memory x{memory_ratio:.2f}{note}")
+
+	if args.save:
+		with open(args.save, "w") as f:
+			json.dump(report, f, indent=1)
+		print(f"\nSaved {args.save}")
+
+	return 1 if flagged or regressions else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
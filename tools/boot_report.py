@@ -0,0 +1,55 @@
+"""
+Pantallita 3.0 - Boot Report (host-side, CPython 3.8+)
+Groups the device's "Boot report:" log lines by feature set and startup mode
+and prints median boot times and baseline heap per combination
+
+Usage:
+	python3 tools/boot_report.py LOGS/*.txt
+	cat serial-capture.txt | python3 tools/boot_report.py -
+
+Capture one boot per config.csv combination (and with / without
+PANTALLITA_MPY_DIR) to fill the table; repeated boots of the same
+combination are summarized by their median.
+
+Standard library only - no host dependencies.
+"""
+
+import argparse
+import re
+import statistics
+import sys
+
+LINE = re.compile(r"Boot report: features=(\S+) mpy=(\S+) imports_ms=(\d+) first_screen_ms=(\d+) ready_ms=(\d+) heap_kb=(\d+)")
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Summarize Pantallita boot reports per feature combination")
+	parser.add_argument("logs", nargs="+", help="Serial log files ('-' = stdin)")
+	args = parser.parse_args()
+
+	runs = {}
+	for path in args.logs:
+		stream = sys.stdin if path == "-" else open(path, errors="replace")
+		with stream:
+			for line in stream:
+				match = LINE.search(line)
+				if not match:
+					continue
+				key = (match.group(1), match.group(2))
+				runs.setdefault(key, []).append([int(value) for value in match.groups()[2:]])
+
+	if not runs:
+		print("No 'Boot report:' lines found")
+		return 1
+
+	print(f"{'features':<36} {'mpy':<4} {'runs':>4} {'imports':>8} {'1st screen':>10} {'ready':>8} {'heap':>7}")
+	for (feature_set, mpy), samples in sorted(runs.items()):
+		medians = [int(statistics.median(column)) for column in zip(*samples)]
+		imports_ms, first_screen_ms, ready_ms, heap_kb = medians
+		print(f"{feature_set:<36} {mpy:<4} {len(samples):>4} {imports_ms:>6}ms {first_screen_ms:>8}ms {ready_ms:>6}ms {heap_kb:>5}KB")
+
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,369 @@
+"""
+Pantallita 3.0 - Asset Build Tool (host-side, CPython 3.8+)
+Validates BMP bit depth and dimensions against config.Layout, normalizes
+palettes to 4-bit indexed, and packs each image family into one atlas BMP
+plus a CSV index that the display modules select tiles from
+
+Usage:
+	python3 tools/build_assets.py                 # validate, then build img/atlas/
+	python3 tools/build_assets.py --check         # validate only (CI / pre-deploy)
+	python3 tools/build_assets.py --fix           # rewrite drifted files as 4-bit first
+	python3 tools/build_assets.py --skip-invalid  # build atlases from the valid files only
+
+Exit status is 1 when any asset is invalid (and nothing is written unless
+--skip-invalid), so a malformed icon cannot reach the device.
+
+Copy img/atlas/ to the device next to the loose images. Icons missing from an
+atlas index (or a missing atlas) fall back to the individual BMP files.
+
+Standard library only - no host dependencies.
+"""
+
+import argparse
+import os
+import struct
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import config  # noqa: E402 - host-importable (only depends on os)
+
+ATLAS_COLUMNS = 8  # Tiles per atlas row
+TARGET_BPP = 4  # Documented asset format: 4-bit indexed BMP
+MAX_INDEXED_COLORS = 16
+
+
+# ============================================================================
+# FAMILIES
+# ============================================================================
+
+# name, device directory, tile width, tile height, exact size (False = max size)
+FAMILIES = (
+	("weather", config.Paths.WEATHER_IMAGES, config.Layout.WIDTH, config.Layout.HEIGHT, True),
+	("columns", config.Paths.COLUMN_IMAGES, config.Layout.FORECAST_ICON_SIZE, config.Layout.FORECAST_ICON_SIZE, True),
+	("schedules", config.Paths.SCHEDULE_IMAGES, config.Layout.SCHEDULE_IMAGE_WIDTH, config.Layout.SCHEDULE_IMAGE_HEIGHT, True),
+	("events", config.Paths.EVENT_IMAGES, config.Layout.EVENT_IMAGE_WIDTH, config.Layout.EVENT_IMAGE_HEIGHT, False),
+)
+
+
+# ============================================================================
+# BMP READ / WRITE
+# ============================================================================
+
+class BmpError(Exception):
+	"""Unreadable or unsupported BMP."""
+
+
+def read_bmp(path):
+	"""
+	Decode a BMP into RGB pixels.
+
+	Supports 1/4/8-bit indexed and 24/32-bit BI_RGB or BI_BITFIELDS files
+	(what image editors export). Alpha is ignored - the LED matrix has none.
+
+	Returns:
+		dict: width, height, bpp, pixels (top-down list of (r, g, b) rows)
+	"""
+	with open(path, "rb") as f:
+		data = f.read()
+
+	if len(data) < 54 or data[:2] != b"BM":
+		raise BmpError("not a BMP file")
+
+	pixel_offset = struct.unpack_from("<I", data, 10)[0]
+	dib_size = struct.unpack_from("<I", data, 14)[0]
+	if dib_size < 40:
+		raise BmpError(f"unsupported header size {dib_size}")
+
+	width, height, _planes, bpp, compression = struct.unpack_from("<iiHHI", data, 18)
+	colors_used = struct.unpack_from("<I", data, 46)[0]
+	top_down = height < 0
+	height = abs(height)
+
+	if width <= 0 or height == 0:
+		raise BmpError(f"bad dimensions {width}x{height}")
+	if compression not in (0, 3):
+		raise BmpError(f"compressed BMP (type {compression}) not supported by displayio")
+
+	palette = None
+	masks = None
+	if bpp in (1, 4, 8):
+		count = colors_used or (1 << bpp)
+		start = 14 + dib_size
+		palette = []
+		for i in range(count):
+			b, g, r = data[start + i * 4:start + i * 4 + 3]
+			palette.append((r, g, b))
+	elif bpp in (24, 32):
+		if compression == 3:
+			masks = struct.unpack_from("<III", data, 54)  # Right after the 40-byte fields (V3-V5)
+	else:
+		raise BmpError(f"{bpp}-bit BMP not supported")
+
+	stride = ((width * bpp + 31) // 32) * 4
+	rows = []
+	for y in range(height):
+		src_row = y if top_down else height - 1 - y
+		base = pixel_offset + src_row * stride
+		if base + (width * bpp + 7) // 8 > len(data):
+			raise BmpError("truncated pixel data")
+		row = []
+		for x in range(width):
+			if palette is not None:
+				bit = x * bpp
+				byte = data[base + bit // 8]
+				index = (byte >> (8 - bpp - bit % 8)) & ((1 << bpp) - 1)
+				if index >= len(palette):
+					raise BmpError(f"pixel index {index} outside {len(palette)}-color palette")
+				row.append(palette[index])
+			elif masks is not None:
+				offset = base + x * (bpp // 8)
+				value = int.from_bytes(data[offset:offset + bpp // 8], "little")
+				pixel = []
+				for mask in masks:
+					shift = (mask & -mask).bit_length() - 1 if mask else 0
+					top = mask >> shift if mask else 1
+					pixel.append(((value & mask) >> shift) * 255 // top if mask else 0)
+				row.append(tuple(pixel))
+			else:
+				offset = base + x * (bpp // 8)
+				b, g, r = data[offset:offset + 3]
+				row.append((r, g, b))
+		rows.append(row)
+
+	return {"width": width, "height": height, "bpp": bpp, "pixels": rows}
+
+
+def write_indexed_bmp(path, width, height, palette, indexes, bpp):
+	"""
+	Write an uncompressed bottom-up indexed BMP (4 or 8 bit, BITMAPINFOHEADER).
+
+	Args:
+		palette: [(r, g, b), ...] - at most 1 << bpp entries
+		indexes: top-down rows of palette indexes
+	"""
+	stride = ((width * bpp + 31) // 32) * 4
+	pixel_bytes = bytearray()
+	for y in range(height - 1, -1, -1):
+		row = bytearray(stride)
+		for x, index in enumerate(indexes[y]):
+			if bpp == 8:
+				row[x] = index
+			else:
+				row[x // 2] |= index << (4 if x % 2 == 0 else 0)
+		pixel_bytes += row
+
+	palette_bytes = bytearray()
+	for r, g, b in palette:
+		palette_bytes += bytes((b, g, r, 0))
+
+	pixel_offset = 14 + 40 + len(palette_bytes)
+	file_size = pixel_offset + len(pixel_bytes)
+	header = struct.pack("<2sIHHI", b"BM", file_size, 0, 0, pixel_offset)
+	info = struct.pack("<IiiHHIIiiII", 40, width, height, 1, bpp, 0, len(pixel_bytes), 2835, 2835, len(palette), len(palette))
+
+	tmp_path = path + ".tmp"
+	with open(tmp_path, "wb") as f:
+		f.write(header + info + palette_bytes + pixel_bytes)
+	os.replace(tmp_path, path)
+
+
+def normalize(pixels):
+	"""
+	Build a sorted palette of the colors actually used (black first) and
+	the matching index rows. Same pixels always produce the same file.
+	"""
+	colors = set()
+	for row in pixels:
+		colors.update(row)
+	palette = sorted(colors)
+	lookup = {color: i for i, color in enumerate(palette)}
+	indexes = [[lookup[color] for color in row] for row in pixels]
+	return palette, indexes
+
+
+# ============================================================================
+# VALIDATION
+# ============================================================================
+
+def validate_family(root, family, fix):
+	"""
+	Check every BMP in a family directory.
+
+	Errors (block deploy):
+	- unreadable / compressed / unsupported bit depth
+	- wrong dimensions for the family's layout slot
+	- more than 16 colors (cannot be 4-bit without quantizing artwork)
+	- names containing commas (atlas index is CSV)
+
+	Drift (fixable with --fix, an error otherwise):
+	- not 4-bit indexed (e.g. 8-bit or 32-bit exports)
+
+	Returns:
+		(valid, errors, fixed): valid = [(name, image)], errors = [message]
+	"""
+	name, device_dir, tile_w, tile_h, exact = family
+	directory = os.path.join(root, device_dir.lstrip("/"))
+	valid = []
+	errors = []
+	fixed = 0
+
+	if not os.path.isdir(directory):
+		return valid, [f"{device_dir}: directory missing"], fixed
+
+	for filename in sorted(os.listdir(directory)):
+		if not filename.lower().endswith(".bmp"):
+			continue
+		path = os.path.join(directory, filename)
+		label = f"{device_dir}/{filename}"
+
+		if "," in filename:
+			errors.append(f"{label}: comma in file name")
+			continue
+
+		try:
+			image = read_bmp(path)
+		except (BmpError, OSError, struct.error) as e:
+			errors.append(f"{label}: {e}")
+			continue
+
+		width, height = image["width"], image["height"]
+		if exact and (width, height) != (tile_w, tile_h):
+			errors.append(f"{label}: {width}x{height}, expected {tile_w}x{tile_h}")
+			continue
+		if not exact and (width > tile_w or height > tile_h):
+			errors.append(f"{label}: {width}x{height}, larger than {tile_w}x{tile_h} slot")
+			continue
+
+		palette, indexes = normalize(image["pixels"])
+		if len(palette) > MAX_INDEXED_COLORS:
+			errors.append(f"{label}: {len(palette)} colors, 4-bit allows {MAX_INDEXED_COLORS}")
+			continue
+
+		if image["bpp"] != TARGET_BPP:
+			if fix:
+				write_indexed_bmp(path, width, height, palette, indexes, TARGET_BPP)
+				fixed += 1
+				print(f"  fixed {label}: {image['bpp']}-bit -> 4-bit, {len(palette)} colors")
+			else:
+				errors.append(f"{label}: {image['bpp']}-bit, expected 4-bit indexed (run with --fix)")
+				continue
+
+		valid.append((filename, image))
+
+	return valid, errors, fixed
+
+
+# ============================================================================
+# ATLAS PACKING
+# ============================================================================
+
+def build_atlas(root, family, valid):
+	"""
+	Pack a family into img/atlas/<name>.bmp + <name>.csv.
+
+	Tiles are tile_w x tile_h in a grid ATLAS_COLUMNS wide, in file name order.
+	Smaller images (events) sit in the tile's top-left corner, padded with
+	palette index 0 (black = LED off), matching their loose-file placement.
+
+	Returns:
+		(atlas_path, bpp, colors) or raises ValueError if the union palette
+		does not fit 8 bits
+	"""
+	name, device_dir, tile_w, tile_h, _exact = family
+
+	colors = set()
+	for _filename, image in valid:
+		for row in image["pixels"]:
+			colors.update(row)
+	colors.add((0, 0, 0))  # Padding color
+	palette = sorted(colors)
+	if len(palette) > 256:
+		raise ValueError(f"{name}: {len(palette)} colors across the family, atlas allows 256")
+	bpp = 4 if len(palette) <= MAX_INDEXED_COLORS else 8
+	lookup = {color: i for i, color in enumerate(palette)}
+
+	count = len(valid)
+	columns = min(ATLAS_COLUMNS, count)
+	rows = (count + columns - 1) // columns
+	atlas_w = columns * tile_w
+	atlas_h = rows * tile_h
+	black = lookup[(0, 0, 0)]
+	indexes = [[black] * atlas_w for _ in range(atlas_h)]
+
+	for tile, (_filename, image) in enumerate(valid):
+		left = (tile % columns) * tile_w
+		top = (tile // columns) * tile_h
+		for y, row in enumerate(image["pixels"]):
+			target = indexes[top + y]
+			for x, color in enumerate(row):
+				target[left + x] = lookup[color]
+
+	atlas_dir = os.path.join(root, config.Paths.ATLAS_IMAGES.lstrip("/"))
+	os.makedirs(atlas_dir, exist_ok=True)
+	atlas_path = os.path.join(atlas_dir, f"{name}.bmp")
+	write_indexed_bmp(atlas_path, atlas_w, atlas_h, palette, indexes, bpp)
+
+	lines = [
+		"# Generated by tools/build_assets.py - do not edit",
+		f"source,{device_dir}",
+		f"tile,{tile_w},{tile_h}",
+	]
+	for tile, (filename, _image) in enumerate(valid):
+		lines.append(f"{filename},{tile}")
+	with open(os.path.join(atlas_dir, f"{name}.csv"), "w") as f:
+		f.write("\n".join(lines) + "\n")
+
+	return atlas_path, bpp, len(palette)
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+	parser = argparse.ArgumentParser(description="Validate Pantallita BMP assets and build sprite atlases")
+	parser.add_argument("--root", default=REPO_ROOT, help="Directory that mirrors the device filesystem")
+	parser.add_argument("--check", action="store_true", help="Validate only, write nothing")
+	parser.add_argument("--fix", action="store_true", help="Rewrite drifted files as normalized 4-bit BMPs")
+	parser.add_argument("--skip-invalid", action="store_true", help="Build atlases from valid files, leave invalid ones out")
+	args = parser.parse_args()
+
+	if args.check and args.fix:
+		parser.error("--check and --fix are mutually exclusive")
+
+	results = []
+	total_errors = 0
+	for family in FAMILIES:
+		valid, errors, fixed = validate_family(args.root, family, args.fix)
+		total_errors += len(errors)
+		results.append((family, valid, errors))
+		print(f"{family[0]:<10} {len(valid)} valid, {len(errors)} invalid, {fixed} fixed")
+		for message in errors:
+			print(f"  ERROR {message}")
+
+	if args.check:
+		return 1 if total_errors else 0
+
+	if total_errors and not args.skip_invalid:
+		print(f"\n{total_errors} invalid assets - no atlases written (fix them or pass --skip-invalid)")
+		return 1
+
+	print()
+	for family, valid, errors in results:
+		if not valid:
+			continue
+		try:
+			atlas_path, bpp, colors = build_atlas(args.root, family, valid)
+		except ValueError as e:
+			print(f"ERROR {e}")
+			return 1
+		size = os.path.getsize(atlas_path)
+		print(f"{family[0]:<10} {len(valid)} tiles -> {os.path.relpath(atlas_path, args.root)} ({bpp}-bit, {colors} colors, {size} bytes); {len(valid)} file opens -> 1")
+
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
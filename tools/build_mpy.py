@@ -0,0 +1,75 @@
+"""
+Pantallita 3.0 - Precompiled Module Build (host-side, CPython 3.8+)
+Compiles every project module to .mpy with CircuitPython's mpy-cross for the
+precompiled startup mode (PANTALLITA_MPY_DIR in settings.toml)
+
+Usage:
+	python3 tools/build_mpy.py [--mpy-cross PATH] [--out build/mpy]
+
+Then copy the output directory to the device as /mpy and set
+	PANTALLITA_MPY_DIR = "/mpy"
+in settings.toml. code.py stays a .py file (it is the entry point and puts
+the .mpy directory first on sys.path). Rebuild after every .py change - the
+device prefers the .mpy copy even when the .py next to it is newer.
+
+mpy-cross must match the firmware's bytecode version: use the CircuitPython
+10.x build from https://adafruit-circuit-python.s3.amazonaws.com/index.html?prefix=bin/mpy-cross/
+(the PyPI "mpy-cross" package targets MicroPython and is not compatible).
+
+Standard library only - no host dependencies.
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Not compiled: entry point, archived v2 code
+SKIP = ("code.py", "old_code.py", "boot.py")
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Build .mpy copies of the Pantallita modules")
+	parser.add_argument("--mpy-cross", default=shutil.which("mpy-cross") or "mpy-cross", help="CircuitPython 10.x mpy-cross binary")
+	parser.add_argument("--out", default=os.path.join(REPO_ROOT, "build", "mpy"))
+	args = parser.parse_args()
+
+	try:
+		version = subprocess.run([args.mpy_cross, "--version"], capture_output=True, text=True, check=True).stdout.strip()
+	except (OSError, subprocess.CalledProcessError) as e:
+		print(f"mpy-cross not usable ({e}) - pass --mpy-cross PATH")
+		return 1
+	if "CircuitPython" not in version:
+		print(f"WARNING: {version!r} does not look like CircuitPython's mpy-cross")
+
+	# Fresh output so removed modules cannot linger on the device
+	if os.path.isdir(args.out):
+		shutil.rmtree(args.out)
+	os.makedirs(args.out)
+
+	total_py = 0
+	total_mpy = 0
+	for file_name in sorted(os.listdir(REPO_ROOT)):
+		if not file_name.endswith(".py") or file_name in SKIP:
+			continue
+		source = os.path.join(REPO_ROOT, file_name)
+		target = os.path.join(args.out, file_name[:-3] + ".mpy")
+		result = subprocess.run([args.mpy_cross, "-o", target, source], capture_output=True, text=True)
+		if result.returncode != 0:
+			print(f"FAILED {file_name}:\n{result.stderr}")
+			return 1
+		py_size = os.path.getsize(source)
+		mpy_size = os.path.getsize(target)
+		total_py += py_size
+		total_mpy += mpy_size
+		print(f"{file_name:<24} {py_size:>7} -> {mpy_size:>6} bytes")
+
+	print(f"\n{version}\nTotal {total_py} -> {total_mpy} bytes in {args.out}")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
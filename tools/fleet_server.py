@@ -0,0 +1,907 @@
+"""
+Pantallita 3.0 - Fleet Aggregator (host-side, CPython 3.9+)
+Fetches AccuWeather, Twelve Data and CTA once for a whole fleet of displays
+and serves each device a small JSON digest, so the same keys are not spent
+once per device and the heavy upstream JSON is parsed on the host
+
+Usage:
+	python3 tools/fleet_server.py serve  --config tools/fleet.example.json [--port 8780] [--replay DIR]
+	python3 tools/fleet_server.py replay --config tools/fleet.example.json [--fixtures DIR] [--rounds 3]
+	python3 tools/fleet_server.py digest --config tools/fleet.example.json --device kitchen [--fixtures DIR]
+
+Devices fetch http://<host-ip>:8780/digest?device=<id> when settings.toml has
+FLEET_DIGEST_URL = "http://<host-ip>:8780/digest" and FLEET_DEVICE_ID = "<id>".
+/stats returns upstream calls made vs the calls each device would have made.
+
+Thin clients (FLEET_FRAME_URL = "http://<host-ip>:8780/frame") get the weather,
+forecast and transit screens as pre-rendered 64x32 frames (tools/frame_renderer.py,
+rendered in a process pool): /frame?device=<id>&screen=<name>&now=YYYYMMDDHHMM
+&wd=<0|1>&routes=<label,label>&base=<crc of the frame on screen>
+
+API keys come from the environment (same names as settings.toml):
+ACCUWEATHER_API_KEY_TYPE1, TWELVE_DATA_API_KEY, CTA_API_KEY, CTA_BUS_API_KEY
+
+Standard library only - no host dependencies.
+"""
+
+import argparse
+import asyncio
+import datetime
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+	from zoneinfo import ZoneInfo
+	EXCHANGE_TZ = ZoneInfo("America/New_York")
+except Exception:
+	EXCHANGE_TZ = None  # No tz database: quotes refresh around the clock
+
+import frame_renderer  # noqa: E402 - tools/ is on sys.path when run as a script (adds the repo root)
+import config  # noqa: E402 - repo config.py (stale windows)
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "fleet")
+
+# Same endpoints as config.API and the device modules
+ACCUWEATHER_BASE = "https://dataservice.accuweather.com"
+ACCUWEATHER_CURRENT = "/currentconditions/v1/{location}?details=true"
+ACCUWEATHER_FORECAST = "/forecasts/v1/hourly/12hour/{location}?details=true"
+TWELVE_DATA_BASE = "https://api.twelvedata.com"
+CTA_TRAIN_URL = "http://lapi.transitchicago.com/api/1.0/ttarrivals.aspx"
+CTA_BUS_URL = "http://www.ctabustracker.com/bustime/api/v2/getpredictions"
+
+# Refresh interval per upstream kind (seconds) - device Timing defaults
+DEFAULT_REFRESH = {"current": 300, "forecast": 900, "quotes": 300, "series": 300, "train": 60, "bus": 60}
+
+# Device batch size (config.Timing.STOCKS_BATCH_MAX) - used to count the quote calls a device would make
+DEVICE_BATCH_MAX = 8
+STOCKS_INTRADAY_BARS = 78
+QUOTE_BATCH_MAX = 120  # Twelve Data batch limit per request
+
+RENDER_CACHE_MAX = 256  # Rendered frames kept (devices with the same data share one)
+FRAME_BASES_MAX = 4     # Frames remembered per device as row-delta bases
+
+
+# ============================================================================
+# NORMALIZATION (same fields the device modules produce)
+# ============================================================================
+
+def normalize_current(item, unit):
+	"""weather_api.fetch_current() dict from one AccuWeather current-conditions item."""
+	temp_unit = "Metric" if unit == "C" else "Imperial"
+	temp = item.get("Temperature", {}).get(temp_unit, {}).get("Value")
+	if temp is None:
+		return None
+	feels_like = item.get("RealFeelTemperature", {}).get(temp_unit, {}).get("Value")
+	if feels_like is None:
+		feels_like = temp
+	feels_shade = item.get("RealFeelTemperatureShade", {}).get(temp_unit, {}).get("Value")
+	if feels_shade is None:
+		feels_shade = feels_like
+	return {
+		"temp": int(temp),
+		"feels_like": int(feels_like),
+		"feels_shade": int(feels_shade),
+		"uv": int(item.get("UVIndex", 0)),
+		"humidity": int(item.get("RelativeHumidity", 0)),
+		"icon": int(item.get("WeatherIcon", 1)),
+		"condition": str(item.get("WeatherText", "Unknown")),
+	}
+
+
+def normalize_forecast(data):
+	"""weather_api.fetch_forecast() list from an AccuWeather 12-hour forecast."""
+	if not data or len(data) < 12:
+		return None
+	forecast = []
+	for hour in data[:12]:
+		temp = hour.get("Temperature", {}).get("Value", 0)
+		feels_like = hour.get("RealFeelTemperature", {}).get("Value")
+		feels_shade = hour.get("RealFeelTemperatureShade", {}).get("Value")
+		if feels_like is None:
+			feels_like = temp
+		if feels_shade is None:
+			feels_shade = feels_like
+		forecast.append({
+			"temp": int(temp),
+			"feels_like": int(feels_like),
+			"feels_shade": int(feels_shade),
+			"icon": hour.get("WeatherIcon", 1),
+			"condition": hour.get("IconPhrase", "Unknown"),
+			"datetime": hour.get("DateTime", ""),
+			"has_precipitation": hour.get("HasPrecipitation", False),
+		})
+	return forecast
+
+
+def normalize_quotes(data):
+	"""stocks_api.fetch_stock_quotes() dict from a Twelve Data /quote response."""
+	if "symbol" in data:
+		quotes = [data]
+	elif isinstance(data, dict):
+		quotes = list(data.values())
+	else:
+		return {}
+	result = {}
+	for quote in quotes:
+		if quote.get("status") == "error" or not quote.get("symbol"):
+			continue
+		try:
+			change_percent = float(quote.get("percent_change", 0))
+			result[quote["symbol"]] = {
+				"price": float(quote.get("close", 0)),
+				"open_price": float(quote.get("open", 0)),
+				"previous_close": float(quote.get("previous_close", 0)),
+				"date": quote.get("datetime", "")[:10],
+				"change_percent": change_percent,
+				"direction": "up" if change_percent >= 0 else "down",
+			}
+		except (ValueError, TypeError):
+			continue
+	return result
+
+
+def normalize_series(data):
+	"""stocks_api.fetch_intraday_time_series() list (oldest first) from /time_series."""
+	if data.get("status") == "error":
+		return []
+	series = []
+	for point in data.get("values", []):
+		try:
+			series.append({
+				"datetime": point.get("datetime", ""),
+				"open_price": float(point.get("open", 0)),
+				"close_price": float(point.get("close", 0)),
+			})
+		except (ValueError, TypeError):
+			continue
+	series.reverse()
+	return series
+
+
+def parse_train(data):
+	"""All arrivals for a set of stations, before per-route filtering: [(rt, destination, minutes)]."""
+	ctatt = data.get("ctatt")
+	if not ctatt or ctatt.get("errCd", "0") != "0":
+		return None
+	tmst = ctatt.get("tmst", "")
+	arrivals = []
+	for eta in ctatt.get("eta", []):
+		destination = eta.get("destNm", "Unknown")
+		if eta.get("isApp", "0") == "1":
+			minutes = 0
+		else:
+			arr_time = eta.get("arrT", "")
+			if "T" not in arr_time or "T" not in tmst:
+				continue
+			try:
+				arr_hms = arr_time.split("T")[1].split(":")
+				cur_hms = tmst.split("T")[1].split(":")
+				minutes = (int(arr_hms[0]) * 60 + int(arr_hms[1])) - (int(cur_hms[0]) * 60 + int(cur_hms[1]))
+			except (ValueError, IndexError):
+				continue
+			if minutes < 0:
+				minutes += 24 * 60
+		arrivals.append((eta.get("rt", "??"), destination, minutes))
+	return arrivals
+
+
+def parse_bus(data):
+	"""All predictions for a route's stops: [(route, destination, minutes)]."""
+	response = data.get("bustime-response")
+	if response is None or "error" in response:
+		return None
+	arrivals = []
+	for prd in response.get("prd", []):
+		countdown = prd.get("prdctdn", "0")
+		try:
+			minutes = 0 if countdown == "DUE" else int(countdown)
+		except ValueError:
+			continue
+		arrivals.append((prd.get("rt", ""), prd.get("des", "Unknown"), minutes))
+	return arrivals
+
+
+def route_arrivals(parsed, route):
+	"""transit_api.fetch_*_arrivals() list for one transits.csv route."""
+	arrivals = []
+	for rt, destination, minutes in parsed:
+		# Brown/Purple: only trains to the Loop (same rule as transit_api)
+		if route["route"] in ("Brn", "P") and rt == route["route"] and "Loop" not in destination:
+			continue
+		if minutes < route.get("min_time", 0):
+			continue
+		arrivals.append({"destination": destination, "minutes": minutes})
+	return arrivals
+
+
+# ============================================================================
+# UPSTREAM CONNECTION POOL
+# ============================================================================
+
+class UpstreamError(Exception):
+	pass
+
+
+class Pool:
+	"""
+	Keep-alive http.client connections per host, used from a thread pool so
+	asyncio can run many upstream requests at once. A connection that went
+	stale between rounds is retried once on a fresh one.
+	"""
+
+	def __init__(self, per_host=4, timeout=15):
+		self.per_host = per_host
+		self.timeout = timeout
+		self.idle = {}
+		self.lock = threading.Lock()
+		self.semaphores = {}
+		self.executor = ThreadPoolExecutor(max_workers=16)
+		self.requests = 0
+		self.new_connections = 0
+
+	def _connect(self, scheme, host):
+		self.new_connections += 1
+		if scheme == "https":
+			return http.client.HTTPSConnection(host, timeout=self.timeout)
+		return http.client.HTTPConnection(host, timeout=self.timeout)
+
+	def _get(self, url):
+		parts = urllib.parse.urlsplit(url)
+		key = (parts.scheme, parts.netloc)
+		path = parts.path + ("?" + parts.query if parts.query else "")
+		with self.lock:
+			idle = self.idle.setdefault(key, [])
+			conn = idle.pop() if idle else None
+		reused = conn is not None
+		if conn is None:
+			conn = self._connect(*key)
+
+		for attempt in (1, 2):
+			try:
+				conn.request("GET", path, headers={"Connection": "keep-alive", "Accept-Encoding": "identity"})
+				response = conn.getresponse()
+				body = response.read()
+				break
+			except (OSError, http.client.HTTPException):
+				conn.close()
+				if not reused or attempt == 2:
+					raise
+				conn = self._connect(*key)  # Server closed the idle connection - one retry
+
+		self.requests += 1
+		if response.will_close:
+			conn.close()
+		else:
+			with self.lock:
+				self.idle[key].append(conn)
+		return response.status, body
+
+	async def get_json(self, url):
+		host = urllib.parse.urlsplit(url).netloc
+		semaphore = self.semaphores.setdefault(host, asyncio.Semaphore(self.per_host))
+		async with semaphore:
+			status, body = await asyncio.get_running_loop().run_in_executor(self.executor, self._get, url)
+		if status != 200:
+			raise UpstreamError(f"HTTP {status}")
+		return json.loads(body)
+
+	def close(self):
+		with self.lock:
+			for conns in self.idle.values():
+				for conn in conns:
+					conn.close()
+			self.idle = {}
+		self.executor.shutdown(wait=False)
+
+
+class ReplayPool:
+	"""Answers upstream URLs from recorded fixtures (tools/fixtures/fleet/) - no network, no keys."""
+
+	FILES = {
+		"currentconditions": "accuweather_current.json",
+		"forecasts": "accuweather_forecast.json",
+		"quote": "twelvedata_quote.json",
+		"time_series": "twelvedata_time_series.json",
+		"ttarrivals.aspx": "cta_train.json",
+		"getpredictions": "cta_bus.json",
+	}
+
+	def __init__(self, directory):
+		self.fixtures = {}
+		for marker, name in self.FILES.items():
+			with open(os.path.join(directory, name)) as f:
+				self.fixtures[marker] = json.load(f)
+		self.requests = 0
+		self.new_connections = 0
+
+	async def get_json(self, url):
+		self.requests += 1
+		parts = urllib.parse.urlsplit(url)
+		query = urllib.parse.parse_qs(parts.query)
+		for marker, fixture in self.fixtures.items():
+			if marker not in parts.path.split("/"):
+				continue
+			if marker == "quote":
+				# Batch answer for exactly the requested symbols
+				symbols = query["symbol"][0].split(",")
+				answer = {}
+				for symbol in symbols:
+					answer[symbol] = fixture.get(symbol, {"symbol": symbol, "status": "error", "message": "not in fixture"})
+				return answer[symbols[0]] if len(symbols) == 1 else answer
+			if marker == "time_series":
+				return dict(fixture, meta={"symbol": query["symbol"][0]})
+			return fixture
+		raise UpstreamError(f"No fixture for {parts.path}")
+
+	def close(self):
+		pass
+
+
+# ============================================================================
+# FLEET
+# ============================================================================
+
+def market_is_open(now=None):
+	"""US regular session (weekday 9:30-16:00 ET) plus 30 min either side; holidays not checked."""
+	if EXCHANGE_TZ is None:
+		return True
+	now = now or datetime.datetime.now(EXCHANGE_TZ)
+	minutes = now.hour * 60 + now.minute
+	return now.weekday() < 5 and 9 * 60 <= minutes <= 16 * 60 + 30
+
+
+class Fleet:
+	"""
+	Upstream jobs shared by the devices in the fleet config.
+
+	Each job (one upstream request) is keyed by what it fetches, so devices
+	with the same location, symbols or stops share one call:
+		("current", location)            AccuWeather current conditions
+		("forecast", location, metric)   AccuWeather 12-hour forecast
+		("quotes", symbols)              Twelve Data batch quote (union of all watchlists)
+		("series", symbol)               Twelve Data 5min intraday bars (chart symbols)
+		("train", stops)                 CTA Train Tracker
+		("bus", route, stops)            CTA Bus Tracker
+	"""
+
+	def __init__(self, config, pool, keys):
+		self.pool = pool
+		self.keys = keys
+		self.devices = config["devices"]
+		self.refresh = dict(DEFAULT_REFRESH, **config.get("refresh", {}))
+		self.results = {}   # job -> (normalized data, fetched_at)
+		self.errors = {}    # job -> last error text
+		self.jobs = {}      # job -> [device ids]
+		self.render_pool = None  # ProcessPoolExecutor for frames (serve); None renders inline
+		self.rendered = {}  # (screen, context) -> (palette, pixels, overlays)
+		self.sent = {}      # device id -> {crc: (palette, pixels)} recent frames (delta bases)
+
+		symbols = set()
+		for device_id, device in self.devices.items():
+			for job in self.device_jobs(device):
+				if job[0] != "quotes":
+					self.jobs.setdefault(job, []).append(device_id)
+			symbols.update(device.get("symbols", []))
+			symbols.update(device.get("charts", []))
+
+		# One batch quote per QUOTE_BATCH_MAX symbols for the whole fleet
+		symbols = sorted(symbols)
+		for i in range(0, len(symbols), QUOTE_BATCH_MAX):
+			chunk = tuple(symbols[i:i + QUOTE_BATCH_MAX])
+			users = [d for d, dev in self.devices.items() if set(chunk) & set(dev.get("symbols", []) + dev.get("charts", []))]
+			self.jobs[("quotes", chunk)] = users
+
+		# Savings report: per device, calls it would have made vs its share of ours
+		self.stats = {d: {"would_call": 0, "share": 0.0, "digests": 0, "digest_bytes": 0, "frames": 0, "frame_bytes": 0} for d in self.devices}
+		self.upstream_calls = 0
+
+	@staticmethod
+	def device_jobs(device):
+		jobs = []
+		if device.get("location"):
+			jobs.append(("current", device["location"]))
+			jobs.append(("forecast", device["location"], device.get("unit", "F") == "C"))
+		if device.get("symbols") or device.get("charts"):
+			jobs.append(("quotes", None))
+		for symbol in device.get("charts", []):
+			jobs.append(("series", symbol))
+		for route in device.get("routes", []):
+			stops = tuple(route["stops"])
+			if route["type"] == "train":
+				jobs.append(("train", stops))
+			else:
+				jobs.append(("bus", route["route"], stops))
+		return jobs
+
+	@staticmethod
+	def device_calls(device, kind):
+		"""Requests the device itself would make for one refresh of this kind."""
+		if kind == "quotes":
+			count = len(set(device.get("symbols", []) + device.get("charts", [])))
+			return (count + DEVICE_BATCH_MAX - 1) // DEVICE_BATCH_MAX
+		if kind == "series":
+			return len(device.get("charts", []))
+		if kind in ("train", "bus"):
+			return len([r for r in device.get("routes", []) if r["type"] == kind])
+		return 1
+
+	def url(self, job):
+		kind = job[0]
+		if kind == "current":
+			return ACCUWEATHER_BASE + ACCUWEATHER_CURRENT.format(location=job[1]) + f"&apikey={self.keys['accuweather']}"
+		if kind == "forecast":
+			metric = "true" if job[2] else "false"
+			return ACCUWEATHER_BASE + ACCUWEATHER_FORECAST.format(location=job[1]) + f"&metric={metric}&apikey={self.keys['accuweather']}"
+		if kind == "quotes":
+			return f"{TWELVE_DATA_BASE}/quote?symbol={','.join(job[1])}&apikey={self.keys['twelve_data']}"
+		if kind == "series":
+			return f"{TWELVE_DATA_BASE}/time_series?symbol={job[1]}&interval=5min&outputsize={STOCKS_INTRADAY_BARS}&apikey={self.keys['twelve_data']}"
+		if kind == "train":
+			return f"{CTA_TRAIN_URL}?key={self.keys['cta_train']}&mapid={','.join(job[1])}&outputType=JSON"
+		return f"{CTA_BUS_URL}?key={self.keys['cta_bus']}&rt={job[1]}&format=json" + "".join(f"&stpid={s}" for s in job[2])
+
+	def due(self, now, force=False):
+		"""Jobs whose data is older than their refresh interval (stocks only around market hours)."""
+		due = []
+		market = None
+		for job in self.jobs:
+			fetched = self.results.get(job)
+			if force or fetched is None:
+				due.append(job)
+				continue
+			if now - fetched[1] < self.refresh[job[0]]:
+				continue
+			if job[0] in ("quotes", "series"):
+				if market is None:
+					market = market_is_open()
+				if not market:
+					continue
+			due.append(job)
+		return due
+
+	async def fetch(self, job):
+		kind = job[0]
+		try:
+			data = await self.pool.get_json(self.url(job))
+			if kind == "current":
+				result = data[0] if data else None  # Raw item: each device picks its unit
+			elif kind == "forecast":
+				result = normalize_forecast(data)
+			elif kind == "quotes":
+				result = normalize_quotes(data)
+			elif kind == "series":
+				result = normalize_series(data)
+			elif kind == "train":
+				result = parse_train(data)
+			else:
+				result = parse_bus(data)
+		except (UpstreamError, OSError, ValueError, KeyError, IndexError, TypeError, http.client.HTTPException) as e:
+			self.errors[job] = str(e)
+			result = None
+		finally:
+			self.upstream_calls += 1
+			users = self.jobs[job]
+			for device_id in users:
+				self.stats[device_id]["share"] += 1 / len(users)
+
+		if result is None:
+			self.errors.setdefault(job, "unexpected response")
+			return False
+		self.errors.pop(job, None)
+		self.results[job] = (result, time.time())
+		return True
+
+	async def refresh_round(self, force=False):
+		"""Fetch every due job concurrently. Returns (fetched, failed)."""
+		due = self.due(time.time(), force)
+		if not due:
+			return 0, 0
+
+		# What each device would have requested for the same refreshes
+		for device_id, device in self.devices.items():
+			kinds = set()
+			for job in due:
+				if device_id in self.jobs[job]:
+					kinds.add(job[0])
+			for kind in kinds:
+				self.stats[device_id]["would_call"] += self.device_calls(device, kind)
+
+		results = await asyncio.gather(*[self.fetch(job) for job in due])
+		ok = sum(1 for r in results if r)
+		return ok, len(results) - ok
+
+	def digest(self, device_id):
+		"""One device's digest: device-module shapes plus seconds since each section was fetched."""
+		device = self.devices[device_id]
+		now = time.time()
+		digest = {"v": 1, "age": {}}
+
+		def take(section, job):
+			fetched = self.results.get(job)
+			if fetched is None:
+				return None
+			age = int(now - fetched[1])
+			digest["age"][section] = max(digest["age"].get(section, 0), age)
+			return fetched[0]
+
+		if device.get("location"):
+			item = take("weather", ("current", device["location"]))
+			digest["weather"] = normalize_current(item, device.get("unit", "F")) if item else None
+			digest["forecast"] = take("forecast", ("forecast", device["location"], device.get("unit", "F") == "C"))
+
+		wanted = set(device.get("symbols", []) + device.get("charts", []))
+		if wanted:
+			quotes = {}
+			for job in self.jobs:
+				if job[0] == "quotes" and wanted & set(job[1]):
+					batch = take("quotes", job) or {}
+					for symbol in wanted & set(batch):
+						quotes[symbol] = batch[symbol]
+			digest["quotes"] = quotes
+
+		if device.get("charts"):
+			digest["series"] = {}
+			for symbol in device["charts"]:
+				series = take("series", ("series", symbol))
+				if series:
+					digest["series"][symbol] = series
+
+		if device.get("routes"):
+			digest["transit"] = {}
+			for route in device["routes"]:
+				stops = tuple(route["stops"])
+				job = ("train", stops) if route["type"] == "train" else ("bus", route["route"], stops)
+				parsed = take("transit", job)
+				if parsed is not None:
+					digest["transit"][route["label"]] = route_arrivals(parsed, route)
+
+		body = json.dumps(digest, separators=(",", ":")).encode()
+		self.stats[device_id]["digests"] += 1
+		self.stats[device_id]["digest_bytes"] = len(body)
+		return body
+
+	def frame_context(self, device_id, screen, now, weekday_indicator, labels=None):
+		"""
+		Renderer input for one device screen, or None when there is no data
+		for it (the device then falls back to its own renderer).
+
+		Args:
+			now: Device local time (naive datetime from its RTC)
+			weekday_indicator: Device's show-weekday setting
+			labels: Route labels the device has active now (days, commute hours), None = all
+		"""
+		device = self.devices[device_id]
+		wall = time.time()
+		ctx = {"hour": now.hour, "month": now.month, "day": now.day, "wday": now.weekday(),
+		       "weekday_indicator": weekday_indicator, "stale": False}
+		grace = config.Timing.STALE_GRACE
+
+		weather = None
+		if device.get("location"):
+			fetched = self.results.get(("current", device["location"]))
+			if fetched and fetched[0]:
+				weather = normalize_current(fetched[0], device.get("unit", "F"))
+				weather_age = wall - fetched[1]
+
+		if screen == "weather":
+			if weather is None:
+				return None
+			ctx["weather"] = weather
+			ctx["stale"] = weather_age > config.Timing.WEATHER_CACHE_MAX_AGE + grace
+			return ctx
+
+		if screen == "forecast":
+			fetched = self.results.get(("forecast", device.get("location"), device.get("unit", "F") == "C"))
+			if weather is None or not fetched or not fetched[0] or len(fetched[0]) < 2:
+				return None
+			ctx["weather"] = weather
+			ctx["forecast"] = fetched[0]
+			ctx["stale"] = wall - fetched[1] > config.Timing.FORECAST_CACHE_MAX_AGE + grace
+			return ctx
+
+		# Transit: routes with arrivals left after counting down by the data's age
+		ctx["feels_like"] = weather["feels_like"] if weather else None
+		ctx["routes"] = []
+		for route in device.get("routes", []):
+			if labels is not None and route["label"] not in labels:
+				continue
+			stops = tuple(route["stops"])
+			fetched = self.results.get(("train", stops) if route["type"] == "train" else ("bus", route["route"], stops))
+			if fetched is None:
+				continue
+			age = wall - fetched[1]
+			if age > config.Timing.TRANSIT_UPDATE_INTERVAL + grace:
+				ctx["stale"] = True
+			age_minutes = int(age // 60)
+			arrivals = []
+			for arrival in route_arrivals(fetched[0], route):
+				minutes = arrival["minutes"] - age_minutes
+				if minutes >= route.get("min_time", 0):
+					arrivals.append({"destination": arrival["destination"], "minutes": minutes})
+			if arrivals:
+				ctx["routes"].append({"label": route["label"], "type": route["type"], "route": route["route"],
+				                      "color": route.get("color", "WHITE"), "color2": route.get("color2"),
+				                      "arrivals": arrivals[:2]})
+		return ctx
+
+	async def frame(self, device_id, screen, now, weekday_indicator, labels=None, base_crc=0):
+		"""
+		Encoded frame for one device screen (None = no data). Identical
+		contexts render once; when base_crc is a frame this device was sent
+		recently, only the rows that changed since then are included.
+		"""
+		ctx = self.frame_context(device_id, screen, now, weekday_indicator, labels)
+		if ctx is None:
+			return None
+
+		key = json.dumps([screen, ctx], sort_keys=True)
+		rendered = self.rendered.get(key)
+		if rendered is None:
+			if self.render_pool is None:
+				rendered = frame_renderer.render(screen, ctx)
+			else:
+				rendered = await asyncio.get_running_loop().run_in_executor(self.render_pool, frame_renderer.render, screen, ctx)
+			self.rendered[key] = rendered
+			if len(self.rendered) > RENDER_CACHE_MAX:
+				self.rendered.pop(next(iter(self.rendered)))
+
+		palette, pixels, overlays = rendered
+		sent = self.sent.setdefault(device_id, {})
+		base = (base_crc,) + sent[base_crc] if base_crc in sent else None
+		body, crc = frame_renderer.encode(palette, pixels, overlays, base)
+
+		sent.pop(crc, None)
+		sent[crc] = (palette, pixels)
+		if len(sent) > FRAME_BASES_MAX:
+			sent.pop(next(iter(sent)))
+
+		self.stats[device_id]["frames"] += 1
+		self.stats[device_id]["frame_bytes"] += len(body)
+		return body
+
+	def report(self):
+		"""Upstream calls saved per device (would have made - share of the fleet's calls)."""
+		devices = {}
+		for device_id, s in self.stats.items():
+			devices[device_id] = {
+				"would_call": s["would_call"],
+				"share": round(s["share"], 1),
+				"saved": round(s["would_call"] - s["share"], 1),
+				"digests": s["digests"],
+				"digest_bytes": s["digest_bytes"],
+				"frames": s["frames"],
+				"frame_bytes_avg": s["frame_bytes"] // s["frames"] if s["frames"] else 0,
+			}
+		would = sum(s["would_call"] for s in self.stats.values())
+		return {
+			"upstream_calls": self.upstream_calls,
+			"device_calls_replaced": would,
+			"saved": would - self.upstream_calls,
+			"http_requests": self.pool.requests,
+			"new_connections": self.pool.new_connections,
+			"errors": {" ".join(str(p) for p in job): e for job, e in self.errors.items()},
+			"devices": devices,
+		}
+
+
+def print_report(report):
+	print(f"[fleet] upstream calls {report['upstream_calls']} (replacing {report['device_calls_replaced']} device calls, "
+	      f"{report['saved']} saved), {report['new_connections']} connections for {report['http_requests']} requests")
+	for device_id, d in report["devices"].items():
+		print(f"[fleet]   {device_id:<12} would call {d['would_call']:>5}  share {d['share']:>7}  saved {d['saved']:>7}  "
+		      f"digest {d['digest_bytes']} B ({d['digests']} served)" +
+		      (f"  frames {d['frames']} ({d['frame_bytes_avg']} B avg)" if d["frames"] else ""))
+	for job, error in report["errors"].items():
+		print(f"[fleet]   error {job}: {error}")
+
+
+# ============================================================================
+# SETUP
+# ============================================================================
+
+def load_config(path):
+	with open(path) as f:
+		config = json.load(f)
+	for device_id, device in config.get("devices", {}).items():
+		for route in device.get("routes", []):
+			for field in ("label", "type", "route", "stops"):
+				if field not in route:
+					raise ValueError(f"{device_id}: route missing '{field}'")
+			if route["type"] not in ("train", "bus"):
+				raise ValueError(f"{device_id}: route type must be train or bus")
+	if not config.get("devices"):
+		raise ValueError("no devices")
+	return config
+
+
+def make_fleet(args, replay_dir=None):
+	config = load_config(args.config)
+	keys = {
+		"accuweather": os.environ.get("ACCUWEATHER_API_KEY_TYPE1", ""),
+		"twelve_data": os.environ.get("TWELVE_DATA_API_KEY", ""),
+		"cta_train": os.environ.get("CTA_API_KEY", ""),
+		"cta_bus": os.environ.get("CTA_BUS_API_KEY", ""),
+	}
+	pool = ReplayPool(replay_dir) if replay_dir else Pool(per_host=getattr(args, "per_host", 4))
+	return Fleet(config, pool, keys)
+
+
+# ============================================================================
+# COMMANDS
+# ============================================================================
+
+async def handle_client(reader, writer, fleet, args):
+	try:
+		request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=10)
+	except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+		writer.close()
+		return
+
+	try:
+		method, target = request.split(b"\r\n", 1)[0].decode().split(" ")[:2]
+	except ValueError:
+		method, target = "", ""
+	parts = urllib.parse.urlsplit(target)
+	query = urllib.parse.parse_qs(parts.query)
+
+	status, body = "404 Not Found", b'{"error":"not found"}'
+	content_type = "application/json"
+	if method != "GET":
+		status, body = "405 Method Not Allowed", b'{"error":"GET only"}'
+	elif parts.path == "/digest":
+		device_id = query.get("device", [""])[0]
+		if device_id in fleet.devices:
+			status, body = "200 OK", fleet.digest(device_id)
+			if not args.quiet:
+				print(f"[fleet] digest {device_id} -> {writer.get_extra_info('peername')[0]} ({len(body)} B)")
+		else:
+			status, body = "404 Not Found", b'{"error":"unknown device"}'
+	elif parts.path == "/frame":
+		device_id = query.get("device", [""])[0]
+		screen = query.get("screen", [""])[0]
+		try:
+			now = datetime.datetime.strptime(query.get("now", [""])[0], "%Y%m%d%H%M")
+		except ValueError:
+			now = datetime.datetime.now()
+		try:
+			base_crc = int(query.get("base", ["0"])[0], 16)
+		except ValueError:
+			base_crc = 0
+		labels = query["routes"][0].split(",") if "routes" in query else None
+		if device_id not in fleet.devices or screen not in frame_renderer.SCREENS:
+			status, body = "404 Not Found", b'{"error":"unknown device or screen"}'
+		else:
+			frame = await fleet.frame(device_id, screen, now, query.get("wd", ["0"])[0] == "1", labels, base_crc)
+			if frame is None:
+				status, body = "404 Not Found", b'{"error":"no data"}'
+			else:
+				status, body, content_type = "200 OK", frame, "application/octet-stream"
+				if not args.quiet:
+					print(f"[fleet] frame {device_id}/{screen} -> {writer.get_extra_info('peername')[0]} ({len(body)} B)")
+	elif parts.path == "/stats":
+		status, body = "200 OK", json.dumps(fleet.report()).encode()
+
+	writer.write((f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+	              f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n").encode() + body)
+	try:
+		await writer.drain()
+	except ConnectionError:
+		pass
+	writer.close()
+
+
+async def serve(args):
+	fleet = make_fleet(args, args.replay)
+	fleet.render_pool = ProcessPoolExecutor(max_workers=args.render_workers)
+	print(f"[fleet] {len(fleet.devices)} devices, {len(fleet.jobs)} upstream jobs ({'replay ' + args.replay if args.replay else 'live'})")
+	fetched, failed = await fleet.refresh_round(force=True)
+	print(f"[fleet] first round: {fetched} fetched, {failed} failed")
+
+	async def refresher():
+		last_report = time.time()
+		while True:
+			await asyncio.sleep(args.tick)
+			fetched, failed = await fleet.refresh_round()
+			if fetched or failed:
+				if not args.quiet:
+					print(f"[fleet] refresh: {fetched} fetched, {failed} failed")
+			if time.time() - last_report >= args.report_every:
+				print_report(fleet.report())
+				last_report = time.time()
+
+	server = await asyncio.start_server(lambda r, w: handle_client(r, w, fleet, args), args.host, args.port)
+	print(f"[fleet] listening on http://{args.host}:{args.port}/digest?device=<id>")
+	asyncio.ensure_future(refresher())
+	try:
+		async with server:
+			await server.serve_forever()
+	finally:
+		fleet.pool.close()
+		fleet.render_pool.shutdown()
+
+
+async def replay(args):
+	"""Run rounds against fixtures: check every digest builds and report the savings."""
+	fleet = make_fleet(args, args.fixtures)
+	print(f"[fleet] replaying {args.rounds} rounds for {len(fleet.devices)} devices, {len(fleet.jobs)} upstream jobs")
+	failures = 0
+	for _ in range(args.rounds):
+		fetched, failed = await fleet.refresh_round(force=True)
+		failures += failed
+		for device_id in fleet.devices:
+			digest = json.loads(fleet.digest(device_id))
+			if "weather" in digest and not digest["weather"]:
+				print(f"[fleet] {device_id}: no weather in digest")
+				failures += 1
+			# Thin-client frames, each based on the previous one (row deltas)
+			now = datetime.datetime.now()
+			for screen in frame_renderer.SCREENS:
+				base = next(reversed(fleet.sent.get(device_id, {0: None})))
+				await fleet.frame(device_id, screen, now, True, None, base)
+	print_report(fleet.report())
+	return 0 if failures == 0 else 1
+
+
+async def show_digest(args):
+	fleet = make_fleet(args, args.fixtures)
+	if args.device not in fleet.devices:
+		print(f"Unknown device {args.device} (config has {', '.join(fleet.devices)})")
+		return 1
+	await fleet.refresh_round(force=True)
+	print(json.dumps(json.loads(fleet.digest(args.device)), indent=1))
+	fleet.pool.close()
+	return 0
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Fleet aggregator: one upstream fetch, one digest per Pantallita")
+	sub = parser.add_subparsers(dest="command")
+
+	p = sub.add_parser("serve", help="Fetch upstream on a schedule and serve device digests")
+	p.add_argument("--config", required=True, help="Fleet JSON (see tools/fleet.example.json)")
+	p.add_argument("--host", default="0.0.0.0")
+	p.add_argument("--port", type=int, default=8780)
+	p.add_argument("--replay", default=None, help="Serve from a fixture directory instead of the live APIs")
+	p.add_argument("--per-host", type=int, default=4, help="Max concurrent requests (pooled connections) per upstream host")
+	p.add_argument("--tick", type=float, default=5, help="Seconds between due-job checks")
+	p.add_argument("--report-every", type=float, default=600, help="Seconds between savings reports")
+	p.add_argument("--render-workers", type=int, default=2, help="Frame renderer processes")
+	p.add_argument("--quiet", action="store_true")
+
+	p = sub.add_parser("replay", help="Run refresh rounds against recorded fixtures and report savings")
+	p.add_argument("--config", required=True)
+	p.add_argument("--fixtures", default=DEFAULT_FIXTURES)
+	p.add_argument("--rounds", type=int, default=3)
+
+	p = sub.add_parser("digest", help="Print one device's digest (fixtures unless --fixtures '')")
+	p.add_argument("--config", required=True)
+	p.add_argument("--device", required=True)
+	p.add_argument("--fixtures", default=DEFAULT_FIXTURES)
+	p.add_argument("--per-host", type=int, default=4)
+
+	args = parser.parse_args()
+	try:
+		if args.command == "serve":
+			return asyncio.run(serve(args))
+		if args.command == "replay":
+			return asyncio.run(replay(args))
+		if args.command == "digest":
+			return asyncio.run(show_digest(args))
+	except (OSError, ValueError, KeyError) as e:
+		print(f"[fleet] {e}")
+		return 1
+	parser.print_help()
+	return 2
+
+
+if __name__ == "__main__":
+	try:
+		sys.exit(main() or 0)
+	except KeyboardInterrupt:
+		pass
@@ -0,0 +1,558 @@
+"""
+Pantallita 3.0 - Frame Renderer (host-side, CPython 3.9+)
+Renders the weather, forecast and transit screens into exact 64x32
+palette-indexed frames for thin-client displays (display_frame.py), using
+the same config.Layout constants, BDF fonts and BMP icons as the device.
+Only the clock and arrival countdowns are left to the device as live overlays.
+
+Usage:
+	python3 tools/frame_renderer.py preview --screen weather [--out frame.bmp]
+	python3 tools/frame_renderer.py bench [--devices 20] [--workers 4] [--rounds 5]
+
+tools/fleet_server.py serves frames at /frame (process pool of these renderers).
+
+Frame format (little-endian):
+	header   "PF1", flags (1 = row delta, 2 = 4-bit pixels), colors, overlays, 0, crc32, base crc32
+	palette  colors x RGB bytes
+	overlays kind, font, anchor, x (h), y (h), color, background (255 = none),
+	         padding top/bottom/left/right (b), value (h), text length, UTF-8 text
+	pixels   full: 32 rows; delta: changed-row mask (I) + changed rows
+	         (row = 32 bytes at 4 bits/pixel, high nibble first, or 64 bytes at 8 bits)
+
+Standard library only - no host dependencies.
+"""
+
+import argparse
+import os
+import struct
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(TOOLS_DIR)
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, TOOLS_DIR)
+
+import config  # noqa: E402 - host-importable (only depends on os)
+from build_assets import BmpError, read_bmp, write_indexed_bmp  # noqa: E402
+
+SCREENS = ("weather", "forecast", "transit")
+
+WIDTH = config.Layout.WIDTH
+HEIGHT = config.Layout.HEIGHT
+
+# Overlay kinds / fonts / anchors (display_frame.py uses the same numbers)
+OVERLAY_CLOCK = 1      # text with "{t}" replaced by the live H:MM clock
+OVERLAY_COUNTDOWN = 2  # value minus whole minutes since the frame was fetched
+FONT_SMALL = 0
+FONT_LARGE = 1
+ANCHOR_NONE = 0        # x, y are the label position
+ANCHOR_TOP_CENTER = 1  # anchor_point (0.5, 0.0) at anchored_position (x, y)
+ANCHOR_TOP_RIGHT = 2   # anchor_point (1.0, 0.0)
+NO_BACKGROUND = 255
+
+FLAG_DELTA = 1
+FLAG_4BIT = 2
+HEADER = "<3sBBBBII"
+OVERLAY = "<BBBhhBBbbbbhB"
+
+MONTHS = ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"]
+WEEKDAY_COLORS = (config.Colors.RED, config.Colors.ORANGE, config.Colors.YELLOW, config.Colors.GREEN,
+                  config.Colors.AQUA, config.Colors.PURPLE, config.Colors.PINK)
+
+
+# ============================================================================
+# FONTS (BDF, as loaded by adafruit_bitmap_font)
+# ============================================================================
+
+class Font:
+	"""BDF font: ascent/descent plus glyphs {codepoint: (width, height, dx, dy, shift_x, rows)}."""
+
+	def __init__(self, path):
+		self.ascent = 0
+		self.descent = 0
+		self.glyphs = {}
+		with open(path) as f:
+			lines = f.read().splitlines()
+
+		i = 0
+		while i < len(lines):
+			parts = lines[i].split()
+			if not parts:
+				i += 1
+				continue
+			if parts[0] == "FONT_ASCENT":
+				self.ascent = int(parts[1])
+			elif parts[0] == "FONT_DESCENT":
+				self.descent = int(parts[1])
+			elif parts[0] == "STARTCHAR":
+				code, shift_x, bbx, rows = None, 0, (0, 0, 0, 0), []
+				i += 1
+				while i < len(lines) and lines[i] != "ENDCHAR":
+					parts = lines[i].split()
+					if parts and parts[0] == "ENCODING":
+						code = int(parts[1])
+					elif parts and parts[0] == "DWIDTH":
+						shift_x = int(parts[1])
+					elif parts and parts[0] == "BBX":
+						bbx = tuple(int(p) for p in parts[1:5])
+					elif parts and parts[0] == "BITMAP":
+						i += 1
+						while lines[i] != "ENDCHAR":
+							bits = len(lines[i].strip()) * 4
+							value = int(lines[i], 16)
+							rows.append([(value >> (bits - 1 - c)) & 1 for c in range(bbx[0])])
+							i += 1
+						break
+					i += 1
+				if code is not None and code >= 0:
+					self.glyphs[code] = (bbx[0], bbx[1], bbx[2], bbx[3], shift_x, rows)
+			i += 1
+
+	def measure(self, text):
+		"""bitmap_label box: (text width, tight height, tight top above baseline)."""
+		x = right = 0
+		top = bottom = 0
+		for char in text:
+			glyph = self.glyphs.get(ord(char))
+			if glyph is None:
+				continue
+			width, height, dx, dy, shift_x, _ = glyph
+			right = max(right, x + shift_x, x + width + dx)
+			top = max(top, height + dy)
+			bottom = min(bottom, dy)
+			x += shift_x
+		return right, top - bottom, top
+
+
+_FONTS = {}
+_IMAGES = {}
+
+
+def font(which):
+	"""Fonts load once per (pool) process."""
+	if which not in _FONTS:
+		path = config.Paths.FONT_LARGE if which == FONT_LARGE else config.Paths.FONT_SMALL
+		_FONTS[which] = Font(os.path.join(REPO_ROOT, path.lstrip("/")))
+	return _FONTS[which]
+
+
+def image(device_path):
+	"""BMP pixels (top-down RGB rows) by device path, cached per process. None if missing/unreadable."""
+	if device_path not in _IMAGES:
+		try:
+			_IMAGES[device_path] = read_bmp(os.path.join(REPO_ROOT, device_path.lstrip("/")))
+		except (OSError, BmpError):
+			_IMAGES[device_path] = None
+	return _IMAGES[device_path]
+
+
+# ============================================================================
+# CANVAS (displayio semantics)
+# ============================================================================
+
+class Canvas:
+	def __init__(self):
+		self.pixels = [[config.Colors.BLACK] * WIDTH for _ in range(HEIGHT)]
+		self.overlays = []
+
+	def fill(self, x, y, w, h, color):
+		for row in range(max(y, 0), min(y + h, HEIGHT)):
+			for col in range(max(x, 0), min(x + w, WIDTH)):
+				self.pixels[row][col] = color
+
+	def blit(self, device_path, x, y):
+		"""Opaque TileGrid of a whole BMP (OnDiskBitmap palettes have no transparency)."""
+		bmp = image(device_path)
+		if bmp is None:
+			return False
+		for row in range(bmp["height"]):
+			if 0 <= y + row < HEIGHT:
+				for col in range(bmp["width"]):
+					if 0 <= x + col < WIDTH:
+						r, g, b = bmp["pixels"][row][col]
+						self.pixels[y + row][x + col] = (r << 16) | (g << 8) | b
+		return True
+
+	@staticmethod
+	def place(which, text, x=0, y=0, anchor=ANCHOR_NONE, pads=(0, 0, 0, 0)):
+		"""
+		bitmap_label geometry: label origin (x, y) for a plain or anchored
+		label and its background box. The box is the loose box (font ascent
+		+ descent, pen width) grown by the paddings; anchoring uses the text
+		box without padding, so with a top anchor the ascent starts at y.
+
+		Returns:
+			tuple: (origin_x, origin_y, box_x, box_y, box_w, box_h)
+		"""
+		f = font(which)
+		width, _, _ = f.measure(text)
+		pad_top, pad_bottom, pad_left, pad_right = pads
+		half = f.ascent // 2
+		if anchor != ANCHOR_NONE:
+			anchor_x = 0.5 if anchor == ANCHOR_TOP_CENTER else 1.0
+			x = int(x - round(anchor_x * width))
+			y = int(y - (half - f.ascent))
+		box_x = x - pad_left
+		box_y = y + half - f.ascent - pad_top
+		box_w = width + pad_left + pad_right
+		box_h = f.ascent + f.descent + pad_top + pad_bottom
+		return x, y, box_x, box_y, box_w, box_h
+
+	def label(self, which, text, color, x=0, y=0, anchor=ANCHOR_NONE, background=None, pads=(0, 0, 0, 0)):
+		"""Draw a bitmap_label (text clipped to its box, like the label's own bitmap)."""
+		if not text:
+			return
+		f = font(which)
+		x, y, box_x, box_y, box_w, box_h = self.place(which, text, x, y, anchor, pads)
+		if background is not None:
+			self.fill(box_x, box_y, box_w, box_h, background)
+
+		baseline = y + f.ascent // 2
+		pen = x
+		for char in text:
+			glyph = f.glyphs.get(ord(char))
+			if glyph is None:
+				continue
+			width, height, dx, dy, shift_x, rows = glyph
+			top = baseline - (height + dy)
+			for r in range(height):
+				py = top + r
+				if py < max(box_y, 0) or py >= min(box_y + box_h, HEIGHT):
+					continue
+				for c in range(width):
+					px = pen + dx + c
+					if rows[r][c] and max(box_x, 0) <= px < min(box_x + box_w, WIDTH):
+						self.pixels[py][px] = color
+			pen += shift_x
+
+	def overlay(self, kind, which, text, color, x=0, y=0, anchor=ANCHOR_NONE, background=None, pads=(0, 0, 0, 0), value=0):
+		"""Leave a label to the device (drawn live over the frame)."""
+		self.overlays.append((kind, which, anchor, x, y, color, background, pads, value, text))
+
+	def weekday(self, wday, stale):
+		"""display_weekday.add_weekday_indicator: 5x7 black margin box, 4x4 day square, hollow when stale."""
+		self.fill(59, 0, 5, 7, config.Colors.BLACK)
+		self.fill(60, 0, 4, 4, WEEKDAY_COLORS[wday] if 0 <= wday <= 6 else config.Colors.WHITE)
+		if stale:
+			self.fill(61, 1, 2, 2, config.Colors.BLACK)
+
+
+# ============================================================================
+# SCREENS (mirror display_weather / display_forecast / display_transit)
+# ============================================================================
+
+def render_weather(canvas, ctx):
+	weather = ctx["weather"]
+	canvas.blit(f"{config.Paths.WEATHER_IMAGES}/{weather['icon']}.bmp", 0, 0)
+
+	if ctx["weekday_indicator"] or ctx["stale"]:
+		canvas.weekday(ctx["wday"], ctx["stale"])
+
+	temp, feels, shade = weather["temp"], weather["feels_like"], weather["feels_shade"]
+	canvas.label(FONT_LARGE, f"{temp}°", config.Colors.WHITE, config.Layout.LEFT_EDGE, config.Layout.WEATHER_TEMP_Y,
+	             background=config.Colors.BLACK, pads=(-5, 0, 0, 0))
+
+	show_shade = shade != feels
+	if feels != temp:
+		canvas.label(FONT_SMALL, f"{feels}°", config.Colors.WHITE, config.Layout.WIDTH, config.Layout.FEELSLIKE_Y,
+		             anchor=ANCHOR_TOP_RIGHT, background=config.Colors.BLACK, pads=(-5, -2, 0, 0))
+	if show_shade:
+		canvas.label(FONT_SMALL, f"{shade}°", config.Colors.WHITE, config.Layout.WIDTH, config.Layout.FEELSLIKE_SHADE_Y,
+		             anchor=ANCHOR_TOP_RIGHT, background=config.Colors.BLACK, pads=(-5, -2, 0, 0))
+
+	# Live clock: centered when the shade temp is shown, else right-aligned at its position
+	if show_shade:
+		canvas.overlay(OVERLAY_CLOCK, FONT_SMALL, "{t}", config.Colors.WHITE, config.Display.WIDTH // 2, config.Layout.WEATHER_TIME_Y,
+		               anchor=ANCHOR_TOP_CENTER, background=config.Colors.BLACK, pads=(-4, 0, 2, 2))
+	else:
+		canvas.overlay(OVERLAY_CLOCK, FONT_SMALL, "{t}", config.Colors.WHITE, config.Layout.WIDTH, config.Layout.WEATHER_TIME_Y,
+		               anchor=ANCHOR_TOP_RIGHT, background=config.Colors.BLACK, pads=(-4, 0, 2, 2))
+
+	# UV bar (gap every 3 pixels) and humidity bar (gap every 2)
+	for value, y, group in ((min(int(weather.get("uv", 0)), 11), config.Layout.UV_BAR_Y, 3),
+	                        (min(int(round(weather.get("humidity", 0) / 10)), 10), config.Layout.HUMIDITY_BAR_Y, 2)):
+		drawn = position = 0
+		while drawn < value:
+			canvas.fill(position + config.Layout.LEFT_EDGE, y, 1, 1, config.Colors.WHITE)
+			drawn += 1
+			position += 1
+			if drawn % group == 0 and drawn < value:
+				position += 1
+
+
+def render_forecast(canvas, ctx):
+	current, forecast = ctx["weather"], ctx["forecast"]
+	hour = ctx["hour"]
+
+	# Smart column selection (same rules as display_forecast.show)
+	col2, col3 = 0, 1
+	precip = [h.get("has_precipitation", False) for h in forecast]
+	if current.get("has_precipitation", False):
+		stop = next((i for i in range(len(precip)) if not precip[i]), -1)
+		if stop != -1:
+			col2, col3 = stop, min(stop + 1, len(forecast) - 1)
+		else:
+			col2, col3 = 1, 11
+	else:
+		start = stop = -1
+		for i in range(len(precip)):
+			if precip[i] and start == -1:
+				start = i
+			elif not precip[i] and start != -1 and stop == -1:
+				stop = i
+				break
+		if start != -1:
+			col2, col3 = start, (stop if stop != -1 else 11)
+
+	if col2 == 0 and int(forecast[col2]["datetime"][11:13]) % 24 == hour and len(forecast) >= 3:
+		col2, col3 = 1, 2
+
+	if ctx["weekday_indicator"] or ctx["stale"]:
+		canvas.weekday(ctx["wday"], ctx["stale"])
+
+	col2_hour = int(forecast[col2]["datetime"][11:13]) % 24
+	col3_hour = int(forecast[col3]["datetime"][11:13]) % 24
+	col2_color = config.Colors.DIMMEST_WHITE if (col2_hour - hour) % 24 <= 1 else config.Colors.MINT
+	if col2_color == config.Colors.MINT or (col3_hour - col2_hour) % 24 > 1:
+		col3_color = config.Colors.MINT
+	else:
+		col3_color = config.Colors.DIMMEST_WHITE
+
+	columns = (
+		(current["icon"], config.Layout.FORECAST_ICON1_X, f"{int(current['feels_like'])}°"),
+		(forecast[col2]["icon"], config.Layout.FORECAST_ICON2_X, f"{int(forecast[col2]['feels_like'])}°"),
+		(forecast[col3]["icon"], config.Layout.FORECAST_ICON3_X, f"{int(forecast[col3]['feels_like'])}°"),
+	)
+	for icon, x, _ in columns:
+		canvas.blit(f"{config.Paths.FORECAST_IMAGES}/{icon}.bmp", x, config.Layout.FORECAST_ICON_Y)
+
+	# Column 1 time is the live clock; columns 2-3 centered hour labels
+	canvas.overlay(OVERLAY_CLOCK, FONT_SMALL, "{t}", config.Colors.DIMMEST_WHITE, config.Layout.FORECAST_COL1_X, config.Layout.FORECAST_TIME_Y)
+	for col_hour, col_x, color in ((col2_hour, config.Layout.FORECAST_COL2_X, col2_color), (col3_hour, config.Layout.FORECAST_COL3_X, col3_color)):
+		text = f"{col_hour % 12 or 12}{'A' if col_hour < 12 else 'P'}"
+		width = font(FONT_SMALL).measure(text)[0]
+		canvas.label(FONT_SMALL, text, color, col_x + (config.Layout.FORECAST_COLUMN_WIDTH - width) // 2, config.Layout.FORECAST_TIME_Y)
+
+	starts = (config.Layout.FORECAST_COL1_X, config.Layout.FORECAST_COL2_X, config.Layout.FORECAST_COL3_X)
+	for i, (_, _, text) in enumerate(columns):
+		remaining = config.Layout.FORECAST_COLUMN_WIDTH - font(FONT_SMALL).measure(text)[0]
+		offset = remaining // 2 if i == 0 else (remaining + 1) // 2
+		canvas.label(FONT_SMALL, text, config.Colors.DIMMEST_WHITE, starts[i] + offset, config.Layout.FORECAST_TEMP_Y)
+
+
+def render_transit(canvas, ctx):
+	routes = ctx["routes"]
+	if not routes:
+		if ctx["weekday_indicator"]:
+			canvas.weekday(ctx["wday"], False)
+		canvas.label(FONT_SMALL, "No CTA", config.Colors.DIMMEST_WHITE, 18, 14)
+		return
+
+	# Header with the live clock
+	if ctx.get("feels_like") is not None:
+		header = f"CTA {{t}} {round(ctx['feels_like'])}°"
+	else:
+		header = f"{MONTHS[ctx['month'] - 1]} {ctx['day']:02d} {{t}}"
+	canvas.overlay(OVERLAY_CLOCK, FONT_SMALL, header, config.Colors.MINT, 1, 1)
+
+	if ctx["weekday_indicator"] or ctx["stale"]:
+		canvas.weekday(ctx["wday"], ctx["stale"])
+
+	for i, route in enumerate(routes[:3]):
+		y = (9, 17, 25)[i]
+		canvas.label(FONT_SMALL, route["label"], config.Colors.WHITE, 7, y)
+		arrivals = route["arrivals"]
+		if len(arrivals) >= 1:
+			canvas.overlay(OVERLAY_COUNTDOWN, FONT_SMALL, "", config.Colors.WHITE, 51, y - 6, anchor=ANCHOR_TOP_RIGHT, value=arrivals[0]["minutes"])
+		if len(arrivals) >= 2:
+			canvas.overlay(OVERLAY_COUNTDOWN, FONT_SMALL, "", config.Colors.WHITE, 64, y - 6, anchor=ANCHOR_TOP_RIGHT, value=arrivals[1]["minutes"])
+
+		color = getattr(config.Colors, route.get("color") or "WHITE", config.Colors.WHITE)
+		if route.get("type") == "bus":
+			canvas.label(FONT_SMALL, route.get("route", "8"), color, 1, y)
+		else:
+			color2 = getattr(config.Colors, route.get("color2") or "", None)
+			canvas.fill(1, y, 4, 6, color)
+			if color2 is not None:
+				canvas.fill(3, y, 2, 6, color2)
+
+
+RENDERERS = {"weather": render_weather, "forecast": render_forecast, "transit": render_transit}
+
+
+def render(screen, ctx):
+	"""
+	Render one screen (runs in a pool worker).
+
+	Returns:
+		tuple: (palette [0xRRGGBB], pixel indexes bytes (64x32, row-major), overlays)
+	"""
+	canvas = Canvas()
+	RENDERERS[screen](canvas, ctx)
+
+	# Overlay colors must be in the palette too (device labels use RGB, but keep them indexable)
+	colors = {}
+	for row in canvas.pixels:
+		for color in row:
+			colors[color] = colors.get(color, 0) + 1
+	for overlay in canvas.overlays:
+		colors.setdefault(overlay[5], 0)
+		if overlay[6] is not None:
+			colors.setdefault(overlay[6], 0)
+
+	# More than 256 colors (photographic icon): drop low bits until it fits
+	shift = 0
+	while len(colors) > 256:
+		shift += 1
+		mask = (0xFF << shift) & 0xFF
+		mask = (mask << 16) | (mask << 8) | mask
+		canvas.pixels = [[c & mask for c in row] for row in canvas.pixels]
+		merged = {}
+		for color, count in colors.items():
+			merged[color & mask] = merged.get(color & mask, 0) + count
+		colors = merged
+
+	palette = sorted(colors, key=lambda c: (c != config.Colors.BLACK, -colors[c]))
+	index = {color: i for i, color in enumerate(palette)}
+	pixels = bytes(index[c] for row in canvas.pixels for c in row)
+	overlays = [(kind, which, anchor, x, y, index[color], NO_BACKGROUND if background is None else index[background], pads, value, text)
+	            for kind, which, anchor, x, y, color, background, pads, value, text in canvas.overlays]
+	return palette, pixels, overlays
+
+
+# ============================================================================
+# ENCODING
+# ============================================================================
+
+def encode(palette, pixels, overlays, base=None):
+	"""
+	Pack a rendered frame; with base = (crc, palette, pixels) of the frame the
+	device is showing, only the changed rows are sent (when that is smaller).
+
+	Returns:
+		tuple: (frame bytes, crc32 of palette + pixels)
+	"""
+	four_bit = len(palette) <= 16
+	palette_bytes = b"".join(c.to_bytes(3, "big") for c in palette)
+	crc = zlib.crc32(palette_bytes + pixels)
+
+	rows = []
+	for y in range(HEIGHT):
+		row = pixels[y * WIDTH:(y + 1) * WIDTH]
+		if four_bit:
+			row = bytes((row[x] << 4) | row[x + 1] for x in range(0, WIDTH, 2))
+		rows.append(row)
+
+	mask = 0xFFFFFFFF
+	base_crc = 0
+	if base is not None and base[1] == palette:
+		mask = 0
+		for y in range(HEIGHT):
+			if base[2][y * WIDTH:(y + 1) * WIDTH] != pixels[y * WIDTH:(y + 1) * WIDTH]:
+				mask |= 1 << y
+		if bin(mask).count("1") < HEIGHT - 1:  # Row mask costs 4 bytes - skip when nearly every row changed
+			base_crc = base[0]
+		else:
+			mask = 0xFFFFFFFF
+
+	flags = (FLAG_DELTA if base_crc else 0) | (FLAG_4BIT if four_bit else 0)
+	out = [struct.pack(HEADER, b"PF1", flags, len(palette), len(overlays), 0, crc, base_crc)]
+	out.append(palette_bytes)
+	for kind, which, anchor, x, y, color, background, pads, value, text in overlays:
+		encoded = text.encode()
+		out.append(struct.pack(OVERLAY, kind, which, anchor, x, y, color, background, *pads, value, len(encoded)) + encoded)
+	if base_crc:
+		out.append(struct.pack("<I", mask))
+	for y in range(HEIGHT):
+		if mask & (1 << y):
+			out.append(rows[y])
+	return b"".join(out), crc
+
+
+# ============================================================================
+# SAMPLE CONTEXT (preview / bench)
+# ============================================================================
+
+def sample_context(screen, minute_offset=0):
+	"""Context like fleet_server builds it, from the replay fixtures' values."""
+	hours = [{"temp": -4 + i // 3, "feels_like": -9 + i // 3, "feels_shade": -10 + i // 3, "icon": (6, 7, 19, 22)[i % 4],
+	          "condition": "", "datetime": f"2026-01-14T{(10 + i) % 24:02d}:00:00-06:00", "has_precipitation": i in (4, 5, 6)}
+	         for i in range(12)]
+	ctx = {
+		"weather": {"temp": -3, "feels_like": -9, "feels_shade": -10, "uv": 1, "humidity": 71, "icon": 6, "condition": "Mostly cloudy"},
+		"forecast": hours,
+		"hour": 9, "month": 1, "day": 14, "wday": 2,
+		"weekday_indicator": True, "stale": False,
+		"feels_like": -9,
+		"routes": [
+			{"label": "96St", "type": "train", "route": "Red", "color": "RED", "color2": None,
+			 "arrivals": [{"destination": "95th/Dan Ryan", "minutes": 11 + minute_offset}, {"destination": "95th/Dan Ryan", "minutes": 19}]},
+			{"label": "Loop", "type": "train", "route": "Brn", "color": "BROWN", "color2": "PURPLE",
+			 "arrivals": [{"destination": "Loop", "minutes": 13}]},
+		],
+	}
+	return ctx
+
+
+def _bench_job(job):
+	screen, ctx, base = job
+	palette, pixels, overlays = render(screen, ctx)
+	frame, crc = encode(palette, pixels, overlays, base)
+	return len(frame)
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Render Pantallita screens into 64x32 thin-client frames")
+	sub = parser.add_subparsers(dest="command")
+
+	p = sub.add_parser("preview", help="Render a sample screen to an 8-bit BMP (overlays listed)")
+	p.add_argument("--screen", choices=SCREENS, default="weather")
+	p.add_argument("--out", default="frame.bmp")
+
+	p = sub.add_parser("bench", help="Render frames for many devices through the process pool")
+	p.add_argument("--devices", type=int, default=20)
+	p.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+	p.add_argument("--rounds", type=int, default=5)
+
+	args = parser.parse_args()
+
+	if args.command == "preview":
+		palette, pixels, overlays = render(args.screen, sample_context(args.screen))
+		frame, crc = encode(palette, pixels, overlays)
+		write_indexed_bmp(args.out, WIDTH, HEIGHT, [((c >> 16) & 255, (c >> 8) & 255, c & 255) for c in palette],
+		                  [list(pixels[y * WIDTH:(y + 1) * WIDTH]) for y in range(HEIGHT)], 8)
+		print(f"{args.screen}: {len(palette)} colors, {len(frame)} bytes, crc {crc:08x} -> {args.out}")
+		for overlay in overlays:
+			print(f"  overlay kind {overlay[0]} at ({overlay[3]}, {overlay[4]}) text {overlay[9]!r} value {overlay[8]}")
+		return 0
+
+	if args.command == "bench":
+		jobs = []
+		for device in range(args.devices):
+			for screen in SCREENS:
+				jobs.append((screen, sample_context(screen, device % 5), None))
+		start = time.monotonic()
+		serial_bytes = sum(_bench_job(job) for job in jobs[:len(SCREENS)])
+		serial = (time.monotonic() - start) / len(SCREENS)
+		with ProcessPoolExecutor(max_workers=args.workers) as pool:
+			list(pool.map(_bench_job, jobs[:args.workers]))  # Warm up workers (fonts, icons)
+			start = time.monotonic()
+			total = 0
+			for _ in range(args.rounds):
+				total += sum(pool.map(_bench_job, jobs, chunksize=max(1, len(jobs) // (args.workers * 4))))
+			elapsed = time.monotonic() - start
+		frames = len(jobs) * args.rounds
+		print(f"[bench] serial: {serial * 1000:.1f} ms/frame (first frames, cold caches, {serial_bytes // len(SCREENS)} B avg)")
+		print(f"[bench] pool x{args.workers}: {frames} frames in {elapsed:.2f}s = {frames / elapsed:.0f} frames/s, "
+		      f"{total // frames} B avg - {frames / elapsed / len(SCREENS) * 60:.0f} displays at one frame set per minute")
+		return 0
+
+	parser.print_help()
+	return 2
+
+
+if __name__ == "__main__":
+	sys.exit(main() or 0)
@@ -0,0 +1,362 @@
+"""
+Pantallita 3.0 - Mock Price Stream Server (host-side, CPython 3.8+)
+Replays recorded ticks over WebSocket using the Twelve Data /quotes/price
+protocol, so stocks_stream.py can be developed and load-tested offline
+
+Usage:
+	python3 tools/mock_ws_server.py serve [--port 8765] [--ticks FILE] [--speed 10] [--drop-after 120]
+	python3 tools/mock_ws_server.py load  [--url ws://127.0.0.1:8765/] [--clients 50] [--seconds 30]
+	python3 tools/mock_ws_server.py record --symbols AAPL,BTC/USD [--seconds 600] [--out FILE]
+
+Point the device at the mock with TWELVE_DATA_WS_URL = "ws://<host-ip>:8765/"
+in settings.toml and stocks_streaming,true in config.csv.
+
+Standard library only - no host dependencies.
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import ssl
+import struct
+import sys
+import time
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+DEFAULT_TICKS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "ticks.jsonl")
+
+OP_TEXT = 0x1
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+
+# ============================================================================
+# FRAMING
+# ============================================================================
+
+def encode_frame(opcode, payload, mask=False):
+	"""Encode one WebSocket frame (server frames unmasked, client frames masked)."""
+	length = len(payload)
+	header = bytearray([0x80 | opcode])
+	mask_bit = 0x80 if mask else 0
+	if length < 126:
+		header.append(mask_bit | length)
+	elif length < 65536:
+		header.append(mask_bit | 126)
+		header += struct.pack(">H", length)
+	else:
+		header.append(mask_bit | 127)
+		header += struct.pack(">Q", length)
+
+	if not mask:
+		return bytes(header) + payload
+
+	key = os.urandom(4)
+	masked = bytes(b ^ key[i & 3] for i, b in enumerate(payload))
+	return bytes(header) + key + masked
+
+
+async def read_frame(reader):
+	"""Read one frame, returning (opcode, payload). Handles masked payloads."""
+	head = await reader.readexactly(2)
+	opcode = head[0] & 0x0F
+	masked = head[1] & 0x80
+	length = head[1] & 0x7F
+	if length == 126:
+		length = struct.unpack(">H", await reader.readexactly(2))[0]
+	elif length == 127:
+		length = struct.unpack(">Q", await reader.readexactly(8))[0]
+	key = await reader.readexactly(4) if masked else None
+	payload = await reader.readexactly(length)
+	if key:
+		payload = bytes(b ^ key[i & 3] for i, b in enumerate(payload))
+	return opcode, payload
+
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+def load_ticks(path):
+	"""Load recorded ticks: one JSON object per line {symbol, price, timestamp}."""
+	ticks = []
+	with open(path) as f:
+		for line in f:
+			line = line.strip()
+			if line and not line.startswith("#"):
+				ticks.append(json.loads(line))
+	ticks.sort(key=lambda t: t["timestamp"])
+	return ticks
+
+
+class Stats:
+	"""Server-wide counters printed periodically."""
+	clients = 0
+	peak_clients = 0
+	sent = 0
+	heartbeats = 0
+
+
+async def handle_client(reader, writer, args, ticks):
+	peer = writer.get_extra_info("peername")
+
+	# Upgrade handshake
+	request = await reader.readuntil(b"\r\n\r\n")
+	key = None
+	for line in request.decode(errors="replace").split("\r\n"):
+		if line.lower().startswith("sec-websocket-key:"):
+			key = line.split(":", 1)[1].strip()
+	if key is None:
+		writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n")
+		await writer.drain()
+		writer.close()
+		return
+
+	accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+	writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+	              f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode())
+	await writer.drain()
+
+	Stats.clients += 1
+	Stats.peak_clients = max(Stats.peak_clients, Stats.clients)
+	if not args.quiet:
+		print(f"[mock] client {peer} connected ({Stats.clients} active)")
+
+	subscribed = set()
+	subscribed_event = asyncio.Event()
+
+	async def receive():
+		while True:
+			opcode, payload = await read_frame(reader)
+			if opcode == OP_CLOSE:
+				return
+			if opcode == OP_PING:
+				writer.write(encode_frame(OP_PONG, payload))
+			elif opcode == OP_TEXT:
+				message = json.loads(payload)
+				action = message.get("action")
+				if action == "subscribe":
+					symbols = [s for s in message["params"]["symbols"].split(",") if s]
+					known = set(t["symbol"] for t in ticks)
+					success = [s for s in symbols if s in known or not args.strict]
+					fails = [s for s in symbols if s not in success]
+					subscribed.update(success)
+					status = {"event": "subscribe-status", "status": "ok" if not fails else "error",
+					          "success": [{"symbol": s} for s in success],
+					          "fails": [{"symbol": s} for s in fails]}
+					writer.write(encode_frame(OP_TEXT, json.dumps(status).encode()))
+					subscribed_event.set()
+				elif action == "unsubscribe":
+					for s in message["params"]["symbols"].split(","):
+						subscribed.discard(s)
+				elif action == "heartbeat":
+					Stats.heartbeats += 1
+					writer.write(encode_frame(OP_TEXT, b'{"event":"heartbeat","status":"ok"}'))
+			await writer.drain()
+
+	async def replay():
+		await subscribed_event.wait()
+		started = time.time()
+		while True:
+			# Restamp recorded ticks onto the wall clock (so bars land in today's session)
+			base = ticks[0]["timestamp"]
+			loop_start = time.time()
+			for tick in ticks:
+				due = loop_start + (tick["timestamp"] - base) / args.speed
+				delay = due - time.time()
+				if delay > 0:
+					await asyncio.sleep(delay)
+				if args.drop_after and time.time() - started >= args.drop_after:
+					if not args.quiet:
+						print(f"[mock] dropping {peer} after {args.drop_after}s (fallback test)")
+					writer.transport.abort()
+					return
+				if tick["symbol"] not in subscribed:
+					continue
+				event = {"event": "price", "symbol": tick["symbol"], "price": tick["price"],
+				         "timestamp": int(time.time())}
+				writer.write(encode_frame(OP_TEXT, json.dumps(event).encode()))
+				await writer.drain()
+				Stats.sent += 1
+			if not args.loop:
+				return
+
+	tasks = [asyncio.ensure_future(receive()), asyncio.ensure_future(replay())]
+	try:
+		await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+	except (asyncio.IncompleteReadError, ConnectionError):
+		pass
+	finally:
+		for task in tasks:
+			task.cancel()
+		Stats.clients -= 1
+		writer.close()
+		if not args.quiet:
+			print(f"[mock] client {peer} disconnected ({Stats.clients} active)")
+
+
+async def serve(args):
+	ticks = load_ticks(args.ticks)
+	if not ticks:
+		print(f"No ticks in {args.ticks}")
+		return 1
+	symbols = sorted(set(t["symbol"] for t in ticks))
+	print(f"[mock] {len(ticks)} ticks for {len(symbols)} symbols ({', '.join(symbols)}), speed x{args.speed}")
+
+	server = await asyncio.start_server(lambda r, w: handle_client(r, w, args, ticks), args.host, args.port)
+	print(f"[mock] listening on ws://{args.host}:{args.port}/")
+
+	async def report():
+		last_sent = 0
+		while True:
+			await asyncio.sleep(10)
+			rate = (Stats.sent - last_sent) / 10
+			last_sent = Stats.sent
+			print(f"[mock] clients {Stats.clients} (peak {Stats.peak_clients}), ticks sent {Stats.sent} ({rate:.1f}/s), heartbeats {Stats.heartbeats}")
+
+	asyncio.ensure_future(report())
+	async with server:
+		await server.serve_forever()
+
+
+# ============================================================================
+# CLIENTS (LOAD TEST + RECORDER)
+# ============================================================================
+
+async def open_client(url, symbols):
+	"""Connect, upgrade and subscribe. Returns (reader, writer)."""
+	secure = url.startswith("wss://")
+	rest = url.split("://", 1)[1]
+	host_port, _, path = rest.partition("/")
+	host, _, port = host_port.partition(":")
+	port = int(port) if port else (443 if secure else 80)
+	context = ssl.create_default_context() if secure else None
+	reader, writer = await asyncio.open_connection(host, port, ssl=context)
+
+	key = base64.b64encode(os.urandom(16)).decode()
+	writer.write((f"GET /{path} HTTP/1.1\r\nHost: {host}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+	              f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode())
+	await writer.drain()
+	response = await reader.readuntil(b"\r\n\r\n")
+	if b" 101 " not in response.split(b"\r\n", 1)[0]:
+		raise ConnectionError(response.split(b"\r\n", 1)[0].decode())
+
+	subscribe = {"action": "subscribe", "params": {"symbols": ",".join(symbols)}}
+	writer.write(encode_frame(OP_TEXT, json.dumps(subscribe).encode(), mask=True))
+	await writer.drain()
+	return reader, writer
+
+
+async def load_client(url, symbols, deadline, counts, index):
+	try:
+		reader, writer = await open_client(url, symbols)
+	except Exception:
+		counts["failed"] += 1
+		return
+	counts["connected"] += 1
+	try:
+		while time.time() < deadline:
+			try:
+				opcode, payload = await asyncio.wait_for(read_frame(reader), timeout=max(deadline - time.time(), 0.01))
+			except asyncio.TimeoutError:
+				break
+			if opcode == OP_CLOSE:
+				break
+			if opcode == OP_TEXT and b'"price"' in payload:
+				counts["ticks"] += 1
+	except (asyncio.IncompleteReadError, ConnectionError):
+		counts["dropped"] += 1
+	finally:
+		writer.close()
+
+
+async def load(args):
+	symbols = args.symbols.split(",")
+	counts = {"connected": 0, "failed": 0, "dropped": 0, "ticks": 0}
+	start = time.time()
+	deadline = start + args.seconds
+	await asyncio.gather(*[load_client(args.url, symbols, deadline, counts, i) for i in range(args.clients)])
+	elapsed = time.time() - start
+	print(f"[load] {args.clients} clients x {args.seconds}s: connected {counts['connected']}, failed {counts['failed']}, dropped {counts['dropped']}")
+	print(f"[load] {counts['ticks']} ticks received ({counts['ticks'] / elapsed:.1f}/s total, {counts['ticks'] / elapsed / max(counts['connected'], 1):.2f}/s per client)")
+	return 0 if counts["failed"] == 0 else 1
+
+
+async def record(args):
+	api_key = args.apikey or os.environ.get("TWELVE_DATA_API_KEY")
+	if not api_key:
+		print("Set TWELVE_DATA_API_KEY or pass --apikey")
+		return 1
+	url = f"{args.url}?apikey={api_key}"
+	reader, writer = await open_client(url, args.symbols.split(","))
+	deadline = time.time() + args.seconds
+	last_heartbeat = time.time()
+	written = 0
+	with open(args.out, "a") as out:
+		while time.time() < deadline:
+			if time.time() - last_heartbeat >= 10:
+				writer.write(encode_frame(OP_TEXT, b'{"action":"heartbeat"}', mask=True))
+				await writer.drain()
+				last_heartbeat = time.time()
+			try:
+				opcode, payload = await asyncio.wait_for(read_frame(reader), timeout=1)
+			except asyncio.TimeoutError:
+				continue
+			if opcode != OP_TEXT:
+				continue
+			message = json.loads(payload)
+			if message.get("event") == "price":
+				out.write(json.dumps({"symbol": message["symbol"], "price": message["price"], "timestamp": message["timestamp"]}) + "\n")
+				written += 1
+	writer.close()
+	print(f"[record] {written} ticks appended to {args.out}")
+	return 0
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Mock Twelve Data price stream for Pantallita")
+	sub = parser.add_subparsers(dest="command")
+
+	p = sub.add_parser("serve", help="Replay recorded ticks to connected clients")
+	p.add_argument("--host", default="0.0.0.0")
+	p.add_argument("--port", type=int, default=8765)
+	p.add_argument("--ticks", default=DEFAULT_TICKS, help="JSONL tick recording")
+	p.add_argument("--speed", type=float, default=1.0, help="Replay speed multiplier")
+	p.add_argument("--loop", action="store_true", help="Restart the recording when it ends")
+	p.add_argument("--drop-after", type=float, default=0, help="Abort each connection after N seconds (fallback test)")
+	p.add_argument("--strict", action="store_true", help="Reject symbols missing from the recording")
+	p.add_argument("--quiet", action="store_true")
+
+	p = sub.add_parser("load", help="Open many clients against a server and measure throughput")
+	p.add_argument("--url", default="ws://127.0.0.1:8765/")
+	p.add_argument("--clients", type=int, default=50)
+	p.add_argument("--seconds", type=float, default=30)
+	p.add_argument("--symbols", default="CRM,SPY,AAPL,NVDA,BTC/USD")
+
+	p = sub.add_parser("record", help="Record live ticks from Twelve Data into a JSONL file")
+	p.add_argument("--url", default="wss://ws.twelvedata.com/v1/quotes/price")
+	p.add_argument("--apikey", default=None)
+	p.add_argument("--symbols", required=True)
+	p.add_argument("--seconds", type=float, default=600)
+	p.add_argument("--out", default=DEFAULT_TICKS)
+
+	args = parser.parse_args()
+	if args.command == "serve":
+		return asyncio.run(serve(args))
+	if args.command == "load":
+		return asyncio.run(load(args))
+	if args.command == "record":
+		return asyncio.run(record(args))
+	parser.print_help()
+	return 2
+
+
+if __name__ == "__main__":
+	try:
+		sys.exit(main() or 0)
+	except KeyboardInterrupt:
+		pass
@@ -8,6 +8,12 @@ import time
 import config
 import state
 import logger
+import quota
+import breaker
+import connections
+import netbuf
+import snapshot
+import fleet_client
 
 
 # ============================================================================
@@ -16,59 +22,46 @@ import logger
 
 def load_transits_config():
 	"""
-	Load transit routes from transits.csv
+	Load transit routes from transits.csv (local, else GitHub)
 
-	Returns list of route configs:
-	[
-		{
-			'type': 'train',  # or 'bus'
-			'route': 'Red',
-			'label': 'RedToLoop',
-			'stops': ['40900', '41380'],  # Map IDs for trains, stop IDs for buses
-			'min_time': 3,
-			'color': 'RED',
-			'commute_hours': [(6, 9), (16, 19)],  # List of (start, end) tuples, empty for all day
-			'days': [0, 1, 2, 3, 4]  # List of weekdays (0=Mon, 6=Sun), empty for all days
-		},
-		...
-	]
+	Returns list of route configs (see parse_transits_csv_content).
+	The local file is read and parsed only when it changed since the config snapshot.
 
-	INLINE - all parsing inline
+	INLINE - all loading inline
 	"""
-	routes = []
-
 	try:
 		# Try loading from local file
-		with open('/transits.csv', 'r') as f:
-			lines = f.readlines()
+		routes = snapshot.parsed_file("transits.csv", '/transits.csv', parse_transits_csv_content)
 
 		logger.log(f"Loaded transits.csv from local SD card", config.LogLevel.DEBUG, area="TRANSIT")
 
 	except OSError:
 		# File not found - check GitHub
 		if config.Env.TRANSITS_GITHUB_URL:
+			response = None
 			try:
 				logger.log(f"Local transits.csv not found, fetching from GitHub", config.LogLevel.DEBUG, area="TRANSIT")
 
 				response = state.session.get(config.Env.TRANSITS_GITHUB_URL, timeout=10)
 
 				if response.status_code == 200:
-					content = response.text
-					lines = content.split('\n')
+					routes = snapshot.parsed("github:transits.csv", netbuf.read(response, spill=True), parse_transits_csv_content)
 					logger.log(f"Loaded transits.csv from GitHub", config.LogLevel.DEBUG, area="TRANSIT")
 				else:
 					logger.log(f"GitHub transits.csv fetch failed: HTTP {response.status_code}", config.LogLevel.WARNING, area="TRANSIT")
 					return []
 
-				# Close response
-				try:
-					response.close()
-				except:
-					pass
-
 			except Exception as e:
 				logger.log(f"GitHub transits.csv fetch error: {e}", config.LogLevel.WARNING, area="TRANSIT")
 				return []
+
+			finally:
+				# Close response
+				if response:
+					try:
+						response.close()
+					except:
+						pass
 		else:
 			logger.log(f"No transits.csv found (local or GitHub)", config.LogLevel.WARNING, area="TRANSIT")
 			return []
@@ -77,8 +70,39 @@ def load_transits_config():
 		logger.log(f"Error reading transits.csv: {e}", config.LogLevel.ERROR, area="TRANSIT")
 		return []
 
+	logger.log(f"Loaded {len(routes)} transit route(s) from transits.csv", config.LogLevel.INFO, area="TRANSIT")
+
+	return routes
+
+
+def parse_transits_csv_content(csv_content):
+	"""
+	Parse transits.csv content
+
+	Args:
+		csv_content: CSV text (str) or file/body view from netbuf
+
+	Returns list of route configs:
+	[
+		{
+			'type': 'train',  # or 'bus'
+			'route': 'Red',
+			'label': 'RedToLoop',
+			'stops': ['40900', '41380'],  # Map IDs for trains, stop IDs for buses
+			'min_time': 3,
+			'color': 'RED',
+			'commute_hours': [(6, 9), (16, 19)],  # List of (start, end) tuples, empty for all day
+			'days': [0, 1, 2, 3, 4]  # List of weekdays (0=Mon, 6=Sun), empty for all days
+		},
+		...
+	]
+
+	INLINE - all parsing inline
+	"""
+	routes = []
+
 	# Parse CSV lines (inline)
-	for line in lines:
+	for line in netbuf.lines(csv_content):
 		# Strip whitespace
 		line = line.strip()
 
@@ -194,8 +218,6 @@ def load_transits_config():
 		routes.append(route_config)
 		logger.log(f"Loaded transit route: {label} ({transit_type} {route})", config.LogLevel.DEBUG, area="TRANSIT")
 
-	logger.log(f"Loaded {len(routes)} transit route(s) from transits.csv", config.LogLevel.INFO, area="TRANSIT")
-
 	return routes
 
 
@@ -294,6 +316,10 @@ def fetch_train_arrivals(route_config):
 	stops = route_config['stops']
 	min_time = route_config['min_time']
 
+	# Fleet client mode: arrivals come from the aggregator's digest
+	if fleet_client.is_enabled():
+		return fleet_client.arrivals(route_config)
+
 	# Check if API key is configured
 	if not config.Env.CTA_API_KEY:
 		logger.log("CTA_API_KEY not configured", config.LogLevel.WARNING, area="TRANSIT")
@@ -303,20 +329,34 @@ def fetch_train_arrivals(route_config):
 	mapid_param = ",".join(stops)
 	url = f"http://lapi.transitchicago.com/api/1.0/ttarrivals.aspx?key={config.Env.CTA_API_KEY}&mapid={mapid_param}&outputType=JSON"
 
+	# Socket timeout from the remaining fetch budget (no time left = use cache)
+	timeout = connections.request_timeout()
+	if timeout is None:
+		return []
+
+	# Provider circuit breaker (fail fast to cache during outages)
+	if not breaker.allow(quota.CTA_TRAIN):
+		return []
+
+	# Reserve API quota (skip when exhausted)
+	if not quota.reserve(quota.CTA_TRAIN):
+		return []
+
 	response = None
 
 	try:
 		logger.log(f"Fetching train arrivals for {route} line (stops: {stops})", config.LogLevel.DEBUG, area="TRANSIT")
 
 		# Fetch from API
-		response = state.session.get(url, timeout=10)
+		response = state.session.get(url, timeout=timeout)
+		breaker.record(quota.CTA_TRAIN, response.status_code < 500)
 
 		if response.status_code != 200:
 			logger.log(f"CTA Train API error: HTTP {response.status_code}", config.LogLevel.WARNING, area="TRANSIT")
 			return []
 
 		# Parse JSON
-		data = response.json()
+		data = netbuf.load_json(response)
 
 		# Check for API errors (inline)
 		if 'ctatt' not in data:
@@ -417,6 +457,8 @@ def fetch_train_arrivals(route_config):
 		return arrivals
 
 	except Exception as e:
+		if response is None:
+			breaker.record_no_response(quota.CTA_TRAIN, timeout)  # No response: timeout / DNS / socket error
 		logger.log(f"CTA Train API fetch error: {e}", config.LogLevel.WARNING, area="TRANSIT")
 		return []
 
@@ -472,6 +514,10 @@ def fetch_bus_arrivals(route_config):
 	stops = route_config['stops']
 	min_time = route_config['min_time']
 
+	# Fleet client mode: arrivals come from the aggregator's digest
+	if fleet_client.is_enabled():
+		return fleet_client.arrivals(route_config)
+
 	# Check if API key is configured
 	if not config.Env.CTA_BUS_API_KEY:
 		logger.log("CTA_BUS_API_KEY not configured", config.LogLevel.WARNING, area="TRANSIT")
@@ -483,20 +529,34 @@ def fetch_bus_arrivals(route_config):
 	for stop_id in stops:
 		url += f"&stpid={stop_id}"
 
+	# Socket timeout from the remaining fetch budget (no time left = use cache)
+	timeout = connections.request_timeout()
+	if timeout is None:
+		return []
+
+	# Provider circuit breaker (fail fast to cache during outages)
+	if not breaker.allow(quota.CTA_BUS):
+		return []
+
+	# Reserve API quota (skip when exhausted)
+	if not quota.reserve(quota.CTA_BUS):
+		return []
+
 	response = None
 
 	try:
 		logger.log(f"Fetching bus arrivals for route {route} (stops: {stops})", config.LogLevel.DEBUG, area="TRANSIT")
 
 		# Fetch from API
-		response = state.session.get(url, timeout=10)
+		response = state.session.get(url, timeout=timeout)
+		breaker.record(quota.CTA_BUS, response.status_code < 500)
 
 		if response.status_code != 200:
 			logger.log(f"CTA Bus API error: HTTP {response.status_code}", config.LogLevel.WARNING, area="TRANSIT")
 			return []
 
 		# Parse JSON
-		data = response.json()
+		data = netbuf.load_json(response)
 
 		# Check for API response
 		if 'bustime-response' not in data:
@@ -554,6 +614,8 @@ def fetch_bus_arrivals(route_config):
 		return arrivals
 
 	except Exception as e:
+		if response is None:
+			breaker.record_no_response(quota.CTA_BUS, timeout)  # No response: timeout / DNS / socket error
 		logger.log(f"CTA Bus API fetch error: {e}", config.LogLevel.WARNING, area="TRANSIT")
 		return []
 
@@ -570,10 +632,15 @@ def fetch_bus_arrivals(route_config):
 # MAIN TRANSIT DATA FETCHER (INLINE)
 # ============================================================================
 
-def fetch_transit_data():
+def fetch_transit_data(active_routes=None):
 	"""
 	Fetch all configured transit arrivals
 
+	Args:
+		active_routes: Optional list of route configs already filtered by day and
+		               commute hours (from timeline.get_active_transit_routes).
+		               When None, transits.csv is loaded and filtered here.
+
 	Returns list of transit display data:
 	[
 		{
@@ -596,11 +663,16 @@ def fetch_transit_data():
 
 	INLINE - all logic inline
 	"""
-	# Load transits configuration
-	routes = load_transits_config()
+	# Use timeline-filtered routes when available, else load transits configuration
+	if active_routes is not None:
+		routes = active_routes
+		needs_filtering = False
+	else:
+		routes = load_transits_config()
+		needs_filtering = True
 
 	if not routes:
-		logger.log("No transit routes configured", config.LogLevel.DEBUG, area="TRANSIT")
+		logger.log("No transit routes configured or active", config.LogLevel.DEBUG, area="TRANSIT")
 		return []
 
 	# Get current hour and weekday for filtering
@@ -613,28 +685,46 @@ def fetch_transit_data():
 
 	# Fetch arrivals for each route (inline)
 	transit_data = []
+	state.transit_data_stale = False
 
 	for route_config in routes:
 		# Check day filter (inline)
-		if not is_active_today(route_config['days'], current_weekday):
+		if needs_filtering and not is_active_today(route_config['days'], current_weekday):
 			logger.log(f"Route {route_config['label']} filtered by day (current: {current_weekday})", config.LogLevel.DEBUG, area="TRANSIT")
 			continue
 
 		# Check commute hours (inline)
-		if respect_commute_hours:
+		if needs_filtering and respect_commute_hours:
 			if not is_within_commute_hours(route_config['commute_hours'], current_hour):
 				logger.log(f"Route {route_config['label']} filtered by commute hours (current: {current_hour}h)", config.LogLevel.DEBUG, area="TRANSIT")
 				continue
 
 		# Fetch arrivals based on type (inline)
 		if route_config['type'] == 'train':
+			provider = quota.CTA_TRAIN
 			arrivals = fetch_train_arrivals(route_config)
 		elif route_config['type'] == 'bus':
+			provider = quota.CTA_BUS
 			arrivals = fetch_bus_arrivals(route_config)
 		else:
 			logger.log(f"Unknown transit type: {route_config['type']}", config.LogLevel.WARNING, area="TRANSIT")
 			continue
 
+		# Remember the last arrivals per route; while offline or the provider's
+		# breaker is open, count them down by the time since they were fetched
+		label = route_config['label']
+		if arrivals:
+			state.transit_arrivals_cache[label] = (arrivals, time.monotonic())
+		elif (state.wifi_offline or breaker.is_open(provider)) and label in state.transit_arrivals_cache:
+			state.transit_data_stale = True
+			cached_arrivals, fetched_at = state.transit_arrivals_cache[label]
+			age_minutes = int((time.monotonic() - fetched_at) // 60)
+			for arrival in cached_arrivals:
+				minutes = arrival['minutes'] - age_minutes
+				if minutes >= route_config['min_time']:
+					arrivals.append({'destination': arrival['destination'], 'minutes': minutes})
+			logger.log(f"Using cached arrivals for {label} ({age_minutes} min old, {len(arrivals)} left)", config.LogLevel.DEBUG, area="TRANSIT")
+
 		# Skip if no arrivals
 		if not arrivals:
 			logger.log(f"No arrivals for {route_config['label']}", config.LogLevel.DEBUG, area="TRANSIT")
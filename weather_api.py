@@ -9,6 +9,11 @@ import time
 import config
 import state
 import logger
+import quota
+import breaker
+import connections
+import netbuf
+import fleet_client
 
 # ============================================================================
 # LOCATION INFO (INLINE - NO HELPERS)
@@ -40,6 +45,19 @@ def fetch_location_info():
 		logger.log("No AccuWeather location key configured", config.LogLevel.ERROR, area="WEATHER")
 		return None
 
+	# Socket timeout from the remaining fetch budget (no time left = use cache)
+	timeout = connections.request_timeout()
+	if timeout is None:
+		return None
+
+	# Provider circuit breaker (fail fast to cache during outages)
+	if not breaker.allow(quota.ACCUWEATHER):
+		return None
+
+	# Reserve API quota (skip when exhausted)
+	if not quota.reserve(quota.ACCUWEATHER):
+		return None
+
 	# Build URL (inline - no function)
 	url = f"http://dataservice.accuweather.com/locations/v1/{config.Env.ACCUWEATHER_LOCATION}?apikey={config.Env.ACCUWEATHER_KEY}"
 
@@ -49,7 +67,8 @@ def fetch_location_info():
 		logger.log("Fetching location info from AccuWeather...", config.LogLevel.DEBUG, area="WEATHER")
 
 		# Fetch from API
-		response = state.session.get(url, timeout=10)
+		response = state.session.get(url, timeout=timeout)
+		breaker.record(quota.ACCUWEATHER, response.status_code < 500)
 
 		# Check status
 		if response.status_code != 200:
@@ -57,7 +76,7 @@ def fetch_location_info():
 			return None
 
 		# Parse JSON (inline - no helper function)
-		data = response.json()
+		data = netbuf.load_json(response)
 
 		# Extract timezone info
 		timezone_info = data.get("TimeZone", {})
@@ -87,6 +106,8 @@ def fetch_location_info():
 		return location_data
 
 	except Exception as e:
+		if response is None:
+			breaker.record_no_response(quota.ACCUWEATHER, timeout)  # No response: timeout / DNS / socket error
 		logger.log(f"Location fetch failed: {e}", config.LogLevel.WARNING, area="WEATHER")
 		return None
 
@@ -118,10 +139,14 @@ def fetch_current():
 	
 	CRITICAL: All parsing is INLINE to minimize stack depth.
 	"""
+
+	# Fleet client mode: the aggregator already fetched and parsed it
+	if fleet_client.is_enabled():
+		return fleet_client.current()
 	
-	# Check if cache is still fresh
+	# Check if cache is still fresh (a DOWN long-press marks older data stale)
 	cache_age = time.monotonic() - state.last_weather_time
-	if state.last_weather_data and cache_age < config.Timing.WEATHER_CACHE_MAX_AGE:
+	if state.last_weather_data and cache_age < config.Timing.WEATHER_CACHE_MAX_AGE and state.last_weather_time > state.force_refresh_at:
 		# Use human-readable cache age
 		cache_age_str = logger.format_cache_age(cache_age)
 		logger.log(f"Using cached weather ({cache_age_str} old)", area="WEATHER")
@@ -135,6 +160,19 @@ def fetch_current():
 	if not config.Env.ACCUWEATHER_LOCATION:
 		logger.log("No AccuWeather location configured", config.LogLevel.ERROR, area="WEATHER")
 		return state.last_weather_data
+
+	# Socket timeout from the remaining fetch budget (no time left = use cache)
+	timeout = connections.request_timeout()
+	if timeout is None:
+		return state.last_weather_data
+
+	# Provider circuit breaker (fail fast to cache during outages)
+	if not breaker.allow(quota.ACCUWEATHER):
+		return state.last_weather_data
+
+	# Reserve API quota (skip and use cache when exhausted)
+	if not quota.reserve(quota.ACCUWEATHER):
+		return state.last_weather_data
 	
 	# Build URL (inline - no function)
 	url = (config.API.ACCUWEATHER_BASE + 
@@ -147,7 +185,8 @@ def fetch_current():
 		logger.log(f"Fetching weather from AccuWeather...", area="WEATHER")
 
 		# Fetch from API
-		response = state.session.get(url, timeout=10)
+		response = state.session.get(url, timeout=timeout)
+		breaker.record(quota.ACCUWEATHER, response.status_code < 500)
 
 		# Check status
 		if response.status_code != 200:
@@ -156,7 +195,7 @@ def fetch_current():
 			return state.last_weather_data
 
 		# Parse JSON (inline - no helper function)
-		data = response.json()
+		data = netbuf.load_json(response)
 
 		# AccuWeather returns a list with one item
 		if not data or len(data) == 0:
@@ -231,6 +270,8 @@ def fetch_current():
 		return weather_data
 
 	except Exception as e:
+		if response is None:
+			breaker.record_no_response(quota.ACCUWEATHER, timeout)  # No response: timeout / DNS / socket error
 		logger.log(f"Weather fetch failed: {e}", config.LogLevel.ERROR, area="WEATHER")
 		state.weather_fetch_errors += 1
 
@@ -273,9 +314,13 @@ def fetch_forecast():
 	CRITICAL: All parsing is INLINE to minimize stack depth.
 	"""
 
-	# Check if cache is still fresh
+	# Fleet client mode: the aggregator already fetched and parsed it
+	if fleet_client.is_enabled():
+		return fleet_client.forecast()
+
+	# Check if cache is still fresh (a DOWN long-press marks older data stale)
 	cache_age = time.monotonic() - state.last_forecast_time
-	if state.last_forecast_data and cache_age < config.Timing.FORECAST_CACHE_MAX_AGE:
+	if state.last_forecast_data and cache_age < config.Timing.FORECAST_CACHE_MAX_AGE and state.last_forecast_time > state.force_refresh_at:
 		# Use human-readable cache age
 		cache_age_str = logger.format_cache_age(cache_age)
 		logger.log(f"Using cached forecast ({cache_age_str} old)", area="WEATHER")
@@ -290,6 +335,19 @@ def fetch_forecast():
 		logger.log("No AccuWeather location configured", config.LogLevel.ERROR, area="WEATHER")
 		return state.last_forecast_data
 
+	# Socket timeout from the remaining fetch budget (no time left = use cache)
+	timeout = connections.request_timeout()
+	if timeout is None:
+		return state.last_forecast_data
+
+	# Provider circuit breaker (fail fast to cache during outages)
+	if not breaker.allow(quota.ACCUWEATHER):
+		return state.last_forecast_data
+
+	# Reserve API quota (skip and use cache when exhausted)
+	if not quota.reserve(quota.ACCUWEATHER):
+		return state.last_forecast_data
+
 	# Determine metric parameter based on temperature unit
 	metric_param = "true" if config.Env.TEMPERATURE_UNIT == "C" else "false"
 
@@ -304,7 +362,8 @@ def fetch_forecast():
 		logger.log(f"Fetching 12-hour forecast from AccuWeather...", area="WEATHER")
 
 		# Fetch from API
-		response = state.session.get(url, timeout=10)
+		response = state.session.get(url, timeout=timeout)
+		breaker.record(quota.ACCUWEATHER, response.status_code < 500)
 
 		# Check status
 		if response.status_code != 200:
@@ -313,7 +372,7 @@ def fetch_forecast():
 			return state.last_forecast_data
 
 		# Parse JSON (inline - no helper function)
-		data = response.json()
+		data = netbuf.load_json(response)
 
 		# AccuWeather returns a list of hourly forecasts
 		if not data or len(data) < 12:
@@ -362,6 +421,8 @@ def fetch_forecast():
 		return forecast_list
 
 	except Exception as e:
+		if response is None:
+			breaker.record_no_response(quota.ACCUWEATHER, timeout)  # No response: timeout / DNS / socket error
 		logger.log(f"Forecast fetch failed: {e}", config.LogLevel.ERROR, area="WEATHER")
 		state.forecast_fetch_errors += 1
 